@@ -0,0 +1,67 @@
+"""Shared helpers for benchmarks that run offline against recorded SEC
+payloads in the fixtures folder."""
+
+import gzip
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sec_cik_mapper import MutualFundMapper, StockMapper  # noqa: E402
+from sec_cik_mapper.transports import InMemoryTransport, RequestsTransport  # noqa: E402
+
+FIXTURES_PATH = Path(__file__).resolve().parent / "fixtures"
+
+MAPPER_TYPES = [StockMapper, MutualFundMapper]
+
+NUM_REPEATS = 5
+
+
+def get_fixture_path(mapper_type):
+    file_name = Path(mapper_type._retriever.source_url).name
+    return FIXTURES_PATH / f"{file_name}.gz"
+
+
+def load_payload(mapper_type):
+    """Load the recorded raw SEC payload for a mapper type."""
+    with gzip.open(get_fixture_path(mapper_type), "rb") as f:
+        return f.read()
+
+
+def record_payloads():
+    """Download the latest SEC payloads into the fixtures folder."""
+    transport = RequestsTransport()
+    for mapper_type in MAPPER_TYPES:
+        payload = transport.fetch(mapper_type._retriever.source_url)
+        fixture_path = get_fixture_path(mapper_type)
+        with gzip.GzipFile(fixture_path, "wb", mtime=0) as f:
+            f.write(payload)
+        print(f"[{mapper_type.__name__}]", fixture_path.name, "✓")
+
+
+def build_mapper(mapper_type, payload=None, **kwargs):
+    """Build a mapper from a recorded SEC payload without any network access,
+    passing ``kwargs`` to the constructor."""
+    payload = load_payload(mapper_type) if payload is None else payload
+    source_url = mapper_type._retriever.source_url
+    return mapper_type(transport=InMemoryTransport({source_url: payload}), **kwargs)
+
+
+def reset_indexes(mapper):
+    """Drop every built mapping so that it is rebuilt on next access."""
+    mapper._indexes.clear()
+    mapper._property_cache.clear()
+
+
+def best_of(func, setup=None, repeats=NUM_REPEATS):
+    """Get the best wall time in seconds of ``func`` over several runs,
+    calling ``setup`` (untimed) before each run."""
+    timings = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
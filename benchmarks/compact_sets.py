@@ -0,0 +1,67 @@
+"""Benchmark the memory, build time, and lookup latency of the mappings from
+keys to sets of values of the recorded SEC data as dicts of sets and as
+compact views (``compact_sets``)."""
+
+from functools import partial
+
+from common import MAPPER_TYPES, best_of, build_mapper, reset_indexes
+
+
+def build(mapper, names, compact_sets):
+    reset_indexes(mapper)
+    mapper.compact_sets = compact_sets
+    return mapper.build_indexes(names)
+
+
+def lookup_all(index, keys):
+    for key in keys:
+        index[key]
+
+
+def contains_all(index, items):
+    return all(value in index[key] for key, value in items)
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    mapper = build_mapper(mapper_type)
+    names = [name for name, spec in mapper._index_specs.items() if spec.multi_valued]
+    print(
+        f"[{identifier}] {'mapping':<24}{'memory':>16}{'build':>16}"
+        f"{'lookup':>16}{'membership':>16}"
+    )
+    results = {}
+    for compact_sets in (False, True):
+        indexes = build(mapper, names, compact_sets)
+        memory = mapper.memory_usage(deep=False)["indexes"]
+        build_time = best_of(lambda c=compact_sets: build(mapper, names, c))
+        indexes = build(mapper, names, compact_sets)
+        for name, index in indexes.items():
+            keys = list(index)
+            items = [(key, next(iter(index[key]))) for key in keys]
+            lookup = best_of(partial(lookup_all, index, keys)) / len(keys)
+            membership = best_of(partial(contains_all, index, items)) / len(keys)
+            results.setdefault(name, []).append((memory[name], lookup, membership))
+        results.setdefault("(all, build)", []).append(build_time)
+
+    for name in names:
+        (dict_memory, *dict_times), (compact_memory, *compact_times) = results[name]
+        print(
+            f"[{identifier}] {name:<24}"
+            f"{dict_memory / 1e6:>6.2f} -> {compact_memory / 1e6:.2f}MB"
+            f"{'':>16}"
+            + "".join(
+                f"{before * 1e9:>7.0f} -> {after * 1e9:>4.0f}ns"
+                for before, after in zip(dict_times, compact_times)
+            )
+        )
+    dict_build, compact_build = results["(all, build)"]
+    print(
+        f"[{identifier}] {'(all, build)':<24}{'':>16}"
+        f"{dict_build * 1000:>7.1f} -> {compact_build * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
@@ -0,0 +1,71 @@
+"""Benchmark building the mapping metadata of each mapper as a table of each
+dataframe backend on the recorded SEC data: construction time, table memory,
+building every mapping, and looking up a batch of keys, along with the cost
+of converting the pandas table of the default backend to Arrow or Polars.
+
+Usage::
+
+    $ python dataframe_backends.py
+"""
+
+import random
+from functools import partial
+
+from common import MAPPER_TYPES, best_of, load_payload
+
+from sec_cik_mapper.transports import InMemoryTransport
+
+BACKENDS = ["pandas", "arrow", "polars"]
+NUM_KEYS = 10_000
+
+
+def build(mapper_type, transport, backend):
+    return mapper_type(transport=transport, backend=backend)
+
+
+def materialize_all(mapper_type, transport, backend):
+    return build(mapper_type, transport, backend).materialize_all()
+
+
+def lookup_many(mapper, keys):
+    return mapper.lookup_many("ticker_to_cik", keys)
+
+
+def convert(pandas_mapper, mapper):
+    # What callers of the pandas backend pay to get a table of another backend
+    return mapper.backend.from_pandas(pandas_mapper.raw_dataframe)
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    transport = InMemoryTransport(
+        {mapper_type._retriever.source_url: load_payload(mapper_type)}
+    )
+    pandas_mapper = build(mapper_type, transport, "pandas")
+    tickers = sorted(pandas_mapper.ticker_to_cik)
+    rng = random.Random(0)
+    keys = [rng.choice(tickers) for _ in range(NUM_KEYS)]
+
+    print(
+        f"[{identifier}] {'backend':<10}{'build':>10}{'table':>10}"
+        f"{'all maps':>10}{'lookup':>16}{'from pandas':>14}"
+    )
+    for backend in BACKENDS:
+        construction = best_of(partial(build, mapper_type, transport, backend))
+        mapper = build(mapper_type, transport, backend)
+        table = sum(mapper.memory_usage()["table"].values())
+        indexes = best_of(partial(materialize_all, mapper_type, transport, backend))
+        # The first batch groups the mapping into a lookup table
+        lookup_many(mapper, keys)
+        lookup = best_of(partial(lookup_many, mapper, keys))
+        conversion = best_of(partial(convert, pandas_mapper, mapper))
+        print(
+            f"[{identifier}] {backend:<10}{construction * 1000:>8.1f}ms"
+            f"{table / 1e6:>8.1f}MB{indexes * 1000:>8.1f}ms"
+            f"{lookup / NUM_KEYS * 1e9:>10.0f}ns/key{conversion * 1000:>12.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
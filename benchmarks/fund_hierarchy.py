@@ -0,0 +1,112 @@
+"""Benchmark batch traversal of the recorded mutual fund hierarchy with the
+integer-coded fund hierarchy against walking the dicts of sets, for building
+each, collecting the tickers and classes under fund families, and getting
+the parents of share classes."""
+
+import random
+
+from common import best_of, build_mapper
+
+from sec_cik_mapper import MutualFundMapper
+
+MAPPINGS = [
+    "cik_to_series_ids",
+    "cik_to_class_ids",
+    "series_id_to_cik",
+    "series_id_to_class_ids",
+    "series_id_to_tickers",
+    "class_id_to_cik",
+]
+NUM_CIKS = 100
+
+
+def tickers_under(mapper, ciks):
+    cik_to_series_ids = mapper.cik_to_series_ids
+    series_id_to_tickers = mapper.series_id_to_tickers
+    return [
+        ticker
+        for cik in ciks
+        for series_id in cik_to_series_ids.get(cik, ())
+        for ticker in series_id_to_tickers.get(series_id, ())
+    ]
+
+
+def classes_under(mapper, ciks):
+    cik_to_class_ids = mapper.cik_to_class_ids
+    return [class_id for cik in ciks for class_id in cik_to_class_ids.get(cik, ())]
+
+
+def parents(mapper, class_id_to_series_id, class_ids):
+    series_id_to_cik = mapper.series_id_to_cik
+    series_ids = [class_id_to_series_id.get(class_id) for class_id in class_ids]
+    return series_ids, [series_id_to_cik.get(series_id) for series_id in series_ids]
+
+
+def build_dicts(mapper):
+    mapper.drop_indexes()
+    mapper.build_indexes(MAPPINGS)
+
+
+def build_hierarchy(mapper):
+    mapper._property_cache.pop("fund_hierarchy", None)
+    return mapper.fund_hierarchy
+
+
+if __name__ == "__main__":
+    mapper = build_mapper(MutualFundMapper)
+    build_dicts(mapper)
+    hierarchy = build_hierarchy(mapper)
+    # No mapping goes from class IDs to series IDs, so invert one for parents
+    class_id_to_series_id = {
+        class_id: series_id
+        for series_id, class_ids in mapper.series_id_to_class_ids.items()
+        for class_id in class_ids
+    }
+
+    dict_bytes = sum(mapper.memory_usage(deep=False)["indexes"].values())
+    hierarchy_bytes = sum(
+        value.nbytes for value in vars(hierarchy).values() if hasattr(value, "nbytes")
+    )
+    print(f"{len(hierarchy)} classes under {len(hierarchy.ciks)} CIKs")
+    print(f"{'':<28}{'dicts':>12}{'hierarchy':>12}")
+    print(f"{'memory (no strings)':<28}{dict_bytes:>10} B{hierarchy_bytes:>10} B")
+    build = (
+        best_of(lambda: build_dicts(mapper)),
+        best_of(lambda: build_hierarchy(mapper)),
+    )
+    print(f"{'build':<28}{build[0] * 1000:>10.1f}ms{build[1] * 1000:>10.1f}ms")
+
+    hierarchy = mapper.fund_hierarchy
+    all_ciks = list(hierarchy.ciks)
+    some_ciks = random.Random(0).sample(all_ciks, NUM_CIKS)
+    class_ids = list(hierarchy.class_ids)
+    cases = [
+        (
+            f"tickers under {NUM_CIKS} CIKs",
+            lambda: tickers_under(mapper, some_ciks),
+            lambda: hierarchy.tickers_under(some_ciks),
+        ),
+        (
+            "tickers under all CIKs",
+            lambda: tickers_under(mapper, all_ciks),
+            lambda: hierarchy.tickers_under(all_ciks),
+        ),
+        (
+            "classes under all CIKs",
+            lambda: classes_under(mapper, all_ciks),
+            lambda: hierarchy.classes_under(all_ciks),
+        ),
+        (
+            "class frame under all CIKs",
+            lambda: classes_under(mapper, all_ciks),
+            lambda: hierarchy.classes_under(all_ciks, as_frame=True),
+        ),
+        (
+            "parents of all classes",
+            lambda: parents(mapper, class_id_to_series_id, class_ids),
+            lambda: hierarchy.parents(class_ids),
+        ),
+    ]
+    for name, walk, traverse in cases:
+        timings = best_of(walk, repeats=20), best_of(traverse, repeats=20)
+        print(f"{name:<28}{timings[0] * 1000:>10.2f}ms{timings[1] * 1000:>10.2f}ms")
@@ -0,0 +1,79 @@
+"""Benchmark lazy mapping views (``lazy_mappings``) against dicts on the
+recorded SEC data: the time to the first lookup in a mapping, the time to
+build every mapping, their memory, and the latency of lookups."""
+
+import sys
+from functools import partial
+
+from common import MAPPER_TYPES, best_of, build_mapper, reset_indexes
+
+
+def reset(mapper, lazy_mappings):
+    reset_indexes(mapper)
+    mapper._key_indexes.clear()
+    mapper._columns.clear()
+    mapper.lazy_mappings = lazy_mappings
+
+
+def first_lookup(mapper, key):
+    return mapper.ticker_to_cik[key]
+
+
+def lookup_all(index, keys):
+    get = index.get
+    for key in keys:
+        get(key)
+
+
+def get_memory(mapper):
+    """Get the memory of the built mappings, and of the key indexes and value
+    lists shared by lazy views, excluding strings."""
+    indexes = sum(mapper.memory_usage(deep=False)["indexes"].values())
+    shared = sum(map(sys.getsizeof, mapper._key_indexes.values()))
+    shared += sum(map(sys.getsizeof, mapper._columns.values()))
+    return indexes + shared
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    mapper = build_mapper(mapper_type)
+    key = mapper.raw_dataframe["Ticker"].iloc[-1]
+    print(
+        f"[{identifier}] {'backend':<8}{'first lookup':>14}{'all mappings':>14}"
+        f"{'memory':>12}"
+    )
+    latencies = {}
+    for lazy_mappings in (False, True):
+        setup = partial(reset, mapper, lazy_mappings)
+        first = best_of(partial(first_lookup, mapper, key), setup)
+        build_all = best_of(mapper.materialize_all, setup)
+        indexes = mapper.materialize_all()
+        print(
+            f"[{identifier}] {'lazy' if lazy_mappings else 'dict':<8}"
+            f"{first * 1000:>12.1f}ms{build_all * 1000:>12.1f}ms"
+            f"{get_memory(mapper) / 1e6:>10.2f}MB"
+        )
+        for name, index in indexes.items():
+            keys = list(index)
+            latency = best_of(partial(lookup_all, index, keys)) / len(keys)
+            latencies.setdefault(name, []).append(latency)
+
+    # Lazy multi-valued lookups build a set of the values of the key, so they
+    # take time in proportion to the number of values
+    print(f"[{identifier}] {'lookup':<24}{'dict':>10}{'lazy':>10}{'values/key':>12}")
+    for name, (dict_latency, lazy_latency) in latencies.items():
+        index = indexes[name]
+        values_per_key = (
+            sum(map(len, index.values())) / len(index)
+            if mapper._index_specs[name].multi_valued
+            else 1
+        )
+        print(
+            f"[{identifier}] {name:<24}{dict_latency * 1e9:>8.0f}ns"
+            f"{lazy_latency * 1e9:>8.0f}ns{values_per_key:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
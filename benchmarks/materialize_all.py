@@ -0,0 +1,29 @@
+"""Benchmark building every mapping property-by-property versus in a single
+pass with ``materialize_all()``."""
+
+from common import MAPPER_TYPES, best_of, build_mapper, reset_indexes
+
+
+def build_property_by_property(mapper):
+    for name in mapper._index_specs:
+        getattr(mapper, name)
+
+
+def run_benchmark(mapper):
+    identifier = type(mapper).__name__
+    num_rows = len(mapper.raw_dataframe)
+    num_mappings = len(mapper._index_specs)
+    setup = lambda: reset_indexes(mapper)  # noqa: E731
+    per_property = best_of(lambda: build_property_by_property(mapper), setup=setup)
+    single_pass = best_of(mapper.materialize_all, setup=setup)
+    print(
+        f"[{identifier}] {num_rows} rows, {num_mappings} mappings: "
+        f"property-by-property {per_property * 1000:.1f} ms, "
+        f"materialize_all {single_pass * 1000:.1f} ms "
+        f"({per_property / single_pass:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(build_mapper(mapper_type))
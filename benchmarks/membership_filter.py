@@ -0,0 +1,88 @@
+"""Benchmark checking a stream of symbols, most of which are not SEC
+tickers, against ``ticker_to_cik`` with and without rejecting unknown
+symbols with the membership filter first, on the recorded SEC data, for
+dict and sorted array mappings."""
+
+import random
+import sys
+from functools import partial
+from itertools import compress
+
+from common import MAPPER_TYPES, best_of, build_mapper
+
+NUM_SYMBOLS = 200_000
+KNOWN_SHARE = 0.05
+FALSE_POSITIVE_RATES = [0.1, 0.01, 0.001]
+
+
+def generate_symbols(tickers):
+    """Generate a stream of symbols with a share of known tickers, and
+    otherwise futures, FX pairs, and foreign listings."""
+    rng = random.Random(0)
+    futures = ["ES", "NQ", "CL", "GC"]
+    unknown = [
+        lambda: f"{rng.choice(futures)}{rng.choice('FHMUZ')}{rng.randrange(10)}",
+        lambda: "".join(rng.sample(["EUR", "USD", "JPY", "GBP", "CHF", "AUD"], 2)),
+        lambda: f"{rng.randrange(10000):04d}.{rng.choice(['T', 'HK', 'L', 'PA'])}",
+        lambda: "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=rng.randint(3, 6))),
+    ]
+    return [
+        rng.choice(tickers) if rng.random() < KNOWN_SHARE else rng.choice(unknown)()
+        for _ in range(NUM_SYMBOLS)
+    ]
+
+
+def probe_all(index, symbols):
+    get = index.get
+    return [get(symbol) for symbol in symbols]
+
+
+def filter_and_probe(mapper, index, symbols):
+    get = index.get
+    candidates = compress(symbols, mapper.contains_many(symbols))
+    return [get(symbol) for symbol in candidates]
+
+
+def build_filter(mapper, false_positive_rate):
+    mapper._membership_filter = None
+    mapper.membership_false_positive_rate = false_positive_rate
+    return mapper.membership_filter
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    mapper = build_mapper(mapper_type)
+    symbols = generate_symbols(sorted(mapper.ticker_to_cik))
+    unknown = [symbol for symbol in symbols if symbol not in mapper.ticker_to_cik]
+    indexes = {"dict": mapper.ticker_to_cik}
+    mapper.drop_indexes()
+    mapper.sorted_arrays = True
+    indexes["sorted"] = mapper.build_indexes(["ticker_to_cik"])["ticker_to_cik"]
+    for backend, index in indexes.items():
+        probe = best_of(partial(probe_all, index, symbols)) / len(symbols)
+        print(f"[{identifier}] {backend} probes only: {probe * 1e9:.0f}ns per symbol")
+    print(
+        f"[{identifier}] {'rate':<8}{'bits':>10}{'hashes':>8}{'memory':>10}"
+        f"{'build':>10}{'measured':>10}"
+        + "".join(f"{backend + ' per symbol':>20}" for backend in indexes)
+    )
+    for false_positive_rate in FALSE_POSITIVE_RATES:
+        build = best_of(partial(build_filter, mapper, false_positive_rate))
+        membership_filter = mapper.membership_filter
+        measured = membership_filter.contains_many(unknown).mean()
+        filtered = [
+            best_of(partial(filter_and_probe, mapper, index, symbols))
+            for index in indexes.values()
+        ]
+        print(
+            f"[{identifier}] {false_positive_rate:<8}{membership_filter.num_bits:>10}"
+            f"{membership_filter.num_hashes:>8}"
+            f"{sys.getsizeof(membership_filter) / 1e3:>8.1f}KB"
+            f"{build * 1000:>8.1f}ms{measured:>10.4f}"
+            + "".join(f"{time / len(symbols) * 1e9:>18.0f}ns" for time in filtered)
+        )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
@@ -0,0 +1,31 @@
+"""Benchmark write time, read time, and file size of every mapping metadata
+export format."""
+
+import tempfile
+from pathlib import Path
+
+from common import MAPPER_TYPES, best_of, build_mapper
+
+from sec_cik_mapper.formats import _FORMATS
+
+
+def run_benchmark(mapper, tmp_dir):
+    mapper_type = type(mapper)
+    identifier = mapper_type.__name__
+    print(f"[{identifier}] {len(mapper.raw_dataframe)} rows")
+    print(f"{'format':<12}{'write (ms)':>12}{'read (ms)':>12}{'size (KB)':>12}")
+    for format in _FORMATS:
+        path = tmp_dir / f"{identifier}.{format}"
+        write_time = best_of(lambda: mapper.save_metadata(path))  # noqa: B023
+        read_time = best_of(lambda: mapper_type.load_metadata(path))  # noqa: B023
+        size = path.stat().st_size / 1024
+        print(
+            f"{format:<12}{write_time * 1000:>12.1f}"
+            f"{read_time * 1000:>12.1f}{size:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mapper_type in MAPPER_TYPES:
+            run_benchmark(build_mapper(mapper_type), Path(tmp_dir))
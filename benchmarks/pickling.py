@@ -0,0 +1,51 @@
+"""Benchmark the size of pickled mappers and the time to unpickle them and
+get every mapping, compared to pickling the mapping metadata dataframe and
+rebuilding the mappings after unpickling."""
+
+import pickle
+
+from common import MAPPER_TYPES, best_of, build_mapper
+
+from sec_cik_mapper.transports import RequestsTransport
+
+
+def run_benchmark(mapper):
+    identifier = type(mapper).__name__
+    # Pickle the mapper as if its data had been fetched from the SEC
+    mapper.transport = RequestsTransport()
+    mapper.materialize_all()
+
+    dataframe = pickle.dumps(mapper.raw_dataframe, protocol=pickle.HIGHEST_PROTOCOL)
+    mapper.pickle_indexes = False
+    without_indexes = pickle.dumps(mapper, protocol=pickle.HIGHEST_PROTOCOL)
+    mapper.pickle_indexes = True
+    with_indexes = pickle.dumps(mapper, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def rebuild_from_dataframe():
+        type(mapper)._from_mapping_metadata(pickle.loads(dataframe)).materialize_all()
+
+    print(f"[{identifier}] {'pickle':<24}{'size':>10}{'load':>10}{'all mappings':>14}")
+    for name, data, load_all in [
+        ("dataframe", dataframe, rebuild_from_dataframe),
+        (
+            "mapper",
+            without_indexes,
+            lambda: pickle.loads(without_indexes).materialize_all(),
+        ),
+        (
+            "mapper with mappings",
+            with_indexes,
+            lambda: pickle.loads(with_indexes).materialize_all(),
+        ),
+    ]:
+        load = best_of(lambda data=data: pickle.loads(data))
+        load_all_time = best_of(load_all)
+        print(
+            f"[{identifier}] {name:<24}{len(data) / 1e6:>8.2f}MB"
+            f"{load * 1000:>8.1f}ms{load_all_time * 1000:>12.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(build_mapper(mapper_type))
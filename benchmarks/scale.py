@@ -0,0 +1,75 @@
+"""Profile build time and peak memory of mappers built from synthetic SEC
+payloads of increasing size, entirely offline.
+
+Usage::
+
+    $ python scale.py
+    $ python scale.py --rows 100000 1000000 --kind stocks
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from common import MAPPER_TYPES
+
+from sec_cik_mapper.synthetic import PAYLOAD_GENERATORS
+from sec_cik_mapper.transports import InMemoryTransport
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+KINDS = dict(zip(PAYLOAD_GENERATORS, MAPPER_TYPES))
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _traced(func):
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def profile(mapper_type, payload):
+    """Get the wall time in seconds and the peak traced memory in bytes of
+    constructing a mapper and of materializing all of its mappings. Memory is
+    traced in a separate run since tracing slows down allocations."""
+    transport = InMemoryTransport({mapper_type._retriever.source_url: payload})
+    mapper, construct_time = _timed(lambda: mapper_type(transport=transport))
+    _, materialize_time = _timed(mapper.materialize_all)
+    mapper, construct_peak = _traced(lambda: mapper_type(transport=transport))
+    _, materialize_peak = _traced(mapper.materialize_all)
+    return construct_time, construct_peak, materialize_time, materialize_peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--kind", choices=list(KINDS), action="append")
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'kind':<14}{'rows':>10}{'construct':>12}{'peak':>10}"
+        f"{'materialize':>14}{'peak':>10}"
+    )
+    for kind in args.kind or list(KINDS):
+        _, generate = PAYLOAD_GENERATORS[kind]
+        for num_rows in args.rows:
+            payload = json.dumps(generate(num_rows, 0)).encode()
+            construct_time, construct_peak, materialize_time, materialize_peak = (
+                profile(KINDS[kind], payload)
+            )
+            print(
+                f"{kind:<14}{num_rows:>10}{construct_time:>11.2f}s"
+                f"{construct_peak / 2**20:>8.0f}MB{materialize_time:>13.2f}s"
+                f"{materialize_peak / 2**20:>8.0f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
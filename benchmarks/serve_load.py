@@ -0,0 +1,153 @@
+"""Load test the lookup service with single and 1k-key batch requests,
+reporting throughput and latency percentiles.
+
+The service is started from the recorded SEC payloads in the fixtures folder
+unless the URL of a running service is given. Each client process sends
+requests back to back over a single keep-alive connection.
+
+Usage::
+
+    $ python serve_load.py
+    $ python serve_load.py --clients 8 --requests 2000 --url http://127.0.0.1:8000
+"""
+
+import argparse
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.client import HTTPConnection
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from common import FIXTURES_PATH, build_mapper
+
+from sec_cik_mapper import StockMapper
+
+NUM_CLIENTS = 4
+NUM_REQUESTS = 1000
+BATCH_SIZE = 1000
+STARTUP_TIMEOUT = 60
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    """Start the lookup service from the recorded payloads in a subprocess."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "sec_cik_mapper.serve",
+            "--data-dir",
+            str(FIXTURES_PATH),
+            "--port",
+            str(port),
+            "--refresh-interval",
+            "0",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            connection = HTTPConnection("127.0.0.1", port)
+            connection.request("GET", "/health")
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Lookup service did not start in time")
+
+
+def run_client(url, requests):
+    """Send requests over one keep-alive connection, returning the latency
+    of each request in seconds."""
+    parts = urlsplit(url)
+    connection = HTTPConnection(parts.hostname, parts.port)
+    latencies = []
+    for method, path, body in requests:
+        start = time.perf_counter()
+        connection.request(method, path, body=body)
+        resp = connection.getresponse()
+        resp.read()
+        latencies.append(time.perf_counter() - start)
+        assert resp.status in (200, 404), resp.status
+    connection.close()
+    return latencies
+
+
+def run_load(url, client_requests):
+    urls = [url] * len(client_requests)
+    with ProcessPoolExecutor(max_workers=len(client_requests)) as executor:
+        # Start the worker processes before timing
+        list(executor.map(run_client, urls, [[]] * len(client_requests)))
+        start = time.perf_counter()
+        results = list(executor.map(run_client, urls, client_requests))
+        elapsed = time.perf_counter() - start
+    latencies = sorted(latency for result in results for latency in result)
+    return len(latencies) / elapsed, latencies
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[
+        min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="URL of a running lookup service.")
+    parser.add_argument("--clients", type=int, default=NUM_CLIENTS)
+    parser.add_argument("--requests", type=int, default=NUM_REQUESTS)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    tickers = list(build_mapper(StockMapper).ticker_to_cik)
+
+    def single_requests():
+        return [
+            ("GET", f"/stocks/ticker_to_cik/{rng.choice(tickers)}", None)
+            for _ in range(args.requests)
+        ]
+
+    def batch_requests():
+        body = json.dumps(rng.sample(tickers, BATCH_SIZE))
+        # Fewer batch requests, since each one looks up a thousand keys
+        return [("POST", "/stocks/ticker_to_cik", body)] * (args.requests // 10)
+
+    process = None
+    url = args.url
+    if url is None:
+        port = get_free_port()
+        process = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        print(f"{'benchmark':<20}{'req/s':>10}{'p50':>10}{'p99':>10}")
+        for name, make_requests in [
+            ("single", single_requests),
+            (f"batch ({BATCH_SIZE} keys)", batch_requests),
+        ]:
+            client_requests = [make_requests() for _ in range(args.clients)]
+            throughput, latencies = run_load(url, client_requests)
+            p50 = percentile(latencies, 0.5) * 1e3
+            p99 = percentile(latencies, 0.99) * 1e3
+            print(f"{name:<20}{throughput:>10.0f}{p50:>8.2f}ms{p99:>8.2f}ms")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare the private memory of pool workers that look up every ticker in
+mappings attached from shared memory against workers that receive a pickled
+copy of the mappings.
+
+Private memory is read from ``/proc/self/smaps_rollup``, so this benchmark
+only runs on Linux.
+
+Usage::
+
+    $ python shared_memory.py
+    $ python shared_memory.py --workers 8
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from common import MAPPER_TYPES, build_mapper
+
+from sec_cik_mapper.shared import SharedMapper
+
+NUM_WORKERS = 4
+
+_worker_state = {}
+
+
+def get_private_memory():
+    """Get the private memory of the current process in bytes."""
+    private = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                private += int(line.split()[1]) * 1024
+    return private
+
+
+def init_worker(mappings):
+    # Shared mappers are pickled by name and attached in the worker
+    if isinstance(mappings, SharedMapper):
+        mappings = mappings.indexes
+    _worker_state["mappings"] = mappings
+
+
+def lookup_all():
+    """Look up every key of every mapping, returning the private memory of
+    the worker afterwards."""
+    mappings = _worker_state["mappings"]
+    for name in list(mappings):
+        index = mappings[name]
+        for key in index:
+            index[key]
+    return get_private_memory()
+
+
+def measure(mappings, num_workers):
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=init_worker, initargs=(mappings,)
+    ) as executor:
+        # Submit one task per worker, each blocking until all have started
+        futures = [executor.submit(lookup_all) for _ in range(num_workers)]
+        return sum(future.result() for future in futures) / num_workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=NUM_WORKERS)
+    args = parser.parse_args(argv)
+
+    baseline = measure({}, args.workers)
+    print(f"{'mapper':<20}{'method':<10}{'per worker':>12}{'shared':>12}")
+    for mapper_type in MAPPER_TYPES:
+        mapper = build_mapper(mapper_type)
+        name = mapper_type.__name__
+        with SharedMapper.publish(mapper) as shared_mapper:
+            for method, mappings, shared_size in [
+                ("pickled", mapper.materialize_all(), 0),
+                ("shared", shared_mapper, shared_mapper.size),
+            ]:
+                private = measure(mappings, args.workers) - baseline
+                print(
+                    f"{name:<20}{method:<10}{private / 1e6:>10.1f}MB"
+                    f"{shared_size / 1e6:>10.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
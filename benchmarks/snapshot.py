@@ -0,0 +1,38 @@
+"""Benchmark restoring a mapper from a snapshot against building it from the
+raw SEC payload or from saved mapping metadata, up to the first lookup and
+up to every mapping being available."""
+
+import tempfile
+from pathlib import Path
+
+from common import MAPPER_TYPES, best_of, build_mapper
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    mapper = build_mapper(mapper_type)
+    key = next(iter(mapper.ticker_to_cik))
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = Path(directory) / "mapper.snapshot"
+        metadata_path = Path(directory) / "metadata.parquet"
+        mapper.save_snapshot(snapshot_path)
+        mapper.save_metadata(metadata_path)
+
+        print(f"[{identifier}] {'source':<12}{'first lookup':>14}{'all mappings':>14}")
+        for name, load in [
+            ("payload", lambda: build_mapper(mapper_type)),
+            ("parquet", lambda: mapper_type.load_metadata(metadata_path)),
+            ("snapshot", lambda: mapper_type.load_snapshot(snapshot_path)),
+        ]:
+            first_lookup = best_of(lambda load=load: load().ticker_to_cik[key])
+            all_mappings = best_of(lambda load=load: load().materialize_all())
+            print(
+                f"[{identifier}] {name:<12}{first_lookup * 1000:>12.1f}ms"
+                f"{all_mappings * 1000:>12.1f}ms"
+            )
+        print(f"[{identifier}] snapshot size: {snapshot_path.stat().st_size} bytes")
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
@@ -0,0 +1,65 @@
+"""Benchmark getting a mapper through a snapshot cache in a shared directory:
+on a miss (fetching the recorded SEC payload and storing its snapshot), on a
+hit, and for several processes starting at once against an empty cache."""
+
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from common import MAPPER_TYPES, best_of, get_fixture_path, load_payload
+
+from sec_cik_mapper.cache import SnapshotCache
+from sec_cik_mapper.transports import FileTransport
+
+NUM_PROCESSES = 8
+
+
+def load(directory, data_dir, mapper_type, clear=False):
+    """Get a mapper through the cache, returning whether it fetched the SEC
+    data and how long it took."""
+    if clear:
+        for path in Path(directory).iterdir():
+            path.unlink()
+    transport = FileTransport(data_dir)
+    start = time.perf_counter()
+    mapper = SnapshotCache(directory).load(mapper_type, transport)
+    mapper.ticker_to_cik
+    return mapper._mapping_metadata_loader is None, time.perf_counter() - start
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = Path(directory) / "sec"
+        data_dir.mkdir()
+        payload_name = get_fixture_path(mapper_type).name[: -len(".gz")]
+        (data_dir / payload_name).write_bytes(load_payload(mapper_type))
+        cache_dir = Path(directory) / "cache"
+        cache_dir.mkdir()
+
+        miss = best_of(partial(load, cache_dir, data_dir, mapper_type, clear=True))
+        hit = best_of(partial(load, cache_dir, data_dir, mapper_type))
+        print(f"[{identifier}] miss: {miss * 1000:.1f}ms, hit: {hit * 1000:.1f}ms")
+
+        for path in cache_dir.iterdir():
+            path.unlink()
+        with ProcessPoolExecutor(NUM_PROCESSES) as executor:
+            results = list(
+                executor.map(
+                    partial(load, cache_dir, data_dir),
+                    [mapper_type] * NUM_PROCESSES,
+                )
+            )
+        fetches = sum(fetched for fetched, _ in results)
+        slowest = max(elapsed for _, elapsed in results)
+        print(
+            f"[{identifier}] {NUM_PROCESSES} processes on an empty cache: "
+            f"{fetches} fetched the SEC data, slowest took {slowest * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
@@ -0,0 +1,77 @@
+"""Benchmark the sorted array backend of the mappings (``sorted_arrays``)
+against dicts on the recorded SEC data: the memory and build time of every
+mapping, and the latency of scalar and batch lookups."""
+
+from functools import partial
+
+from common import MAPPER_TYPES, best_of, build_mapper, reset_indexes
+
+NUM_BATCH_KEYS = 1000
+
+
+def build_all(mapper, sorted_arrays):
+    reset_indexes(mapper)
+    mapper.sorted_arrays = sorted_arrays
+    return mapper.materialize_all()
+
+
+def lookup_all(index, keys):
+    get = index.get
+    for key in keys:
+        get(key)
+
+
+def lookup_batch(index, keys):
+    get_many = getattr(index, "get_many", None)
+    if get_many is not None:
+        return get_many(keys)
+    get = index.get
+    return [get(key) for key in keys]
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    mapper = build_mapper(mapper_type)
+    print(
+        f"[{identifier}] {'mapping':<24}{'memory':>18}{'scalar lookup':>20}"
+        f"{'batch lookup':>20}"
+    )
+    results = {}
+    build_times = []
+    for sorted_arrays in (False, True):
+        build_times.append(best_of(partial(build_all, mapper, sorted_arrays)))
+        indexes = build_all(mapper, sorted_arrays)
+        memory = mapper.memory_usage(deep=False)["indexes"]
+        for name, index in indexes.items():
+            keys = sorted(index)
+            # Batches of keys in random order, including missing keys
+            batch = keys[::7][:NUM_BATCH_KEYS] + ["?"] * (NUM_BATCH_KEYS // 10)
+            scalar = best_of(partial(lookup_all, index, keys)) / len(keys)
+            batched = best_of(partial(lookup_batch, index, batch)) / len(batch)
+            results.setdefault(name, []).append((memory[name], scalar, batched))
+
+    for name, (
+        (dict_memory, *dict_times),
+        (sorted_memory, *sorted_times),
+    ) in results.items():
+        print(
+            f"[{identifier}] {name:<24}"
+            f"{dict_memory / 1e6:>8.2f} -> {sorted_memory / 1e6:.2f}MB"
+            + "".join(
+                f"{before * 1e9:>10.0f} -> {after * 1e9:>4.0f}ns"
+                for before, after in zip(dict_times, sorted_times)
+            )
+        )
+    dict_memory = sum(memory for (memory, *_), _ in results.values())
+    sorted_memory = sum(memory for _, (memory, *_) in results.values())
+    dict_build, sorted_build = build_times
+    print(
+        f"[{identifier}] {'(all)':<24}"
+        f"{dict_memory / 1e6:>8.2f} -> {sorted_memory / 1e6:.2f}MB"
+        f"   build {dict_build * 1000:.1f} -> {sorted_build * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
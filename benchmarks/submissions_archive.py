@@ -0,0 +1,55 @@
+"""Benchmark building a :class:`SubmissionsMapper` from a synthetic EDGAR
+``submissions.zip`` archive, reading and decoding its members across an
+increasing number of worker processes, entirely offline.
+
+Usage::
+
+    $ python submissions_archive.py
+    $ python submissions_archive.py --companies 100000 --workers 1 4 8
+"""
+
+import argparse
+import os
+from functools import partial
+
+from common import best_of
+
+from sec_cik_mapper import SubmissionsMapper
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import generate_submissions_archive
+from sec_cik_mapper.transports import InMemoryTransport
+
+DEFAULT_COMPANIES = 20_000
+DEFAULT_WORKERS = [1, 2, 4]
+
+
+def build(transport, workers):
+    instrumentation = Instrumentation()
+    SubmissionsMapper(transport, instrumentation, workers)
+    return instrumentation.stats["decode"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--companies", type=int, default=DEFAULT_COMPANIES)
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    archive = generate_submissions_archive(args.companies)
+    transport = InMemoryTransport({"submissions.zip": archive})
+    print(
+        f"[submissions] {args.companies} companies, {len(archive) / 1e6:.1f}MB "
+        f"archive, {os.cpu_count()} CPUs"
+    )
+    print(f"[submissions] {'workers':<10}{'build':>10}{'decode':>10}{'members/s':>12}")
+    for workers in args.workers:
+        total = best_of(partial(build, transport, workers), repeats=3)
+        decode = build(transport, workers).wall_time
+        print(
+            f"[submissions] {workers:<10}{total * 1000:>8.0f}ms{decode * 1000:>8.0f}ms"
+            f"{args.companies / decode:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
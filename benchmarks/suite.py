@@ -0,0 +1,201 @@
+"""Offline benchmark suite covering ingest, index builds, lookups, and export.
+
+Every phase of building and using a mapper is measured against the recorded
+SEC payloads in the fixtures folder. Results can be saved as JSON and
+compared against a stored baseline to flag regressions.
+
+Usage::
+
+    $ python suite.py --output results.json --baseline baseline.json
+    $ python suite.py --save-baseline baseline.json
+    $ python suite.py --record  # refresh the recorded SEC payloads
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from common import (
+    MAPPER_TYPES,
+    NUM_REPEATS,
+    best_of,
+    build_mapper,
+    load_payload,
+    record_payloads,
+    reset_indexes,
+)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Allowed slowdown relative to the baseline before flagging a regression
+DEFAULT_THRESHOLD = 0.25
+
+NUM_LOOKUPS = 10_000
+BATCH_SIZE = 1_000
+# Share of batch lookup keys that are not in the mapping
+BATCH_MISS_RATE = 0.2
+
+
+def benchmark_mapper(mapper_type, repeats, tmp_dir):
+    """Benchmark every phase for a mapper type. Returns timings in seconds."""
+    results = {}
+    payload = load_payload(mapper_type)
+    shell = mapper_type._from_mapping_metadata(None)
+
+    data = json.loads(payload)
+    results["decode"] = best_of(lambda: json.loads(payload), repeats=repeats)
+
+    transformed_data = shell._transform_company_data(data)
+    results["transform"] = best_of(
+        lambda: shell._transform_company_data(data), repeats=repeats
+    )
+    results["build_dataframe"] = best_of(
+        lambda: shell._build_mapping_metadata(transformed_data), repeats=repeats
+    )
+
+    mapper = build_mapper(mapper_type, payload)
+    setup = lambda: reset_indexes(mapper)  # noqa: E731
+    for name in mapper._index_specs:
+        results[f"build.{name}"] = best_of(
+            lambda name=name: getattr(mapper, name), setup=setup, repeats=repeats
+        )
+    results["materialize_all"] = best_of(
+        mapper.materialize_all, setup=setup, repeats=repeats
+    )
+
+    rng = random.Random(0)
+    for name in ["ticker_to_cik", "cik_to_tickers"]:
+        mapping = getattr(mapper, name)
+        keys = list(mapping)
+        single_keys = [rng.choice(keys) for _ in range(NUM_LOOKUPS)]
+        num_misses = int(BATCH_SIZE * BATCH_MISS_RATE)
+        batch_keys = rng.sample(keys, BATCH_SIZE - num_misses)
+        batch_keys += [f"MISSING{i}" for i in range(num_misses)]
+
+        def single_lookups(mapping=mapping, keys=single_keys):
+            for key in keys:
+                mapping[key]
+
+        def batch_lookup(mapping=mapping, keys=batch_keys):
+            return [mapping.get(key) for key in keys]
+
+        # Average time per single lookup
+        single_time = best_of(single_lookups, repeats=repeats)
+        results[f"lookup.{name}"] = single_time / NUM_LOOKUPS
+        results[f"batch_lookup.{name}"] = best_of(batch_lookup, repeats=repeats)
+
+    csv_path = Path(tmp_dir) / f"{mapper_type.__name__}.csv"
+    results["save_metadata_to_csv"] = best_of(
+        lambda: mapper.save_metadata_to_csv(csv_path), repeats=repeats
+    )
+    return results
+
+
+def run_suite(repeats=NUM_REPEATS):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mapper_type in MAPPER_TYPES:
+            timings = benchmark_mapper(mapper_type, repeats, tmp_dir)
+            for phase, seconds in timings.items():
+                results[f"{mapper_type.__name__}.{phase}"] = seconds
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """Get every benchmark that is slower than the baseline by more than the
+    threshold, as ``(name, baseline, current)`` tuples."""
+    regressions = []
+    for name, baseline_time in baseline["results"].items():
+        current_time = results["results"].get(name)
+        if current_time is not None and current_time > baseline_time * (1 + threshold):
+            regressions.append((name, baseline_time, current_time))
+    return regressions
+
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} µs"
+    return f"{seconds * 1e3:.2f} ms"
+
+
+def print_results(results, baseline=None):
+    baseline_results = baseline["results"] if baseline else {}
+    print(f"{'benchmark':<50}{'time':>14}{'baseline':>14}{'change':>10}")
+    for name, seconds in results["results"].items():
+        baseline_time = baseline_results.get(name)
+        if baseline_time is None:
+            print(f"{name:<50}{format_time(seconds):>14}")
+            continue
+        change = seconds / baseline_time - 1
+        print(
+            f"{name:<50}{format_time(seconds):>14}"
+            f"{format_time(baseline_time):>14}{change:>+10.1%}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--output", type=Path, help="Save results as JSON.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline results to compare against (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        help="Save results as the new baseline instead of comparing.",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeats", type=int, default=NUM_REPEATS)
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Download the latest SEC payloads into the fixtures folder.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_payloads()
+        return
+
+    results = run_suite(args.repeats)
+    if args.output:
+        args.output.write_text(f"{json.dumps(results, indent=2)}\n")
+    if args.save_baseline:
+        args.save_baseline.write_text(f"{json.dumps(results, indent=2)}\n")
+        print_results(results)
+        return
+
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    print_results(results, baseline)
+
+    if baseline:
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for name, baseline_time, current_time in regressions:
+            print(
+                f"Regression: {name} took {format_time(current_time)} "
+                f"(baseline {format_time(baseline_time)})"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark resolving vendor spellings of the recorded SEC tickers (dot,
+slash, space, and CQS styles) through the ticker alias index, against
+normalizing the symbols and retrying hand-made variants."""
+
+import time
+
+from common import build_mapper
+
+from sec_cik_mapper import StockMapper
+
+# Vendor spellings of SEC suffixes by style: (class separator, preferred
+# prefix, warrant, unit, and rights suffixes)
+VENDOR_STYLES = {
+    "sec": ("-", "-P", "-WT", "-UN", "-RI"),
+    "dot": (".", ".PR.", ".WS", ".U", ".RT"),
+    "slash": ("/", "/PR", "/WS", "/U", "/R"),
+    "space": (" ", " PR", " WS", " U", " R"),
+    "cqs": (".", "p", "+", "=", "^"),
+}
+NUM_REPEATS = 20
+
+
+def spell(ticker, style):
+    """Spell an SEC ticker in a vendor style."""
+    class_separator, preferred, warrant, unit, rights = VENDOR_STYLES[style]
+    base, _, suffix = ticker.partition("-")
+    if not suffix:
+        return ticker
+    if suffix in ("WT", "UN", "RI"):
+        return base + {"WT": warrant, "UN": unit, "RI": rights}[suffix]
+    if suffix.startswith("P") and len(suffix) <= 2:
+        # Preferred shares without a series, e.g. "BAC.PR"
+        return base + (preferred + suffix[1:]).rstrip("./ ")
+    return base + class_separator + suffix
+
+
+def resolve_with_retries(mapper, symbols):
+    """Look up each symbol, retrying with separators replaced by dashes."""
+    ticker_to_cik = mapper.ticker_to_cik
+    resolved = []
+    for symbol in symbols:
+        cik = None
+        for variant in (symbol, symbol.replace(".", "-"), symbol.replace("/", "-")):
+            cik = ticker_to_cik.get(mapper.normalize_key("ticker_to_cik", variant))
+            if cik is not None:
+                break
+        resolved.append(cik)
+    return resolved
+
+
+def resolve_with_aliases(mapper, symbols):
+    ticker_to_cik = mapper.ticker_to_cik
+    return [ticker_to_cik.get(t) for t in mapper.canonicalize_tickers(symbols)]
+
+
+def measure(func, mapper, symbols):
+    timings = []
+    for _ in range(NUM_REPEATS):
+        start = time.perf_counter()
+        resolved = func(mapper, symbols)
+        timings.append(time.perf_counter() - start)
+    hit_rate = sum(cik is not None for cik in resolved) / len(symbols)
+    return min(timings) / len(symbols), hit_rate
+
+
+if __name__ == "__main__":
+    mapper = build_mapper(StockMapper)
+    tickers = list(mapper.ticker_to_cik)
+    start = time.perf_counter()
+    num_aliases = len(mapper.ticker_aliases)
+    build_time = time.perf_counter() - start
+    print(
+        f"{len(tickers)} tickers, {num_aliases} aliases built in "
+        f"{build_time * 1000:.1f} ms"
+    )
+
+    print(f"{'style':<8}{'retries':>18}{'aliases':>18}{'suffixed aliases':>20}")
+    suffixed = [ticker for ticker in tickers if "-" in ticker]
+    for style in VENDOR_STYLES:
+        symbols = [spell(ticker, style) for ticker in tickers]
+        row = f"{style:<8}"
+        for func in (resolve_with_retries, resolve_with_aliases):
+            per_symbol, hit_rate = measure(func, mapper, symbols)
+            row += f"{per_symbol * 1e9:>8.0f} ns {hit_rate:>6.1%}"
+        suffixed_symbols = [spell(ticker, style) for ticker in suffixed]
+        _, hit_rate = measure(resolve_with_aliases, mapper, suffixed_symbols)
+        row += f"{hit_rate:>20.1%}"
+        print(row)
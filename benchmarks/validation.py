@@ -0,0 +1,51 @@
+"""Benchmark the validation of the mapping metadata fetched from the SEC:
+the construction time of each mapper with and without its validator, and
+the time of each check, on the recorded SEC data."""
+
+from functools import partial
+
+from common import MAPPER_TYPES, best_of, build_mapper, load_payload
+
+from sec_cik_mapper.backends import PandasBackend
+from sec_cik_mapper.validation import MetadataValidator
+
+# Construction times vary more than the validation overhead between runs
+NUM_REPEATS = 20
+
+
+def build(mapper_type, payload, validator):
+    return build_mapper(mapper_type, payload, validator=validator)
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    payload = load_payload(mapper_type)
+    validator = MetadataValidator()
+    without = best_of(partial(build, mapper_type, payload, None), repeats=NUM_REPEATS)
+    with_validation = best_of(
+        partial(build, mapper_type, payload, validator), repeats=NUM_REPEATS
+    )
+    mapper = build(mapper_type, payload, validator)
+    validate = best_of(
+        partial(
+            validator.validate,
+            mapper.mapping_metadata,
+            PandasBackend(),
+            mapper._index_columns(),
+            len(mapper.mapping_metadata),
+        )
+    )
+    print(
+        f"[{identifier}] construction without validation: {without * 1000:.1f}ms, "
+        f"with validation: {with_validation * 1000:.1f}ms "
+        f"({with_validation / without - 1:+.1%})"
+    )
+    print(
+        f"[{identifier}] validation of {mapper.validation_report.rows} rows: "
+        f"{validate * 1000:.2f}ms ({validate / without:.1%} of construction)"
+    )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
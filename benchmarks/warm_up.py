@@ -0,0 +1,62 @@
+"""Benchmark the warm-up policies of each mapper on the recorded SEC data:
+construction time, latency of the first lookup of a ticker, and of the
+first lookup of one key of every mapping, after construction without a
+warm-up, with every mapping built on construction, and with every mapping
+built in a background thread.
+
+Usage::
+
+    $ python warm_up.py
+"""
+
+import time
+
+from common import MAPPER_TYPES, NUM_REPEATS, load_payload
+
+from sec_cik_mapper.transports import InMemoryTransport
+
+POLICIES = {
+    "none": {"warm_up": "none"},
+    "eager": {"warm_up": "all"},
+    "background": {"warm_up": "all", "background_warm_up": True},
+}
+
+
+def first_lookups(mapper_type, transport, kwargs):
+    """Time construction, the first ticker lookup, and a lookup of one key of
+    every other mapping."""
+    start = time.perf_counter()
+    mapper = mapper_type(transport=transport, **kwargs)
+    constructed = time.perf_counter()
+    mapper.ticker_to_cik.get("AAPL")
+    first = time.perf_counter()
+    for name in mapper._index_specs:
+        getattr(mapper, name).get("AAPL")
+    end = time.perf_counter()
+    return constructed - start, first - constructed, end - constructed
+
+
+def run_benchmark(mapper_type):
+    identifier = mapper_type.__name__
+    transport = InMemoryTransport(
+        {mapper_type._retriever.source_url: load_payload(mapper_type)}
+    )
+    print(
+        f"[{identifier}] {'policy':<12}{'build':>10}{'first':>10}"
+        f"{'all maps':>10}{'total':>10}"
+    )
+    for policy, kwargs in POLICIES.items():
+        timings = [
+            first_lookups(mapper_type, transport, kwargs) for _ in range(NUM_REPEATS)
+        ]
+        construction, first, every = min(timings, key=lambda timing: sum(timing[::2]))
+        print(
+            f"[{identifier}] {policy:<12}{construction * 1000:>8.1f}ms"
+            f"{first * 1000:>8.1f}ms{every * 1000:>8.1f}ms"
+            f"{(construction + every) * 1000:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    for mapper_type in MAPPER_TYPES:
+        run_benchmark(mapper_type)
@@ -1,24 +1,35 @@
 """Generate curl commands for docs."""
 
-import csv
+import argparse
+import hashlib
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 
-GENERATED_MAPPINGS_PATH = Path("../mappings")
+sys.path.append("..")
+
+from sec_cik_mapper.generate import load_manifest  # noqa: E402
 
-if not GENERATED_MAPPINGS_PATH.exists():
-    print(f"Folder does not exist: {GENERATED_MAPPINGS_PATH.resolve()}")
-    print("Ensure that your current working directory is the scripts folder.")
-    sys.exit(1)
+GENERATED_MAPPINGS_PATH = Path("../mappings")
 
 BASE_URL_GH_RAW = (
     "https://raw.githubusercontent.com/jadchaar/sec-cik-mapper/main/mappings"
 )
 BASE_URL_JSDELIVR = "https://cdn.jsdelivr.net/gh/jadchaar/sec-cik-mapper@main/mappings"
+BASE_URLS = {
+    "gh": BASE_URL_GH_RAW,
+    "jsdelivr": BASE_URL_JSDELIVR,
+}
 CURL_TEMPLATE = "curl {0} -O"
 
+# Maximum number of concurrent downloads during validation
+MAX_WORKERS = 8
+CHUNK_SIZE = 64 * 1024
+TIMEOUT = 60
+
 RST_TEMPLATE = """
 **GitHub**
 
@@ -33,23 +44,40 @@ RST_TEMPLATE = """
 {1}
 """
 
+# Sessions are not thread-safe, so each worker thread reuses its own session
+# (and its pool of keep-alive connections) across downloads
+_thread_local = threading.local()
+
+
+def get_session():
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
+
+
+def get_expected_artifacts(mappings_path):
+    """Get the expected SHA-256 digest and size of every mapping file, keyed by
+    path relative to the mappings folder. Files missing from the manifest are
+    hashed from disk."""
+    manifest = load_manifest(mappings_path)
+    expected = {}
+    for mapping_folder in sorted(p for p in mappings_path.glob("*") if p.is_dir()):
+        artifacts = manifest.get(mapping_folder.name, {}).get("artifacts", {})
+        for file_path in sorted(mapping_folder.glob("*")):
+            record = artifacts.get(file_path.name)
+            if record is None:
+                data = file_path.read_bytes()
+                record = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+            expected[f"{mapping_folder.name}/{file_path.name}"] = record
+    return expected
 
-def generate_urls():
+
+def generate_urls(expected_artifacts, base_urls=BASE_URLS):
     print("Generating URLs...", end=" ")
-    url_map = {
-        "gh": [],
-        "jsdelivr": [],
-    }
-    for mapping_type in GENERATED_MAPPINGS_PATH.glob("*"):
-        mapping_folder = GENERATED_MAPPINGS_PATH / mapping_type
-        for file_path in mapping_folder.glob("*"):
-            full_url_gh_raw = f"{BASE_URL_GH_RAW}/{mapping_type.name}/{file_path.name}"
-            full_url_jsdelivr = (
-                f"{BASE_URL_JSDELIVR}/{mapping_type.name}/{file_path.name}"
-            )
-            validate_urls([full_url_gh_raw, full_url_jsdelivr])
-            url_map["gh"].append(full_url_gh_raw)
-            url_map["jsdelivr"].append(full_url_jsdelivr)
+    url_map = {name: [] for name in base_urls}
+    for relative_path in expected_artifacts:
+        for name, base_url in base_urls.items():
+            url_map[name].append(f"{base_url}/{relative_path}")
     print("✓")
     return url_map
 
@@ -73,19 +101,50 @@ def print_curl_commands(url_map):
     print(formatted_rst)
 
 
-def validate_urls(urls):
-    """Validate URLs by making a GET request, checking status code, and attempting to parse."""
-    for url in urls:
-        resp = requests.get(url)
+def validate_url(url, expected):
+    """Stream a URL and check its content against the expected SHA-256 digest
+    and size, without parsing it."""
+    digest = hashlib.sha256()
+    size = 0
+    with get_session().get(url, stream=True, timeout=TIMEOUT) as resp:
         resp.raise_for_status()
-        if url.endswith(".json"):
-            # Parse JSON
-            assert resp.json() is not None, f"Invalid URL: {url}"
-        else:
-            # Parse CSV
-            assert csv.DictReader(resp.iter_lines()) is not None, f"Invalid URL: {url}"
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    assert size == expected["size"], f"Invalid URL: {url} (size {size})"
+    assert digest.hexdigest() == expected["sha256"], f"Invalid URL: {url} (hash)"
+
+
+def validate_urls(expected_artifacts, base_urls=BASE_URLS, max_workers=MAX_WORKERS):
+    """Validate every mapping URL concurrently with a bounded pool of workers."""
+    print("Validating URLs...", end=" ")
+    tasks = [
+        (f"{base_url}/{relative_path}", expected)
+        for relative_path, expected in expected_artifacts.items()
+        for base_url in base_urls.values()
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results to raise the first validation error, if any
+        list(executor.map(lambda task: validate_url(*task), tasks))
+    print("✓")
 
 
-if __name__ == "__main__":
-    url_map = generate_urls()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mappings-dir", type=Path, default=GENERATED_MAPPINGS_PATH)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args(argv)
+
+    if not args.mappings_dir.exists():
+        print(f"Folder does not exist: {args.mappings_dir.resolve()}")
+        print("Ensure that your current working directory is the scripts folder.")
+        sys.exit(1)
+
+    expected_artifacts = get_expected_artifacts(args.mappings_dir)
+    validate_urls(expected_artifacts, max_workers=args.workers)
+    url_map = generate_urls(expected_artifacts)
     print_curl_commands(url_map)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,172 @@
 """Provides a :class:`BaseMapper` class for mapping stock and mutual
 fund data from the SEC."""
 
-import time
-from collections import defaultdict
+import hashlib
+import json
+import sys
+import threading
+from collections import Counter, defaultdict
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import ClassVar, Dict, List, Union, cast
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
+import numpy as np
 import pandas as pd
-import requests
 
-from .retrievers import MutualFundRetriever, StockRetriever
-from .types import CompanyData, FieldIndices, Fields, KeyToValueSet
+from .aliases import build_ticker_aliases, normalize_alias
+from .backends import BaseBackend, PandasBackend, get_backend
+from .bloom import BloomFilter
+from .compact import CompactSetMapping
+from .formats import read_metadata, write_metadata
+from .instrumentation import Instrumentation, phase
+from .retrievers import BaseRetriever
+from .sorted_arrays import SortedArrayMapping
+from .transports import BaseTransport, RequestsTransport
+from .types import (
+    CompanyData,
+    DataFrameBackend,
+    FieldIndices,
+    Fields,
+    Index,
+    IndexSpec,
+    KeyToValueSet,
+    MemoryUsage,
+    MetadataFormat,
+    PhaseStats,
+    SECPayload,
+    SetMapping,
+    WarmUp,
+)
 from .utils import with_cache
+from .validation import MetadataValidator, ValidationReport, ValidatorOption
+from .views import KeyIndex, MappingView
+
+MapperType = TypeVar("MapperType", bound="BaseMapper")
+
+# Version of the pickled state of mappers, bumped on incompatible changes
+_STATE_VERSION = 1
+
+
+class _EncodedIndex(NamedTuple):
+    """Mapping restored from a pickle or snapshot as arrays of string codes,
+    decoded on first access."""
+
+    # Distinct strings referenced by the codes
+    strings: np.ndarray
+    keys: np.ndarray
+    values: np.ndarray
+    # Number of values of each key of multi-valued mappings
+    counts: Optional[np.ndarray]
+
+
+def _decode_mapping_metadata(
+    strings: np.ndarray, columns: List[str], codes: List[np.ndarray]
+) -> pd.DataFrame:
+    """Decode mapping metadata restored from a pickle or snapshot."""
+    return pd.DataFrame(
+        {column: strings[column_codes] for column, column_codes in zip(columns, codes)},
+        columns=columns,
+    )
 
 
 class BaseMapper:
     """A :class:`BaseMapper` object."""
 
-    _headers: ClassVar[Dict[str, str]] = {
-        "User-Agent": f"{int(time.time())} {int(time.time())}@gmail.com",
-        "Accept-Encoding": "gzip, deflate",
-        "Host": "www.sec.gov",
+    _retriever: ClassVar[BaseRetriever]
+
+    # Column pairs backing each *_to_* property. Subclasses extend this
+    # with their own mappings.
+    _index_specs: ClassVar[Dict[str, IndexSpec]] = {
+        "cik_to_tickers": IndexSpec("CIK", "Ticker", multi_valued=True),
+        "ticker_to_cik": IndexSpec("Ticker", "CIK", multi_valued=False),
     }
 
-    def __init__(self, retriever: Union[StockRetriever, MutualFundRetriever]) -> None:
-        """Constructor for the :class:`BaseMapper` class."""
-        self.retriever = retriever
-        self.mapping_metadata = self._get_mapping_metadata_from_sec()
+    # Whether built mappings are pickled along with the mapping metadata, so
+    # that unpickled mappers do not rebuild them. Can be set per mapper.
+    pickle_indexes: bool = True
+
+    # Whether mappings from keys to sets of values are built as compact
+    # read-only views (see :mod:`sec_cik_mapper.compact`) rather than dicts
+    # of sets. Can be set per mapper, and applies to mappings built after.
+    compact_sets: bool = False
+
+    # Whether mappings are built as read-only mappings over a sorted array of
+    # fixed-width byte string keys searched with binary search (see
+    # :mod:`sec_cik_mapper.sorted_arrays`), rather than dicts. Takes
+    # precedence over ``compact_sets``. Can be set per mapper, and applies to
+    # mappings built after.
+    sorted_arrays: bool = False
+
+    # Whether mappings are built as lazy read-only views (see
+    # :mod:`sec_cik_mapper.views`) that share one hash index per key column,
+    # rather than dicts. Takes precedence over ``sorted_arrays`` and
+    # ``compact_sets``. Can be set per mapper, and applies to mappings built
+    # after.
+    lazy_mappings: bool = False
+
+    # False positive rate of the membership filter over tickers and CIKs (see
+    # :attr:`membership_filter`). Can be set per mapper, and applies to
+    # filters built after.
+    membership_false_positive_rate: float = 0.01
+
+    # Validates the mapping metadata fetched from the SEC before it is
+    # accepted (see :mod:`sec_cik_mapper.validation`), or ``None`` to skip
+    # validation. Can be set per mapper (e.g. with the ``validator``
+    # argument), and applies to data fetched after.
+    validator: Optional[MetadataValidator] = MetadataValidator()
+
+    def __init__(
+        self,
+        retriever: Optional[BaseRetriever] = None,
+        transport: Optional[BaseTransport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        backend: Union[DataFrameBackend, BaseBackend] = "pandas",
+        warm_up: WarmUp = "none",
+        background_warm_up: bool = False,
+        validator: ValidatorOption = "default",
+    ) -> None:
+        """Constructor for the :class:`BaseMapper` class. Data is retrieved
+        with the retriever of the class unless another ``retriever`` is
+        given."""
+        if validator is None or isinstance(validator, MetadataValidator):
+            self.validator = validator
+        self.retriever = type(self)._retriever if retriever is None else retriever
+        self.transport = RequestsTransport() if transport is None else transport
+        self.instrumentation = instrumentation
+        # SHA-256 hex digest of the raw SEC payload the mapper was built from
+        self.payload_hash = ""
+        self._backend = get_backend(backend)
+        # Held while mappings are built or the mapping metadata is replaced,
+        # so that concurrent lookups wait for a build (e.g. a background
+        # warm-up) rather than repeat it
+        self._build_lock = threading.RLock()
+        self._mapping_metadata: Optional[pd.DataFrame] = None
+        self._table: Optional[Any] = None
+        # Decodes the mapping metadata of mappers restored from a pickle or
+        # snapshot on first access, instead of fetching it from the SEC
+        self._mapping_metadata_loader: Optional[Callable[[], pd.DataFrame]] = None
+        # Report of the validation of the mapping metadata fetched last
+        self.validation_report: Optional[ValidationReport] = None
+        self._set_table(self._fetch_table())
+        # Thread of the background warm-up started on construction, if any
+        self.warm_up_thread = self.warm_up(warm_up, background_warm_up)
 
     def __new__(cls, *args, **kwargs):
         """BaseMapper should not be directly instantiated,
@@ -40,21 +180,367 @@ class BaseMapper:
                 "Please instantiate the StockMapper and/or MutualFundMapper "
                 "classes instead."
             )
-        return object.__new__(cls, *args, **kwargs)
+        return object.__new__(cls)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get a compact columnar state for pickling. Every distinct string of
+        the mapping metadata and built mappings is stored once, and columns,
+        mapping keys, and mapping values are stored as arrays of string codes.
+        Instrumentation is not pickled.
+        """
+        sections: List[Union[Sequence[Any], np.ndarray]] = []
+        table = self._mapping_metadata
+        if table is None and (
+            self._table is not None or self._mapping_metadata_loader is not None
+        ):
+            table = self.mapping_metadata
+        columns = None
+        num_rows = 0
+        if table is not None:
+            columns = [str(column) for column in table.columns]
+            num_rows = len(table)
+            sections.extend(
+                table[column].to_numpy(dtype=object) for column in table.columns
+            )
+
+        # Number of keys of each mapping, and of values of each key for
+        # multi-valued mappings
+        indexes: Dict[str, Tuple[int, Optional[np.ndarray]]] = {}
+        for name, index in self._indexes.items() if self.pickle_indexes else ():
+            sections.append(list(index))
+            if self._index_specs[name].multi_valued:
+                value_sets = cast(KeyToValueSet, index).values()
+                counts = [len(values) for values in value_sets]
+                dtype = np.min_scalar_type(max(counts, default=0))
+                indexes[name] = (len(index), np.array(counts, dtype=dtype))
+                sections.append(list(chain.from_iterable(value_sets)))
+            else:
+                indexes[name] = (len(index), None)
+                sections.append(list(index.values()))
+        encoded_indexes = self._encoded_indexes if self.pickle_indexes else {}
+        for name, encoded in encoded_indexes.items():
+            indexes[name] = (len(encoded.keys), encoded.counts)
+            sections.append(encoded.strings[encoded.keys])
+            sections.append(encoded.strings[encoded.values])
+
+        strings = np.concatenate(
+            [np.asarray(section, dtype=object) for section in sections]
+            + [np.empty(0, dtype=object)]
+        )
+        codes, uniques = pd.factorize(strings)
+        unique_strings: List[Optional[str]] = uniques.tolist()
+        if (codes < 0).any():
+            # Missing values are pickled as None
+            codes[codes < 0] = len(unique_strings)
+            unique_strings.append(None)
+        return {
+            "version": _STATE_VERSION,
+            "transport": self.transport,
+            "payload_hash": self.payload_hash,
+            "pickle_indexes": self.pickle_indexes,
+            "compact_sets": self.compact_sets,
+            "sorted_arrays": self.sorted_arrays,
+            "lazy_mappings": self.lazy_mappings,
+            "validator": self.validator,
+            "backend": self._backend.name,
+            "strings": unique_strings,
+            "codes": codes.astype(np.min_scalar_type(max(len(unique_strings) - 1, 0))),
+            "columns": columns,
+            "num_rows": num_rows,
+            "indexes": indexes,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a mapper from the state of :meth:`__getstate__`. The
+        mapping metadata and pickled mappings are decoded on first access."""
+        if state.get("version") != _STATE_VERSION:
+            raise ValueError(
+                f"Unsupported {type(self).__name__} pickle version: "
+                f"{state.get('version')} (expected {_STATE_VERSION})"
+            )
+        strings = np.array(state["strings"], dtype=object)
+        codes = state["codes"]
+        position = 0
+
+        def take(size: int) -> np.ndarray:
+            nonlocal position
+            position += size
+            return codes[position - size : position]
+
+        self.retriever = type(self)._retriever
+        self.transport = state["transport"]
+        self.instrumentation = None
+        self.payload_hash = state["payload_hash"]
+        self.pickle_indexes = state["pickle_indexes"]
+        self.compact_sets = state.get("compact_sets", type(self).compact_sets)
+        self.sorted_arrays = state.get("sorted_arrays", type(self).sorted_arrays)
+        self.lazy_mappings = state.get("lazy_mappings", type(self).lazy_mappings)
+        self.validator = state.get("validator", type(self).validator)
+        self._backend = get_backend(state.get("backend", PandasBackend.name))
+        self._build_lock = threading.RLock()
+        self._mapping_metadata = None
+        self._table = None
+        self.validation_report = None
+        self._mapping_metadata_loader = None
+        self._drop_derived_state()
+        self.warm_up_thread = None
+        if state["columns"] is not None:
+            columns = state["columns"]
+            column_codes = [take(state["num_rows"]) for _ in columns]
+            self._mapping_metadata_loader = partial(
+                _decode_mapping_metadata, strings, columns, column_codes
+            )
+
+        for name, (num_keys, counts) in state["indexes"].items():
+            keys = take(num_keys)
+            num_values = num_keys if counts is None else int(counts.sum())
+            values = take(num_values)
+            self._encoded_indexes[name] = _EncodedIndex(strings, keys, values, counts)
+
+    def _decode_index(self, name: str) -> Index:
+        """Decode a mapping restored from a pickle or snapshot."""
+        strings, keys, values, counts = self._encoded_indexes.pop(name)
+        if self.sorted_arrays:
+            key_column = (
+                strings[keys] if counts is None else np.repeat(strings[keys], counts)
+            )
+            return SortedArrayMapping.from_columns(
+                key_column, strings[values], multi_valued=counts is not None
+            )
+        if counts is not None and self.compact_sets:
+            key_column = np.repeat(strings[keys], counts)
+            return CompactSetMapping.from_columns(key_column, strings[values])
+        decoded_keys = strings[keys].tolist()
+        if counts is None:
+            return dict(zip(decoded_keys, strings[values].tolist()))
+        flat_values = iter(strings[values].tolist())
+        return {
+            key: set(islice(flat_values, count))
+            for key, count in zip(decoded_keys, counts.tolist())
+        }
+
+    @classmethod
+    def _from_mapping_metadata(
+        cls: Type[MapperType], mapping_metadata: pd.DataFrame, payload_hash: str = ""
+    ) -> MapperType:
+        """Create a mapper from existing mapping metadata without fetching
+        data from the SEC.
+        """
+        mapper = object.__new__(cls)
+        mapper.retriever = cls._retriever
+        mapper.transport = RequestsTransport()
+        mapper.instrumentation = None
+        mapper.payload_hash = payload_hash
+        mapper._backend = PandasBackend()
+        mapper._build_lock = threading.RLock()
+        mapper._mapping_metadata = mapping_metadata
+        mapper._table = None
+        mapper.validation_report = None
+        mapper._mapping_metadata_loader = None
+        mapper._drop_derived_state()
+        mapper.warm_up_thread = None
+        return mapper
+
+    def _drop_derived_state(self) -> None:
+        """Drop every mapping and other state built from the mapping
+        metadata, to build it again from the mapping metadata on next
+        access."""
+        self._indexes: Dict[str, Index] = {}
+        # Mappings restored from a pickle or snapshot, decoded on first access
+        self._encoded_indexes: Dict[str, _EncodedIndex] = {}
+        # Values of the properties cached with with_cache
+        self._property_cache: Dict[str, Any] = {}
+        # Groups of the values of each mapping by key, for batch lookups
+        self._lookup_tables: Dict[str, Any] = {}
+        self._ticker_aliases: Optional[Dict[str, str]] = None
+        self._membership_filter: Optional[BloomFilter] = None
+        # Key indexes and value columns shared by lazy mapping views
+        self._key_indexes: Dict[str, KeyIndex] = {}
+        self._columns: Dict[str, List[Any]] = {}
+        # Row count of the mapping metadata dropped with drop_raw_table, to
+        # validate the mapping metadata fetched again against
+        self._dropped_rows: Optional[int] = None
+
+    @property
+    def mapping_metadata(self) -> pd.DataFrame:
+        """Mapping metadata the ``*_to_*`` mappings are built from. It is
+        fetched again through the mapper's transport if it was dropped with
+        :meth:`drop_raw_table`, or decoded on first access for mappers
+        restored from a pickle or snapshot. Replacing it drops every mapping
+        built from the previous mapping metadata, and clears
+        :attr:`payload_hash`.
+        """
+        if self._mapping_metadata is None:
+            if self._table is None and self._mapping_metadata_loader is not None:
+                self._mapping_metadata = self._mapping_metadata_loader()
+            else:
+                self._mapping_metadata = self._backend.to_pandas(self.table)
+        return self._mapping_metadata
+
+    @mapping_metadata.setter
+    def mapping_metadata(self, mapping_metadata: pd.DataFrame) -> None:
+        with self._build_lock:
+            # The mapping metadata was not built from a payload anymore
+            self.payload_hash = ""
+            self._replace_mapping_metadata(mapping_metadata, None)
+
+    def _replace_mapping_metadata(
+        self, mapping_metadata: Optional[pd.DataFrame], table: Optional[Any]
+    ) -> None:
+        """Replace the mapping metadata, as a pandas dataframe and/or as a
+        table of the mapper's backend. Mappings, lookup tables, ticker
+        aliases, and the membership filter are built again from the new
+        mapping metadata."""
+        with self._build_lock:
+            self._mapping_metadata = mapping_metadata
+            self._table = table
+            self._mapping_metadata_loader = None
+            self._drop_derived_state()
+
+    @property
+    def table(self) -> Any:
+        """Mapping metadata as a table of the mapper's :attr:`backend`, e.g. an
+        Arrow table. It is fetched again through the mapper's transport if it
+        was dropped with :meth:`drop_raw_table`, or converted on first access
+        for mappers restored from a pickle or snapshot or switched to another
+        backend.
+        """
+        if self._table is None:
+            if self._mapping_metadata is None and self._mapping_metadata_loader is None:
+                self._refetch_table()
+            else:
+                self._table = self._backend.from_pandas(self.mapping_metadata)
+        return self._table
+
+    def _refetch_table(self) -> None:
+        """Fetch the mapping metadata dropped with :meth:`drop_raw_table`
+        again. Mappings built from the dropped mapping metadata are kept if
+        the SEC payload is unchanged, and dropped otherwise, so that mappings
+        are never built from different payloads. They are also kept if the
+        fetched mapping metadata is rejected by the mapper's
+        :attr:`validator`, e.g. as it lost too many of the dropped rows.
+
+        :raises ~sec_cik_mapper.validation.ValidationError: if the mapping
+            metadata is rejected.
+        """
+        with self._build_lock:
+            payload_hash = self.payload_hash
+            try:
+                table = self._fetch_table(self._dropped_rows)
+            except Exception:
+                self.payload_hash = payload_hash
+                raise
+            if self.payload_hash != payload_hash:
+                self._set_table(table)
+            else:
+                self._table = table
+                if isinstance(table, pd.DataFrame):
+                    self._mapping_metadata = table
+
+    def _set_table(self, table: Any) -> None:
+        """Replace the mapping metadata with a table of the mapper's backend.
+        Tables of other backends than pandas are converted to pandas on
+        first access of :attr:`mapping_metadata`."""
+        mapping_metadata = table if isinstance(table, pd.DataFrame) else None
+        self._replace_mapping_metadata(mapping_metadata, table)
+
+    @property
+    def backend(self) -> BaseBackend:
+        """Backend of the mapping metadata table (see
+        :mod:`sec_cik_mapper.backends`). It can be switched to another
+        backend by name, which converts the table on next access.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.backend = "polars"
+            >>> type(stock_mapper.raw_dataframe)
+            <class 'polars.dataframe.frame.DataFrame'>
+        """
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: Union[DataFrameBackend, BaseBackend]) -> None:
+        backend = get_backend(backend)
+        if self._table is not None:
+            # Kept as pandas to convert it to the new backend
+            self._mapping_metadata = self.mapping_metadata
+        self._backend = backend
+        self._table = None
+        self._lookup_tables = {}
+
+    def _index_columns(self) -> List[str]:
+        """Get the columns of the mapping metadata backing the mappings."""
+        specs = self._index_specs.values()
+        return list(dict.fromkeys(chain.from_iterable(spec[:2] for spec in specs)))
+
+    def _fetch_table(self, previous_rows: Optional[int] = None) -> Any:
+        """Fetch the mapping metadata from the SEC as a table of the mapper's
+        backend, validated by the mapper's :attr:`validator`, comparing its
+        row count to ``previous_rows``.
+
+        :raises ~sec_cik_mapper.validation.ValidationError: if the mapping
+            metadata is rejected.
+        """
+        table = self._get_mapping_metadata_from_sec()
+        if self.validator is not None:
+            with phase(self.instrumentation, "validate") as counters:
+                report = self.validator.validate(
+                    table, self._backend, self._index_columns(), previous_rows
+                )
+                counters.rows = report.rows
+            report.raise_for_errors()
+            self.validation_report = report
+        return table
+
+    def validate(self, previous_rows: Optional[int] = None) -> ValidationReport:
+        """Validate the mapping metadata with the mapper's :attr:`validator`
+        (or the default one if validation is disabled), comparing its row
+        count to ``previous_rows``, e.g. of the previous snapshot. Invalid
+        mapping metadata is reported rather than raised.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> report = stock_mapper.validate(previous_rows=14000)
+            >>> report.valid, report.errors[0].message
+            (False, 'Rows dropped by 31% from 14000 to 9713, more than 25%')
+        """
+        validator = MetadataValidator() if self.validator is None else self.validator
+        return validator.validate(
+            self.table, self._backend, self._index_columns(), previous_rows
+        )
 
     def _get_indices_from_fields(self, fields: Fields) -> FieldIndices:
         """Get list indices from field names."""
         field_indices = {field: fields.index(field) for field in fields}
         return cast(FieldIndices, field_indices)
 
-    def _get_mapping_metadata_from_sec(self) -> pd.DataFrame:
-        """Get company mapping metadata from the SEC as a pandas dataframe,
-        sorted by CIK and ticker.
+    def _get_mapping_metadata_from_sec(self) -> Any:
+        """Get company mapping metadata from the SEC (through the mapper's
+        transport) as a table of the mapper's backend, sorted by CIK and
+        ticker.
         """
-        resp = requests.get(self.retriever.source_url, headers=BaseMapper._headers)
-        resp.raise_for_status()
-        data = resp.json()
+        with phase(self.instrumentation, "network") as counters:
+            payload = self.transport.fetch(self.retriever.source_url)
+            counters.size = len(payload)
+        self.payload_hash = hashlib.sha256(payload).hexdigest()
+        with phase(self.instrumentation, "decode") as counters:
+            data = json.loads(payload)
+            counters.rows = len(data["data"])
+        if self.validator is not None:
+            # Rows are transformed by field, so missing fields fail early
+            self.validator.check_fields(data, self.retriever.fields).raise_for_errors()
+
+        with phase(self.instrumentation, "transform") as counters:
+            transformed_data = self._transform_company_data(data)
+            counters.rows = len(transformed_data)
+        return self._build_mapping_metadata(transformed_data)
 
+    def _transform_company_data(self, data: SECPayload) -> List[Dict[str, str]]:
+        """Transform each row of decoded SEC data with the mapper's retriever."""
         fields: Fields = data["fields"]
         field_indices: FieldIndices = self._get_indices_from_fields(fields)
 
@@ -65,10 +551,18 @@ class BaseMapper:
             transformed_data.append(
                 self.retriever.transform(field_indices, cd),
             )
+        return transformed_data
 
-        df = pd.DataFrame(transformed_data)
-        df.sort_values(by=["CIK", "Ticker"], inplace=True, ignore_index=True)
-        return df
+    def _build_mapping_metadata(self, transformed_data: List[Dict[str, str]]) -> Any:
+        """Build the mapping metadata as a table of the mapper's backend,
+        sorted by CIK and ticker."""
+        with phase(self.instrumentation, "dataframe") as counters:
+            table = self._backend.from_records(transformed_data)
+            counters.rows = len(table)
+        with phase(self.instrumentation, "sort") as counters:
+            table = self._backend.sort(table, ["CIK", "Ticker"])
+            counters.rows = len(table)
+        return table
 
     def _form_kv_set_mapping(self, keys: pd.Series, values: pd.Series) -> KeyToValueSet:
         """Form mapping from key to list of values, ignoring blank keys and values.
@@ -87,9 +581,506 @@ class BaseMapper:
         """Form key-value mapping, ignoring blank keys and values."""
         return {k: v for k, v in zip(keys, values) if k and v}
 
+    def _form_indexes(self, specs: Dict[str, IndexSpec]) -> Dict[str, Index]:
+        """Form several mappings in a single pass over the rows of the
+        mapping metadata, with the same semantics as :meth:`_form_kv_mapping`
+        and :meth:`_form_kv_set_mapping`.
+        """
+        columns = list(self.mapping_metadata.columns)
+        indexes: Dict[str, Index] = {name: {} for name in specs}
+
+        # Group targets by key column so that each key is only checked once per row
+        plan: Dict[int, List[tuple]] = defaultdict(list)
+        for name, spec in specs.items():
+            target = (columns.index(spec.value), spec.multi_valued, indexes[name])
+            plan[columns.index(spec.key)].append(target)
+        key_plan = list(plan.items())
+
+        for row in zip(*(self.mapping_metadata[col] for col in columns)):
+            for key_idx, targets in key_plan:
+                key = row[key_idx]
+                # Ignore blank keys and values
+                if not key:
+                    continue
+                for value_idx, multi_valued, mapping in targets:
+                    value = row[value_idx]
+                    if not value:
+                        continue
+                    if not multi_valued:
+                        mapping[key] = value
+                    elif key in mapping:
+                        mapping[key].add(value)
+                    else:
+                        mapping[key] = {value}
+        return indexes
+
+    def _check_index_names(self, names: Optional[Iterable[str]]) -> List[str]:
+        """Get a list of names of ``*_to_*`` mappings (all of them if ``None``).
+
+        :raises ValueError: if a name is not a mapping of the mapper.
+        """
+        names = list(self._index_specs if names is None else names)
+        unknown = [name for name in names if name not in self._index_specs]
+        if unknown:
+            raise ValueError(
+                f"Unknown mapping(s) for {type(self).__name__}: {', '.join(unknown)}. "
+                f"Valid mappings: {', '.join(self._index_specs)}."
+            )
+        return names
+
+    def build_indexes(self, names: Optional[Iterable[str]] = None) -> Dict[str, Index]:
+        """Build the given ``*_to_*`` mappings (all of them by default) in a
+        single pass over the mapping metadata and cache them for the
+        corresponding properties. Mappings that have already been built are
+        not rebuilt.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> indexes = stock_mapper.build_indexes(["ticker_to_cik", "ticker_to_exchange"])
+            >>> indexes["ticker_to_cik"]
+            {'AAPL': '0000320193', 'MSFT': '0000789019', 'GOOG': '0001652044', ...}
+        """
+        names = self._check_index_names(names)
+        with self._build_lock:
+            return self._build_indexes(names)
+
+    def _build_indexes(self, names: List[str]) -> Dict[str, Index]:
+        """Build the given mappings that have not been built yet, holding
+        the build lock."""
+        for name in names:
+            if name in self._encoded_indexes:
+                self._indexes[name] = self._decode_index(name)
+
+        missing = {
+            name: self._index_specs[name]
+            for name in dict.fromkeys(names)
+            if name not in self._indexes
+        }
+        lazy = {name: spec for name, spec in missing.items() if self.lazy_mappings}
+        for name, spec in lazy.items():
+            with phase(self.instrumentation, f"build.{name}") as counters:
+                self._indexes[name] = MappingView(
+                    self._get_key_index(spec.key),
+                    self._get_column(spec.value),
+                    spec.multi_valued,
+                )
+                counters.rows = len(self._indexes[name])
+            del missing[name]
+
+        sorted_arrays = {
+            name: spec for name, spec in missing.items() if self.sorted_arrays
+        }
+        for name, spec in sorted_arrays.items():
+            with phase(self.instrumentation, f"build.{name}") as counters:
+                self._indexes[name] = SortedArrayMapping.from_columns(
+                    self.mapping_metadata[spec.key],
+                    self.mapping_metadata[spec.value],
+                    spec.multi_valued,
+                )
+                counters.rows = len(self._indexes[name])
+            del missing[name]
+
+        compact = {
+            name: spec
+            for name, spec in missing.items()
+            if spec.multi_valued and self.compact_sets
+        }
+        # Columns shared by several compact mappings are only factorized once
+        columns = {column for spec in compact.values() for column in spec[:2]}
+        factorized = {
+            column: pd.factorize(self.mapping_metadata[column], sort=True)
+            for column in columns
+        }
+        for name, spec in compact.items():
+            with phase(self.instrumentation, f"build.{name}") as counters:
+                self._indexes[name] = CompactSetMapping.from_codes(
+                    *factorized[spec.key], *factorized[spec.value]
+                )
+                counters.rows = len(self._indexes[name])
+            del missing[name]
+        if missing and self._backend.vectorized_indexes:
+            for name, spec in missing.items():
+                with phase(self.instrumentation, f"build.{name}") as counters:
+                    self._indexes[name] = self._backend.build_index(self.table, spec)
+                    counters.rows = len(self._indexes[name])
+        elif len(missing) == 1:
+            # A single mapping is cheaper to build with a dedicated comprehension
+            [(name, spec)] = missing.items()
+            keys = self.mapping_metadata[spec.key]
+            values = self.mapping_metadata[spec.value]
+            with phase(self.instrumentation, f"build.{name}") as counters:
+                if spec.multi_valued:
+                    self._indexes[name] = self._form_kv_set_mapping(keys, values)
+                else:
+                    self._indexes[name] = self._form_kv_mapping(keys, values)
+                counters.rows = len(self._indexes[name])
+        elif missing:
+            with phase(self.instrumentation, "build_indexes") as counters:
+                indexes = self._form_indexes(missing)
+                counters.rows = sum(len(index) for index in indexes.values())
+            self._indexes.update(indexes)
+
+        return {name: self._indexes[name] for name in names}
+
+    def warm_up(
+        self, names: WarmUp = "all", background: bool = False
+    ) -> Optional[threading.Thread]:
+        """Build the given ``*_to_*`` mappings (``"all"`` of them by default,
+        or ``"none"``) ahead of their first lookup, in a single pass over the
+        mapping metadata. With ``background``, they are built in a daemon
+        thread, which is returned. Lookups of any mapping during a background
+        warm-up wait for it to finish instead of building the mapping again.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> mutual_fund_mapper = MutualFundMapper()
+            >>> thread = mutual_fund_mapper.warm_up(
+            ...     ["series_id_to_class_ids", "ticker_to_series_id"], background=True
+            ... )
+            >>> # Waits for the warm-up to finish
+            >>> mutual_fund_mapper.series_id_to_class_ids["S000002848"]
+            {'C000007791', 'C000007792', 'C000007793', ...}
+        """
+        if names == "none":
+            return None
+        if isinstance(names, str) and names != "all":
+            raise ValueError(
+                f"Unknown warm-up policy: {names}. "
+                "Valid policies: none, all, or a list of mappings."
+            )
+        index_names = self._check_index_names(None if names == "all" else names)
+        if not background:
+            self.build_indexes(index_names)
+            return None
+
+        started = threading.Event()
+
+        def build() -> None:
+            with self._build_lock:
+                started.set()
+                self._build_indexes(index_names)
+
+        thread = threading.Thread(
+            target=build, name=f"{type(self).__name__}-warm-up", daemon=True
+        )
+        thread.start()
+        # Lookups made after this returns wait for the warm-up
+        started.wait()
+        return thread
+
+    def lookup_many(
+        self, name: str, keys: Iterable[str], default: Any = None
+    ) -> List[Any]:
+        """Look up several keys of a ``*_to_*`` mapping at once with vectorized
+        operations of the mapper's :attr:`backend`, without building the
+        mapping. Values of mappings from keys to several values are sets, and
+        missing keys get ``default``. Keys must be normalized like the keys of
+        the mapping (see :meth:`normalize_key`), and may also be a column of
+        the backend, e.g. of an Arrow table, which is not converted to Python.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper(backend="arrow")
+            >>> stock_mapper.lookup_many("ticker_to_cik", ["AAPL", "MSFT", "ESZ4"])
+            ['0000320193', '0000789019', None]
+            >>> stock_mapper.lookup_many("cik_to_tickers", ["0001652044"])
+            [{'GOOG', 'GOOGL'}]
+        """
+        [name] = self._check_index_names([name])
+        spec = self._index_specs[name]
+        if name not in self._lookup_tables:
+            with phase(self.instrumentation, f"group.{name}"):
+                self._lookup_tables[name] = self._backend.group(self.table, spec)
+        return self._backend.lookup_many(
+            self._lookup_tables[name], keys, spec.multi_valued, default
+        )
+
+    def _get_column(self, column: str) -> List[Any]:
+        """Get a column of the mapping metadata as a list, shared by the lazy
+        mapping views."""
+        if column not in self._columns:
+            values = self.mapping_metadata[column].to_numpy(dtype=object)
+            self._columns[column] = values.tolist()
+        return self._columns[column]
+
+    def _get_key_index(self, column: str) -> KeyIndex:
+        """Get the hash index of a key column, shared by the lazy mapping views
+        keyed by the column."""
+        if column not in self._key_indexes:
+            self._key_indexes[column] = KeyIndex(self._get_column(column))
+        return self._key_indexes[column]
+
+    def materialize_all(self) -> Dict[str, Index]:
+        """Build every ``*_to_*`` mapping in a single pass over the mapping
+        metadata. Subsequent property accesses return the prebuilt mappings.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.materialize_all()
+            {'cik_to_tickers': {...}, 'ticker_to_cik': {...}, ...}
+        """
+        return self.build_indexes()
+
+    def normalize_key(self, name: str, key: str) -> str:
+        """Normalize a lookup key for a ``*_to_*`` mapping the same way as the
+        keys of the mapping: tickers are uppercased and stripped of characters
+        other than letters, numbers, and dashes, and CIKs are zero-padded to
+        10 digits.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.normalize_key("ticker_to_cik", " brk.b ")
+            'BRKB'
+            >>> stock_mapper.normalize_key("cik_to_tickers", "320193")
+            '0000320193'
+        """
+        column = self._index_specs[name].key
+        if column == "Ticker":
+            return self.retriever._clean_ticker(key)
+        if column == "CIK":
+            return key.strip().zfill(10)
+        return key.strip()
+
+    @property
+    def ticker_aliases(self) -> Dict[str, str]:
+        """Get a mapping from tickers and their common vendor spellings (with
+        dots, slashes, spaces, or other suffixes for share classes, preferred
+        shares, warrants, units, and rights) to SEC tickers. It is built on
+        first access.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.ticker_aliases
+            {'BRK.B': 'BRK-B', 'BRK/B': 'BRK-B', 'BRK B': 'BRK-B', 'BRKB': 'BRK-B', ...}
+        """
+        if self._ticker_aliases is None:
+            tickers = self.mapping_metadata["Ticker"].tolist()
+            self._ticker_aliases = build_ticker_aliases(tickers)
+        return self._ticker_aliases
+
+    def canonicalize_ticker(self, symbol: str) -> Optional[str]:
+        """Get the SEC ticker of a ticker or vendor symbol (e.g. ``BRK-B`` for
+        ``brk.b``, ``BRK/B``, or ``BRK B``) with a single lookup in
+        :attr:`ticker_aliases`, or ``None`` if it is unknown.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.canonicalize_ticker("BRK.B")
+            'BRK-B'
+            >>> stock_mapper.ticker_to_cik[stock_mapper.canonicalize_ticker("BAC PRL")]
+            '0000070858'
+        """
+        return self.ticker_aliases.get(normalize_alias(symbol))
+
+    def canonicalize_tickers(self, symbols: Iterable[str]) -> List[Optional[str]]:
+        """Get the SEC tickers of several tickers or vendor symbols, in order,
+        with ``None`` for unknown symbols.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.canonicalize_tickers(["BRK/B", "ACAH.WS", "AAPL", "?"])
+            ['BRK-B', 'ACAH-WT', 'AAPL', None]
+        """
+        get = self.ticker_aliases.get
+        return [get(normalize_alias(symbol)) for symbol in symbols]
+
+    @property
+    def membership_filter(self) -> BloomFilter:
+        """Get a probabilistic membership filter over the tickers and CIKs of
+        the mapping metadata, with a false positive rate of
+        :attr:`membership_false_positive_rate`. It is built on first access,
+        and again when the mapping metadata is replaced.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.membership_filter
+            BloomFilter(num_keys=17318, num_bits=165995, num_hashes=7, false_positive_rate=0.01)
+        """
+        if self._membership_filter is None:
+            with phase(self.instrumentation, "build.membership_filter") as counters:
+                keys = pd.unique(
+                    np.concatenate(
+                        [
+                            self.mapping_metadata[column].to_numpy(dtype=object)
+                            for column in ("Ticker", "CIK")
+                        ]
+                    )
+                )
+                keys = keys[keys.astype(bool)]
+                self._membership_filter = BloomFilter(
+                    keys, self.membership_false_positive_rate
+                )
+                counters.rows = len(keys)
+        return self._membership_filter
+
+    def contains_many(self, keys: Iterable[str]) -> np.ndarray:
+        """Check whether each of several tickers or CIKs may be known, with
+        the :attr:`membership_filter`. ``False`` means that a key is definitely
+        not a ticker or CIK of the mapping metadata, so it can be skipped
+        without a lookup. Keys must be normalized like the keys of the
+        mappings (see :meth:`normalize_key`).
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> symbols = ["AAPL", "ESZ4", "EURUSD", "0000320193"]
+            >>> stock_mapper.contains_many(symbols)
+            array([ True, False, False,  True])
+        """
+        return self.membership_filter.contains_many(keys)
+
+    def _get_index(self, name: str) -> Mapping[str, Any]:
+        """Get a cached mapping, building it on first access."""
+        if name not in self._indexes:
+            self.build_indexes([name])
+        return self._indexes[name]
+
+    def drop_indexes(self, names: Optional[Iterable[str]] = None) -> None:
+        """Drop the given built ``*_to_*`` mappings (all of them by default)
+        to free memory. Dropped mappings are rebuilt on next access.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.materialize_all()
+            >>> stock_mapper.drop_indexes(["cik_to_exchange", "exchange_to_ciks"])
+        """
+        names = self._check_index_names(names)
+        with self._build_lock:
+            for name in names:
+                self._indexes.pop(name, None)
+                self._encoded_indexes.pop(name, None)
+                self._lookup_tables.pop(name, None)
+                self._property_cache.pop(name, None)
+            # Views that are still built keep their own references
+            self._key_indexes.clear()
+            self._columns.clear()
+
+    def drop_raw_table(self) -> None:
+        """Drop the mapping metadata to free memory, e.g. after building every
+        mapping needed with :meth:`build_indexes`. Built mappings remain
+        available, while accessing the mapping metadata or building another
+        mapping fetches the data again through the mapper's transport (or
+        decodes it again for mappers restored from a pickle or snapshot). If
+        the SEC payload changed in the meantime, every mapping is built again
+        from the new payload, and :attr:`payload_hash` is updated, unless the
+        new payload is rejected by the mapper's :attr:`validator`, e.g. as it
+        lost too many of the dropped rows.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.build_indexes(["ticker_to_cik"])
+            >>> stock_mapper.drop_raw_table()
+            >>> stock_mapper.ticker_to_cik["AAPL"]
+            '0000320193'
+        """
+        with self._build_lock:
+            table = self._table if self._table is not None else self._mapping_metadata
+            if table is not None:
+                self._dropped_rows = len(table)
+            self._mapping_metadata = None
+            self._table = None
+            self._key_indexes.clear()
+            self._columns.clear()
+
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        """Get the memory used by the mapping metadata, by column, and by each
+        built ``*_to_*`` mapping, in bytes. With ``deep``, the strings in the
+        mappings are included and split into strings shared between several
+        mappings and strings referenced by a single mapping. The total counts
+        each distinct string once. Otherwise, only the dicts and sets of the
+        mappings are included.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.materialize_all()
+            >>> stock_mapper.memory_usage()
+            {'table': {'Index': 132, 'CIK': 914772, 'Ticker': 844012, ...},
+             'indexes': {'cik_to_tickers': 3173542, 'ticker_to_cik': 1966916, ...},
+             'shared_strings': 1581328, 'unique_strings': 16352, 'total': 13484826}
+        """
+        table: Dict[str, int] = {}
+        if self._table is not None:
+            table = self._backend.memory_usage(self._table, deep)
+        elif self._mapping_metadata is not None:
+            table = PandasBackend().memory_usage(self._mapping_metadata, deep)
+
+        indexes: Dict[str, int] = {}
+        string_sizes: Dict[int, int] = {}
+        # Number of mappings referencing each distinct string, by object ID
+        string_refs: Counter = Counter()
+        for name, index in self._indexes.items():
+            size = sys.getsizeof(index)
+            strings: Dict[int, str] = {}
+            # Sorted array mappings include their keys in their own size
+            key_strings = not isinstance(index, SortedArrayMapping)
+            for key, value in index.items():
+                if key_strings:
+                    strings[id(key)] = key
+                if isinstance(value, str):
+                    strings[id(value)] = value
+                else:
+                    # Compact mappings and views include their values in
+                    # their own size
+                    if isinstance(index, dict):
+                        size += sys.getsizeof(value)
+                    strings.update((id(item), item) for item in value)
+            if deep:
+                for string_id, string in strings.items():
+                    string_sizes[string_id] = sys.getsizeof(string)
+                size += sum(string_sizes[string_id] for string_id in strings)
+                string_refs.update(strings.keys())
+            indexes[name] = size
+
+        shared_strings = sum(
+            string_sizes[string_id]
+            for string_id, refs in string_refs.items()
+            if refs > 1
+        )
+        unique_strings = sum(string_sizes.values()) - shared_strings
+        string_bytes = sum(
+            string_sizes[string_id] * refs for string_id, refs in string_refs.items()
+        )
+        total = (
+            sum(table.values())
+            + sum(indexes.values())
+            - string_bytes
+            + shared_strings
+            + unique_strings
+        )
+        return {
+            "table": table,
+            "indexes": indexes,
+            "shared_strings": shared_strings,
+            "unique_strings": unique_strings,
+            "total": total,
+        }
+
     @property  # type: ignore
     @with_cache
-    def cik_to_tickers(self) -> KeyToValueSet:
+    def cik_to_tickers(self) -> SetMapping:
         """Get CIK to tickers mapping.
 
         Usage::
@@ -102,13 +1093,11 @@ class BaseMapper:
             >>> mutual_fund_mapper.cik_to_tickers
             {'0000002110': {'CRBYX', 'CEFZX', ...}, '0000002646': {'IIBPX', 'IPISX', ...}, ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        ticker_col = self.mapping_metadata["Ticker"]
-        return self._form_kv_set_mapping(cik_col, ticker_col)
+        return self._get_index("cik_to_tickers")
 
     @property  # type: ignore
     @with_cache
-    def ticker_to_cik(self) -> Dict[str, str]:
+    def ticker_to_cik(self) -> Mapping[str, str]:
         """Get ticker to CIK mapping.
 
         Usage::
@@ -121,13 +1110,12 @@ class BaseMapper:
             >>> mutual_fund_mapper.ticker_to_cik
             {'LACAX': '0000002110', 'LIACX': '0000002110', 'ACRNX': '0000002110', ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        ticker_col = self.mapping_metadata["Ticker"]
-        return self._form_kv_mapping(ticker_col, cik_col)
+        return self._get_index("ticker_to_cik")
 
     @property  # type: ignore
-    def raw_dataframe(self) -> pd.DataFrame:
-        """Get raw pandas dataframe.
+    def raw_dataframe(self) -> Any:
+        """Get the raw dataframe in the native type of the mapper's
+        :attr:`backend` (a pandas dataframe by default), without copying it.
 
         Usage::
 
@@ -165,7 +1153,26 @@ class BaseMapper:
 
             [29242 rows x 4 columns]
         """
-        return self.mapping_metadata
+        return self.table
+
+    @property
+    def stats(self) -> Dict[str, PhaseStats]:
+        """Get the latest stats of each instrumented phase of building the
+        mapper, keyed by phase name. Empty unless the mapper was created with
+        an :class:`~sec_cik_mapper.instrumentation.Instrumentation`.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> from sec_cik_mapper.instrumentation import Instrumentation
+            >>> stock_mapper = StockMapper(instrumentation=Instrumentation())
+            >>> stock_mapper.materialize_all()
+            >>> {phase: stats.wall_time for phase, stats in stock_mapper.stats.items()}
+            {'network': 0.31, 'decode': 0.02, 'transform': 0.01, ..., 'build_indexes': 0.05}
+        """
+        if self.instrumentation is None:
+            return {}
+        return self.instrumentation.stats
 
     def save_metadata_to_csv(self, path: Union[str, Path]) -> None:
         """Save stock mapping metadata (CIK, ticker, exchange, and company name)
@@ -185,3 +1192,79 @@ class BaseMapper:
             >>> mutual_fund_mapper.save_metadata_to_csv(csv_path)
         """
         self.mapping_metadata.to_csv(path, index=False)
+
+    def save_metadata(
+        self, path: Union[str, Path], format: Optional[MetadataFormat] = None
+    ) -> None:
+        """Save mapping metadata to a file in the given format. Supported
+        formats are ``csv``, ``ndjson`` (each optionally compressed as ``.gz``
+        or ``.xz``), ``parquet``, and ``feather`` (Arrow IPC). Parquet and
+        Feather require the ``pyarrow`` package. The format is inferred from
+        the file extension when it is not given.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.save_metadata("cik_mapping.parquet")
+            >>> stock_mapper.save_metadata("cik_mapping.csv.gz")
+            >>> stock_mapper.save_metadata("cik_mapping.json", format="ndjson.xz")
+        """
+        write_metadata(self.mapping_metadata, path, format)
+
+    @classmethod
+    def load_metadata(
+        cls: Type[MapperType],
+        path: Union[str, Path],
+        format: Optional[MetadataFormat] = None,
+    ) -> MapperType:
+        """Create a mapper from mapping metadata previously saved with
+        :meth:`save_metadata` or :meth:`save_metadata_to_csv`, without
+        fetching data from the SEC.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper.load_metadata("cik_mapping.parquet")
+            >>> stock_mapper.ticker_to_cik
+            {'AAPL': '0000320193', 'MSFT': '0000789019', 'GOOG': '0001652044', ...}
+        """
+        return cls._from_mapping_metadata(read_metadata(path, format))
+
+    def save_snapshot(self, path: Union[str, Path]) -> None:
+        """Build every ``*_to_*`` mapping and compile them, along with the
+        mapping metadata, into a versioned binary snapshot that
+        :meth:`load_snapshot` restores in milliseconds.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper()
+            >>> stock_mapper.save_snapshot("stocks.snapshot")
+        """
+        from .snapshot import write_snapshot
+
+        write_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(
+        cls: Type[MapperType],
+        path: Union[str, Path],
+        transport: Optional[BaseTransport] = None,
+    ) -> MapperType:
+        """Create a mapper from a snapshot saved with :meth:`save_snapshot`.
+        The mapping metadata and each mapping are decoded on first access.
+        Snapshots written by another version of the snapshot format or of
+        Python are ignored, and the mapper is built from the SEC data
+        (through ``transport``) instead.
+
+        Usage::
+
+            >>> from sec_cik_mapper import StockMapper
+            >>> stock_mapper = StockMapper.load_snapshot("stocks.snapshot")
+            >>> stock_mapper.ticker_to_cik["AAPL"]
+            '0000320193'
+        """
+        from .snapshot import load_snapshot
+
+        return load_snapshot(cls, path, transport)
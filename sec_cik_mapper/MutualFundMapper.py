@@ -1,12 +1,17 @@
 """Provides a :class:`MutualFundMapper` class for mapping CIKs, tickers,
 series IDs, and class IDs."""
 
-from typing import ClassVar, Dict
+from typing import ClassVar, Dict, Mapping, Optional, Union
 
+from .backends import BaseBackend
 from .BaseMapper import BaseMapper
+from .hierarchy import FundHierarchy
+from .instrumentation import Instrumentation
 from .retrievers import MutualFundRetriever
-from .types import KeyToValueSet
+from .transports import BaseTransport
+from .types import DataFrameBackend, IndexSpec, SetMapping, WarmUp
 from .utils import with_cache
+from .validation import ValidatorOption
 
 
 class MutualFundMapper(BaseMapper):
@@ -18,15 +23,54 @@ class MutualFundMapper(BaseMapper):
         >>> mutual_fund_mapper = MutualFundMapper()
     """
 
+    _index_specs: ClassVar[Dict[str, IndexSpec]] = {
+        **BaseMapper._index_specs,
+        "cik_to_series_ids": IndexSpec("CIK", "Series ID", multi_valued=True),
+        "ticker_to_series_id": IndexSpec("Ticker", "Series ID", multi_valued=False),
+        "series_id_to_cik": IndexSpec("Series ID", "CIK", multi_valued=False),
+        "series_id_to_tickers": IndexSpec("Series ID", "Ticker", multi_valued=True),
+        "series_id_to_class_ids": IndexSpec("Series ID", "Class ID", multi_valued=True),
+        "ticker_to_class_id": IndexSpec("Ticker", "Class ID", multi_valued=False),
+        "cik_to_class_ids": IndexSpec("CIK", "Class ID", multi_valued=True),
+        "class_id_to_cik": IndexSpec("Class ID", "CIK", multi_valued=False),
+        "class_id_to_ticker": IndexSpec("Class ID", "Ticker", multi_valued=False),
+    }
+
     _retriever: ClassVar[MutualFundRetriever] = MutualFundRetriever()
 
-    def __init__(self) -> None:
-        """Constructor for the :class:`MutualFundMapper` class."""
-        super().__init__(MutualFundMapper._retriever)
+    def __init__(
+        self,
+        transport: Optional[BaseTransport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        backend: Union[DataFrameBackend, BaseBackend] = "pandas",
+        warm_up: WarmUp = "none",
+        background_warm_up: bool = False,
+        validator: ValidatorOption = "default",
+    ) -> None:
+        """Constructor for the :class:`MutualFundMapper` class. Data is fetched from
+        the SEC unless another ``transport`` is given. Each phase of building
+        the mapper is measured by ``instrumentation``, if given. The mapping
+        metadata is built as a table of ``backend`` (see
+        :mod:`sec_cik_mapper.backends`). The mappings in ``warm_up`` (``"all"``,
+        a list of names, or ``"none"``, the default) are built right after the
+        data is loaded, in a background thread with ``background_warm_up``
+        (see :meth:`warm_up`). The mapping metadata is checked by
+        ``validator`` (see :mod:`sec_cik_mapper.validation`), the class's
+        :attr:`validator` by default, or not checked if ``None``.
+        """
+        super().__init__(
+            MutualFundMapper._retriever,
+            transport,
+            instrumentation,
+            backend,
+            warm_up,
+            background_warm_up,
+            validator,
+        )
 
     @property  # type: ignore
     @with_cache
-    def cik_to_series_ids(self) -> KeyToValueSet:
+    def cik_to_series_ids(self) -> SetMapping:
         """Get CIK to series ID mapping.
 
         Usage::
@@ -36,13 +80,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.cik_to_series_ids
             {'0000002110': {'S000009184', 'S000033622', ...}, '0000002646': {'S000008760'}, ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        series_id_col = self.mapping_metadata["Series ID"]
-        return self._form_kv_set_mapping(cik_col, series_id_col)
+        return self._get_index("cik_to_series_ids")
 
     @property  # type: ignore
     @with_cache
-    def ticker_to_series_id(self) -> Dict[str, str]:
+    def ticker_to_series_id(self) -> Mapping[str, str]:
         """Get ticker to series ID mapping.
 
         Usage::
@@ -52,13 +94,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.ticker_to_series_id
             {'LACAX': 'S000009184', 'LIACX': 'S000009184', 'ACRNX': 'S000009184', ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        series_id_col = self.mapping_metadata["Series ID"]
-        return self._form_kv_mapping(ticker_col, series_id_col)
+        return self._get_index("ticker_to_series_id")
 
     @property  # type: ignore
     @with_cache
-    def series_id_to_cik(self) -> Dict[str, str]:
+    def series_id_to_cik(self) -> Mapping[str, str]:
         """Get series ID to CIK mapping.
 
         Usage::
@@ -68,13 +108,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.series_id_to_cik
             {'S000009184': '0000002110', 'S000009185': '0000002110', ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        series_id_col = self.mapping_metadata["Series ID"]
-        return self._form_kv_mapping(series_id_col, cik_col)
+        return self._get_index("series_id_to_cik")
 
     @property  # type: ignore
     @with_cache
-    def series_id_to_tickers(self) -> KeyToValueSet:
+    def series_id_to_tickers(self) -> SetMapping:
         """Get series ID to tickers mapping.
 
         Usage::
@@ -84,13 +122,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.series_id_to_tickers
             {'S000009184': {'CEARX', 'CRBYX', ...}, 'S000009185': {'ACINX', 'CACRX', ...}, ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        series_id_col = self.mapping_metadata["Series ID"]
-        return self._form_kv_set_mapping(series_id_col, ticker_col)
+        return self._get_index("series_id_to_tickers")
 
     @property  # type: ignore
     @with_cache
-    def series_id_to_class_ids(self) -> KeyToValueSet:
+    def series_id_to_class_ids(self) -> SetMapping:
         """Get series ID to class IDs mapping.
 
         Usage::
@@ -100,13 +136,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.series_id_to_class_ids
             {'S000009184': {'C000024956', ...}, 'S000009185': {'C000024958', ...}, ...}
         """
-        class_id_col = self.mapping_metadata["Class ID"]
-        series_id_col = self.mapping_metadata["Series ID"]
-        return self._form_kv_set_mapping(series_id_col, class_id_col)
+        return self._get_index("series_id_to_class_ids")
 
     @property  # type: ignore
     @with_cache
-    def ticker_to_class_id(self) -> Dict[str, str]:
+    def ticker_to_class_id(self) -> Mapping[str, str]:
         """Get ticker to class ID mapping.
 
         Usage::
@@ -116,13 +150,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.ticker_to_class_id
             {'LACAX': 'C000024954', 'LIACX': 'C000024956', 'ACRNX': 'C000024957', ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        class_id_col = self.mapping_metadata["Class ID"]
-        return self._form_kv_mapping(ticker_col, class_id_col)
+        return self._get_index("ticker_to_class_id")
 
     @property  # type: ignore
     @with_cache
-    def cik_to_class_ids(self) -> KeyToValueSet:
+    def cik_to_class_ids(self) -> SetMapping:
         """Get CIK to class IDs mapping.
 
         Usage::
@@ -132,13 +164,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.cik_to_class_ids
             {'0000002110': {'C000024958', ...}, '0000002646': {'C000023849', ...}, ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        class_id_col = self.mapping_metadata["Class ID"]
-        return self._form_kv_set_mapping(cik_col, class_id_col)
+        return self._get_index("cik_to_class_ids")
 
     @property  # type: ignore
     @with_cache
-    def class_id_to_cik(self) -> Dict[str, str]:
+    def class_id_to_cik(self) -> Mapping[str, str]:
         """Get class ID to CIK mapping.
 
         Usage::
@@ -148,13 +178,11 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.class_id_to_cik
             {'C000024954': '0000002110', 'C000024956': '0000002110', ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        class_id_col = self.mapping_metadata["Class ID"]
-        return self._form_kv_mapping(class_id_col, cik_col)
+        return self._get_index("class_id_to_cik")
 
     @property  # type: ignore
     @with_cache
-    def class_id_to_ticker(self) -> Dict[str, str]:
+    def class_id_to_ticker(self) -> Mapping[str, str]:
         """Get class ID to ticker mapping.
 
         Usage::
@@ -164,6 +192,24 @@ class MutualFundMapper(BaseMapper):
             >>> mutual_fund_mapper.class_id_to_ticker
             {'C000024954': 'LACAX', 'C000024956': 'LIACX', 'C000024957': 'ACRNX', ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        class_id_col = self.mapping_metadata["Class ID"]
-        return self._form_kv_mapping(class_id_col, ticker_col)
+        return self._get_index("class_id_to_ticker")
+
+    @property  # type: ignore
+    @with_cache
+    def fund_hierarchy(self) -> FundHierarchy:
+        """Get the CIK, series, and share class hierarchy as integer-coded
+        arrays, for traversing whole fund families in batches. It is built on
+        first access.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> mutual_fund_mapper = MutualFundMapper()
+            >>> hierarchy = mutual_fund_mapper.fund_hierarchy
+            >>> hierarchy.tickers_under(["0000002110", "0000002646"])
+            array(['CAEAX', 'CAECX', 'CAEEX', ...], dtype=object)
+            >>> hierarchy.parents(["C000024954"], as_frame=True)
+                 Class ID   Series ID         CIK
+            0  C000024954  S000009184  0000002110
+        """
+        return FundHierarchy(self.mapping_metadata)
@@ -1,12 +1,16 @@
 """Provides a :class:`StockMapper` class for mapping CIKs, tickers,
 exchanges, and company names."""
 
-from typing import ClassVar, Dict
+from typing import ClassVar, Dict, Mapping, Optional, Union
 
+from .backends import BaseBackend
 from .BaseMapper import BaseMapper
+from .instrumentation import Instrumentation
 from .retrievers import StockRetriever
-from .types import KeyToValueSet
+from .transports import BaseTransport
+from .types import DataFrameBackend, IndexSpec, SetMapping, WarmUp
 from .utils import with_cache
+from .validation import ValidatorOption
 
 
 class StockMapper(BaseMapper):
@@ -18,15 +22,51 @@ class StockMapper(BaseMapper):
         >>> stock_mapper = StockMapper()
     """
 
+    _index_specs: ClassVar[Dict[str, IndexSpec]] = {
+        **BaseMapper._index_specs,
+        "cik_to_company_name": IndexSpec("CIK", "Name", multi_valued=False),
+        "ticker_to_company_name": IndexSpec("Ticker", "Name", multi_valued=False),
+        "ticker_to_exchange": IndexSpec("Ticker", "Exchange", multi_valued=False),
+        "exchange_to_tickers": IndexSpec("Exchange", "Ticker", multi_valued=True),
+        "cik_to_exchange": IndexSpec("CIK", "Exchange", multi_valued=False),
+        "exchange_to_ciks": IndexSpec("Exchange", "CIK", multi_valued=True),
+    }
+
     _retriever: ClassVar[StockRetriever] = StockRetriever()
 
-    def __init__(self) -> None:
-        """Constructor for the :class:`StockMapper` class."""
-        super().__init__(StockMapper._retriever)
+    def __init__(
+        self,
+        transport: Optional[BaseTransport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        backend: Union[DataFrameBackend, BaseBackend] = "pandas",
+        warm_up: WarmUp = "none",
+        background_warm_up: bool = False,
+        validator: ValidatorOption = "default",
+    ) -> None:
+        """Constructor for the :class:`StockMapper` class. Data is fetched from
+        the SEC unless another ``transport`` is given. Each phase of building
+        the mapper is measured by ``instrumentation``, if given. The mapping
+        metadata is built as a table of ``backend`` (see
+        :mod:`sec_cik_mapper.backends`). The mappings in ``warm_up`` (``"all"``,
+        a list of names, or ``"none"``, the default) are built right after the
+        data is loaded, in a background thread with ``background_warm_up``
+        (see :meth:`warm_up`). The mapping metadata is checked by
+        ``validator`` (see :mod:`sec_cik_mapper.validation`), the class's
+        :attr:`validator` by default, or not checked if ``None``.
+        """
+        super().__init__(
+            StockMapper._retriever,
+            transport,
+            instrumentation,
+            backend,
+            warm_up,
+            background_warm_up,
+            validator,
+        )
 
     @property  # type: ignore
     @with_cache
-    def cik_to_company_name(self) -> Dict[str, str]:
+    def cik_to_company_name(self) -> Mapping[str, str]:
         """Get CIK to company name mapping.
 
         Usage::
@@ -36,13 +76,11 @@ class StockMapper(BaseMapper):
             >>> stock_mapper.cik_to_company_name
             {'0000320193': 'Apple Inc.', '0000789019': 'Microsoft Corp', ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        company_name_col = self.mapping_metadata["Name"]
-        return self._form_kv_mapping(cik_col, company_name_col)
+        return self._get_index("cik_to_company_name")
 
     @property  # type: ignore
     @with_cache
-    def ticker_to_company_name(self) -> Dict[str, str]:
+    def ticker_to_company_name(self) -> Mapping[str, str]:
         """Get ticker to company name mapping.
 
         Usage::
@@ -52,13 +90,11 @@ class StockMapper(BaseMapper):
             >>> stock_mapper.ticker_to_company_name
             {'AAPL': 'Apple Inc.', 'MSFT': 'Microsoft Corp', 'GOOG': 'Alphabet Inc.', ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        company_name_col = self.mapping_metadata["Name"]
-        return self._form_kv_mapping(ticker_col, company_name_col)
+        return self._get_index("ticker_to_company_name")
 
     @property  # type: ignore
     @with_cache
-    def ticker_to_exchange(self) -> Dict[str, str]:
+    def ticker_to_exchange(self) -> Mapping[str, str]:
         """Get ticker to exchange mapping.
 
         Usage::
@@ -68,13 +104,11 @@ class StockMapper(BaseMapper):
             >>> stock_mapper.ticker_to_exchange
             {'AAPL': 'Nasdaq', 'MSFT': 'Nasdaq', 'GOOG': 'Nasdaq', ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        exchange_col = self.mapping_metadata["Exchange"]
-        return self._form_kv_mapping(ticker_col, exchange_col)
+        return self._get_index("ticker_to_exchange")
 
     @property  # type: ignore
     @with_cache
-    def exchange_to_tickers(self) -> KeyToValueSet:
+    def exchange_to_tickers(self) -> SetMapping:
         """Get exchange to tickers mapping.
 
         Usage::
@@ -84,13 +118,11 @@ class StockMapper(BaseMapper):
             >>> stock_mapper.exchange_to_tickers
             {'Nasdaq': {'CYRN', 'OHPAW', ...}, 'NYSE': {'PLAG', 'TDW-WTB', ...}, ...}
         """
-        ticker_col = self.mapping_metadata["Ticker"]
-        exchange_col = self.mapping_metadata["Exchange"]
-        return self._form_kv_set_mapping(exchange_col, ticker_col)
+        return self._get_index("exchange_to_tickers")
 
     @property  # type: ignore
     @with_cache
-    def cik_to_exchange(self) -> Dict[str, str]:
+    def cik_to_exchange(self) -> Mapping[str, str]:
         """Get CIK to exchange mapping.
 
         Usage::
@@ -100,13 +132,11 @@ class StockMapper(BaseMapper):
             >>> stock_mapper.cik_to_exchange
             {'0000320193': 'Nasdaq', '0000789019': 'Nasdaq', '0001652044': 'Nasdaq', ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        exchange_col = self.mapping_metadata["Exchange"]
-        return self._form_kv_mapping(cik_col, exchange_col)
+        return self._get_index("cik_to_exchange")
 
     @property  # type: ignore
     @with_cache
-    def exchange_to_ciks(self) -> KeyToValueSet:
+    def exchange_to_ciks(self) -> SetMapping:
         """Get exchange to CIKs mapping.
 
         Usage::
@@ -116,6 +146,4 @@ class StockMapper(BaseMapper):
             >>> stock_mapper.exchange_to_ciks
             {'Nasdaq': {'0000779544', ...}, 'NYSE': {'0000764478', ...}, ...}
         """
-        cik_col = self.mapping_metadata["CIK"]
-        exchange_col = self.mapping_metadata["Exchange"]
-        return self._form_kv_set_mapping(exchange_col, cik_col)
+        return self._get_index("exchange_to_ciks")
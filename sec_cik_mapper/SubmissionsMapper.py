@@ -0,0 +1,288 @@
+"""Provides a :class:`SubmissionsMapper` class for mapping CIKs, tickers,
+SIC codes, states of incorporation, and former company names from the EDGAR
+bulk submissions archive."""
+
+import hashlib
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import (
+    IO,
+    Any,
+    ClassVar,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+    cast,
+)
+
+from .backends import BaseBackend
+from .BaseMapper import BaseMapper
+from .instrumentation import Instrumentation, phase
+from .retrievers import SubmissionsRetriever
+from .transports import BaseTransport
+from .types import DataFrameBackend, IndexSpec, SetMapping, WarmUp
+from .utils import with_cache
+from .validation import ValidatorOption
+
+
+def _parse_members(members: List[bytes]) -> List[Dict[str, str]]:
+    """Decode and transform a batch of members of the submissions archive,
+    in a worker process when parsing in parallel."""
+    parse = SubmissionsMapper._retriever.parse
+    return list(chain.from_iterable(map(parse, members)))
+
+
+def _sha256_file(file: IO[bytes]) -> str:
+    """Get the SHA-256 hex digest of a seekable file, reading it in chunks and
+    rewinding it."""
+    digest = hashlib.sha256()
+    for chunk in iter(partial(file.read, 1 << 20), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class SubmissionsMapper(BaseMapper):
+    """A :class:`SubmissionsMapper` object, built from the EDGAR bulk
+    submissions archive (``submissions.zip``), which holds one JSON file per
+    CIK. Members of the archive are read one at a time, without extracting
+    the archive, and are decoded in batches of ``batch_size`` members across
+    ``workers`` processes.
+
+    The mapping metadata has one row per ticker and per former name of each
+    CIK, with its company name, SIC code and description, and state of
+    incorporation.
+
+    Usage::
+
+        >>> from sec_cik_mapper import SubmissionsMapper
+        >>> submissions_mapper = SubmissionsMapper(workers=8)
+    """
+
+    _index_specs: ClassVar[Dict[str, IndexSpec]] = {
+        **BaseMapper._index_specs,
+        "cik_to_company_name": IndexSpec("CIK", "Name", multi_valued=False),
+        "cik_to_sic": IndexSpec("CIK", "SIC", multi_valued=False),
+        "sic_to_ciks": IndexSpec("SIC", "CIK", multi_valued=True),
+        "sic_to_description": IndexSpec("SIC", "SIC Description", multi_valued=False),
+        "cik_to_state_of_incorporation": IndexSpec(
+            "CIK", "State of Incorporation", multi_valued=False
+        ),
+        "state_of_incorporation_to_ciks": IndexSpec(
+            "State of Incorporation", "CIK", multi_valued=True
+        ),
+        "cik_to_former_names": IndexSpec("CIK", "Former Name", multi_valued=True),
+        "former_name_to_ciks": IndexSpec("Former Name", "CIK", multi_valued=True),
+    }
+
+    _retriever: ClassVar[SubmissionsRetriever] = SubmissionsRetriever()
+
+    # Number of processes decoding members of the archive. Can be set per
+    # mapper, and applies to the mapping metadata fetched after.
+    workers: int = 1
+
+    # Number of members of the archive decoded together by a process
+    batch_size: int = 1000
+
+    def __init__(
+        self,
+        transport: Optional[BaseTransport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        workers: Optional[int] = None,
+        backend: Union[DataFrameBackend, BaseBackend] = "pandas",
+        warm_up: WarmUp = "none",
+        background_warm_up: bool = False,
+        validator: ValidatorOption = "default",
+    ) -> None:
+        """Constructor for the :class:`SubmissionsMapper` class. Data is
+        fetched from the SEC unless another ``transport`` is given, and
+        decoded across ``workers`` processes (one by default). Each phase of
+        building the mapper is measured by ``instrumentation``, if given. The
+        mapping metadata is built as a table of ``backend`` (see
+        :mod:`sec_cik_mapper.backends`). The mappings in ``warm_up`` (``"all"``,
+        a list of names, or ``"none"``, the default) are built right after the
+        data is loaded, in a background thread with ``background_warm_up``
+        (see :meth:`warm_up`). The mapping metadata is checked by
+        ``validator`` (see :mod:`sec_cik_mapper.validation`), the class's
+        :attr:`validator` by default, or not checked if ``None``.
+        """
+        if workers is not None:
+            self.workers = workers
+        super().__init__(
+            SubmissionsMapper._retriever,
+            transport,
+            instrumentation,
+            backend,
+            warm_up,
+            background_warm_up,
+            validator,
+        )
+
+    def _read_batches(self, archive: zipfile.ZipFile) -> Iterator[List[bytes]]:
+        """Read the members of the archive holding company data, one member at
+        a time, in batches of ``batch_size`` members."""
+        retriever = cast(SubmissionsRetriever, self.retriever)
+        infos = [
+            info
+            for info in archive.infolist()
+            if retriever.is_company_member(info.filename)
+        ]
+        for start in range(0, len(infos), self.batch_size):
+            yield [
+                archive.read(info) for info in infos[start : start + self.batch_size]
+            ]
+
+    def _parse_archive(self, archive: zipfile.ZipFile) -> List[Dict[str, str]]:
+        """Decode and transform every member of the archive holding company
+        data, across ``workers`` processes when there is more than one."""
+        batches = self._read_batches(archive)
+        if self.workers <= 1:
+            return list(chain.from_iterable(map(_parse_members, batches)))
+
+        transformed_data: List[Dict[str, str]] = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # At most two batches per process are in flight to bound memory
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(executor.submit(_parse_members, batch))
+                if len(pending) >= 2 * self.workers:
+                    transformed_data.extend(pending.popleft().result())
+            while pending:
+                transformed_data.extend(pending.popleft().result())
+        return transformed_data
+
+    def _get_mapping_metadata_from_sec(self) -> Any:
+        """Get company mapping metadata from the EDGAR submissions archive
+        (through the mapper's transport) as a table of the mapper's backend,
+        sorted by CIK and ticker. The ``decode`` phase covers reading, decoding, and
+        transforming the members of the archive.
+        """
+        with phase(self.instrumentation, "network") as counters:
+            file = self.transport.open(self.retriever.source_url)
+            self.payload_hash = _sha256_file(file)
+            counters.size = file.seek(0, 2)
+            file.seek(0)
+        with file, zipfile.ZipFile(file) as archive:
+            with phase(self.instrumentation, "decode") as counters:
+                transformed_data = self._parse_archive(archive)
+                counters.rows = len(transformed_data)
+        return self._build_mapping_metadata(transformed_data)
+
+    @property  # type: ignore
+    @with_cache
+    def cik_to_company_name(self) -> Mapping[str, str]:
+        """Get CIK to company name mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.cik_to_company_name
+            {'0000320193': 'Apple Inc.', '0000789019': 'Microsoft Corp', ...}
+        """
+        return self._get_index("cik_to_company_name")
+
+    @property  # type: ignore
+    @with_cache
+    def cik_to_sic(self) -> Mapping[str, str]:
+        """Get CIK to SIC code mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.cik_to_sic
+            {'0000320193': '3571', '0000789019': '7372', ...}
+        """
+        return self._get_index("cik_to_sic")
+
+    @property  # type: ignore
+    @with_cache
+    def sic_to_ciks(self) -> SetMapping:
+        """Get SIC code to CIKs mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.sic_to_ciks
+            {'3571': {'0000320193', '0001018724', ...}, '7372': {'0000789019', ...}, ...}
+        """
+        return self._get_index("sic_to_ciks")
+
+    @property  # type: ignore
+    @with_cache
+    def sic_to_description(self) -> Mapping[str, str]:
+        """Get SIC code to SIC description mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.sic_to_description
+            {'3571': 'Electronic Computers', '7372': 'Services-Prepackaged Software', ...}
+        """
+        return self._get_index("sic_to_description")
+
+    @property  # type: ignore
+    @with_cache
+    def cik_to_state_of_incorporation(self) -> Mapping[str, str]:
+        """Get CIK to state of incorporation mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.cik_to_state_of_incorporation
+            {'0000320193': 'CA', '0000789019': 'WA', ...}
+        """
+        return self._get_index("cik_to_state_of_incorporation")
+
+    @property  # type: ignore
+    @with_cache
+    def state_of_incorporation_to_ciks(self) -> SetMapping:
+        """Get state of incorporation to CIKs mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.state_of_incorporation_to_ciks
+            {'CA': {'0000320193', ...}, 'DE': {'0001018724', ...}, ...}
+        """
+        return self._get_index("state_of_incorporation_to_ciks")
+
+    @property  # type: ignore
+    @with_cache
+    def cik_to_former_names(self) -> SetMapping:
+        """Get CIK to former company names mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.cik_to_former_names
+            {'0000320193': {'Apple Computer Inc'}, ...}
+        """
+        return self._get_index("cik_to_former_names")
+
+    @property  # type: ignore
+    @with_cache
+    def former_name_to_ciks(self) -> SetMapping:
+        """Get former company name to CIKs mapping.
+
+        Usage::
+
+            >>> from sec_cik_mapper import SubmissionsMapper
+            >>> submissions_mapper = SubmissionsMapper()
+            >>> submissions_mapper.former_name_to_ciks
+            {'Apple Computer Inc': {'0000320193'}, ...}
+        """
+        return self._get_index("former_name_to_ciks")
@@ -1,5 +1,11 @@
 from ._version import __version__
 from .BaseMapper import BaseMapper
 from .MutualFundMapper import MutualFundMapper
-from .retrievers import BaseRetriever, MutualFundRetriever, StockRetriever
+from .retrievers import (
+    BaseRetriever,
+    MutualFundRetriever,
+    StockRetriever,
+    SubmissionsRetriever,
+)
 from .StockMapper import StockMapper
+from .SubmissionsMapper import SubmissionsMapper
@@ -0,0 +1,100 @@
+"""Common vendor spellings of SEC tickers with share class, preferred,
+warrant, unit, and rights suffixes.
+
+The SEC spells these tickers with a dash (e.g. ``BRK-B``, ``BAC-PA``,
+``ACAH-WT``, ``ACAH-UN``), while data vendors use dots, slashes, spaces,
+other suffixes, or CQS suffix characters instead (e.g. ``BRK.B``,
+``BRK/B``, ``BAC PRA``, ``BAC.PR.A``, ``ACAH.WS``, ``ACAH+``, ``ACAH=``).
+An alias index maps every such spelling to its SEC ticker up front, so that
+resolving a vendor symbol is a single dict lookup.
+"""
+
+import re
+from typing import Dict, Iterable, List, Pattern
+
+from typing_extensions import Final
+
+# Characters separating a ticker from its suffix, including none
+_SEPARATORS: Final = ("-", ".", "/", " ", "_", "")
+
+# Vendor spellings of SEC ticker suffixes
+_SUFFIX_SPELLINGS: Final[Dict[str, List[str]]] = {
+    # Warrants
+    "WT": ["WT", "WS", "W"],
+    # Units
+    "UN": ["UN", "U"],
+    # Rights
+    "RI": ["RI", "RT", "R"],
+}
+
+# CQS suffix characters, which replace the separator and suffix
+_CQS_SUFFIXES: Final[Dict[str, str]] = {"WT": "+", "UN": "=", "RI": "^"}
+
+# Preferred shares, optionally of a series, e.g. "PA" for series A
+_PREFERRED_PATTERN: Final[Pattern[str]] = re.compile(r"P([A-Z]?)")
+
+
+def normalize_alias(symbol: str) -> str:
+    """Normalize a vendor symbol for lookups in an alias index. Lowercase
+    CQS preferred suffixes (e.g. ``BACpA``) become the ``BACPA`` alias."""
+    return symbol.strip().upper()
+
+
+def _suffix_spellings(suffix: str) -> List[str]:
+    preferred = _PREFERRED_PATTERN.fullmatch(suffix)
+    if preferred is not None:
+        series = preferred.group(1)
+        return [f"P{series}", f"PR{series}"] + [
+            f"PR{separator}{series}" for separator in _SEPARATORS[:4] if series
+        ]
+    return _SUFFIX_SPELLINGS.get(suffix, [suffix])
+
+
+def spell_ticker(ticker: str) -> List[str]:
+    """Get the vendor spellings of an SEC ticker, excluding the ticker itself.
+
+    Usage::
+
+        >>> from sec_cik_mapper.aliases import spell_ticker
+        >>> spell_ticker("BRK-B")
+        ['BRK.B', 'BRK/B', 'BRK B', 'BRK_B', 'BRKB']
+    """
+    base, separator, suffix = ticker.partition("-")
+    if not (base and separator and suffix):
+        return []
+    spellings = [
+        f"{base}{separator}{spelling}"
+        for spelling in _suffix_spellings(suffix)
+        for separator in _SEPARATORS
+    ]
+    if suffix in _CQS_SUFFIXES:
+        spellings.append(f"{base}{_CQS_SUFFIXES[suffix]}")
+    return [spelling for spelling in dict.fromkeys(spellings) if spelling != ticker]
+
+
+def build_ticker_aliases(tickers: Iterable[str]) -> Dict[str, str]:
+    """Build an index from the vendor spellings of SEC tickers (and the
+    tickers themselves) to the SEC tickers. Actual tickers always map to
+    themselves, and spellings shared by several tickers are left out rather
+    than resolved to the wrong one.
+
+    Usage::
+
+        >>> from sec_cik_mapper.aliases import build_ticker_aliases
+        >>> aliases = build_ticker_aliases(["BRK-A", "BRK-B", "ACAH", "ACAH-WT"])
+        >>> aliases["BRK/B"], aliases["ACAH.WS"], aliases["ACAH"]
+        ('BRK-B', 'ACAH-WT', 'ACAH')
+    """
+    canonical = dict.fromkeys(ticker for ticker in tickers if ticker)
+    aliases: Dict[str, str] = {}
+    ambiguous = set()
+    for ticker in canonical:
+        for alias in spell_ticker(ticker):
+            if alias in canonical:
+                continue
+            if aliases.setdefault(alias, ticker) != ticker:
+                ambiguous.add(alias)
+    for alias in ambiguous:
+        del aliases[alias]
+    aliases.update((ticker, ticker) for ticker in canonical)
+    return aliases
@@ -0,0 +1,304 @@
+"""Table backends for the mapping metadata of mappers.
+
+The mapping metadata of a mapper is built as a table of its backend: a
+pandas ``DataFrame`` (``"pandas"``, the default), an Arrow ``Table``
+(``"arrow"``, requires ``pyarrow``), or a Polars ``DataFrame``
+(``"polars"``, requires ``polars`` and ``pyarrow``). ``raw_dataframe``
+returns the table itself, without converting or copying it.
+
+Each backend also groups the values of a ``*_to_*`` mapping by key with its
+own vectorized operations, to look up batches of keys with
+:meth:`~sec_cik_mapper.BaseMapper.BaseMapper.lookup_many`. Arrow and Polars
+mappers build the ``*_to_*`` mappings from these grouped tables as well,
+rather than with a pass over the rows of the mapping metadata. Features
+that work on pandas (e.g. lazy mappings or snapshots) get a pandas view of
+the table, converted on first access without copying its strings where
+the pandas version allows it.
+
+Usage::
+
+    >>> from sec_cik_mapper import StockMapper
+    >>> stock_mapper = StockMapper(backend="arrow")
+    >>> stock_mapper.raw_dataframe
+    pyarrow.Table
+    CIK: string
+    Ticker: string
+    Name: string
+    Exchange: string
+    ----
+    ...
+    >>> stock_mapper.lookup_many("ticker_to_cik", ["AAPL", "MSFT", "ESZ4"])
+    ['0000320193', '0000789019', None]
+"""
+
+from abc import ABCMeta, abstractmethod
+from typing import Any, ClassVar, Dict, Iterable, List, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+
+from .types import DataFrameBackend, Index, IndexSpec
+
+
+class BaseBackend(metaclass=ABCMeta):
+    # Name of the backend, e.g. "arrow"
+    name: ClassVar[str]
+
+    # Whether dict mappings are built from grouped tables of the backend
+    # rather than with a single pass over the rows of the mapping metadata
+    vectorized_indexes: ClassVar[bool] = True
+
+    @abstractmethod
+    def from_records(self, records: List[Dict[str, str]]) -> Any:
+        """Build a table from rows of transformed company data."""
+
+    @abstractmethod
+    def sort(self, table: Any, columns: List[str]) -> Any:
+        """Sort a table by several columns."""
+
+    @abstractmethod
+    def from_pandas(self, df: pd.DataFrame) -> Any:
+        """Convert a pandas dataframe to a table of the backend."""
+
+    @abstractmethod
+    def to_pandas(self, table: Any) -> pd.DataFrame:
+        """Convert a table of the backend to a pandas dataframe."""
+
+    @abstractmethod
+    def column_names(self, table: Any) -> List[str]:
+        """Get the names of the columns of a table."""
+
+    @abstractmethod
+    def column(self, table: Any, name: str) -> pd.Series:
+        """Get a column of a table as a pandas series, e.g. for column-wise
+        checks with pandas string operations."""
+
+    @abstractmethod
+    def memory_usage(self, table: Any, deep: bool) -> Dict[str, int]:
+        """Get the bytes used by each column of a table."""
+
+    @abstractmethod
+    def group(self, table: Any, spec: IndexSpec) -> Any:
+        """Group the values of a mapping by key, ignoring blank keys and
+        values: the last value of each key for single-valued mappings, or the
+        distinct values of each key for multi-valued mappings."""
+
+    @abstractmethod
+    def to_lists(self, grouped: Any) -> Tuple[List[str], List[Any]]:
+        """Get the keys and values (lists of values for multi-valued mappings)
+        of a grouped mapping."""
+
+    @abstractmethod
+    def take(self, grouped: Any, keys: Iterable[str]) -> List[Any]:
+        """Get the values of several keys of a grouped mapping, or ``None``
+        for missing keys. Keys may also be a column of the backend."""
+
+    def build_index(self, table: Any, spec: IndexSpec) -> Index:
+        """Build a mapping as a dict (of sets for multi-valued mappings)."""
+        keys, values = self.to_lists(self.group(table, spec))
+        if spec.multi_valued:
+            return {key: set(key_values) for key, key_values in zip(keys, values)}
+        return dict(zip(keys, values))
+
+    def lookup_many(
+        self, grouped: Any, keys: Iterable[str], multi_valued: bool, default: Any
+    ) -> List[Any]:
+        """Look up several keys of a grouped mapping, with sets of values for
+        multi-valued mappings and ``default`` for missing keys."""
+        values = self.take(grouped, keys)
+        if multi_valued:
+            return [default if value is None else set(value) for value in values]
+        return [default if value is None else value for value in values]
+
+
+class PandasBackend(BaseBackend):
+    """Backend of pandas dataframes, the default."""
+
+    name = "pandas"
+
+    # Dicts are faster to build with a pass over the rows than from pandas
+    # groups, which hold a Python object per key
+    vectorized_indexes = False
+
+    def from_records(self, records: List[Dict[str, str]]) -> pd.DataFrame:
+        return pd.DataFrame(records)
+
+    def sort(self, table: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        return table.sort_values(by=columns, ignore_index=True)
+
+    def from_pandas(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df
+
+    def to_pandas(self, table: pd.DataFrame) -> pd.DataFrame:
+        return table
+
+    def column_names(self, table: pd.DataFrame) -> List[str]:
+        return [str(column) for column in table.columns]
+
+    def column(self, table: pd.DataFrame, name: str) -> pd.Series:
+        return table[name]
+
+    def memory_usage(self, table: pd.DataFrame, deep: bool) -> Dict[str, int]:
+        usage = table.memory_usage(index=True, deep=deep)
+        return {str(column): int(size) for column, size in usage.items()}
+
+    def group(self, table: pd.DataFrame, spec: IndexSpec) -> pd.Series:
+        keys, values = table[spec.key], table[spec.value]
+        rows = table.loc[
+            keys.astype(bool) & values.astype(bool), [spec.key, spec.value]
+        ]
+        if not spec.multi_valued:
+            return rows.groupby(spec.key, sort=False)[spec.value].last()
+        return (
+            rows.drop_duplicates().groupby(spec.key, sort=False)[spec.value].agg(list)
+        )
+
+    def to_lists(self, grouped: pd.Series) -> Tuple[List[str], List[Any]]:
+        return grouped.index.tolist(), grouped.tolist()
+
+    def take(self, grouped: pd.Series, keys: Iterable[str]) -> List[Any]:
+        positions = grouped.index.get_indexer(pd.Index(keys, dtype=object))
+        found = np.flatnonzero(positions >= 0)
+        values: List[Any] = [None] * len(positions)
+        for i, value in zip(found.tolist(), grouped.iloc[positions[found]].tolist()):
+            values[i] = value
+        return values
+
+
+class ArrowBackend(BaseBackend):
+    """Backend of Arrow tables. Requires the ``pyarrow`` package."""
+
+    name = "arrow"
+
+    def __init__(self) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.compute as pc  # type: ignore
+
+        self._pa = pa
+        self._pc = pc
+
+    def from_records(self, records: List[Dict[str, str]]) -> Any:
+        return self._pa.Table.from_pylist(records)
+
+    def sort(self, table: Any, columns: List[str]) -> Any:
+        return table.sort_by([(column, "ascending") for column in columns])
+
+    def from_pandas(self, df: pd.DataFrame) -> Any:
+        return self._pa.Table.from_pandas(df, preserve_index=False)
+
+    def to_pandas(self, table: Any) -> pd.DataFrame:
+        return table.to_pandas()
+
+    def column_names(self, table: Any) -> List[str]:
+        return table.column_names
+
+    def column(self, table: Any, name: str) -> pd.Series:
+        return table.column(name).to_pandas()
+
+    def memory_usage(self, table: Any, deep: bool) -> Dict[str, int]:
+        return {name: table.column(name).nbytes for name in table.column_names}
+
+    def group(self, table: Any, spec: IndexSpec) -> Tuple[Any, Any]:
+        # Comparisons with null are null, so null keys and values are
+        # filtered out along with blanks
+        mask = self._pc.and_(
+            self._pc.not_equal(table[spec.key], ""),
+            self._pc.not_equal(table[spec.value], ""),
+        )
+        rows = table.select([spec.key, spec.value]).filter(mask)
+        aggregation = "distinct" if spec.multi_valued else "last"
+        # Keys are grouped in order (of their first row) without threads
+        grouped = rows.group_by(spec.key, use_threads=False).aggregate(
+            [(spec.value, aggregation)]
+        )
+        return (
+            grouped[spec.key].combine_chunks(),
+            grouped[f"{spec.value}_{aggregation}"].combine_chunks(),
+        )
+
+    def to_lists(self, grouped: Tuple[Any, Any]) -> Tuple[List[str], List[Any]]:
+        keys, values = grouped
+        return keys.to_pylist(), values.to_pylist()
+
+    def take(self, grouped: Tuple[Any, Any], keys: Iterable[str]) -> List[Any]:
+        grouped_keys, values = grouped
+        if isinstance(keys, (self._pa.Array, self._pa.ChunkedArray)):
+            keys = keys.cast(grouped_keys.type)
+        else:
+            keys = self._pa.array(list(keys), grouped_keys.type)
+        positions = self._pc.index_in(keys, value_set=grouped_keys)
+        return values.take(positions).to_pylist()
+
+
+class PolarsBackend(BaseBackend):
+    """Backend of Polars dataframes. Requires the ``polars`` package, and
+    ``pyarrow`` to convert them to pandas."""
+
+    name = "polars"
+
+    def __init__(self) -> None:
+        import polars as pl  # type: ignore
+
+        self._pl = pl
+
+    def from_records(self, records: List[Dict[str, str]]) -> Any:
+        return self._pl.from_dicts(records)
+
+    def sort(self, table: Any, columns: List[str]) -> Any:
+        return table.sort(columns, maintain_order=True)
+
+    def from_pandas(self, df: pd.DataFrame) -> Any:
+        return self._pl.from_pandas(df)
+
+    def to_pandas(self, table: Any) -> pd.DataFrame:
+        return table.to_pandas()
+
+    def column_names(self, table: Any) -> List[str]:
+        return table.columns
+
+    def column(self, table: Any, name: str) -> pd.Series:
+        return table[name].to_pandas()
+
+    def memory_usage(self, table: Any, deep: bool) -> Dict[str, int]:
+        return {name: int(table[name].estimated_size()) for name in table.columns}
+
+    def group(self, table: Any, spec: IndexSpec) -> Any:
+        key, value = self._pl.col(spec.key), self._pl.col(spec.value)
+        # Comparisons with null are null, so null keys and values are
+        # filtered out along with blanks
+        rows = table.select(key, value).filter((key != "") & (value != ""))
+        aggregation = (
+            value.unique(maintain_order=True) if spec.multi_valued else (value.last())
+        )
+        return rows.group_by(spec.key, maintain_order=True).agg(aggregation)
+
+    def to_lists(self, grouped: Any) -> Tuple[List[str], List[Any]]:
+        return grouped.to_series(0).to_list(), grouped.to_series(1).to_list()
+
+    def take(self, grouped: Any, keys: Iterable[str]) -> List[Any]:
+        key = grouped.columns[0]
+        keys = keys if isinstance(keys, self._pl.Series) else list(keys)
+        lookups = self._pl.DataFrame({key: keys}, schema={key: self._pl.String})
+        joined = lookups.join(grouped, on=key, how="left", maintain_order="left")
+        return joined.to_series(1).to_list()
+
+
+BACKENDS: Dict[str, Type[BaseBackend]] = {
+    backend.name: backend for backend in (PandasBackend, ArrowBackend, PolarsBackend)
+}
+
+
+def get_backend(backend: Union[DataFrameBackend, BaseBackend]) -> BaseBackend:
+    """Get a backend by name, or the backend itself if it is not a name.
+
+    :raises ValueError: if there is no backend with the name.
+    :raises ImportError: if the package of the backend is not installed.
+    """
+    if isinstance(backend, BaseBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown dataframe backend: {backend}. "
+            f"Valid backends: {', '.join(BACKENDS)}."
+        )
+    return BACKENDS[backend]()
@@ -0,0 +1,123 @@
+"""Provides a compact probabilistic membership filter for rejecting unknown
+tickers and CIKs before looking them up.
+
+A :class:`BloomFilter` sets ``num_hashes`` bits of a bit array for each of
+its keys, at positions derived from a 64-bit hash of the key. A key whose
+bits are not all set is definitely not one of the keys, while a key whose
+bits are all set is one of the keys, or else a false positive with a
+probability of about ``false_positive_rate``. Keys are hashed and checked in
+batches with vectorized NumPy operations.
+"""
+
+import math
+import sys
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .compact import Column
+
+_LOW_BITS = np.uint64(0xFFFFFFFF)
+_HIGH_SHIFT = np.uint64(32)
+
+
+def _hash(keys: Union[Column, Iterable[str]]) -> np.ndarray:
+    """Get the 64-bit hashes of keys."""
+    keys = keys if isinstance(keys, (np.ndarray, pd.Series, pd.Index)) else list(keys)
+    return pd.util.hash_array(np.asarray(keys, dtype=object), categorize=False)
+
+
+def _split(hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split 64-bit hashes into their low and high 32 bits."""
+    return hashes & _LOW_BITS, hashes >> _HIGH_SHIFT
+
+
+class BloomFilter:
+    """A :class:`BloomFilter` object, a probabilistic membership filter over
+    a set of keys with no false negatives and a configurable rate of false
+    positives.
+
+    Usage::
+
+        >>> from sec_cik_mapper.bloom import BloomFilter
+        >>> bloom_filter = BloomFilter(["AAPL", "MSFT", "0000320193"])
+        >>> "AAPL" in bloom_filter
+        True
+        >>> bloom_filter.contains_many(["MSFT", "ESZ4", "EURUSD"])
+        array([ True, False, False])
+    """
+
+    def __init__(
+        self, keys: Union[Column, Iterable[str]], false_positive_rate: float = 0.01
+    ) -> None:
+        """Constructor for the :class:`BloomFilter` class. The filter is sized
+        for the number of distinct ``keys`` at ``false_positive_rate``."""
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(
+                "False positive rate must be between 0 and 1, "
+                f"got {false_positive_rate}."
+            )
+        hashes = np.unique(_hash(keys))
+        self.false_positive_rate = false_positive_rate
+        #: Number of distinct keys
+        self.num_keys = len(hashes)
+        # Optimal number of bits and of hashes for the false positive rate
+        num_keys = max(self.num_keys, 1)
+        num_bits = -num_keys * math.log(false_positive_rate) / math.log(2) ** 2
+        self.num_bits = max(int(math.ceil(num_bits)), 8)
+        self.num_hashes = max(int(round(self.num_bits / num_keys * math.log(2))), 1)
+
+        bits = np.zeros(self.num_bits, dtype=bool)
+        low, high = _split(hashes)
+        for i in range(self.num_hashes):
+            bits[self._position(low, high, i)] = True
+        self._bits = np.packbits(bits, bitorder="little")
+
+    def _position(self, low: np.ndarray, high: np.ndarray, i: int) -> np.ndarray:
+        """Get the bit positions of the ``i``-th hash function from the low and
+        high 32 bits of the hashes of keys (double hashing)."""
+        return (low + np.uint64(i) * high) % np.uint64(self.num_bits)
+
+    def _test(self, positions: np.ndarray) -> np.ndarray:
+        """Check whether the bits at positions are set."""
+        bytes_ = self._bits[positions >> np.uint64(3)]
+        return ((bytes_ >> (positions & np.uint64(7))) & 1).astype(bool)
+
+    def contains_many(self, keys: Union[Column, Iterable[str]]) -> np.ndarray:
+        """Check whether each of several keys may be in the filter, with a
+        vectorized pass per hash function. ``False`` means that a key is
+        definitely not in the filter.
+
+        Usage::
+
+            >>> from sec_cik_mapper.bloom import BloomFilter
+            >>> bloom_filter = BloomFilter(["AAPL", "MSFT"], false_positive_rate=0.001)
+            >>> bloom_filter.contains_many(["AAPL", "ESZ4"])
+            array([ True, False])
+        """
+        hashes = _hash(keys)
+        result = np.ones(len(hashes), dtype=bool)
+        # Keys are only checked against the next hash function while all of
+        # their bits so far are set, so most unknown keys are rejected early
+        candidates = np.arange(len(hashes))
+        low, high = _split(hashes)
+        for i in range(self.num_hashes):
+            present = self._test(self._position(low, high, i))
+            result[candidates[~present]] = False
+            candidates = candidates[present]
+            low, high = low[present], high[present]
+        return result
+
+    def __contains__(self, key: object) -> bool:
+        return bool(self.contains_many([key])[0])
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(num_keys={self.num_keys}, "
+            f"num_bits={self.num_bits}, num_hashes={self.num_hashes}, "
+            f"false_positive_rate={self.false_positive_rate})"
+        )
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._bits)
@@ -0,0 +1,427 @@
+"""Share mapper snapshots between processes or hosts through a common store,
+so that only one of them fetches the SEC data at a time.
+
+A :class:`SnapshotCache` stores snapshots (see :mod:`sec_cik_mapper.snapshot`)
+content-addressed by the SHA-256 digest of the SEC payload they were built
+from, along with an index of the newest snapshots of each type of mapper.
+Mappers are restored from the newest snapshot while it is fresher than
+``max_age``. Otherwise, one process at a time (holding the store's lock for
+the type of mapper) fetches the SEC data, stores a snapshot unless one with
+the same payload hash is already stored, and drops all but the newest
+``keep`` snapshots. Other processes wait for the lock and then restore the
+new snapshot. SEC data rejected by validation (see
+:mod:`sec_cik_mapper.validation`), e.g. with far fewer rows than the newest
+snapshot, is not stored, and mappers are restored from the newest snapshot
+instead, however old.
+
+Stores are pluggable. :class:`DirectorySnapshotStore`, the default, keeps
+snapshots as files in a directory, e.g. on a filesystem shared by several
+hosts, with lock files. :class:`InMemorySnapshotStore` keeps them in memory.
+
+Usage::
+
+    >>> from sec_cik_mapper import StockMapper
+    >>> from sec_cik_mapper.cache import SnapshotCache
+    >>> cache = SnapshotCache("/mnt/shared/sec-cik-mapper", keep=3, max_age=3600)
+    >>> stock_mapper = cache.load(StockMapper)
+    >>> stock_mapper.ticker_to_cik["AAPL"]
+    '0000320193'
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .BaseMapper import MapperType
+from .snapshot import SnapshotError, _get_versions, dumps_snapshot, loads_snapshot
+from .transports import BaseTransport
+from .validation import ValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP = 3
+DEFAULT_MAX_AGE = 3600
+DEFAULT_LOCK_TIMEOUT = 600
+# Lock files are touched while held, so only those of crashed processes get
+# this old, however long the SEC data takes to fetch and build
+DEFAULT_STALE_LOCK_AGE = 3 * DEFAULT_LOCK_TIMEOUT
+
+
+def _new_token() -> str:
+    """Get a token unique to a lock holder, across processes and hosts."""
+    return f"{os.getpid()}-{uuid.uuid4().hex}"
+
+
+class LockTimeoutError(TimeoutError):
+    """Raised when the lock of a snapshot store is not acquired in time."""
+
+
+class BaseSnapshotStore(metaclass=ABCMeta):
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the data stored under a key, or ``None`` if there is none."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        """Store data under a key, replacing any data stored under it. Readers
+        never observe partially stored data."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete the data stored under a key, if any."""
+
+    def exists(self, key: str) -> bool:
+        """Check whether data is stored under a key."""
+        return self.get(key) is not None
+
+    @abstractmethod
+    def lock(self, name: str, timeout: float) -> ContextManager[None]:
+        """Get a context manager that holds the lock of a name, shared by
+        every user of the store, waiting up to ``timeout`` seconds for it.
+
+        :raises LockTimeoutError: if the lock is still held after ``timeout``.
+        """
+
+
+class DirectorySnapshotStore(BaseSnapshotStore):
+    """Store data as files in a directory, which may be shared by several
+    hosts, e.g. over NFS. Files are replaced atomically, and locks are lock
+    files created atomically with a hard link, holding a token unique to their
+    holder. Holders touch their lock file every tenth of ``stale_lock_age``
+    seconds, and lock files untouched for ``stale_lock_age`` seconds are
+    considered left behind by a crashed process and removed.
+
+    Usage::
+
+        >>> from sec_cik_mapper.cache import DirectorySnapshotStore, SnapshotCache
+        >>> cache = SnapshotCache(DirectorySnapshotStore("/mnt/shared/snapshots"))
+    """
+
+    poll_interval: float = 0.1
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        stale_lock_age: float = DEFAULT_STALE_LOCK_AGE,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.stale_lock_age = stale_lock_age
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return (self.directory / key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self.directory / key
+        # Unique per process and thread, so that concurrent writers of the
+        # same key do not write to the same temporary file
+        temp_path = path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            (self.directory / key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key: str) -> bool:
+        return (self.directory / key).exists()
+
+    @staticmethod
+    def _read_lock(path: Path) -> Optional[Tuple[str, float]]:
+        """Get the token of a lock file and the time it was last touched, or
+        ``None`` if there is no lock file."""
+        try:
+            with open(path, "rb") as f:
+                return f.read().decode(), os.fstat(f.fileno()).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _remove_lock(self, path: Path, token: str) -> bool:
+        """Remove a lock file if it holds the given token. The lock file is
+        moved aside before its token is checked, so that a lock taken by
+        another process in the meantime is put back rather than removed."""
+        moved_path = path.with_name(f".{path.name}.{_new_token()}.removed")
+        try:
+            os.rename(path, moved_path)
+        except FileNotFoundError:
+            return False
+        removed = moved_path.read_text() == token
+        if not removed:
+            # Fails only if a third process took the lock since it was moved
+            with suppress(FileExistsError):
+                os.link(moved_path, path)
+        moved_path.unlink()
+        return removed
+
+    def _break_stale_lock(self, path: Path) -> None:
+        lock = self._read_lock(path)
+        if lock is None:
+            return
+        token, touched = lock
+        age = time.time() - touched
+        if age > self.stale_lock_age and self._remove_lock(path, token):
+            logger.warning("Removed stale lock file %s (%.0fs old)", path, age)
+
+    def _touch_lock(self, path: Path, released: threading.Event) -> None:
+        """Touch a held lock file until it is released, so that it is not
+        considered stale however long it is held."""
+        while not released.wait(self.stale_lock_age / 10):
+            os.utime(path)
+
+    @contextmanager
+    def lock(self, name: str, timeout: float) -> Iterator[None]:
+        path = self.directory / f"{name}.lock"
+        token = _new_token()
+        # A hard link of this file is the lock file while the lock is held,
+        # and touching it touches the lock file
+        own_path = path.with_name(f".{path.name}.{token}")
+        own_path.write_text(token)
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    os.link(own_path, path)
+                    break
+                except FileExistsError:
+                    if time.monotonic() >= deadline:
+                        raise LockTimeoutError(
+                            f"Timed out waiting for lock file {path}"
+                        ) from None
+                    self._break_stale_lock(path)
+                    time.sleep(self.poll_interval)
+
+            released = threading.Event()
+            toucher = threading.Thread(
+                target=self._touch_lock, args=(own_path, released), daemon=True
+            )
+            toucher.start()
+            try:
+                yield
+            finally:
+                released.set()
+                toucher.join()
+                self._remove_lock(path, token)
+        finally:
+            own_path.unlink()
+
+
+class InMemorySnapshotStore(BaseSnapshotStore):
+    """Store data in memory, shared by the threads of a process.
+
+    Usage::
+
+        >>> from sec_cik_mapper.cache import InMemorySnapshotStore, SnapshotCache
+        >>> cache = SnapshotCache(InMemorySnapshotStore())
+    """
+
+    def __init__(self) -> None:
+        self.data: Dict[str, bytes] = {}
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.data[key] = data
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    @contextmanager
+    def lock(self, name: str, timeout: float) -> Iterator[None]:
+        lock = self._locks[name]
+        if not lock.acquire(timeout=timeout):
+            raise LockTimeoutError(f"Timed out waiting for lock {name}")
+        try:
+            yield
+        finally:
+            lock.release()
+
+
+class SnapshotCache:
+    """A :class:`SnapshotCache` object, which restores mappers from snapshots
+    in a store shared with other processes or hosts, and fetches the SEC data
+    to store a new snapshot when the newest one is older than ``max_age``
+    seconds. Snapshots include every mapping unless ``indexes`` is ``False``.
+    A directory path is stored with a :class:`DirectorySnapshotStore`.
+    """
+
+    def __init__(
+        self,
+        store: Union[str, Path, BaseSnapshotStore],
+        keep: int = DEFAULT_KEEP,
+        max_age: float = DEFAULT_MAX_AGE,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+        indexes: bool = True,
+    ) -> None:
+        """Constructor for the :class:`SnapshotCache` class."""
+        if keep < 1:
+            raise ValueError(f"At least one snapshot must be kept, got {keep}.")
+        self.store = (
+            store
+            if isinstance(store, BaseSnapshotStore)
+            else DirectorySnapshotStore(store)
+        )
+        self.keep = keep
+        self.max_age = max_age
+        self.lock_timeout = lock_timeout
+        self.indexes = indexes
+
+    @staticmethod
+    def snapshot_key(mapper_type: Type[Any], payload_hash: str) -> str:
+        """Get the key of the snapshot of a type of mapper built from a
+        payload with the given hash. Keys include the versions of the
+        snapshot format, Python, and marshal, which only read their own
+        snapshots."""
+        versions = ".".join(map(str, _get_versions()))
+        return f"{mapper_type.__name__}-{payload_hash}-{versions}.snapshot"
+
+    @staticmethod
+    def _index_key(mapper_type: Type[Any]) -> str:
+        """Get the key of the index of a type of mapper. Each version of the
+        snapshot format, Python, and marshal has its own index, so that
+        snapshots are only pruned by processes of their version."""
+        versions = ".".join(map(str, _get_versions()))
+        return f"{mapper_type.__name__}-{versions}.json"
+
+    def get_index(self, mapper_type: Type[Any]) -> Dict[str, Any]:
+        """Get the index of the stored snapshots of a type of mapper: the
+        payload hashes of the newest snapshots, newest first, the time the
+        SEC data was last fetched, and the rows of the newest snapshot."""
+        data = self.store.get(self._index_key(mapper_type))
+        return (
+            {"payload_hashes": [], "updated": 0} if data is None else json.loads(data)
+        )
+
+    def _load_fresh(
+        self, mapper_type: Type[MapperType], transport: Optional[BaseTransport]
+    ) -> Optional[MapperType]:
+        """Restore a mapper from the newest snapshot, or get ``None`` if there
+        is none or it is stale."""
+        index = self.get_index(mapper_type)
+        if time.time() - index["updated"] > self.max_age:
+            return None
+        return self._load_newest(mapper_type, transport, index)
+
+    def _load_newest(
+        self,
+        mapper_type: Type[MapperType],
+        transport: Optional[BaseTransport],
+        index: Dict[str, Any],
+    ) -> Optional[MapperType]:
+        """Restore a mapper from the newest snapshot of an index, or get
+        ``None`` if there is none."""
+        if not index["payload_hashes"]:
+            return None
+        key = self.snapshot_key(mapper_type, index["payload_hashes"][0])
+        data = self.store.get(key)
+        if data is None:
+            return None
+        try:
+            return loads_snapshot(mapper_type, data, transport, key)
+        except SnapshotError as e:
+            # Corrupted snapshots are stored again on refresh
+            logger.warning("Deleting invalid snapshot: %s", e)
+            self.store.delete(key)
+            return None
+
+    def _refresh(
+        self, mapper_type: Type[MapperType], transport: Optional[BaseTransport]
+    ) -> MapperType:
+        """Build a mapper from the SEC data, store its snapshot, and drop all
+        but the newest snapshots. If the SEC data is rejected by validation,
+        the mapper is restored from the newest snapshot instead.
+
+        :raises ~sec_cik_mapper.validation.ValidationError: if the SEC data is
+            rejected and there is no snapshot.
+        """
+        index = self.get_index(mapper_type)
+        try:
+            mapper = mapper_type(transport=transport)
+            # Compared to the newest snapshot, a drop in rows is a sign of
+            # truncated SEC data
+            mapper.validate(index.get("rows")).raise_for_errors()
+        except ValidationError as e:
+            newest = self._load_newest(mapper_type, transport, index)
+            if newest is None:
+                raise
+            logger.warning(
+                "Keeping the newest %s snapshot, SEC data rejected: %s",
+                mapper_type.__name__,
+                e,
+            )
+            return newest
+
+        key = self.snapshot_key(mapper_type, mapper.payload_hash)
+        if not self.store.exists(key):
+            self.store.put(key, dumps_snapshot(mapper, self.indexes))
+
+        payload_hashes: List[str] = [mapper.payload_hash] + [
+            payload_hash
+            for payload_hash in index["payload_hashes"]
+            if payload_hash != mapper.payload_hash
+        ]
+        index = {
+            "payload_hashes": payload_hashes[: self.keep],
+            "updated": time.time(),
+            "rows": len(mapper.table),
+        }
+        self.store.put(self._index_key(mapper_type), json.dumps(index).encode())
+        for payload_hash in payload_hashes[self.keep :]:
+            self.store.delete(self.snapshot_key(mapper_type, payload_hash))
+        return mapper
+
+    def load(
+        self, mapper_type: Type[MapperType], transport: Optional[BaseTransport] = None
+    ) -> MapperType:
+        """Get a mapper of a type from the newest stored snapshot if it is
+        fresh, or else from the SEC data (through ``transport``), storing its
+        snapshot for other processes. Only one process at a time fetches the
+        SEC data, while the others wait for its snapshot. If the lock cannot
+        be acquired within ``lock_timeout`` seconds, the mapper is built from
+        the SEC data without storing it.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> from sec_cik_mapper.cache import SnapshotCache
+            >>> cache = SnapshotCache("/mnt/shared/sec-cik-mapper")
+            >>> mutual_fund_mapper = cache.load(MutualFundMapper)
+        """
+        mapper = self._load_fresh(mapper_type, transport)
+        if mapper is not None:
+            return mapper
+        try:
+            with self.store.lock(mapper_type.__name__, self.lock_timeout):
+                # Another process may have stored a snapshot while this one
+                # was waiting for the lock
+                mapper = self._load_fresh(mapper_type, transport)
+                return (
+                    self._refresh(mapper_type, transport) if mapper is None else mapper
+                )
+        except LockTimeoutError as e:
+            logger.warning("%s, building the mapper from SEC data instead", e)
+            return mapper_type(transport=transport)
@@ -0,0 +1,130 @@
+"""Command-line interface installed as ``sec-cik-mapper``.
+
+Usage::
+
+    $ sec-cik-mapper resolve trades.csv --key-column symbol --fields cik name
+    $ sec-cik-mapper snapshot stocks.snapshot --kind stocks
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .generate import MAPPER_TYPES
+from .resolve import DEFAULT_CHUNK_SIZE, resolve
+from .transports import FileTransport
+
+
+def _resolve(args: argparse.Namespace) -> None:
+    mapper_type = MAPPER_TYPES[args.kind]
+    if args.metadata is not None:
+        mapper = mapper_type.load_metadata(args.metadata)
+    elif args.snapshot is not None:
+        mapper = mapper_type.load_snapshot(args.snapshot)
+    else:
+        transport = None if args.data_dir is None else FileTransport(args.data_dir)
+        mapper = mapper_type(transport=transport)
+    num_rows = resolve(
+        mapper,
+        args.input,
+        args.output,
+        key_column=args.key_column,
+        key=args.key,
+        fields=args.fields,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print(f"Resolved {num_rows} rows", file=sys.stderr)
+
+
+def _snapshot(args: argparse.Namespace) -> None:
+    transport = None if args.data_dir is None else FileTransport(args.data_dir)
+    mapper = MAPPER_TYPES[args.kind](transport=transport)
+    mapper.save_snapshot(args.output)
+    print(f"Wrote {args.output} ({args.output.stat().st_size} bytes)", file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Entry point of the ``sec-cik-mapper`` console command."""
+    parser = argparse.ArgumentParser(prog="sec-cik-mapper")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    resolve_parser = subparsers.add_parser(
+        "resolve",
+        help="Resolve a key column of a CSV or Parquet file to other fields.",
+        description=(
+            "Stream a CSV or Parquet file (or CSV from stdin with -) chunk by "
+            "chunk and add a column for each resolved field."
+        ),
+    )
+    resolve_parser.add_argument("input", help="Input file, or - for stdin.")
+    resolve_parser.add_argument(
+        "--output",
+        default="-",
+        help="Output CSV or Parquet file, or - for stdout (default: %(default)s).",
+    )
+    resolve_parser.add_argument(
+        "--key-column", required=True, help="Input column holding the keys."
+    )
+    resolve_parser.add_argument(
+        "--key",
+        default="ticker",
+        help="Field held by the key column, e.g. ticker or cik (default: %(default)s).",
+    )
+    resolve_parser.add_argument(
+        "--fields",
+        nargs="+",
+        default=["cik"],
+        help="Fields to resolve the keys to (default: cik).",
+    )
+    resolve_parser.add_argument("--kind", choices=list(MAPPER_TYPES), default="stocks")
+    source = resolve_parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Read SEC data from this directory instead of fetching it.",
+    )
+    source.add_argument(
+        "--metadata",
+        type=Path,
+        help="Load mapping metadata saved with save_metadata() instead.",
+    )
+    source.add_argument(
+        "--snapshot",
+        type=Path,
+        help="Load a snapshot saved with save_snapshot() instead.",
+    )
+    resolve_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    resolve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: %(default)s).",
+    )
+    resolve_parser.set_defaults(func=_resolve)
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="Compile a mapper and all of its mappings into a binary snapshot.",
+        description=(
+            "Build every mapping of a mapper and write them, along with the "
+            "mapping metadata, to a snapshot that loads in milliseconds."
+        ),
+    )
+    snapshot_parser.add_argument("output", type=Path, help="Snapshot file to write.")
+    snapshot_parser.add_argument("--kind", choices=list(MAPPER_TYPES), default="stocks")
+    snapshot_parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Read SEC data from this directory instead of fetching it.",
+    )
+    snapshot_parser.set_defaults(func=_snapshot)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
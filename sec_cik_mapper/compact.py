@@ -0,0 +1,164 @@
+"""Provides compact read-only replacements for the ``*_to_*`` mappings from
+keys to sets of values.
+
+A :class:`CompactSetMapping` stores its keys in one sorted tuple, the values
+of all keys grouped by key and sorted within each group in another, and the
+start of each group in an offset array, instead of a dict with a Python
+``set`` per key. Lookups bisect the keys and return a :class:`CompactSet`
+view over the values of the key, which compares equal to the corresponding
+``set`` and supports the other read-only set operations.
+"""
+
+import sys
+from bisect import bisect_left
+from typing import AbstractSet, Any, Iterable, Iterator, Mapping, Sequence, Set, Union
+
+import numpy as np
+import pandas as pd
+
+Column = Union[Sequence[Any], np.ndarray, pd.Series, pd.Index]
+
+
+class CompactSet(AbstractSet[str]):
+    """A read-only set view over the sorted values of a key of a
+    :class:`CompactSetMapping`."""
+
+    __slots__ = ("_values", "_start", "_stop")
+
+    def __init__(self, values: Sequence[str], start: int, stop: int) -> None:
+        """Constructor for the :class:`CompactSet` class."""
+        self._values = values
+        self._start = start
+        self._stop = stop
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[Any]) -> Set[Any]:  # type: ignore
+        # Results of set operations are regular sets
+        return set(iterable)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, str):
+            return False
+        position = bisect_left(self._values, value, self._start, self._stop)
+        return position < self._stop and self._values[position] == value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values[self._start : self._stop])
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __repr__(self) -> str:
+        # Like a set, but in sorted order
+        return f"{{{', '.join(map(repr, self))}}}" if self else "set()"
+
+
+class CompactSetMapping(Mapping[str, AbstractSet[str]]):
+    """A :class:`CompactSetMapping` object, a read-only mapping from keys to
+    sets of values stored as grouped sorted tuples with offsets.
+
+    Usage::
+
+        >>> from sec_cik_mapper.compact import CompactSetMapping
+        >>> mapping = CompactSetMapping.from_columns(
+        ...     ["0001067983", "0001067983", "0000320193"], ["BRK-B", "BRK-A", "AAPL"]
+        ... )
+        >>> mapping["0001067983"]
+        {'BRK-A', 'BRK-B'}
+        >>> mapping["0001067983"] == {"BRK-A", "BRK-B"}
+        True
+    """
+
+    def __init__(
+        self, keys: Sequence[str], values: Sequence[str], offsets: np.ndarray
+    ) -> None:
+        """Constructor for the :class:`CompactSetMapping` class. ``keys``
+        must be sorted, and the values of ``keys[i]`` are the sorted
+        ``values[offsets[i]:offsets[i + 1]]``."""
+        self._keys = tuple(keys)
+        self._values = tuple(values)
+        self._offsets = offsets
+
+    @classmethod
+    def from_columns(cls, keys: Column, values: Column) -> "CompactSetMapping":
+        """Build a mapping from each key of ``keys`` to the set of values of
+        ``values`` in the same rows, ignoring blank or missing keys and
+        values."""
+        key_codes, unique_keys = pd.factorize(np.asarray(keys, dtype=object), sort=True)
+        value_codes, unique_values = pd.factorize(
+            np.asarray(values, dtype=object), sort=True
+        )
+        return cls.from_codes(key_codes, unique_keys, value_codes, unique_values)
+
+    @classmethod
+    def from_codes(
+        cls,
+        key_codes: np.ndarray,
+        unique_keys: Column,
+        value_codes: np.ndarray,
+        unique_values: Column,
+    ) -> "CompactSetMapping":
+        """Build a mapping from the codes of keys and values in the same rows,
+        as returned by ``pd.factorize(..., sort=True)``, so that columns
+        shared by several mappings are only factorized once. Blank keys and
+        values and missing (-1) codes are ignored."""
+        unique_keys = np.asarray(unique_keys, dtype=object)
+        unique_values = np.asarray(unique_values, dtype=object)
+        # Code -1 picks the trailing False
+        present_keys = np.append(unique_keys.astype(bool), False)
+        present_values = np.append(unique_values.astype(bool), False)
+        present = present_keys[key_codes] & present_values[value_codes]
+
+        # Group values by key, sorted and without duplicates within groups
+        order = np.lexsort((value_codes[present], key_codes[present]))
+        key_codes = key_codes[present][order]
+        value_codes = value_codes[present][order]
+        new_key = np.ones(len(key_codes), dtype=bool)
+        new_key[1:] = key_codes[1:] != key_codes[:-1]
+        distinct = new_key.copy()
+        distinct[1:] |= value_codes[1:] != value_codes[:-1]
+        key_codes = key_codes[distinct]
+        starts = np.flatnonzero(new_key[distinct])
+        offsets = np.append(starts, len(key_codes))
+        return cls(
+            unique_keys[key_codes[starts]].tolist(),
+            unique_values[value_codes[distinct]].tolist(),
+            offsets.astype(np.min_scalar_type(len(key_codes))),
+        )
+
+    def _find(self, key: object) -> int:
+        """Get the position of a key, or -1 if it is missing."""
+        if not isinstance(key, str):
+            return -1
+        position = bisect_left(self._keys, key)
+        found = position < len(self._keys) and self._keys[position] == key
+        return position if found else -1
+
+    def __getitem__(self, key: str) -> AbstractSet[str]:
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+        start, stop = self._offsets[position : position + 2].tolist()
+        return CompactSet(self._values, start, stop)
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __sizeof__(self) -> int:
+        """Get the memory used by the mapping and its tuples and offsets,
+        excluding the strings."""
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._keys)
+            + sys.getsizeof(self._values)
+            + sys.getsizeof(self._offsets)
+        )
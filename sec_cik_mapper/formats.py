@@ -0,0 +1,118 @@
+"""Readers and writers for the export formats of mapping metadata."""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+from .types import MetadataFormat
+
+_Writer = Callable[[pd.DataFrame, Path, Any], None]
+_Reader = Callable[[Path, Any], pd.DataFrame]
+
+
+def _write_csv(df: pd.DataFrame, path: Path, compression: Any) -> None:
+    df.to_csv(path, index=False, compression=compression)
+
+
+def _read_csv(path: Path, compression: Any) -> pd.DataFrame:
+    # Keep CIKs zero-padded and blank values as empty strings
+    return pd.read_csv(path, dtype=str, keep_default_na=False, compression=compression)
+
+
+def _write_ndjson(df: pd.DataFrame, path: Path, compression: Any) -> None:
+    df.to_json(
+        path,
+        orient="records",
+        lines=True,
+        force_ascii=False,
+        compression=compression,
+    )
+
+
+def _read_ndjson(path: Path, compression: Any) -> pd.DataFrame:
+    return pd.read_json(
+        path, orient="records", lines=True, dtype=False, compression=compression
+    )
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, compression: Any) -> None:
+    df.to_parquet(path, index=False)
+
+
+def _read_parquet(path: Path, compression: Any) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
+def _write_feather(df: pd.DataFrame, path: Path, compression: Any) -> None:
+    df.to_feather(path)
+
+
+def _read_feather(path: Path, compression: Any) -> pd.DataFrame:
+    return pd.read_feather(path)
+
+
+_SERIALIZERS: Dict[str, Tuple[_Writer, _Reader]] = {
+    "csv": (_write_csv, _read_csv),
+    "ndjson": (_write_ndjson, _read_ndjson),
+    "parquet": (_write_parquet, _read_parquet),
+    "feather": (_write_feather, _read_feather),
+}
+
+# Format name -> (serializer, compression). Parquet and Feather files are
+# compressed internally by Arrow.
+_FORMATS: Dict[str, Tuple[str, Any]] = {
+    "csv": ("csv", None),
+    "csv.gz": ("csv", "gzip"),
+    "csv.xz": ("csv", "xz"),
+    "ndjson": ("ndjson", None),
+    "ndjson.gz": ("ndjson", "gzip"),
+    "ndjson.xz": ("ndjson", "xz"),
+    "parquet": ("parquet", None),
+    "feather": ("feather", None),
+}
+
+
+def _resolve_format(
+    path: Union[str, Path], format: Optional[MetadataFormat]
+) -> Tuple[str, Any]:
+    """Get the serializer and compression for a metadata file, inferring the
+    format from the file extension when it is not given explicitly.
+    """
+    if format is None:
+        suffixes = [suffix.lower().lstrip(".") for suffix in Path(path).suffixes]
+        # Prefer compound extensions such as .csv.gz over the last extension
+        candidates = [".".join(suffixes[-2:]), "".join(suffixes[-1:])]
+        inferred = next((c for c in candidates if c in _FORMATS), None)
+        if inferred is None:
+            raise ValueError(
+                f"Unable to infer metadata format from file name: {Path(path).name}. "
+                f"Valid formats: {', '.join(_FORMATS)}."
+            )
+        return _FORMATS[inferred]
+    if format not in _FORMATS:
+        raise ValueError(
+            f"Unknown metadata format: {format}. "
+            f"Valid formats: {', '.join(_FORMATS)}."
+        )
+    return _FORMATS[format]
+
+
+def write_metadata(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    format: Optional[MetadataFormat] = None,
+) -> None:
+    """Write mapping metadata to a file in the given format."""
+    serializer, compression = _resolve_format(path, format)
+    writer, _ = _SERIALIZERS[serializer]
+    writer(df, Path(path), compression)
+
+
+def read_metadata(
+    path: Union[str, Path], format: Optional[MetadataFormat] = None
+) -> pd.DataFrame:
+    """Read mapping metadata from a file in the given format."""
+    serializer, compression = _resolve_format(path, format)
+    _, reader = _SERIALIZERS[serializer]
+    return reader(Path(path), compression)
@@ -0,0 +1,330 @@
+"""Generate the JSON and CSV mapping artifacts published under ``mappings/``.
+
+Usage::
+
+    $ python -m sec_cik_mapper.generate --output-dir mappings
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import pandas as pd
+
+from .BaseMapper import BaseMapper
+from .MutualFundMapper import MutualFundMapper
+from .StockMapper import StockMapper
+from .transports import BaseTransport, InMemoryTransport, RequestsTransport
+from .types import ArtifactRecord, Index, ManifestEntry
+from .validation import ValidationError
+
+logger = logging.getLogger(__name__)
+
+CSV_FILE_NAME = "mappings.csv"
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Bump whenever the artifact format changes so that every artifact is rewritten
+MANIFEST_VERSION = 1
+
+MAPPER_TYPES: Dict[str, Union[Type[StockMapper], Type[MutualFundMapper]]] = {
+    "stocks": StockMapper,
+    "mutual_funds": MutualFundMapper,
+}
+
+
+def serialize_mapping(mapping: Index) -> str:
+    """Serialize a mapping to JSON with sorted keys and sorted set values.
+
+    Sets are sorted up front rather than through a custom ``JSONEncoder``
+    so that the C-accelerated encoder can be used when it is available.
+    """
+    normalized = {
+        key: value if isinstance(value, str) else sorted(value)
+        for key, value in mapping.items()
+    }
+    return json.dumps(normalized, ensure_ascii=False, sort_keys=True)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomically(path: Path, write: Callable[[Path], object]) -> None:
+    """Write a file through a temporary file in the same directory, then move
+    it into place so that readers never observe a partially written file.
+    """
+    # Created by ``write`` rather than with tempfile, which would make it
+    # readable only by its owner, so that it gets the usual permissions
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def _write_artifact(path: Path, mapping: Index) -> Tuple[str, int]:
+    """Serialize a mapping and atomically write it to disk, returning the
+    SHA-256 hex digest and size of the written file.
+    """
+    data = serialize_mapping(mapping).encode("utf-8")
+    _write_atomically(path, lambda tmp_path: tmp_path.write_bytes(data))
+    return _sha256(data), len(data)
+
+
+def _hash_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """Hash the content of each column of a dataframe."""
+    return {
+        col: _sha256(
+            pd.util.hash_pandas_object(df[col], index=False).to_numpy().tobytes()
+        )
+        for col in df.columns
+    }
+
+
+def _get_input_hashes(mapper: BaseMapper) -> Dict[str, str]:
+    """Get a hash of the inputs of every artifact, keyed by file name. Each
+    ``*_to_*`` mapping only depends on its key and value columns.
+    """
+    column_hashes = _hash_columns(mapper.mapping_metadata)
+
+    def input_hash(*parts: object) -> str:
+        return _sha256(repr((MANIFEST_VERSION, *parts)).encode("utf-8"))
+
+    input_hashes = {CSV_FILE_NAME: input_hash(sorted(column_hashes.items()))}
+    for name, spec in mapper._index_specs.items():
+        input_hashes[f"{name}.json"] = input_hash(
+            spec, column_hashes[spec.key], column_hashes[spec.value]
+        )
+    return input_hashes
+
+
+def _is_intact(path: Path, record: ArtifactRecord) -> bool:
+    """Check whether an artifact on disk still matches its manifest record.
+    Sizes are compared first to avoid hashing artifacts that changed size.
+    """
+    return (
+        path.is_file()
+        and path.stat().st_size == record["size"]
+        and _sha256(path.read_bytes()) == record["sha256"]
+    )
+
+
+def save_mappings(
+    mapper: BaseMapper,
+    save_path: Union[str, Path],
+    max_workers: Optional[int] = None,
+    previous: Optional[ManifestEntry] = None,
+) -> Tuple[ManifestEntry, List[Path]]:
+    """Save the mapping metadata CSV and every ``*_to_*`` mapping as JSON to
+    ``save_path``. JSON artifacts are serialized concurrently across a
+    process pool of ``max_workers`` processes (defaults to the number of
+    CPUs). Pass ``max_workers=1`` to serialize them in the current process.
+
+    When the manifest entry of a ``previous`` run is given, artifacts whose
+    inputs are unchanged are neither rebuilt nor rewritten. Returns the new
+    manifest entry along with the paths that were written.
+
+    Usage::
+
+        >>> from sec_cik_mapper import StockMapper
+        >>> from sec_cik_mapper.generate import save_mappings
+        >>> entry, written = save_mappings(StockMapper(), "mappings/stocks")
+        >>> written
+        [PosixPath('mappings/stocks/mappings.csv'), ...]
+    """
+    save_path = Path(save_path)
+    save_path.mkdir(parents=True, exist_ok=True)
+
+    input_hashes = _get_input_hashes(mapper)
+    artifacts: Dict[str, ArtifactRecord] = {}
+    if previous is not None:
+        artifacts = {
+            file_name: record
+            for file_name, record in previous["artifacts"].items()
+            if input_hashes.get(file_name) == record["input_hash"]
+            and _is_intact(save_path / file_name, record)
+        }
+
+    written: List[Path] = []
+    if CSV_FILE_NAME not in artifacts:
+        csv_path = save_path / CSV_FILE_NAME
+        _write_atomically(csv_path, mapper.save_metadata_to_csv)
+        data = csv_path.read_bytes()
+        artifacts[CSV_FILE_NAME] = ArtifactRecord(
+            input_hash=input_hashes[CSV_FILE_NAME],
+            sha256=_sha256(data),
+            size=len(data),
+        )
+        written.append(csv_path)
+
+    # Build every stale mapping in a single pass over the data
+    names = [name for name in mapper._index_specs if f"{name}.json" not in artifacts]
+    paths = [save_path / f"{name}.json" for name in names]
+    mappings = list(mapper.build_indexes(names).values())
+    if not names:
+        results: List[Tuple[str, int]] = []
+    elif max_workers == 1:
+        results = list(map(_write_artifact, paths, mappings))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_write_artifact, paths, mappings))
+
+    for path, (sha256, size) in zip(paths, results):
+        artifacts[path.name] = ArtifactRecord(
+            input_hash=input_hashes[path.name], sha256=sha256, size=size
+        )
+    written.extend(paths)
+
+    entry = ManifestEntry(
+        payload_hash=mapper.payload_hash,
+        rows=len(mapper.mapping_metadata),
+        artifacts=dict(sorted(artifacts.items())),
+    )
+    return entry, written
+
+
+def load_manifest(output_dir: Union[str, Path]) -> Dict[str, ManifestEntry]:
+    """Load the manifest of a previous run, if any."""
+    manifest_path = Path(output_dir) / MANIFEST_FILE_NAME
+    if not manifest_path.is_file():
+        return {}
+    with manifest_path.open(encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest["mappings"]
+
+
+def save_manifest(
+    output_dir: Union[str, Path], manifest: Dict[str, ManifestEntry]
+) -> None:
+    """Atomically save the manifest of the current run."""
+    data = json.dumps(
+        {"version": MANIFEST_VERSION, "mappings": manifest}, indent=2, sort_keys=True
+    )
+    _write_atomically(
+        Path(output_dir) / MANIFEST_FILE_NAME,
+        lambda tmp_path: tmp_path.write_text(f"{data}\n", encoding="utf-8"),
+    )
+
+
+def generate_mappings(
+    output_dir: Union[str, Path],
+    kinds: Sequence[str] = tuple(MAPPER_TYPES),
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    transport: Optional[BaseTransport] = None,
+) -> Dict[str, List[Path]]:
+    """Fetch the latest data from the SEC (through ``transport``) and save the
+    mappings for each kind of mapper (``stocks`` and/or ``mutual_funds``)
+    under ``output_dir``.
+
+    A manifest of input and output content hashes is kept in ``output_dir``
+    so that only artifacts whose inputs changed since the last run are
+    rewritten. A kind is skipped entirely when its SEC payload is unchanged,
+    before the payload is decoded or any mapper is built, and its artifacts
+    are kept when its SEC data is rejected by validation, e.g. as it lost
+    too many of the rows of the previous run. Pass ``force=True`` to ignore
+    the manifest. Returns the paths written for each kind.
+
+    :raises ~sec_cik_mapper.validation.ValidationError: if the SEC data of a
+        kind without previous artifacts is rejected.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {} if force else load_manifest(output_dir)
+    transport = RequestsTransport() if transport is None else transport
+
+    written: Dict[str, List[Path]] = {}
+    for kind in kinds:
+        save_path = output_dir / kind
+        mapper_type = MAPPER_TYPES[kind]
+        source_url = mapper_type._retriever.source_url
+        payload = transport.fetch(source_url)
+        previous = manifest.get(kind)
+
+        if (
+            previous is not None
+            and previous["payload_hash"] == _sha256(payload)
+            and all(
+                _is_intact(save_path / file_name, record)
+                for file_name, record in previous["artifacts"].items()
+            )
+        ):
+            written[kind] = []
+            continue
+
+        try:
+            # Built from the fetched payload rather than fetching it again
+            mapper = mapper_type(transport=InMemoryTransport({source_url: payload}))
+            if previous is not None:
+                # Compared to the previous run, a drop in rows is a sign of
+                # truncated SEC data
+                mapper.validate(previous.get("rows")).raise_for_errors()
+        except ValidationError as e:
+            if previous is None:
+                raise
+            logger.warning(
+                "Keeping the previous %s mappings, SEC data rejected: %s", kind, e
+            )
+            written[kind] = []
+            continue
+        manifest[kind], written[kind] = save_mappings(
+            mapper, save_path, max_workers, previous
+        )
+        save_manifest(output_dir, manifest)
+
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point for mapping generation."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sec_cik_mapper.generate",
+        description="Generate CSV and JSON mappings from SEC data.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="mappings",
+        help="Directory to save mappings to (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--kind",
+        dest="kinds",
+        action="append",
+        choices=list(MAPPER_TYPES),
+        help="Kind of mappings to generate. May be repeated (default: all).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of serialization processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite every artifact, even if its inputs are unchanged.",
+    )
+    args = parser.parse_args(argv)
+
+    kinds = args.kinds or list(MAPPER_TYPES)
+    written = generate_mappings(args.output_dir, kinds, args.workers, args.force)
+    for kind, paths in written.items():
+        if not paths:
+            print(f"[{kind}] No changes detected, skipping")
+        for path in paths:
+            print(f"[{kind}]", path.name, "✓")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,243 @@
+"""Provides a :class:`FundHierarchy` class for traversing the CIK, series,
+and share class hierarchy of mutual funds in batches.
+
+CIKs, series IDs, and class IDs are coded as integers in compressed sparse
+row form: series are sorted by CIK and classes by series, so the series or
+classes under a CIK are a contiguous range given by an offset array, and the
+parent of each series or class is a code in a parent array. Walking a whole
+fund family is a few array operations rather than a dict and set probe per
+series and class.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .types import FundParents
+
+Keys = Union[Sequence[str], np.ndarray, pd.Series]
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Get the positions of the concatenated ``[start, end)`` ranges."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    # Offset of each range's first position within the output
+    range_starts = np.cumsum(lengths) - lengths
+    return np.arange(total) + np.repeat(starts - range_starts, lengths)
+
+
+def _with_unknown(values: np.ndarray, unknown: Optional[int]) -> np.ndarray:
+    """Append the value of the unknown code, -1, to an array."""
+    return np.concatenate((values, np.array([unknown], dtype=values.dtype)))
+
+
+class FundHierarchy:
+    """A :class:`FundHierarchy` object, built from mutual fund mapping
+    metadata. Rows with a blank CIK, series ID, or class ID are left out.
+    Like ``series_id_to_cik``, a series listed more than once belongs to the
+    CIK of its last row, and a class to the series of its last row.
+
+    Usage::
+
+        >>> from sec_cik_mapper import MutualFundMapper
+        >>> mutual_fund_mapper = MutualFundMapper()
+        >>> hierarchy = mutual_fund_mapper.fund_hierarchy
+        >>> hierarchy.tickers_under(["0000002110"])
+        array(['CAEAX', 'CAECX', 'CAEEX', ...], dtype=object)
+    """
+
+    def __init__(self, mapping_metadata: pd.DataFrame) -> None:
+        """Constructor for the :class:`FundHierarchy` class."""
+        table = mapping_metadata[["CIK", "Series ID", "Class ID", "Ticker"]]
+        table = table[
+            (table["CIK"] != "")
+            & (table["Series ID"] != "")
+            & (table["Class ID"] != "")
+        ].drop_duplicates("Class ID", keep="last")
+        series = table.drop_duplicates("Series ID", keep="last")
+
+        series_parents, ciks = pd.factorize(series["CIK"])
+        #: CIKs, coded by position
+        self.ciks: np.ndarray = np.asarray(ciks, dtype=object)
+        # Stable sorts by parent keep the order of the mapping metadata
+        order = np.argsort(series_parents, kind="stable")
+        #: Series IDs sorted by CIK, coded by position
+        self.series_ids: np.ndarray = series["Series ID"].to_numpy(dtype=object)[order]
+        #: CIK code of each series
+        self.series_parents: np.ndarray = series_parents[order]
+        #: Series codes of each CIK, from ``cik_offsets[i]`` to ``cik_offsets[i + 1]``
+        self.cik_offsets: np.ndarray = self._offsets(
+            self.series_parents, len(self.ciks)
+        )
+        self._cik_index = pd.Index(self.ciks, dtype=object)
+        self._series_index = pd.Index(self.series_ids, dtype=object)
+
+        class_parents = self._series_index.get_indexer(table["Series ID"])
+        order = np.argsort(class_parents, kind="stable")
+        #: Class IDs sorted by series, coded by position
+        self.class_ids: np.ndarray = table["Class ID"].to_numpy(dtype=object)[order]
+        #: Ticker of each class, blank if it has none
+        self.class_tickers: np.ndarray = table["Ticker"].to_numpy(dtype=object)[order]
+        #: Series code of each class
+        self.class_parents: np.ndarray = class_parents[order]
+        #: Class codes of each series, from ``series_offsets[i]`` to
+        #: ``series_offsets[i + 1]``
+        self.series_offsets: np.ndarray = self._offsets(
+            self.class_parents, len(self.series_ids)
+        )
+        self._class_index = pd.Index(self.class_ids, dtype=object)
+        # Classes are sorted by series, which are sorted by CIK, so the classes
+        # of a CIK are contiguous too
+        self._cik_class_offsets = self.series_offsets[self.cik_offsets]
+
+        # Arrays with a trailing -1 or None for the unknown code, -1
+        self._ciks = _with_unknown(self.ciks, None)
+        self._series_ids = _with_unknown(self.series_ids, None)
+        self._class_ids = _with_unknown(self.class_ids, None)
+        self._series_parents = _with_unknown(self.series_parents, -1)
+        self._class_parents = _with_unknown(self.class_parents, -1)
+
+    @staticmethod
+    def _offsets(parents: np.ndarray, num_parents: int) -> np.ndarray:
+        """Get the offsets of sorted children by parent code."""
+        counts = np.bincount(parents, minlength=num_parents)
+        return np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def __len__(self) -> int:
+        """Get the number of share classes in the hierarchy."""
+        return len(self.class_ids)
+
+    def cik_codes(self, ciks: Keys) -> np.ndarray:
+        """Get the codes of CIKs, in order, with ``-1`` for unknown CIKs."""
+        return self._cik_index.get_indexer(pd.Index(ciks, dtype=object))
+
+    def class_codes(self, class_ids: Keys) -> np.ndarray:
+        """Get the codes of class IDs, in order, with ``-1`` for unknown class
+        IDs."""
+        return self._class_index.get_indexer(pd.Index(class_ids, dtype=object))
+
+    def _known_cik_codes(self, ciks: Keys) -> np.ndarray:
+        """Get the codes of CIKs, in order, without unknown and repeated CIKs."""
+        codes = self.cik_codes(ciks)
+        return pd.unique(codes[codes >= 0])
+
+    def _series_codes_under(self, cik_codes: np.ndarray) -> np.ndarray:
+        return _expand_ranges(
+            self.cik_offsets[cik_codes], self.cik_offsets[cik_codes + 1]
+        )
+
+    def _class_codes_under(self, cik_codes: np.ndarray) -> np.ndarray:
+        return _expand_ranges(
+            self._cik_class_offsets[cik_codes], self._cik_class_offsets[cik_codes + 1]
+        )
+
+    def series_under(
+        self, ciks: Keys, as_frame: bool = False
+    ) -> Union[np.ndarray, pd.DataFrame]:
+        """Get the series IDs of several CIKs, in order of the given CIKs and
+        then of the mapping metadata. Unknown and repeated CIKs are ignored. With
+        ``as_frame``, get a dataframe with the ``CIK`` of each series.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> hierarchy = MutualFundMapper().fund_hierarchy
+            >>> hierarchy.series_under(["0000002110", "0000002646"])
+            array(['S000033621', 'S000009189', ..., 'S000008760'], dtype=object)
+        """
+        series_codes = self._series_codes_under(self._known_cik_codes(ciks))
+        series_ids = self.series_ids[series_codes]
+        if not as_frame:
+            return series_ids
+        return pd.DataFrame(
+            {
+                "CIK": self.ciks[self.series_parents[series_codes]],
+                "Series ID": series_ids,
+            }
+        )
+
+    def classes_under(
+        self, ciks: Keys, as_frame: bool = False
+    ) -> Union[np.ndarray, pd.DataFrame]:
+        """Get the class IDs of several CIKs, in order of the given CIKs and
+        then of series and of the mapping metadata. Unknown and repeated CIKs
+        are ignored. With ``as_frame``, get a dataframe with the ``CIK``,
+        ``Series ID``, ``Class ID``, and ``Ticker`` of each class.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> hierarchy = MutualFundMapper().fund_hierarchy
+            >>> hierarchy.classes_under(["0000002646"])
+            array(['C000023849', 'C000074893', 'C000028784', ...], dtype=object)
+            >>> hierarchy.classes_under(["0000002646"], as_frame=True)
+                      CIK   Series ID    Class ID Ticker
+            0  0000002646  S000008760  C000023849  IIBPX
+            1  0000002646  S000008760  C000074893  IIBTX
+            2  0000002646  S000008760  C000028784  IPIIX
+            ...
+        """
+        class_codes = self._class_codes_under(self._known_cik_codes(ciks))
+        class_ids = self.class_ids[class_codes]
+        if not as_frame:
+            return class_ids
+        series_codes = self.class_parents[class_codes]
+        return pd.DataFrame(
+            {
+                "CIK": self.ciks[self.series_parents[series_codes]],
+                "Series ID": self.series_ids[series_codes],
+                "Class ID": class_ids,
+                "Ticker": self.class_tickers[class_codes],
+            }
+        )
+
+    def tickers_under(self, ciks: Keys) -> np.ndarray:
+        """Get the tickers of the classes of several CIKs, in order of the
+        given CIKs and then of series and of the mapping metadata. Classes
+        without a ticker and unknown and repeated CIKs are ignored.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> hierarchy = MutualFundMapper().fund_hierarchy
+            >>> hierarchy.tickers_under(["0000002646"])
+            array(['IIBPX', 'IIBTX', 'IPIIX', ...], dtype=object)
+        """
+        tickers = self.class_tickers[
+            self._class_codes_under(self._known_cik_codes(ciks))
+        ]
+        return tickers[tickers != ""]
+
+    def parents(
+        self, class_ids: Keys, as_frame: bool = False
+    ) -> Union[FundParents, pd.DataFrame]:
+        """Get the series ID and CIK of several class IDs, in order, with
+        ``None`` for unknown class IDs. With ``as_frame``, get a dataframe
+        with the ``Class ID``, ``Series ID``, and ``CIK`` of each class ID.
+
+        Usage::
+
+            >>> from sec_cik_mapper import MutualFundMapper
+            >>> hierarchy = MutualFundMapper().fund_hierarchy
+            >>> hierarchy.parents(["C000024954", "C000000000"])
+            FundParents(series_ids=array(['S000009184', None], dtype=object),
+                        ciks=array(['0000002110', None], dtype=object))
+        """
+        class_codes = self.class_codes(class_ids)
+        # Unknown codes (-1) pick the trailing -1 or None of each array
+        series_codes = self._class_parents[class_codes]
+        parents = FundParents(
+            self._series_ids[series_codes],
+            self._ciks[self._series_parents[series_codes]],
+        )
+        if not as_frame:
+            return parents
+        return pd.DataFrame(
+            {
+                "Class ID": self._class_ids[class_codes],
+                "Series ID": parents.series_ids,
+                "CIK": parents.ciks,
+            }
+        )
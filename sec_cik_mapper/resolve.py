@@ -0,0 +1,324 @@
+"""Resolve a key column of large CSV or Parquet files to other fields of the
+SEC mappings, streaming the input chunk by chunk with constant memory.
+
+Usage::
+
+    $ sec-cik-mapper resolve trades.csv --key-column symbol --key ticker \\
+          --fields cik name exchange --output resolved.csv
+    $ cat trades.csv | sec-cik-mapper resolve - --key-column symbol > resolved.csv
+"""
+
+import bz2
+import gzip
+import lzma
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+    cast,
+)
+
+import numpy as np
+import pandas as pd
+
+from .BaseMapper import BaseMapper
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Separator between the values of multi-valued fields, e.g. the tickers of a CIK
+MULTI_VALUE_SEPARATOR = "|"
+
+# Lookup tables of a worker process, set once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+# Process pools take an initializer from Python 3.7
+_POOL_INITIALIZER = sys.version_info >= (3, 7)
+
+_CSV_OPENERS: Dict[str, Callable[..., IO[str]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+
+class Lookups(NamedTuple):
+    # Mapping metadata column of the keys, e.g. "Ticker"
+    key_column: str
+    ticker_pattern: str
+    fields: List[str]
+    # Keys of the lookup table
+    keys: pd.Index
+    # Row of field values for each key, followed by a row of blanks for
+    # missing keys (at position -1)
+    values: np.ndarray
+
+
+class _CSVChunk(NamedTuple):
+    """Resolved chunk formatted as CSV rows without a header."""
+
+    columns: List[str]
+    num_rows: int
+    text: str
+
+
+def _field_name(column: str) -> str:
+    """Get the command-line name of a mapping metadata column, e.g.
+    ``series_id`` for ``Series ID``."""
+    return column.lower().replace(" ", "_")
+
+
+def build_lookups(mapper: BaseMapper, key: str, fields: Iterable[str]) -> Lookups:
+    """Build a lookup table from the ``key`` field to each of ``fields``
+    (e.g. ``ticker`` to ``cik``) out of the mapper's ``*_to_*`` mappings.
+    Values of multi-valued fields are sorted and joined with ``|``.
+    """
+    specs = mapper._index_specs.values()
+    columns = {_field_name(spec.key): spec.key for spec in specs}
+    columns.update((_field_name(spec.value), spec.value) for spec in specs)
+    if key not in columns:
+        raise ValueError(
+            f"Unknown key field for {type(mapper).__name__}: {key}. "
+            f"Valid fields: {', '.join(columns)}."
+        )
+
+    mapping_names = {}
+    for field in fields:
+        mapping_name = next(
+            (
+                name
+                for name, spec in mapper._index_specs.items()
+                if (spec.key, spec.value) == (columns[key], columns.get(field))
+            ),
+            None,
+        )
+        if mapping_name is None:
+            raise ValueError(f"Unable to resolve {key} to {field}.")
+        mapping_names[field] = mapping_name
+
+    indexes = mapper.build_indexes(mapping_names.values())
+    tables = {}
+    for field, mapping_name in mapping_names.items():
+        index = indexes[mapping_name]
+        if mapper._index_specs[mapping_name].multi_valued:
+            index = {
+                k: MULTI_VALUE_SEPARATOR.join(sorted(values))
+                for k, values in index.items()
+            }
+        tables[field] = pd.Series(index, dtype=object)
+    table = pd.DataFrame(tables).fillna("")
+    blank_row = np.full((1, len(tables)), "", dtype=object)
+    return Lookups(
+        key_column=columns[key],
+        ticker_pattern=mapper.retriever.ticker_pattern.pattern,
+        fields=list(tables),
+        keys=table.index,
+        values=np.vstack([table.to_numpy(dtype=object), blank_row]),
+    )
+
+
+def normalize_keys(keys: pd.Series, key_column: str, ticker_pattern: str) -> pd.Series:
+    """Normalize a column of keys the same way as
+    :meth:`~sec_cik_mapper.BaseMapper.BaseMapper.normalize_key`."""
+    keys = keys.fillna("").astype(str)
+    if key_column == "Ticker":
+        # A pattern string (rather than a compiled pattern) lets pandas use
+        # vectorized string kernels when they are available
+        return keys.str.upper().str.replace(ticker_pattern, "", regex=True)
+    if key_column == "CIK":
+        return keys.str.strip().str.zfill(10)
+    return keys.str.strip()
+
+
+def resolve_chunk(
+    chunk: pd.DataFrame, key_column: str, lookups: Lookups
+) -> pd.DataFrame:
+    """Add a column to a chunk for each looked up field, with empty strings
+    for keys that are not found. Every field is looked up with a single
+    vectorized probe of the lookup table."""
+    if key_column not in chunk:
+        raise ValueError(f"Key column not found in input: {key_column}")
+    keys = normalize_keys(chunk[key_column], lookups.key_column, lookups.ticker_pattern)
+    # Missing keys get position -1, the row of blanks
+    rows = lookups.values[lookups.keys.get_indexer(pd.Index(keys))]
+    for i, field in enumerate(lookups.fields):
+        chunk[field] = rows[:, i]
+    return chunk
+
+
+def _format_csv_chunk(chunk: pd.DataFrame) -> _CSVChunk:
+    return _CSVChunk(
+        list(chunk.columns), len(chunk), chunk.to_csv(index=False, header=False)
+    )
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    _worker_state.update(state)
+
+
+def _resolve_chunk_in_worker(
+    chunk: pd.DataFrame, key_column: str, state: Optional[Dict[str, Any]] = None
+) -> Union[pd.DataFrame, _CSVChunk]:
+    """Resolve a chunk in a worker process, also formatting it as CSV for
+    CSV output so that serialization is spread across the workers. The
+    lookups are those of the pool initializer, unless given with the chunk
+    in ``state``."""
+    state = _worker_state if state is None else state
+    resolved = resolve_chunk(chunk, key_column, state["lookups"])
+    return _format_csv_chunk(resolved) if state["as_csv"] else resolved
+
+
+def _is_parquet(path: Union[str, Path]) -> bool:
+    return str(path) != "-" and Path(path).suffix.lower() == ".parquet"
+
+
+def read_chunks(
+    path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Read a CSV (optionally compressed) or Parquet file, or CSV from stdin
+    if ``path`` is ``-``, in chunks of ``chunk_size`` rows."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq  # type: ignore
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+
+    source: Union[str, Path, IO[str]] = sys.stdin if str(path) == "-" else path
+    # Read every column as text to keep CIKs zero-padded and blanks empty
+    reader = pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size)
+    try:
+        yield from reader
+    finally:
+        reader.close()
+
+
+class ChunkWriter:
+    """Write chunks to a CSV (optionally compressed) or Parquet file, or as CSV
+    to stdout if ``path`` is ``-``, one chunk at a time."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = path
+        self.is_parquet = _is_parquet(path)
+        self._parquet_writer: Any = None
+        self._csv_file: Optional[IO[str]] = None
+
+    def _write_parquet(self, chunk: pd.DataFrame) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        if self._parquet_writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(
+                chunk, schema=self._parquet_writer.schema, preserve_index=False
+            )
+        self._parquet_writer.write_table(table)
+
+    def _write_csv(self, chunk: _CSVChunk) -> None:
+        if self._csv_file is None:
+            if str(self.path) == "-":
+                self._csv_file = sys.stdout
+            else:
+                suffix = Path(self.path).suffix.lower()
+                opener = _CSV_OPENERS.get(suffix, open)
+                self._csv_file = opener(self.path, "wt", newline="")
+            header = pd.DataFrame(columns=chunk.columns).to_csv(index=False)
+            self._csv_file.write(header)
+        self._csv_file.write(chunk.text)
+
+    def write(self, chunk: Union[pd.DataFrame, _CSVChunk]) -> int:
+        """Write a resolved chunk, returning its number of rows."""
+        if self.is_parquet:
+            self._write_parquet(cast(pd.DataFrame, chunk))
+            return len(chunk)
+        if isinstance(chunk, pd.DataFrame):
+            chunk = _format_csv_chunk(chunk)
+        self._write_csv(chunk)
+        return chunk.num_rows
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._csv_file is not None and self._csv_file is not sys.stdout:
+            self._csv_file.close()
+
+
+def _resolve_in_pool(
+    executor: Executor,
+    chunks: Iterator[pd.DataFrame],
+    key_column: str,
+    max_pending: int,
+    state: Optional[Dict[str, Any]] = None,
+) -> Iterator[Union[pd.DataFrame, _CSVChunk]]:
+    """Resolve chunks across a pool in input order, with at most
+    ``max_pending`` chunks in flight to bound memory. The lookups are sent
+    with each chunk if ``state`` is given, and else set by the pool
+    initializer."""
+    pending: Deque[Future] = deque()
+    for chunk in chunks:
+        pending.append(
+            executor.submit(_resolve_chunk_in_worker, chunk, key_column, state)
+        )
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def resolve(
+    mapper: BaseMapper,
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    key_column: str,
+    key: str = "ticker",
+    fields: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+) -> int:
+    """Stream ``input_path`` to ``output_path``, resolving ``key_column``
+    (holding ``key`` values, e.g. tickers) to each of ``fields`` (CIKs by
+    default). Chunks are resolved and formatted across ``workers``
+    processes when there is more than one. Returns the number of rows
+    written.
+    """
+    lookups = build_lookups(mapper, key, fields or ["cik"])
+    chunks = read_chunks(input_path, chunk_size)
+    writer = ChunkWriter(output_path)
+    num_rows = 0
+    try:
+        if workers > 1:
+            state = {"lookups": lookups, "as_csv": not writer.is_parquet}
+            chunk_state: Optional[Dict[str, Any]] = None
+            if _POOL_INITIALIZER:
+                # The lookups are sent once per worker rather than per chunk
+                executor = ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker, initargs=(state,)
+                )
+            else:
+                executor = ProcessPoolExecutor(max_workers=workers)
+                chunk_state = state
+            with executor:
+                for resolved in _resolve_in_pool(
+                    executor, chunks, key_column, 2 * workers, chunk_state
+                ):
+                    num_rows += writer.write(resolved)
+        else:
+            for chunk in chunks:
+                num_rows += writer.write(resolve_chunk(chunk, key_column, lookups))
+    finally:
+        writer.close()
+    return num_rows
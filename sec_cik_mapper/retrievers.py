@@ -1,27 +1,47 @@
 """Retrieval abstractions for SEC source URLs and data transformers."""
 
+import json
 import re
 from abc import ABCMeta, abstractmethod
-from typing import ClassVar, Dict, List, Pattern, Union, cast
+from itertools import zip_longest
+from typing import Any, ClassVar, Dict, List, Optional, Pattern, Sequence, Union, cast
 
 from typing_extensions import Final
 
-from .types import FieldIndices, MutualFundFieldIndices, StockFieldIndices
+from .types import (
+    CompanyData,
+    FieldIndices,
+    Fields,
+    MutualFundFieldIndices,
+    MutualFundFields,
+    StockFieldIndices,
+    StockFields,
+    SubmissionFieldIndices,
+    SubmissionFields,
+)
 
 # See CIK, ticker, and exchange associations section of:
 # https://www.sec.gov/os/accessing-edgar-data
-_SEC_MAPPING_SOURCE_URL_STOCKS: Final[
-    str
-] = "https://www.sec.gov/files/company_tickers_exchange.json"
-_SEC_MAPPING_SOURCE_URL_MUTUAL_FUNDS: Final[
-    str
-] = "https://www.sec.gov/files/company_tickers_mf.json"
+_SEC_MAPPING_SOURCE_URL_STOCKS: Final[str] = (
+    "https://www.sec.gov/files/company_tickers_exchange.json"
+)
+_SEC_MAPPING_SOURCE_URL_MUTUAL_FUNDS: Final[str] = (
+    "https://www.sec.gov/files/company_tickers_mf.json"
+)
+# See the bulk data section of:
+# https://www.sec.gov/edgar/sec-api-documentation
+_SEC_MAPPING_SOURCE_URL_SUBMISSIONS: Final[str] = (
+    "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+)
 
 
 class BaseRetriever(metaclass=ABCMeta):
     # Tickers can contain letters, numbers, and dashes
     ticker_pattern: ClassVar[Pattern[str]] = re.compile(r"[^A-Z0-9\-]+")
 
+    # Fields of the rows of company data read by the retriever
+    fields: ClassVar[Sequence[Fields]]
+
     def _clean_ticker(self, string: str) -> str:
         return re.sub(BaseRetriever.ticker_pattern, "", string.upper())
 
@@ -40,6 +60,8 @@ class BaseRetriever(metaclass=ABCMeta):
 
 
 class StockRetriever(BaseRetriever):
+    fields: ClassVar[List[StockFields]] = ["cik", "name", "ticker", "exchange"]
+
     @property
     def source_url(self) -> str:
         return _SEC_MAPPING_SOURCE_URL_STOCKS
@@ -63,6 +85,8 @@ class StockRetriever(BaseRetriever):
 
 
 class MutualFundRetriever(BaseRetriever):
+    fields: ClassVar[List[MutualFundFields]] = ["cik", "seriesId", "classId", "symbol"]
+
     @property
     def source_url(self) -> str:
         return _SEC_MAPPING_SOURCE_URL_MUTUAL_FUNDS
@@ -83,3 +107,103 @@ class MutualFundRetriever(BaseRetriever):
             "Series ID": seriesId,
             "Class ID": classId,
         }
+
+
+def _text(value: Optional[Union[int, str]]) -> str:
+    """Get a field of a submission as text, with missing values as blanks."""
+    return "" if value is None else str(value)
+
+
+class SubmissionsRetriever(BaseRetriever):
+    """Retriever of the EDGAR bulk submissions archive, which holds one JSON
+    file of company data and filings per CIK."""
+
+    # Fields of the rows of company data of each submission
+    fields: ClassVar[List[SubmissionFields]] = [
+        "cik",
+        "name",
+        "ticker",
+        "exchange",
+        "sic",
+        "sicDescription",
+        "stateOfIncorporation",
+        "formerName",
+    ]
+
+    # Members holding further pages of the filings of a CIK, without company data
+    filings_page_pattern: ClassVar[Pattern[str]] = re.compile(
+        r"-submissions-\d+\.json$"
+    )
+
+    @property
+    def source_url(self) -> str:
+        return _SEC_MAPPING_SOURCE_URL_SUBMISSIONS
+
+    def is_company_member(self, name: str) -> bool:
+        """Check whether a member of the archive holds the company data of a
+        CIK, e.g. ``CIK0000320193.json``."""
+        return name.endswith(".json") and not self.filings_page_pattern.search(name)
+
+    def get_company_data(self, submission: Dict[str, Any]) -> CompanyData:
+        """Get rows of company data from a decoded submission, with one row
+        per ticker (and its exchange) and per former name. Tickers and former
+        names are unrelated, so they are paired up row by row to keep a
+        single row per CIK in the common case."""
+        former_names = [
+            former_name.get("name")
+            for former_name in submission.get("formerNames") or []
+        ]
+        rows = zip_longest(
+            submission.get("tickers") or [],
+            submission.get("exchanges") or [],
+            former_names,
+        )
+        return [
+            [
+                _text(value)
+                for value in (
+                    submission.get("cik"),
+                    submission.get("name"),
+                    ticker,
+                    exchange,
+                    submission.get("sic"),
+                    submission.get("sicDescription"),
+                    submission.get("stateOfIncorporation"),
+                    former_name,
+                )
+            ]
+            for ticker, exchange, former_name in list(rows) or [(None, None, None)]
+        ]
+
+    def transform(
+        self,
+        field_indices: FieldIndices,
+        company_data: List[Union[int, str]],
+    ) -> Dict[str, str]:
+        field_indices = cast(SubmissionFieldIndices, field_indices)
+        cik = str(company_data[field_indices["cik"]])
+        ticker = str(company_data[field_indices["ticker"]])
+        name = str(company_data[field_indices["name"]])
+        exchange = str(company_data[field_indices["exchange"]])
+        sic = str(company_data[field_indices["sic"]])
+        sic_description = str(company_data[field_indices["sicDescription"]])
+        state = str(company_data[field_indices["stateOfIncorporation"]])
+        former_name = str(company_data[field_indices["formerName"]])
+        return {
+            "CIK": cik.zfill(10),
+            "Ticker": self._clean_ticker(ticker),
+            "Name": name.title(),
+            "Exchange": exchange,
+            "SIC": sic,
+            "SIC Description": sic_description,
+            "State of Incorporation": state,
+            "Former Name": former_name.title(),
+        }
+
+    def parse(self, member: bytes) -> List[Dict[str, str]]:
+        """Decode and transform the company data of a member of the archive."""
+        field_indices = {field: i for i, field in enumerate(self.fields)}
+        return [
+            self.transform(cast(SubmissionFieldIndices, field_indices), row)
+            for row in self.get_company_data(json.loads(member))
+        ]
@@ -0,0 +1,325 @@
+"""Serve single and batch lookups for every ``*_to_*`` mapping over HTTP.
+
+Every mapping is built once at startup and shared by all requests.
+Connections are kept alive between requests, responses are compact JSON,
+and mappers are refreshed from the SEC in the background.
+
+Usage::
+
+    $ python -m sec_cik_mapper.serve --port 8000 --refresh-interval 3600
+
+    $ curl localhost:8000/stocks/ticker_to_cik/AAPL
+    "0000320193"
+    $ curl localhost:8000/stocks/ticker_to_cik -d '["AAPL", "MSFT", "UNKNOWN"]'
+    ["0000320193","0000789019",null]
+    $ curl localhost:8000/mutual_funds/series_id_to_tickers/S000002848
+    ["VITSX","VSMPX","VSTSX","VTI","VTSAX","VTSIX","VTSMX"]
+"""
+
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import unquote, urlsplit
+
+from .BaseMapper import BaseMapper
+from .cache import SnapshotCache
+from .generate import MAPPER_TYPES
+from .transports import BaseTransport, FileTransport
+from .types import Index
+from .validation import ValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 3600
+DEFAULT_MAX_BODY_SIZE = 8 << 20
+
+
+class MapperService:
+    """Hold a mapper of each kind with every mapping prebuilt, and refresh
+    them when the SEC data changes.
+
+    Usage::
+
+        >>> from sec_cik_mapper.serve import MapperService
+        >>> service = MapperService()
+        >>> service.lookup("stocks", "ticker_to_cik", "aapl")
+        '0000320193'
+        >>> service.lookup_many("stocks", "ticker_to_exchange", ["AAPL", "UNKNOWN"])
+        ['Nasdaq', None]
+    """
+
+    def __init__(
+        self,
+        transport: Optional[BaseTransport] = None,
+        kinds: Optional[Iterable[str]] = None,
+        cache: Optional[SnapshotCache] = None,
+    ) -> None:
+        self.transport = transport
+        # Mappers are restored from the snapshots of other services in the
+        # cache while they are fresh, instead of fetching the SEC data
+        self.cache = cache
+        self.kinds = list(MAPPER_TYPES if kinds is None else kinds)
+        self.mappers: Dict[str, BaseMapper] = {}
+        # Prebuilt mappings of each kind, replaced as a whole on refresh so
+        # that lookups never observe a partially refreshed mapper
+        self.indexes: Dict[str, Dict[str, Index]] = {}
+        self._refresh_lock = threading.Lock()
+        self._stop_refresh = threading.Event()
+        self.refresh()
+
+    def refresh(self) -> List[str]:
+        """Fetch the SEC data of every kind and rebuild the mappers whose data
+        changed. Returns the refreshed kinds. SEC data rejected by validation
+        (see :mod:`sec_cik_mapper.validation`), e.g. with far fewer rows than
+        the current mapper, is skipped, and the current mappings are kept.
+
+        :raises ~sec_cik_mapper.validation.ValidationError: if the SEC data of
+            a kind without current mappings is rejected.
+        """
+        refreshed = []
+        with self._refresh_lock:
+            for kind in self.kinds:
+                mapper_type = MAPPER_TYPES[kind]
+                current = self.mappers.get(kind)
+                try:
+                    mapper = (
+                        mapper_type(transport=self.transport)
+                        if self.cache is None
+                        else self.cache.load(mapper_type, self.transport)
+                    )
+                    if current is not None:
+                        if current.payload_hash == mapper.payload_hash:
+                            continue
+                        # Compared to the current mapper, a drop in rows is a
+                        # sign of truncated SEC data
+                        mapper.validate(len(current.table)).raise_for_errors()
+                except ValidationError as e:
+                    if current is None:
+                        raise
+                    logger.warning(
+                        "Keeping the current %s mappings, SEC data rejected: %s",
+                        kind,
+                        e,
+                    )
+                    continue
+                indexes = mapper.materialize_all()
+                # The membership filter is rebuilt before the mapper is swapped
+                # in, so that checking keys never waits for it
+                mapper.membership_filter
+                self.indexes = {**self.indexes, kind: indexes}
+                self.mappers = {**self.mappers, kind: mapper}
+                refreshed.append(kind)
+        return refreshed
+
+    def _refresh_periodically(self, interval: float) -> None:
+        while not self._stop_refresh.wait(interval):
+            try:
+                refreshed = self.refresh()
+            except Exception:
+                # Keep serving the current mappings until the next refresh
+                logger.exception("Failed to refresh mappers")
+            else:
+                logger.info("Refreshed mappers: %s", ", ".join(refreshed) or "none")
+
+    def start_refresh(self, interval: float) -> threading.Thread:
+        """Refresh the mappers every ``interval`` seconds in a background
+        thread until :meth:`stop_refresh` is called."""
+        self._stop_refresh.clear()
+        thread = threading.Thread(
+            target=self._refresh_periodically, args=(interval,), daemon=True
+        )
+        thread.start()
+        return thread
+
+    def stop_refresh(self) -> None:
+        self._stop_refresh.set()
+
+    def _get_index(self, kind: str, name: str) -> Index:
+        try:
+            return self.indexes[kind][name]
+        except KeyError:
+            raise KeyError(f"Unknown mapping: {kind}/{name}") from None
+
+    def lookup(self, kind: str, name: str, key: str) -> Any:
+        """Look up a normalized key in a mapping. Returns ``None`` for missing
+        keys and raises :class:`KeyError` for unknown mappings."""
+        index = self._get_index(kind, name)
+        return index.get(self.mappers[kind].normalize_key(name, key))
+
+    def lookup_many(self, kind: str, name: str, keys: Iterable[str]) -> List[Any]:
+        """Look up several keys in a mapping, in order."""
+        index = self._get_index(kind, name)
+        normalize_key = self.mappers[kind].normalize_key
+        return [index.get(normalize_key(name, key)) for key in keys]
+
+
+class _LookupRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so avoid delayed ACK stalls
+    disable_nagle_algorithm = True
+    server: "LookupServer"
+
+    def _send_json(self, status: int, body: Any) -> None:
+        # Sets are serialized as sorted lists
+        data = json.dumps(body, separators=(",", ":"), default=sorted).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _get_path_parts(self) -> List[str]:
+        return urlsplit(self.path).path.strip("/").split("/", 2)
+
+    def do_GET(self) -> None:
+        parts = self._get_path_parts()
+        service = self.server.service
+        if parts == ["health"]:
+            hashes = {k: mapper.payload_hash for k, mapper in service.mappers.items()}
+            self._send_json(200, hashes)
+            return
+        if len(parts) != 3:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+
+        kind, name, key = parts
+        try:
+            value = service.lookup(kind, name, unquote(key))
+        except KeyError as e:
+            self._send_json(404, {"error": e.args[0]})
+            return
+        if value is None:
+            self._send_json(404, {"error": f"Unknown key: {unquote(key)}"})
+            return
+        self._send_json(200, value)
+
+    def _read_body(self) -> Optional[bytes]:
+        """Read the request body, or send an error and get ``None`` if its
+        ``Content-Length`` is missing, invalid, or larger than the server's
+        ``max_body_size``."""
+        length = self.headers.get("Content-Length")
+        max_body_size = self.server.max_body_size
+        if length is None:
+            status, error = 411, "Content-Length required"
+        elif not length.isdigit():
+            status, error = 400, f"Invalid Content-Length: {length}"
+        elif int(length) > max_body_size:
+            status, error = 413, f"Request body larger than {max_body_size} bytes"
+        else:
+            return self.rfile.read(int(length))
+        # The unread body would be parsed as the next request
+        self.close_connection = True
+        self._send_json(status, {"error": error})
+        return None
+
+    def do_POST(self) -> None:
+        # Bodies are read first, so that the connection can be kept alive
+        body = self._read_body()
+        if body is None:
+            return
+        parts = self._get_path_parts()
+        if len(parts) != 2:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+
+        try:
+            keys = json.loads(body)
+        except ValueError:
+            keys = None
+        if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+            self._send_json(400, {"error": "Expected a JSON array of keys"})
+            return
+
+        kind, name = parts
+        try:
+            values = self.server.service.lookup_many(kind, name, keys)
+        except KeyError as e:
+            self._send_json(404, {"error": e.args[0]})
+            return
+        self._send_json(200, values)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Logging every request would dominate the cost of a lookup
+        pass
+
+
+class LookupServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server answering lookups from a :class:`MapperService`."""
+
+    daemon_threads = True
+
+    # Largest request body accepted, in bytes. Can be set per server.
+    max_body_size: int = DEFAULT_MAX_BODY_SIZE
+
+    def __init__(
+        self, service: MapperService, host: str = "127.0.0.1", port: int = 8000
+    ) -> None:
+        super().__init__((host, port), _LookupRequestHandler)
+        self.service = service
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point for the lookup service."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sec_cik_mapper.serve",
+        description="Serve single and batch lookups for every SEC mapping.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--kind",
+        choices=list(MAPPER_TYPES),
+        action="append",
+        help="Kind of mappings to serve (default: all).",
+    )
+    parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=DEFAULT_REFRESH_INTERVAL,
+        help="Seconds between refreshes, or 0 to disable (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Read SEC data from this directory instead of fetching it.",
+    )
+    parser.add_argument(
+        "--snapshot-cache",
+        type=Path,
+        help=(
+            "Share snapshots with other services through this directory, so "
+            "that only one of them fetches the SEC data per refresh interval."
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    transport = None if args.data_dir is None else FileTransport(args.data_dir)
+    cache = None
+    if args.snapshot_cache is not None:
+        max_age = args.refresh_interval or DEFAULT_REFRESH_INTERVAL
+        cache = SnapshotCache(args.snapshot_cache, max_age=max_age)
+    service = MapperService(transport, args.kind, cache)
+    if args.refresh_interval > 0:
+        service.start_refresh(args.refresh_interval)
+
+    server = LookupServer(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop_refresh()
+        server.server_close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,359 @@
+"""Publish a mapper's table and mappings once into shared memory as flat
+buffers that worker processes attach to read-only (Python 3.8+).
+
+Every distinct string is stored once in a UTF-8 string pool. Table columns
+are arrays of string IDs, and each ``*_to_*`` mapping is an open-addressing
+hash table (keyed by the CRC-32 of the key, which unlike :func:`hash` is
+the same in every process) over arrays of key and value string IDs.
+Lookups read the shared buffer directly, so attached workers neither copy
+the mappings nor touch shared pages through reference count updates, and
+memory stays close to a single copy however many workers attach.
+
+Usage::
+
+    >>> from concurrent.futures import ProcessPoolExecutor
+    >>> from sec_cik_mapper import StockMapper
+    >>> from sec_cik_mapper.shared import SharedMapper
+    >>> shared_mapper = SharedMapper.publish(StockMapper())
+    >>> def lookup_cik(ticker):
+    ...     return shared_mapper.ticker_to_cik.get(ticker)
+    >>> # Workers attach to the published mapper when it is pickled to them
+    >>> with ProcessPoolExecutor() as executor:
+    ...     list(executor.map(lookup_cik, ["AAPL", "MSFT"]))
+    ['0000320193', '0000789019']
+    >>> shared_mapper.unlink()
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+
+import pandas as pd
+
+from .BaseMapper import BaseMapper
+
+try:
+    from multiprocessing import shared_memory
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "sec_cik_mapper.shared requires Python 3.8 or later "
+        "(multiprocessing.shared_memory)"
+    ) from e
+
+MAGIC = b"SECCIKSM"
+VERSION = 1
+
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+_EMPTY_SLOT = -1
+
+SharedValue = Union[str, FrozenSet[str]]
+
+
+def _pad(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+class _StringPool:
+    """Read-only view of the UTF-8 strings of a shared buffer."""
+
+    def __init__(self, data: memoryview, offsets: memoryview) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    def get(self, string_id: int) -> str:
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return str(self.data[start:end], "utf-8")
+
+    def equals(self, string_id: int, encoded: bytes) -> bool:
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return self.data[start:end] == encoded
+
+
+class SharedIndex(Mapping[str, SharedValue]):
+    """Read-only ``*_to_*`` mapping backed by a hash table in shared memory.
+    Multi-valued mappings return frozensets."""
+
+    def __init__(
+        self,
+        pool: _StringPool,
+        slots: memoryview,
+        keys: memoryview,
+        values: memoryview,
+        value_offsets: Optional[memoryview],
+    ) -> None:
+        self._pool = pool
+        self._slots = slots
+        self._mask = len(slots) - 1
+        self._keys = keys
+        self._values = values
+        self._value_offsets = value_offsets
+
+    def _find(self, key: str) -> int:
+        """Get the entry of a key, or ``-1`` if it is missing."""
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & self._mask
+        while True:
+            entry = self._slots[slot]
+            if entry == _EMPTY_SLOT or self._pool.equals(self._keys[entry], encoded):
+                return entry
+            slot = (slot + 1) & self._mask
+
+    def _get_value(self, entry: int) -> SharedValue:
+        if self._value_offsets is None:
+            return self._pool.get(self._values[entry])
+        start, end = self._value_offsets[entry], self._value_offsets[entry + 1]
+        return frozenset(self._pool.get(i) for i in self._values[start:end])
+
+    def __getitem__(self, key: str) -> SharedValue:
+        entry = self._find(key) if isinstance(key, str) else _EMPTY_SLOT
+        if entry == _EMPTY_SLOT:
+            raise KeyError(key)
+        return self._get_value(entry)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) != _EMPTY_SLOT
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._pool.get(key_id) for key_id in self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a shared memory block without tracking it for cleanup when
+    possible (Python 3.13+), since only the publisher owns the block. Before
+    Python 3.13, processes started by :mod:`multiprocessing` share the
+    resource tracker of the publisher, which tracks each block only once.
+    """
+    options: Dict[str, Any] = {"track": False} if sys.version_info >= (3, 13) else {}
+    return shared_memory.SharedMemory(name=name, **options)
+
+
+def _build_hash_table(encoded_keys: List[bytes]) -> array:
+    capacity = 8
+    while capacity < 2 * len(encoded_keys):
+        capacity *= 2
+    mask = capacity - 1
+    slots = array("i", [_EMPTY_SLOT]) * capacity
+    for entry, encoded in enumerate(encoded_keys):
+        slot = zlib.crc32(encoded) & mask
+        while slots[slot] != _EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        slots[slot] = entry
+    return slots
+
+
+def encode_mapper(mapper: BaseMapper) -> bytes:
+    """Encode a mapper's table and every ``*_to_*`` mapping as a flat buffer."""
+    table = mapper.mapping_metadata
+    string_ids: Dict[str, int] = {}
+    sections: Dict[str, bytes] = {}
+    for column in table.columns:
+        column_ids = [string_ids.setdefault(s, len(string_ids)) for s in table[column]]
+        sections[f"table.{column}"] = array("I", column_ids).tobytes()
+
+    encoded_strings = [s.encode("utf-8") for s in string_ids]
+    offsets = array("Q", [0])
+    offsets.extend(accumulate(len(s) for s in encoded_strings))
+    sections["string_offsets"] = offsets.tobytes()
+    sections["strings"] = b"".join(encoded_strings)
+
+    index_meta: Dict[str, Dict[str, Any]] = {}
+    for name, index in mapper.materialize_all().items():
+        multi_valued = mapper._index_specs[name].multi_valued
+        keys = list(index)
+        key_ids = [string_ids[key] for key in keys]
+        sections[f"{name}.slots"] = _build_hash_table(
+            [encoded_strings[i] for i in key_ids]
+        ).tobytes()
+        sections[f"{name}.keys"] = array("I", key_ids).tobytes()
+        if multi_valued:
+            values = [sorted(index[key]) for key in keys]
+            value_offsets = array("I", [0])
+            value_offsets.extend(accumulate(len(v) for v in values))
+            sections[f"{name}.value_offsets"] = value_offsets.tobytes()
+            value_ids = [string_ids[v] for vs in values for v in vs]
+        else:
+            value_ids = [string_ids[cast(str, index[key])] for key in keys]
+        sections[f"{name}.values"] = array("I", value_ids).tobytes()
+        index_meta[name] = {"multi_valued": multi_valued}
+
+    layout: Dict[str, Tuple[int, int]] = {}
+    position = 0
+    for section_name, data in sections.items():
+        layout[section_name] = (position, len(data))
+        position += len(data) + _pad(len(data))
+
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "mapper": type(mapper).__name__,
+            "payload_hash": mapper.payload_hash,
+            "columns": list(table.columns),
+            "num_rows": len(table),
+            "indexes": index_meta,
+            "sections": layout,
+        }
+    ).encode("utf-8")
+    header += b" " * _pad(len(MAGIC) + _HEADER_LENGTH.size + len(header))
+
+    parts = [MAGIC, _HEADER_LENGTH.pack(len(header)), header]
+    for data in sections.values():
+        parts += [data, b"\0" * _pad(len(data))]
+    return b"".join(parts)
+
+
+class SharedMapper:
+    """Read-only mapper attached to a table and mappings published in shared
+    memory with :meth:`publish`. Mappings are available as attributes with
+    the same names as the mapper properties, and :class:`SharedMapper`
+    objects attach to the same shared memory when pickled to other
+    processes.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Attach to the mapper published in the shared memory block ``name``."""
+        self._shm = _attach(name)
+        self._owner = False
+        try:
+            self._load(cast(memoryview, self._shm.buf))
+        except ValueError:
+            self._shm.close()
+            raise
+
+    def _load(self, buf: memoryview) -> None:
+        magic_size = len(MAGIC)
+        if bytes(buf[:magic_size]) != MAGIC:
+            raise ValueError(f"Not a shared mapper: {self.name}")
+        (header_size,) = _HEADER_LENGTH.unpack_from(buf, magic_size)
+        data_start = magic_size + _HEADER_LENGTH.size + header_size
+        header = json.loads(bytes(buf[magic_size + _HEADER_LENGTH.size : data_start]))
+        if header["version"] != VERSION:
+            raise ValueError(
+                f"Unsupported shared mapper version {header['version']} "
+                f"(expected {VERSION})"
+            )
+        self.mapper_type: str = header["mapper"]
+        self.payload_hash: str = header["payload_hash"]
+        self.columns: List[str] = header["columns"]
+        self.num_rows: int = header["num_rows"]
+
+        # Views into the buffer, released before detaching from it
+        self._views: List[memoryview] = []
+
+        def section(name: str, format: Optional[str] = "I") -> memoryview:
+            offset, size = header["sections"][name]
+            view = buf[data_start + offset : data_start + offset + size]
+            self._views.append(view)
+            if format is not None:
+                view = view.cast(format)  # type: ignore[call-overload]
+                self._views.append(view)
+            return view
+
+        # Views of the table columns, created once so that copying the table
+        # does not pin new views of the buffer
+        self._table_columns = {
+            column: section(f"table.{column}") for column in self.columns
+        }
+        self._pool = _StringPool(
+            section("strings", None), section("string_offsets", "Q")
+        )
+        self.indexes: Dict[str, SharedIndex] = {
+            name: SharedIndex(
+                self._pool,
+                section(f"{name}.slots", "i"),
+                section(f"{name}.keys"),
+                section(f"{name}.values"),
+                section(f"{name}.value_offsets") if meta["multi_valued"] else None,
+            )
+            for name, meta in header["indexes"].items()
+        }
+
+    @classmethod
+    def publish(cls, mapper: BaseMapper, name: Optional[str] = None) -> "SharedMapper":
+        """Build every mapping of ``mapper`` and publish them, along with its
+        table, into a new shared memory block. The returned object owns the
+        block and must :meth:`unlink` it once workers are done with it.
+        """
+        data = encode_mapper(mapper)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        buf = cast(memoryview, shm.buf)
+        buf[: len(data)] = data
+        shared_mapper = cls.__new__(cls)
+        shared_mapper._shm = shm
+        shared_mapper._owner = True
+        shared_mapper._load(buf)
+        return shared_mapper
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        """Size of the shared memory block in bytes."""
+        return self._shm.size
+
+    def __getattr__(self, name: str) -> SharedIndex:
+        indexes = self.__dict__.get("indexes", {})
+        if name in indexes:
+            return indexes[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute {name}")
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        return (SharedMapper, (self.name,))
+
+    @property
+    def raw_dataframe(self) -> pd.DataFrame:
+        """Copy the table out of shared memory into a pandas dataframe."""
+        pool = self._pool
+        return pd.DataFrame(
+            {
+                column: [pool.get(i) for i in string_ids]
+                for column, string_ids in self._table_columns.items()
+            },
+            columns=self.columns,
+        )
+
+    def close(self) -> None:
+        """Detach from the shared memory block. Mappings can no longer be
+        used afterwards."""
+        self.indexes = {}
+        self._table_columns = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Detach from and destroy the shared memory block. Only the
+        publisher should call this."""
+        self.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedMapper":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
@@ -0,0 +1,208 @@
+"""Compile a mapper's mapping metadata and ``*_to_*`` mappings into a single
+versioned binary snapshot that restores a usable mapper in milliseconds,
+e.g. on cold starts.
+
+A snapshot holds the compact columnar state that mappers are pickled with:
+every distinct string is stored once (marshaled), and table columns,
+mapping keys, and mapping values are arrays of string codes read without
+copying. The mapping metadata and each mapping are decoded on first access.
+The whole snapshot is checked against a CRC-32 checksum when it is read.
+
+Usage::
+
+    >>> from sec_cik_mapper import StockMapper
+    >>> StockMapper().save_snapshot("stocks.snapshot")
+    >>> stock_mapper = StockMapper.load_snapshot("stocks.snapshot")
+    >>> stock_mapper.ticker_to_cik["AAPL"]
+    '0000320193'
+
+    $ sec-cik-mapper snapshot stocks.snapshot --kind stocks
+"""
+
+import logging
+import marshal
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from .BaseMapper import _STATE_VERSION, BaseMapper, MapperType
+from .transports import BaseTransport, RequestsTransport
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SECCIKSN"
+VERSION = 1
+
+# Magic, snapshot and mapper state versions, Python major and minor versions
+# and marshal version (marshaled data is only read by the same versions),
+# CRC-32 of the body, and sizes of the marshaled header and strings in the body
+_PREAMBLE = struct.Struct("<8sHHBBBxIQQ")
+_ALIGNMENT = 8
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is corrupted or holds another type of mapper."""
+
+
+class SnapshotVersionError(SnapshotError):
+    """Raised when a snapshot was written by another version of the snapshot
+    format, Python, or marshal."""
+
+
+def _pad(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGNMENT)
+
+
+def _get_versions() -> Tuple[int, ...]:
+    major, minor = sys.version_info[:2]
+    return VERSION, _STATE_VERSION, major, minor, marshal.version
+
+
+def dumps_snapshot(mapper: BaseMapper, indexes: bool = True) -> bytes:
+    """Get a snapshot of a mapper's mapping metadata and, with ``indexes``,
+    of every mapping, building the mappings first."""
+    pickle_indexes = mapper.pickle_indexes
+    try:
+        mapper.pickle_indexes = indexes
+        if indexes:
+            mapper.materialize_all()
+        state = mapper.__getstate__()
+    finally:
+        mapper.pickle_indexes = pickle_indexes
+    codes = state["codes"]
+    encoded_indexes = {
+        name: (
+            num_keys,
+            None if counts is None else (counts.dtype.str, counts.tobytes()),
+        )
+        for name, (num_keys, counts) in state["indexes"].items()
+    }
+    header = marshal.dumps(
+        {
+            "mapper": type(mapper).__name__,
+            "payload_hash": state["payload_hash"],
+            "columns": state["columns"],
+            "num_rows": state["num_rows"],
+            "indexes": encoded_indexes,
+            "codes_dtype": codes.dtype.str,
+        }
+    )
+    strings = marshal.dumps(state["strings"])
+    # Codes are aligned to be read in place
+    body = b"".join(
+        [header, strings, _pad(_PREAMBLE.size + len(header) + len(strings)), codes]
+    )
+    preamble = _PREAMBLE.pack(
+        MAGIC, *_get_versions(), zlib.crc32(body), len(header), len(strings)
+    )
+    return preamble + body
+
+
+def write_snapshot(
+    mapper: BaseMapper, path: Union[str, Path], indexes: bool = True
+) -> None:
+    """Write a snapshot of a mapper's mapping metadata and, with ``indexes``,
+    of every mapping, building the mappings first. The file is replaced
+    atomically."""
+    data = dumps_snapshot(mapper, indexes)
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def loads_snapshot(
+    mapper_type: Type[MapperType],
+    data: bytes,
+    transport: Optional[BaseTransport] = None,
+    path: Union[str, Path] = "<bytes>",
+) -> MapperType:
+    """Restore a mapper from a snapshot returned by :func:`dumps_snapshot`.
+    The mapping metadata is fetched through ``transport`` if it is dropped
+    and needed again. ``path`` names the snapshot in errors.
+
+    :raises SnapshotVersionError: if the snapshot was written by another
+        version of the snapshot format, Python, or marshal.
+    :raises SnapshotError: if the snapshot is corrupted or holds another type
+        of mapper.
+    """
+    if len(data) < _PREAMBLE.size or data[: len(MAGIC)] != MAGIC:
+        raise SnapshotError(f"Not a mapper snapshot: {path}")
+    _, *versions, checksum, header_size, strings_size = _PREAMBLE.unpack_from(data)
+    if tuple(versions) != _get_versions():
+        raise SnapshotVersionError(
+            f"Snapshot {path} was written by snapshot/state/Python/marshal versions "
+            f"{tuple(versions)} (expected {_get_versions()})"
+        )
+    body = memoryview(data)[_PREAMBLE.size :]
+    if zlib.crc32(body) != checksum:
+        raise SnapshotError(f"Snapshot checksum mismatch: {path}")
+
+    header: Dict[str, Any] = marshal.loads(body[:header_size])
+    if header["mapper"] != mapper_type.__name__:
+        raise SnapshotError(
+            f"Snapshot {path} holds a {header['mapper']}, not a {mapper_type.__name__}"
+        )
+    strings = marshal.loads(body[header_size : header_size + strings_size])
+    codes_start = header_size + strings_size
+    codes_start += len(_pad(_PREAMBLE.size + codes_start))
+    indexes = {
+        name: (
+            num_keys,
+            None if counts is None else np.frombuffer(counts[1], dtype=counts[0]),
+        )
+        for name, (num_keys, counts) in header["indexes"].items()
+    }
+
+    mapper = mapper_type.__new__(mapper_type)
+    mapper.__setstate__(
+        {
+            "version": _STATE_VERSION,
+            "transport": RequestsTransport() if transport is None else transport,
+            "payload_hash": header["payload_hash"],
+            "pickle_indexes": True,
+            "strings": strings,
+            "codes": np.frombuffer(body[codes_start:], dtype=header["codes_dtype"]),
+            "columns": header["columns"],
+            "num_rows": header["num_rows"],
+            "indexes": indexes,
+        }
+    )
+    return mapper
+
+
+def read_snapshot(
+    mapper_type: Type[MapperType],
+    path: Union[str, Path],
+    transport: Optional[BaseTransport] = None,
+) -> MapperType:
+    """Restore a mapper from a snapshot written by :func:`write_snapshot`.
+    The mapping metadata is fetched through ``transport`` if it is dropped
+    and needed again.
+
+    :raises SnapshotVersionError: if the snapshot was written by another
+        version of the snapshot format, Python, or marshal.
+    :raises SnapshotError: if the snapshot is corrupted or holds another type
+        of mapper.
+    """
+    return loads_snapshot(mapper_type, Path(path).read_bytes(), transport, path)
+
+
+def load_snapshot(
+    mapper_type: Type[MapperType],
+    path: Union[str, Path],
+    transport: Optional[BaseTransport] = None,
+) -> MapperType:
+    """Restore a mapper from a snapshot, falling back to building it from the
+    SEC data (through ``transport``) if the snapshot was written by another
+    version of the snapshot format, Python, or marshal."""
+    try:
+        return read_snapshot(mapper_type, path, transport)
+    except SnapshotVersionError as e:
+        logger.warning("%s, building the mapper from SEC data instead", e)
+        return mapper_type(transport=transport)
@@ -0,0 +1,199 @@
+"""Provides read-only replacements for the ``*_to_*`` mappings that store
+their keys in one sorted NumPy array of fixed-width byte strings.
+
+A :class:`SortedArrayMapping` looks keys up with a binary search
+(``searchsorted``) over the key array, for one key at a time or for a whole
+batch of keys at once with :meth:`SortedArrayMapping.get_many`. Values are
+stored as an array of codes into the distinct values, grouped by key
+with offsets for mappings from keys to sets of values, so the mapping holds
+no Python object per key.
+"""
+
+import sys
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+
+from .compact import Column
+
+
+def _encode(strings: Sequence[str]) -> np.ndarray:
+    """Encode strings as an array of fixed-width byte strings, as ASCII where
+    possible and as UTF-8 otherwise."""
+    try:
+        return np.array(strings, dtype=np.bytes_)
+    except UnicodeEncodeError:
+        return np.array([string.encode() for string in strings], dtype=np.bytes_)
+
+
+def _factorize_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Factorize keys into codes of positions in a sorted array of the
+    distinct keys encoded as fixed-width byte strings."""
+    codes, unique_keys = pd.factorize(keys)
+    encoded = _encode(unique_keys.tolist())
+    # Keys that are already sorted, like the CIKs of the mapping metadata,
+    # are not sorted again
+    if bool((encoded[1:] >= encoded[:-1]).all()):
+        return codes, encoded
+    order = encoded.argsort(kind="stable")
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return ranks[codes], encoded[order]
+
+
+class SortedArrayMapping(Mapping[str, Any]):
+    """A :class:`SortedArrayMapping` object, a read-only mapping from keys in
+    a sorted fixed-width byte array to values or sets of values. Like the
+    mappings, blank keys and values are ignored, and single-valued mappings
+    get the value of the last row of each key. Keys are iterated in sorted
+    order, and multi-valued mappings return a new set of values on each
+    lookup.
+
+    Usage::
+
+        >>> from sec_cik_mapper.sorted_arrays import SortedArrayMapping
+        >>> ciks = ["0000320193", "0001067983", "0001067983"]
+        >>> tickers = ["AAPL", "BRK-A", "BRK-B"]
+        >>> mapping = SortedArrayMapping.from_columns(tickers, ciks, multi_valued=False)
+        >>> mapping["BRK-B"]
+        '0001067983'
+        >>> mapping.get_many(["AAPL", "MSFT", "BRK-A"])
+        ['0000320193', None, '0001067983']
+    """
+
+    def __init__(
+        self,
+        keys: np.ndarray,
+        values: Sequence[str],
+        codes: np.ndarray,
+        offsets: Optional[np.ndarray] = None,
+    ) -> None:
+        """Constructor for the :class:`SortedArrayMapping` class. ``keys``
+        must be a sorted array of distinct byte strings. Without ``offsets``,
+        the value of ``keys[i]`` is ``values[codes[i]]``. With ``offsets``,
+        the values of ``keys[i]`` are ``values`` at the codes of
+        ``codes[offsets[i]:offsets[i + 1]]``."""
+        self._keys = keys
+        self._values = list(values)
+        self._codes = codes
+        self._offsets = offsets
+
+    @classmethod
+    def from_columns(
+        cls, keys: Column, values: Column, multi_valued: bool
+    ) -> "SortedArrayMapping":
+        """Build a mapping from each key of ``keys`` to the last value (or
+        the set of values if ``multi_valued``) of ``values`` in the same
+        rows, ignoring blank or missing keys and values."""
+        keys = np.asarray(keys, dtype=object)
+        values = np.asarray(values, dtype=object)
+        present = keys.astype(bool) & values.astype(bool)
+        key_codes, encoded_keys = _factorize_keys(keys[present])
+        value_codes, unique_values = pd.factorize(values[present])
+        offsets = None
+        if multi_valued:
+            # Distinct pairs of codes, sorted by key
+            num_values = max(len(unique_values), 1)
+            pairs = np.unique(key_codes * num_values + value_codes)
+            key_codes, value_codes = np.divmod(pairs, num_values)
+            offsets = key_codes.searchsorted(np.arange(len(encoded_keys) + 1))
+            offsets = offsets.astype(np.min_scalar_type(len(value_codes)))
+        else:
+            # Value of the last row of each key
+            _, first_from_end = np.unique(key_codes[::-1], return_index=True)
+            value_codes = value_codes[len(key_codes) - 1 - first_from_end]
+        return cls(
+            encoded_keys,
+            unique_values.tolist(),
+            value_codes.astype(np.min_scalar_type(len(unique_values))),
+            offsets,
+        )
+
+    def _find(self, key: object) -> int:
+        """Get the position of a key, or -1 if it is missing."""
+        if not isinstance(key, str):
+            return -1
+        encoded = key.encode()
+        position = int(self._keys.searchsorted(encoded))
+        found = position < len(self._keys) and self._keys[position] == encoded
+        return position if found else -1
+
+    def find_many(self, keys: Iterable[str]) -> np.ndarray:
+        """Get the positions of several keys with a single vectorized binary
+        search, with -1 for missing keys."""
+        encoded = _encode(list(keys))
+        if not len(self._keys):
+            return np.full(len(encoded), -1, dtype=np.intp)
+        positions = self._keys.searchsorted(encoded)
+        found = self._keys.take(positions, mode="clip") == encoded
+        return np.where(found, positions, -1)
+
+    def _value_at(self, position: int) -> Any:
+        """Get the value or set of values at the position of a key."""
+        values = self._values
+        if self._offsets is None:
+            return values[self._codes[position]]
+        start, stop = self._offsets[position : position + 2].tolist()
+        result: Set[str] = {values[code] for code in self._codes[start:stop].tolist()}
+        return result
+
+    def get_many(self, keys: Iterable[str], default: Any = None) -> List[Any]:
+        """Get the values of several keys, in order, with ``default`` for
+        missing keys. Keys are looked up with a single vectorized binary
+        search.
+
+        Usage::
+
+            >>> from sec_cik_mapper.sorted_arrays import SortedArrayMapping
+            >>> mapping = SortedArrayMapping.from_columns(
+            ...     ["0000320193", "0001067983"], ["AAPL", "BRK-B"], multi_valued=True
+            ... )
+            >>> mapping.get_many(["0001067983", "0000000000"], default=set())
+            [{'BRK-B'}, set()]
+        """
+        value_at = self._value_at
+        positions = self.find_many(keys).tolist()
+        return [
+            value_at(position) if position >= 0 else default for position in positions
+        ]
+
+    def __getitem__(self, key: str) -> Any:
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+        return self._value_at(position)
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (key.decode() for key in self._keys.tolist())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __sizeof__(self) -> int:
+        """Get the memory used by the mapping and its arrays, excluding the
+        strings of the values."""
+        offsets = 0 if self._offsets is None else self._offsets.nbytes
+        return (
+            object.__sizeof__(self)
+            + self._keys.nbytes
+            + sys.getsizeof(self._values)
+            + self._codes.nbytes
+            + offsets
+        )
@@ -0,0 +1,299 @@
+"""Generate synthetic SEC mapping payloads of any size for offline scale
+testing. Payloads follow the format and rough distributions of
+``company_tickers_exchange.json`` and ``company_tickers_mf.json``: most
+companies have a single ticker while some have several share classes,
+warrants, or units, and mutual fund trusts hold many series with several
+share classes each.
+
+Usage::
+
+    $ python -m sec_cik_mapper.synthetic --kind stocks --rows 1000000 --output-dir sec_data
+
+    >>> from sec_cik_mapper import StockMapper
+    >>> from sec_cik_mapper.synthetic import generate_stock_payload
+    >>> from sec_cik_mapper.transports import InMemoryTransport
+    >>> transport = InMemoryTransport(
+    ...     {"company_tickers_exchange.json": generate_stock_payload(1_000_000)}
+    ... )
+    >>> stock_mapper = StockMapper(transport=transport)
+"""
+
+import argparse
+import io
+import json
+import random
+import string
+import zipfile
+from itertools import groupby
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .types import SECPayload
+
+_LETTERS = string.ascii_uppercase
+
+# Relative frequencies observed in the SEC stock data
+_EXCHANGES: Sequence[Tuple[Optional[str], float]] = [
+    ("Nasdaq", 0.40),
+    ("NYSE", 0.30),
+    ("OTC", 0.275),
+    ("CBOE", 0.01),
+    (None, 0.015),
+]
+# Number of tickers per stock CIK
+_TICKERS_PER_CIK: Sequence[Tuple[int, float]] = [
+    (1, 0.83),
+    (2, 0.12),
+    (3, 0.03),
+    (4, 0.01),
+    (5, 0.01),
+]
+_EXTRA_TICKER_SUFFIXES = ["-WT", "-UN", "-A", "-B", "-PA", "-PB", "W", "U", "R"]
+
+_NAME_WORDS = [
+    "American",
+    "Capital",
+    "Global",
+    "Holdings",
+    "Energy",
+    "Financial",
+    "Pacific",
+    "Technologies",
+    "Therapeutics",
+    "Acquisition",
+    "Industries",
+    "Resources",
+    "Partners",
+    "Systems",
+    "Bancorp",
+    "Realty",
+    "Growth",
+    "Income",
+]
+_NAME_SUFFIXES = ["Inc.", "Corp", "Co", "Ltd", "Plc", "LLC", "Trust", "Group"]
+
+# SIC codes and descriptions of the EDGAR submissions, and states of
+# incorporation with their relative frequencies
+_SIC_CODES = [
+    ("2834", "Pharmaceutical Preparations"),
+    ("3571", "Electronic Computers"),
+    ("6022", "State Commercial Banks"),
+    ("6770", "Blank Checks"),
+    ("7372", "Services-Prepackaged Software"),
+]
+_STATES: Sequence[Tuple[str, float]] = [
+    ("DE", 0.6),
+    ("NV", 0.1),
+    ("MD", 0.1),
+    ("E9", 0.1),
+    ("", 0.1),
+]
+_FORMS = ["10-K", "10-Q", "8-K", "4", "S-1", "DEF 14A"]
+
+# Share of mutual fund share classes without a ticker
+_MUTUAL_FUND_BLANK_TICKER_RATE = 0.01
+_MAX_SERIES_PER_CIK = 400
+_MAX_CLASSES_PER_SERIES = 25
+
+
+def _weighted_choices(
+    rng: random.Random, population: Sequence[Tuple[object, float]], k: int
+) -> List:
+    values = [value for value, _ in population]
+    weights = [weight for _, weight in population]
+    return rng.choices(values, weights=weights, k=k)
+
+
+def _unique_codes(rng: random.Random, width: int) -> Iterator[str]:
+    """Generate distinct uppercase codes of a fixed width in a pseudo-random
+    order by striding through every code with a step coprime to the number
+    of codes.
+    """
+    space = len(_LETTERS) ** width
+    step = rng.randrange(1, space)
+    while step % 2 == 0 or step % 13 == 0:
+        step = rng.randrange(1, space)
+    offset = rng.randrange(space)
+    for i in range(space):
+        n = (offset + i * step) % space
+        chars = []
+        for _ in range(width):
+            n, remainder = divmod(n, len(_LETTERS))
+            chars.append(_LETTERS[remainder])
+        yield "".join(chars)
+
+
+def _code_width(num_codes: int, min_width: int) -> int:
+    width = min_width
+    while len(_LETTERS) ** width < num_codes:
+        width += 1
+    return width
+
+
+def _company_name(rng: random.Random) -> str:
+    words = rng.sample(_NAME_WORDS, rng.randint(1, 3))
+    return f"{' '.join(words)} {rng.choice(_NAME_SUFFIXES)}"
+
+
+def generate_stock_payload(num_rows: int, seed: int = 0) -> SECPayload:
+    """Generate a synthetic ``company_tickers_exchange.json`` payload with
+    ``num_rows`` rows, deterministically for a given ``seed``.
+    """
+    rng = random.Random(seed)
+    tickers = _unique_codes(rng, _code_width(num_rows, min_width=4))
+    ticker_counts = iter(_weighted_choices(rng, _TICKERS_PER_CIK, num_rows))
+    exchanges = iter(_weighted_choices(rng, _EXCHANGES, num_rows))
+    data: List[List[Union[int, str, None]]] = []
+    cik = 1750
+    while len(data) < num_rows:
+        cik += rng.randint(1, 150)
+        name = _company_name(rng)
+        exchange = next(exchanges)
+        base_ticker = next(tickers)
+        num_tickers = min(next(ticker_counts), num_rows - len(data))
+        suffixes = rng.sample(_EXTRA_TICKER_SUFFIXES, num_tickers - 1)
+        for ticker in [base_ticker, *(base_ticker + s for s in suffixes)]:
+            data.append([cik, name, ticker, exchange])
+    return {"fields": ["cik", "name", "ticker", "exchange"], "data": data}
+
+
+def generate_mutual_fund_payload(num_rows: int, seed: int = 0) -> SECPayload:
+    """Generate a synthetic ``company_tickers_mf.json`` payload with
+    ``num_rows`` share classes, deterministically for a given ``seed``.
+    """
+    rng = random.Random(seed)
+    tickers = _unique_codes(rng, _code_width(num_rows, min_width=4))
+    data: List[List[Union[int, str]]] = []
+    cik = 2110
+    series_id = 0
+    class_id = 0
+    while len(data) < num_rows:
+        cik += rng.randint(1, 500)
+        # Trusts hold a median of 3 series with a long tail of large fund
+        # families, and series hold 1 to 2 share classes on average
+        num_series = int(3 * rng.paretovariate(1.3)) - 2
+        num_classes = [
+            min(1 + int(rng.expovariate(0.5)), _MAX_CLASSES_PER_SERIES)
+            for _ in range(min(num_series, _MAX_SERIES_PER_CIK))
+        ]
+        for series_num_classes in num_classes:
+            series_id += rng.randint(1, 3)
+            for _ in range(series_num_classes):
+                class_id += rng.randint(1, 3)
+                if rng.random() < _MUTUAL_FUND_BLANK_TICKER_RATE:
+                    ticker = ""
+                else:
+                    ticker = f"{next(tickers)}X"
+                data.append([cik, f"S{series_id:09}", f"C{class_id:09}", ticker])
+                if len(data) == num_rows:
+                    break
+            if len(data) == num_rows:
+                break
+    return {"fields": ["cik", "seriesId", "classId", "symbol"], "data": data}
+
+
+def _generate_submission(
+    rng: random.Random, cik: int, rows: List[List[Union[int, str, None]]]
+) -> Dict[str, object]:
+    """Generate the EDGAR submission of a CIK from its rows of a stock payload,
+    with former names, a SIC code, a state of incorporation, and filings."""
+    num_filings = rng.randint(1, 200)
+    sic, sic_description = rng.choice(_SIC_CODES)
+    return {
+        "cik": str(cik),
+        "name": str(rows[0][1]).upper(),
+        "tickers": [row[2] for row in rows],
+        "exchanges": [row[3] for row in rows],
+        "sic": sic,
+        "sicDescription": sic_description,
+        "stateOfIncorporation": _weighted_choices(rng, _STATES, 1)[0],
+        "formerNames": [
+            {"name": _company_name(rng).upper(), "from": "2001-01-01", "to": ""}
+            for _ in range(int(rng.expovariate(2)))
+        ],
+        "filings": {
+            "recent": {
+                "accessionNumber": [
+                    f"{cik:010}-{rng.randrange(100):02}-{i:06}"
+                    for i in range(num_filings)
+                ],
+                "filingDate": ["2021-01-01"] * num_filings,
+                "form": rng.choices(_FORMS, k=num_filings),
+            },
+            "files": [],
+        },
+    }
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    """Get the header of a compressed member of an archive, with a fixed
+    modification time so that archives are deterministic."""
+    info = zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def generate_submissions_archive(num_companies: int, seed: int = 0) -> bytes:
+    """Generate a synthetic EDGAR ``submissions.zip`` archive with the
+    submissions of ``num_companies`` CIKs, and further pages of filings for
+    some of them, deterministically for a given ``seed``.
+    """
+    rng = random.Random(seed)
+    # Every CIK has at most 5 tickers
+    data = generate_stock_payload(num_companies * 5, seed)["data"]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        companies = groupby(data, key=lambda row: row[0])
+        for _, (cik, rows) in zip(range(num_companies), companies):
+            submission = _generate_submission(rng, cast(int, cik), list(rows))
+            name = f"CIK{cik:010}"
+            archive.writestr(_zip_info(f"{name}.json"), json.dumps(submission))
+            if rng.random() < 0.05:
+                filings = submission["filings"]["recent"]  # type: ignore
+                archive.writestr(
+                    _zip_info(f"{name}-submissions-001.json"), json.dumps(filings)
+                )
+    return buffer.getvalue()
+
+
+PAYLOAD_GENERATORS: Dict[str, Tuple[str, Callable[[int, int], SECPayload]]] = {
+    "stocks": ("company_tickers_exchange.json", generate_stock_payload),
+    "mutual_funds": ("company_tickers_mf.json", generate_mutual_fund_payload),
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point for synthetic payload generation."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sec_cik_mapper.synthetic",
+        description="Generate synthetic SEC mapping payloads.",
+    )
+    parser.add_argument("--kind", choices=list(PAYLOAD_GENERATORS), required=True)
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output-dir",
+        default=".",
+        help="Directory to save the payload to (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+
+    file_name, generate = PAYLOAD_GENERATORS[args.kind]
+    path = Path(args.output_dir) / file_name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(generate(args.rows, args.seed)), encoding="utf-8")
+    print(path, "✓")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,122 @@
+"""Transports for fetching raw SEC mapping data over HTTP, from local files,
+or from memory."""
+
+import gzip
+import io
+import json
+import tempfile
+import time
+from abc import ABCMeta, abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import IO, ClassVar, Dict, Mapping, Union, cast
+from urllib.parse import urlparse
+
+import requests
+
+from .types import SECPayload
+
+
+def _get_file_name(url: str) -> str:
+    """Get the file name of a source URL, e.g. ``company_tickers_mf.json``."""
+    return PurePosixPath(urlparse(url).path).name
+
+
+class BaseTransport(metaclass=ABCMeta):
+    @abstractmethod
+    def fetch(self, url: str) -> bytes:
+        """Fetch the raw payload of a source URL."""
+
+    def open(self, url: str) -> IO[bytes]:
+        """Open the raw payload of a source URL as a seekable binary file, e.g.
+        to read the members of a ZIP archive one at a time. The caller must
+        close it."""
+        return io.BytesIO(self.fetch(url))
+
+
+class RequestsTransport(BaseTransport):
+    """Fetch payloads from the SEC over HTTP. This is the default transport."""
+
+    headers: ClassVar[Dict[str, str]] = {
+        "User-Agent": f"{int(time.time())} {int(time.time())}@gmail.com",
+        "Accept-Encoding": "gzip, deflate",
+        "Host": "www.sec.gov",
+    }
+
+    # Bytes of payloads downloaded by :meth:`open` that are kept in memory
+    # before spilling to a temporary file
+    spool_size: ClassVar[int] = 64 << 20
+
+    def fetch(self, url: str) -> bytes:
+        resp = requests.get(url, headers=RequestsTransport.headers)
+        resp.raise_for_status()
+        return resp.content
+
+    def open(self, url: str) -> IO[bytes]:
+        """Download the payload in chunks to a temporary file, which is kept in
+        memory while it is smaller than ``spool_size`` bytes."""
+        file = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        with requests.get(url, headers=RequestsTransport.headers, stream=True) as resp:
+            resp.raise_for_status()
+            for chunk in resp.iter_content(chunk_size=1 << 20):
+                file.write(chunk)
+        file.seek(0)
+        return cast(IO[bytes], file)
+
+
+class FileTransport(BaseTransport):
+    """Read payloads from a local directory, where each source URL maps to a
+    file with the same name (e.g. ``company_tickers_exchange.json``),
+    optionally gzip compressed with a ``.gz`` extension.
+
+    Usage::
+
+        >>> from sec_cik_mapper import StockMapper
+        >>> from sec_cik_mapper.transports import FileTransport
+        >>> stock_mapper = StockMapper(transport=FileTransport("sec_data"))
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+
+    def fetch(self, url: str) -> bytes:
+        path = self.directory / _get_file_name(url)
+        gzip_path = path.with_name(f"{path.name}.gz")
+        if not path.exists() and gzip_path.exists():
+            with gzip.open(gzip_path, "rb") as f:
+                return f.read()
+        return path.read_bytes()
+
+    def open(self, url: str) -> IO[bytes]:
+        path = self.directory / _get_file_name(url)
+        # Gzip compressed files are not seekable, so they are decompressed in
+        # memory
+        return path.open("rb") if path.exists() else super().open(url)
+
+
+class InMemoryTransport(BaseTransport):
+    """Serve payloads from memory, keyed by source URL or file name. Payloads
+    may be raw bytes or decoded SEC JSON.
+
+    Usage::
+
+        >>> from sec_cik_mapper import StockMapper
+        >>> from sec_cik_mapper.transports import InMemoryTransport
+        >>> payload = {
+        ...     "fields": ["cik", "name", "ticker", "exchange"],
+        ...     "data": [[320193, "Apple Inc.", "AAPL", "Nasdaq"]],
+        ... }
+        >>> transport = InMemoryTransport({"company_tickers_exchange.json": payload})
+        >>> StockMapper(transport=transport).ticker_to_cik
+        {'AAPL': '0000320193'}
+    """
+
+    def __init__(self, payloads: Mapping[str, Union[bytes, SECPayload]]) -> None:
+        self.payloads: Dict[str, bytes] = {
+            key: payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+            for key, payload in payloads.items()
+        }
+
+    def fetch(self, url: str) -> bytes:
+        if url in self.payloads:
+            return self.payloads[url]
+        return self.payloads[_get_file_name(url)]
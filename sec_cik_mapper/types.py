@@ -1,5 +1,19 @@
-from typing import Dict, List, Set, TypeVar, Union
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
 
+import numpy as np
 from typing_extensions import Literal, TypedDict
 
 
@@ -17,16 +31,117 @@ class MutualFundFieldIndices(TypedDict):
     classId: int
 
 
-FieldIndices = Union[StockFieldIndices, MutualFundFieldIndices]
+class SubmissionFieldIndices(TypedDict):
+    cik: int
+    name: int
+    ticker: int
+    exchange: int
+    sic: int
+    sicDescription: int
+    stateOfIncorporation: int
+    formerName: int
+
+
+FieldIndices = Union[StockFieldIndices, MutualFundFieldIndices, SubmissionFieldIndices]
 
 StockFields = Literal["cik", "name", "ticker", "exchange"]
 
 MutualFundFields = Literal["cik", "seriesId", "classId", "symbol"]
 
-Fields = Union[StockFields, MutualFundFields]
+SubmissionFields = Literal[
+    "cik",
+    "name",
+    "ticker",
+    "exchange",
+    "sic",
+    "sicDescription",
+    "stateOfIncorporation",
+    "formerName",
+]
+
+Fields = Union[StockFields, MutualFundFields, SubmissionFields]
+
+MetadataFormat = Literal[
+    "csv",
+    "csv.gz",
+    "csv.xz",
+    "ndjson",
+    "ndjson.gz",
+    "ndjson.xz",
+    "parquet",
+    "feather",
+]
+
+DataFrameBackend = Literal["pandas", "arrow", "polars"]
+
+# Mappings built ahead of their first lookup: none, all, or the given names
+WarmUp = Union[Literal["none", "all"], Iterable[str]]
 
 CompanyData = List[List[Union[int, str]]]
 
+# Decoded SEC JSON with "fields" (column names) and "data" (rows)
+SECPayload = Dict[str, Any]
+
 KeyToValueSet = Dict[str, Set[str]]
 
+# Read-only mapping from keys to sets of values, e.g. a compact mapping
+SetMapping = Mapping[str, AbstractSet[str]]
+
+Index = Union[Dict[str, str], KeyToValueSet, SetMapping, Mapping[str, Any]]
+
+
+class IndexSpec(NamedTuple):
+    key: str
+    value: str
+    multi_valued: bool
+
+
+class PhaseStats(NamedTuple):
+    phase: str
+    # Wall time in seconds
+    wall_time: float
+    # Rows or mapping entries produced by the phase, if applicable
+    rows: Optional[int]
+    # Bytes downloaded by the phase, if applicable
+    size: Optional[int]
+    # Peak bytes allocated during the phase, if memory tracing is enabled
+    peak_memory: Optional[int]
+
+
+PhaseHook = Callable[[PhaseStats], None]
+
+
+class MemoryUsage(TypedDict):
+    # Bytes used by each column of the mapping metadata and by its index
+    table: Dict[str, int]
+    # Bytes used by each built mapping, including its strings if deep
+    indexes: Dict[str, int]
+    # Bytes of distinct strings referenced by more than one mapping
+    shared_strings: int
+    # Bytes of distinct strings referenced by a single mapping
+    unique_strings: int
+    # Total bytes, counting each distinct string once
+    total: int
+
+
+class ArtifactRecord(TypedDict):
+    input_hash: str
+    sha256: str
+    size: int
+
+
+class ManifestEntry(TypedDict):
+    payload_hash: str
+    # Rows of the mapping metadata, to validate the SEC data of the next run
+    rows: int
+    artifacts: Dict[str, ArtifactRecord]
+
+
 T = TypeVar("T")
+
+
+class FundParents(NamedTuple):
+    # Series ID of each class ID, or None if the class ID is unknown
+    series_ids: np.ndarray
+    # CIK of each class ID, or None if the class ID is unknown
+    ciks: np.ndarray
@@ -1,8 +1,21 @@
-from functools import lru_cache
-from typing import Callable
+from functools import wraps
+from typing import Any, Callable
 
 from .types import T
 
 
 def with_cache(func: Callable[..., T]) -> T:
-    return lru_cache()(func)  # type: ignore
+    """Cache the value of a property per instance, in the instance's
+    ``_property_cache`` dict, which is cleared along with the state the
+    value was derived from."""
+    name = func.__name__
+
+    @wraps(func)
+    def cached(self: Any) -> Any:
+        try:
+            return self._property_cache[name]
+        except KeyError:
+            value = self._property_cache[name] = func(self)
+            return value
+
+    return cached  # type: ignore
@@ -0,0 +1,268 @@
+"""Validate the mapping metadata fetched from the SEC before it is accepted.
+
+A truncated or otherwise malformed SEC payload can still decode into a
+smaller or garbled table, so mappers check the mapping metadata they fetch
+with their ``validator`` (a :class:`MetadataValidator` by default) and raise
+:class:`ValidationError` instead of building mappings from it. Checks are
+column-wise, with vectorized pandas string operations:
+
+- ``fields``: the SEC payload has every field read by the retriever.
+- ``columns``: the table has every column of the mapper's mappings.
+- ``missing_values``: no values of these columns are missing.
+- ``cik_format``: CIKs are 10 digits.
+- ``ticker_format``: tickers are blank, or letters and digits separated by
+  single dashes.
+- ``ticker_conflicts``: no ticker maps to several CIKs.
+- ``row_count``: the table has rows, and fewer than ``max_row_drop`` of the
+  rows of the previous snapshot are gone.
+
+Missing values, malformed CIKs and tickers, and conflicting tickers are
+tolerated up to ``max_invalid_share`` of the rows, and are reported as
+warnings. Every other issue is an error. The snapshot cache, the lookup
+service, and the artifact generator compare the row count of fetched data
+to the previous snapshot, and keep the previous snapshot when the fetched
+data is rejected. Mappers
+compare the row count of mapping metadata dropped with ``drop_raw_table``
+and fetched again to the dropped mapping metadata, and keep the mappings
+built from it when the fetched data is rejected.
+
+Usage::
+
+    >>> from sec_cik_mapper import StockMapper
+    >>> stock_mapper = StockMapper()
+    >>> stock_mapper.validation_report.valid
+    True
+    >>> report = stock_mapper.validate(previous_rows=20000)
+    >>> report.valid, [issue.message for issue in report.issues]
+    (False, ['Rows dropped by 51% from 20000 to 9713, more than 25%'])
+"""
+
+from typing import Any, ClassVar, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import pandas as pd
+from typing_extensions import Literal
+
+from .backends import BaseBackend
+from .types import SECPayload
+
+DEFAULT_MAX_ROW_DROP = 0.25
+DEFAULT_MAX_INVALID_SHARE = 0.001
+
+
+class ValidationIssue(NamedTuple):
+    # Name of the failed check, e.g. "cik_format"
+    check: str
+    message: str
+    # Number of offending rows, values, or tickers, or of rows gone
+    num_invalid: int
+    # A few of the offending values
+    examples: List[str]
+    # Whether the issue rejects the mapping metadata, or is only a warning
+    error: bool
+
+
+class ValidationReport(NamedTuple):
+    # Rows of the validated mapping metadata
+    rows: int
+    # Rows of the previous snapshot the row count was compared to, if any
+    previous_rows: Optional[int]
+    issues: List[ValidationIssue]
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.error]
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Raise :class:`ValidationError` if any issue is an error."""
+        if not self.valid:
+            raise ValidationError(self)
+
+
+class ValidationError(ValueError):
+    """Raised when mapping metadata is rejected by validation. The
+    :class:`ValidationReport` is available as ``report``."""
+
+    def __init__(self, report: ValidationReport) -> None:
+        self.report = report
+        messages = "; ".join(issue.message for issue in report.errors)
+        super().__init__(f"Invalid mapping metadata: {messages}")
+
+
+class MetadataValidator:
+    """A :class:`MetadataValidator` object, which checks mapping metadata
+    before it is accepted. Tables that lost more than ``max_row_drop`` of
+    the rows of the previous snapshot are rejected, as are tables with more
+    than ``max_invalid_share`` of invalid rows.
+
+    Usage::
+
+        >>> from sec_cik_mapper import StockMapper
+        >>> from sec_cik_mapper.validation import MetadataValidator
+        >>> validator = MetadataValidator(max_row_drop=0.1)
+        >>> stock_mapper = StockMapper(validator=validator)
+    """
+
+    # CIKs are zero-padded to 10 digits by the retrievers
+    cik_pattern: ClassVar[str] = r"\d{10}"
+
+    # Tickers are cleaned to letters, digits, and dashes by the retrievers
+    ticker_pattern: ClassVar[str] = r"[A-Z0-9]+(?:-[A-Z0-9]+)*"
+
+    # Number of offending values included in each issue
+    max_examples: ClassVar[int] = 5
+
+    def __init__(
+        self,
+        max_row_drop: float = DEFAULT_MAX_ROW_DROP,
+        max_invalid_share: float = DEFAULT_MAX_INVALID_SHARE,
+    ) -> None:
+        """Constructor for the :class:`MetadataValidator` class."""
+        for name, value in (
+            ("max_row_drop", max_row_drop),
+            ("max_invalid_share", max_invalid_share),
+        ):
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}.")
+        self.max_row_drop = max_row_drop
+        self.max_invalid_share = max_invalid_share
+
+    def check_fields(
+        self, data: SECPayload, expected_fields: Sequence[str]
+    ) -> ValidationReport:
+        """Check that a decoded SEC payload has every expected field, before
+        its rows are transformed."""
+        fields = data.get("fields", [])
+        missing = [field for field in expected_fields if field not in fields]
+        issues = []
+        if missing:
+            message = f"Missing fields: {', '.join(missing)}"
+            issues.append(
+                ValidationIssue("fields", message, len(missing), missing, True)
+            )
+        return ValidationReport(len(data.get("data", [])), None, issues)
+
+    def _check_rows(
+        self, check: str, label: str, invalid: pd.Series, column: pd.Series
+    ) -> List[ValidationIssue]:
+        """Report the values of the invalid rows of a column, if any."""
+        count = int(invalid.sum())
+        if not count:
+            return []
+        message = f"{label} in {count} of {len(column)} rows"
+        examples = column[invalid].head(self.max_examples).astype(str).tolist()
+        return [self._tolerate(check, message, count, examples, len(column))]
+
+    def _tolerate(
+        self, check: str, message: str, count: int, examples: List[str], rows: int
+    ) -> ValidationIssue:
+        """Report ``count`` invalid rows (or values), as an error if they are
+        more than ``max_invalid_share`` of the rows."""
+        error = count > self.max_invalid_share * rows
+        return ValidationIssue(check, message, count, examples, error)
+
+    def _check_tickers(
+        self, tickers: pd.Series, ciks: pd.Series
+    ) -> List[ValidationIssue]:
+        """Check the format of tickers, and that no ticker maps to several
+        CIKs."""
+        blank = tickers.isna() | (tickers == "")
+        issues = self._check_rows(
+            "ticker_format",
+            "Malformed tickers",
+            ~(blank | tickers.str.fullmatch(self.ticker_pattern, na=False)),
+            tickers,
+        )
+        # Only tickers on several rows can conflict, and they are rare
+        num_blank = int(blank.sum())
+        if tickers.nunique() - (num_blank > 0) == len(tickers) - num_blank:
+            return issues
+        duplicated = ~blank & tickers.duplicated(keep=False)
+        pairs = pd.DataFrame(
+            {"Ticker": tickers[duplicated], "CIK": ciks[duplicated]}
+        ).drop_duplicates()
+        conflicts = pairs.loc[pairs["Ticker"].duplicated(), "Ticker"].unique()
+        if len(conflicts):
+            issues.append(
+                self._tolerate(
+                    "ticker_conflicts",
+                    f"Tickers mapped to several CIKs: {len(conflicts)}",
+                    len(conflicts),
+                    [str(ticker) for ticker in conflicts[: self.max_examples]],
+                    len(tickers),
+                )
+            )
+        return issues
+
+    def validate(
+        self,
+        table: Any,
+        backend: BaseBackend,
+        columns: Iterable[str],
+        previous_rows: Optional[int] = None,
+    ) -> ValidationReport:
+        """Check a table of mapping metadata of a backend that should have
+        the given ``columns``, comparing its row count to ``previous_rows``,
+        e.g. of the previous snapshot."""
+        rows = len(table)
+        issues: List[ValidationIssue] = []
+        table_columns = set(backend.column_names(table))
+        columns = list(columns)
+        missing_columns = [column for column in columns if column not in table_columns]
+        if missing_columns:
+            message = f"Missing columns: {', '.join(missing_columns)}"
+            issues.append(
+                ValidationIssue(
+                    "columns", message, len(missing_columns), missing_columns, True
+                )
+            )
+
+        if not rows:
+            issues.append(ValidationIssue("row_count", "No rows", 0, [], True))
+            return ValidationReport(rows, previous_rows, issues)
+        if previous_rows and rows < previous_rows * (1 - self.max_row_drop):
+            drop = 1 - rows / previous_rows
+            message = (
+                f"Rows dropped by {drop:.0%} from {previous_rows} to {rows}, "
+                f"more than {self.max_row_drop:.0%}"
+            )
+            issues.append(
+                ValidationIssue("row_count", message, previous_rows - rows, [], True)
+            )
+
+        series = {
+            column: backend.column(table, column)
+            for column in columns
+            if column in table_columns
+        }
+        missing_values = {
+            column: int(values.isna().sum()) for column, values in series.items()
+        }
+        count = sum(missing_values.values())
+        if count:
+            examples = [column for column, num in missing_values.items() if num]
+            message = f"Missing values: {count} in {', '.join(examples)}"
+            issues.append(
+                self._tolerate("missing_values", message, count, examples, rows)
+            )
+
+        ciks = series.get("CIK")
+        if ciks is not None:
+            issues += self._check_rows(
+                "cik_format",
+                "Malformed CIKs",
+                ~ciks.str.fullmatch(self.cik_pattern, na=False),
+                ciks,
+            )
+            tickers = series.get("Ticker")
+            if tickers is not None:
+                issues += self._check_tickers(tickers, ciks)
+        return ValidationReport(rows, previous_rows, issues)
+
+
+# Validator of a mapper: the class's ``validator`` by default, another
+# validator, or ``None`` to skip validation
+ValidatorOption = Union[MetadataValidator, None, Literal["default"]]
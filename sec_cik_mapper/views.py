@@ -0,0 +1,152 @@
+"""Provides lazy read-only views of the ``*_to_*`` mappings over the columns
+of the mapping metadata.
+
+A :class:`KeyIndex` is a single hash index from the distinct keys of a
+column to the rows holding them, grouped by key. A :class:`MappingView`
+answers lookups for one value column through the :class:`KeyIndex` of its
+key column, so mappings that share a key column (e.g. ``cik_to_tickers``
+and ``cik_to_exchange``) share one index instead of each copying the
+columns into a dict of their own.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, Set, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _reduce_groups(
+    ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray
+) -> np.ndarray:
+    """Reduce the groups of values starting at each of ``starts``. Groups are
+    not empty, so ``values`` is only empty when there are no groups."""
+    return ufunc.reduceat(values, starts) if len(values) else np.empty(0, np.intp)
+
+
+class KeyIndex:
+    """A :class:`KeyIndex` object, a hash index from the distinct non-blank
+    keys of a column to the rows holding them.
+
+    Usage::
+
+        >>> from sec_cik_mapper.views import KeyIndex
+        >>> index = KeyIndex(["0000320193", "0001067983", "0001067983"])
+        >>> index.rows_of(index.code("0001067983"))
+        array([1, 2])
+    """
+
+    def __init__(self, column: Union[List[Any], np.ndarray, pd.Series]) -> None:
+        """Constructor for the :class:`KeyIndex` class."""
+        codes, keys = pd.factorize(np.asarray(column, dtype=object))
+        #: Distinct keys in order of their first row, coded by position
+        self.keys: List[Any] = keys.tolist()
+        # Blank keys are left out, like in the mappings
+        self._codes: Dict[Any, int] = {
+            key: code for code, key in enumerate(self.keys) if key
+        }
+        present = np.flatnonzero(codes >= 0)
+        #: Rows grouped by key code, in order within each group
+        self.rows: np.ndarray = present[np.argsort(codes[present], kind="stable")]
+        counts = np.bincount(codes[present], minlength=len(self.keys))
+        #: Rows of key code ``i``, from ``offsets[i]`` to ``offsets[i + 1]``
+        self.offsets: np.ndarray = np.concatenate(([0], np.cumsum(counts)))
+
+    def code(self, key: Any) -> int:
+        """Get the code of a key, or -1 if it is missing or blank."""
+        return self._codes.get(key, -1)
+
+    def rows_of(self, code: int) -> np.ndarray:
+        """Get the rows holding the key of a code, in order."""
+        return self.rows[self.offsets[code] : self.offsets[code + 1]]
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self.keys)
+            + sys.getsizeof(self._codes)
+            + self.rows.nbytes
+            + self.offsets.nbytes
+        )
+
+
+class MappingView(Mapping[str, Any]):
+    """A :class:`MappingView` object, a lazy read-only view of a ``*_to_*``
+    mapping from the keys of a :class:`KeyIndex` to the values of a column
+    in the same rows. Like the mappings, blank values are ignored, keys
+    whose values are all blank are left out, and single-valued views get
+    the value of the last row of each key. Multi-valued views return a new
+    set of values on each lookup.
+
+    Usage::
+
+        >>> from sec_cik_mapper.views import KeyIndex, MappingView
+        >>> ciks = ["0000320193", "0001067983", "0001067983"]
+        >>> tickers = ["AAPL", "BRK-A", "BRK-B"]
+        >>> view = MappingView(KeyIndex(ciks), tickers, multi_valued=True)
+        >>> view["0001067983"]
+        {'BRK-A', 'BRK-B'}
+        >>> dict(MappingView(KeyIndex(tickers), ciks, multi_valued=False))
+        {'AAPL': '0000320193', 'BRK-A': '0001067983', 'BRK-B': '0001067983'}
+    """
+
+    def __init__(
+        self, key_index: KeyIndex, values: List[Any], multi_valued: bool
+    ) -> None:
+        """Constructor for the :class:`MappingView` class. ``values`` is the
+        value column, with a value for every row of the key column."""
+        self._key_index = key_index
+        self._values = values
+        self._multi_valued = multi_valued
+
+        # First and last row of each key code with a non-blank value, or -1
+        rows = key_index.rows
+        present = np.array(values, dtype=object).astype(bool)[rows]
+        ranks = np.where(present, np.arange(len(rows)), -1)
+        starts = key_index.offsets[:-1]
+        last = _reduce_groups(np.maximum, ranks, starts)
+        self._last_rows: np.ndarray = np.where(
+            last >= 0, rows.take(last, mode="clip"), -1
+        )
+        first_rows = _reduce_groups(
+            np.minimum, np.where(present, rows, len(values)), starts
+        )
+        # Keys with a non-blank value, in order of their first such row like
+        # the keys of the mappings
+        codes = np.flatnonzero(
+            (self._last_rows >= 0) & np.array(key_index.keys, dtype=object).astype(bool)
+        )
+        self._codes: np.ndarray = codes[np.argsort(first_rows[codes], kind="stable")]
+
+    def __getitem__(self, key: str) -> Any:
+        code = self._key_index.code(key)
+        row = int(self._last_rows[code]) if code >= 0 else -1
+        if row < 0:
+            raise KeyError(key)
+        if not self._multi_valued:
+            return self._values[row]
+        values = self._values
+        rows = self._key_index.rows_of(code).tolist()
+        result: Set[Any] = {values[row] for row in rows}
+        result.discard("")
+        result.discard(None)
+        return result
+
+    def __contains__(self, key: object) -> bool:
+        code = self._key_index.code(key)
+        return code >= 0 and bool(self._last_rows[code] >= 0)
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._key_index.keys
+        return (keys[code] for code in self._codes.tolist())
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __sizeof__(self) -> int:
+        """Get the memory used by the view, excluding its key index and value
+        column, which are shared with other views."""
+        return object.__sizeof__(self) + self._last_rows.nbytes + self._codes.nbytes
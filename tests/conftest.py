@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 import pytest
 
@@ -9,6 +9,28 @@ from sec_cik_mapper import (
     StockMapper,
     StockRetriever,
 )
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+
+
+class CountingTransport(InMemoryTransport):
+    """Transport recording the URLs it fetches."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.fetched: List[str] = []
+
+    @property
+    def num_fetches(self) -> int:
+        return len(self.fetched)
+
+    def fetch(self, url: str) -> bytes:
+        self.fetched.append(url)
+        return super().fetch(url)
 
 
 @pytest.fixture(scope="session")
@@ -59,3 +81,31 @@ def vtsax_mutual_fund() -> Dict[str, str]:
         "seriesId": "S000002848",
         "classId": "C000007806",
     }
+
+
+@pytest.fixture
+def synthetic_stock_transport() -> CountingTransport:
+    return CountingTransport(
+        {"company_tickers_exchange.json": generate_stock_payload(2000)}
+    )
+
+
+@pytest.fixture
+def synthetic_mutual_fund_transport() -> CountingTransport:
+    return CountingTransport(
+        {"company_tickers_mf.json": generate_mutual_fund_payload(2000)}
+    )
+
+
+@pytest.fixture
+def synthetic_stock_mapper(synthetic_stock_transport: CountingTransport) -> StockMapper:
+    return StockMapper(
+        transport=synthetic_stock_transport, instrumentation=Instrumentation()
+    )
+
+
+@pytest.fixture
+def synthetic_mutual_fund_mapper(
+    synthetic_mutual_fund_transport: CountingTransport,
+) -> MutualFundMapper:
+    return MutualFundMapper(transport=synthetic_mutual_fund_transport)
@@ -0,0 +1,70 @@
+import pickle
+
+from sec_cik_mapper import StockMapper
+from sec_cik_mapper.aliases import build_ticker_aliases, normalize_alias, spell_ticker
+from sec_cik_mapper.transports import InMemoryTransport
+
+STOCK_PAYLOAD = {
+    "fields": ["cik", "name", "ticker", "exchange"],
+    "data": [
+        [320193, "Apple Inc.", "AAPL", "Nasdaq"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-B", "NYSE"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-A", "NYSE"],
+        [70858, "Bank Of America Corp", "BAC", "NYSE"],
+        [70858, "Bank Of America Corp", "BAC-PL", "NYSE"],
+        [1829432, "Acropolis Infrastructure Acquisition Corp", "ACRO-WT", "NYSE"],
+        [1829432, "Acropolis Infrastructure Acquisition Corp", "ACRO-UN", "NYSE"],
+    ],
+}
+
+
+def test_spell_ticker():
+    assert spell_ticker("AAPL") == []
+    assert spell_ticker("BRK-B") == ["BRK.B", "BRK/B", "BRK B", "BRK_B", "BRKB"]
+    warrants = spell_ticker("ACRO-WT")
+    assert {"ACRO.WT", "ACRO.WS", "ACRO/WS", "ACRO WS", "ACROW", "ACRO+"} <= set(
+        warrants
+    )
+    assert "ACRO-WT" not in warrants
+    assert {"ACRO.U", "ACRO UN", "ACRO="} <= set(spell_ticker("ACRO-UN"))
+    assert {"XYZ.RT", "XYZ R", "XYZ^"} <= set(spell_ticker("XYZ-RI"))
+    preferred = spell_ticker("BAC-PL")
+    assert {"BAC.PR.L", "BAC PRL", "BAC/PRL", "BAC PR L", "BACPL", "BAC-PRL"} <= set(
+        preferred
+    )
+    assert {"BAC.PR", "BAC PR", "BACP"} <= set(spell_ticker("BAC-P"))
+
+
+def test_build_ticker_aliases():
+    aliases = build_ticker_aliases(["A-BC", "AB-C", "ABD", "AB-D", "BRK-B", ""])
+    # Spellings of several tickers are left out
+    assert "ABC" not in aliases
+    # Actual tickers map to themselves, even if they spell another ticker
+    assert aliases["ABD"] == "ABD"
+    assert aliases["AB.D"] == "AB-D"
+    assert aliases["BRK/B"] == aliases["BRK-B"] == "BRK-B"
+    assert "" not in aliases
+
+
+def test_normalize_alias():
+    assert normalize_alias(" brk.b ") == "BRK.B"
+    # CQS lowercase preferred suffixes
+    assert normalize_alias("BACpL") == "BACPL"
+
+
+def test_canonicalize_tickers():
+    mapper = StockMapper(
+        transport=InMemoryTransport({"company_tickers_exchange.json": STOCK_PAYLOAD})
+    )
+    assert mapper.canonicalize_ticker("brk.b") == "BRK-B"
+    assert mapper.canonicalize_ticker("AAPL") == "AAPL"
+    assert mapper.canonicalize_ticker("UNKNOWN") is None
+    assert mapper.canonicalize_tickers(
+        ["BRK/B", "BRK A", "BACpL", "BAC.PR.L", "ACRO.WS", "ACRO+", "ACRO=", "?"]
+    ) == ["BRK-B", "BRK-A", "BAC-PL", "BAC-PL", "ACRO-WT", "ACRO-WT", "ACRO-UN", None]
+    assert mapper.ticker_aliases is mapper.ticker_aliases
+
+    # Aliases are rebuilt rather than pickled
+    unpickled = pickle.loads(pickle.dumps(mapper))
+    assert unpickled._ticker_aliases is None
+    assert unpickled.ticker_aliases == mapper.ticker_aliases
@@ -0,0 +1,146 @@
+import pickle
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.backends import (
+    ArrowBackend,
+    PandasBackend,
+    PolarsBackend,
+    get_backend,
+)
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+
+BACKEND_TYPES = {"pandas": pd.DataFrame, "arrow": pa.Table, "polars": pl.DataFrame}
+
+STOCK_TRANSPORT = InMemoryTransport(
+    {"company_tickers_exchange.json": generate_stock_payload(2000)}
+)
+
+
+@pytest.mark.parametrize("backend", list(BACKEND_TYPES))
+@pytest.mark.parametrize(
+    "mapper_type, file_name, payload",
+    [
+        (StockMapper, "company_tickers_exchange.json", generate_stock_payload(2000)),
+        (
+            MutualFundMapper,
+            "company_tickers_mf.json",
+            generate_mutual_fund_payload(2000),
+        ),
+    ],
+)
+def test_backends(mapper_type, file_name, payload, backend):
+    transport = InMemoryTransport({file_name: payload})
+    expected_mapper = mapper_type(transport=transport)
+    expected = expected_mapper.materialize_all()
+
+    instrumentation = Instrumentation()
+    mapper = mapper_type(transport, instrumentation, backend=backend)
+    assert mapper.backend.name == backend
+    assert isinstance(mapper.raw_dataframe, BACKEND_TYPES[backend])
+    assert mapper.raw_dataframe is mapper.raw_dataframe
+    assert mapper.mapping_metadata.equals(expected_mapper.mapping_metadata)
+    assert mapper.stats["dataframe"].rows == len(payload["data"])
+
+    for name, index in expected.items():
+        keys = list(index)[:100] + ["?", ""]
+        expected_values = [index.get(key) for key in keys]
+        assert mapper.lookup_many(name, keys) == expected_values
+        assert mapper.lookup_many(name, iter(keys)) == expected_values
+        assert mapper.lookup_many(name, ["?"], default="") == [""]
+        # Lookup tables are built once per mapping
+        assert f"group.{name}" in mapper.stats
+    assert mapper.materialize_all() == expected
+    assert set(mapper.memory_usage()["table"]) >= set(mapper.mapping_metadata.columns)
+
+
+@pytest.mark.parametrize("backend", [ArrowBackend(), PolarsBackend(), PandasBackend()])
+def test_build_index(backend):
+    expected = StockMapper(transport=STOCK_TRANSPORT).materialize_all()
+    table = backend.from_pandas(StockMapper(transport=STOCK_TRANSPORT).raw_dataframe)
+    for name, spec in StockMapper._index_specs.items():
+        assert backend.build_index(table, spec) == expected[name]
+
+
+def test_blank_and_missing_values():
+    df = pd.DataFrame(
+        {
+            "CIK": ["1", "1", "2", "", "3", None],
+            "Ticker": ["A", "B", "", "C", None, "D"],
+        }
+    )
+    spec = StockMapper._index_specs["cik_to_tickers"]
+    for backend in (ArrowBackend(), PolarsBackend()):
+        table = backend.from_pandas(df)
+        assert backend.build_index(table, spec) == {"1": {"A", "B"}}
+        grouped = backend.group(table, spec)
+        assert backend.lookup_many(grouped, ["1", "2"], True, set()) == [
+            {"A", "B"},
+            set(),
+        ]
+
+
+def test_get_backend():
+    backend = ArrowBackend()
+    assert get_backend(backend) is backend
+    assert isinstance(get_backend("polars"), PolarsBackend)
+    with pytest.raises(ValueError, match="Valid backends: pandas, arrow, polars"):
+        get_backend("spark")
+
+
+def test_switch_backend():
+    mapper = StockMapper(transport=STOCK_TRANSPORT, backend="arrow")
+    tickers = mapper.raw_dataframe["Ticker"]
+    # Columns of the backend are looked up without converting them to Python
+    expected = mapper.lookup_many("ticker_to_cik", tickers)
+    assert expected == mapper.raw_dataframe["CIK"].to_pylist()
+    assert mapper.lookup_many("ticker_to_cik", tickers.chunk(0)) == expected
+    mapper.backend = "polars"
+    assert isinstance(mapper.raw_dataframe, pl.DataFrame)
+    tickers = mapper.raw_dataframe["Ticker"]
+    assert mapper.lookup_many("ticker_to_cik", tickers) == expected
+    mapper.drop_raw_table()
+    mapper.backend = "pandas"
+    assert isinstance(mapper.raw_dataframe, pd.DataFrame)
+
+
+def test_replace_mapping_metadata():
+    mapper = StockMapper(transport=STOCK_TRANSPORT, backend="arrow")
+    mapper.lookup_many("ticker_to_cik", ["?"])
+    mapper.mapping_metadata = mapper.mapping_metadata.head(10)
+    assert mapper.memory_usage()["table"]["Index"] > 0
+    assert mapper.raw_dataframe.num_rows == 10
+    assert len(mapper.memory_usage()["table"]) == 4
+    assert mapper.lookup_many("ticker_to_cik", mapper.raw_dataframe["Ticker"]) == (
+        mapper.raw_dataframe["CIK"].to_pylist()
+    )
+
+    # Dropped tables are fetched again in the backend
+    mapper.drop_raw_table()
+    assert mapper.raw_dataframe.num_rows == 2000
+
+
+def test_backend_pickle():
+    mapper = StockMapper(transport=STOCK_TRANSPORT, backend="polars")
+    mapper.lookup_many("cik_to_tickers", ["?"])
+    unpickled = pickle.loads(pickle.dumps(mapper))
+    assert unpickled.backend.name == "polars"
+    assert unpickled.raw_dataframe.equals(mapper.raw_dataframe)
+
+
+def test_lookup_many_unknown_mapping():
+    mapper = StockMapper(transport=STOCK_TRANSPORT)
+    with pytest.raises(ValueError, match="Unknown mapping"):
+        mapper.lookup_many("ticker_to_sic", ["AAPL"])
+    mapper.lookup_many("ticker_to_cik", ["?"])
+    mapper.drop_indexes(["ticker_to_cik"])
+    assert "ticker_to_cik" not in mapper._lookup_tables
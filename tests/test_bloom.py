@@ -0,0 +1,96 @@
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import StockMapper
+from sec_cik_mapper.bloom import BloomFilter
+from sec_cik_mapper.synthetic import generate_stock_payload
+from sec_cik_mapper.transports import InMemoryTransport
+
+KEYS = [f"T{i:05d}" for i in range(20000)]
+UNKNOWN_KEYS = [f"U{i:06d}" for i in range(200000)]
+
+
+@pytest.mark.parametrize("false_positive_rate", [0.1, 0.01, 0.001])
+def test_false_positive_rate(false_positive_rate: float):
+    bloom_filter = BloomFilter(KEYS, false_positive_rate)
+    assert bloom_filter.num_keys == len(KEYS)
+    # No false negatives
+    assert bloom_filter.contains_many(KEYS).all()
+    rate = bloom_filter.contains_many(UNKNOWN_KEYS).mean()
+    assert false_positive_rate * 0.8 < rate < false_positive_rate * 1.2
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(iter(["AAPL", "MSFT", "AAPL"]), 0.001)
+    assert bloom_filter.num_keys == 2
+    assert "AAPL" in bloom_filter
+    assert "GOOG" not in bloom_filter
+    keys = ["MSFT", "GOOG", "AAPL"]
+    expected = [True, False, True]
+    assert bloom_filter.contains_many(keys).tolist() == expected
+    assert bloom_filter.contains_many(np.array(keys, dtype=object)).tolist() == expected
+    assert bloom_filter.contains_many(pd.Series(keys)).tolist() == expected
+    assert bloom_filter.contains_many([]).tolist() == []
+    assert repr(bloom_filter).startswith("BloomFilter(num_keys=2, num_bits=")
+    assert sys.getsizeof(bloom_filter) > bloom_filter.num_bits // 8
+
+    unpickled = pickle.loads(pickle.dumps(bloom_filter))
+    assert unpickled.contains_many(keys).tolist() == expected
+
+    empty = BloomFilter([])
+    assert empty.num_keys == 0
+    assert "AAPL" not in empty
+
+
+@pytest.mark.parametrize("false_positive_rate", [0, 1, -0.5, 1.5])
+def test_invalid_false_positive_rate(false_positive_rate: float):
+    with pytest.raises(ValueError, match="False positive rate"):
+        BloomFilter(KEYS, false_positive_rate)
+
+
+def test_mapper_membership_filter():
+    transport = InMemoryTransport(
+        {"company_tickers_exchange.json": generate_stock_payload(2000)}
+    )
+    mapper = StockMapper(transport=transport)
+    mapper.membership_false_positive_rate = 0.001
+    tickers = list(mapper.ticker_to_cik)
+    ciks = list(mapper.cik_to_tickers)
+    assert mapper.contains_many(tickers + ciks).all()
+    assert mapper.contains_many(["", "ESZ4", "EURUSD"]).sum() == 0
+    membership_filter = mapper.membership_filter
+    assert membership_filter is mapper.membership_filter
+    assert membership_filter.num_keys == len(set(tickers) | set(ciks))
+    assert membership_filter.false_positive_rate == 0.001
+
+    # The filter is rebuilt when the mapping metadata is replaced
+    mapper.mapping_metadata = mapper.mapping_metadata.iloc[:10]
+    assert mapper.membership_filter is not membership_filter
+    assert mapper.membership_filter.num_keys < membership_filter.num_keys
+
+
+def test_replace_mapping_metadata():
+    transport = InMemoryTransport(
+        {"company_tickers_exchange.json": generate_stock_payload(2000)}
+    )
+    mapper = StockMapper(transport=transport)
+    ticker = mapper.raw_dataframe["Ticker"].iloc[0]
+    cik = mapper.ticker_to_cik[ticker]
+    assert mapper.canonicalize_ticker(ticker) == ticker
+    assert mapper.contains_many([ticker]).all()
+    assert mapper.lookup_many("ticker_to_cik", [ticker]) == [cik]
+    assert ticker in mapper.cik_to_tickers[cik]
+
+    # Mappings, aliases, and the filter all agree on the new mapping metadata
+    df = mapper.mapping_metadata
+    mapper.mapping_metadata = df[df["Ticker"] != ticker]
+    assert mapper.payload_hash == ""
+    assert ticker not in mapper.ticker_to_cik
+    assert ticker not in mapper.cik_to_tickers.get(cik, set())
+    assert mapper.canonicalize_ticker(ticker) is None
+    assert not mapper.contains_many([ticker]).any()
+    assert mapper.lookup_many("ticker_to_cik", [ticker]) == [None]
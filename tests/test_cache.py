@@ -0,0 +1,286 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper, snapshot
+from sec_cik_mapper.cache import (
+    DEFAULT_MAX_AGE,
+    DirectorySnapshotStore,
+    InMemorySnapshotStore,
+    LockTimeoutError,
+    SnapshotCache,
+)
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.validation import ValidationError
+
+from .conftest import CountingTransport
+
+
+@pytest.fixture
+def transport() -> CountingTransport:
+    return CountingTransport(
+        {
+            "company_tickers_exchange.json": generate_stock_payload(500),
+            "company_tickers_mf.json": generate_mutual_fund_payload(500),
+        }
+    )
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SnapshotCache:
+    return SnapshotCache(tmp_path / "snapshots", keep=2)
+
+
+def set_stock_payload(transport: CountingTransport, num_rows: int) -> None:
+    transport.payloads["company_tickers_exchange.json"] = CountingTransport(
+        {"payload": generate_stock_payload(num_rows)}
+    ).payloads["payload"]
+
+
+def test_snapshot_cache(cache: SnapshotCache, transport: CountingTransport):
+    mapper = cache.load(StockMapper, transport)
+    assert transport.num_fetches == 1
+    key = cache.snapshot_key(StockMapper, mapper.payload_hash)
+    assert cache.store.exists(key)
+    assert cache.get_index(StockMapper)["payload_hashes"] == [mapper.payload_hash]
+
+    # Fresh snapshots are restored without fetching the SEC data
+    loaded = cache.load(StockMapper, transport)
+    assert transport.num_fetches == 1
+    assert loaded.transport is transport
+    assert loaded._indexes == {} and loaded._encoded_indexes
+    assert loaded.materialize_all() == mapper.materialize_all()
+
+    # Each type of mapper has its own snapshots
+    cache.load(MutualFundMapper, transport)
+    assert transport.num_fetches == 2
+    assert cache.get_index(StockMapper)["payload_hashes"] == [mapper.payload_hash]
+
+
+def test_snapshot_cache_refresh(cache: SnapshotCache, transport: CountingTransport):
+    cache.max_age = 0
+    first = cache.load(StockMapper, transport)
+    # Stale snapshots are refreshed, and unchanged data is not stored again
+    snapshot_path = cache.store.directory / cache.snapshot_key(
+        StockMapper, first.payload_hash
+    )
+    mtime = snapshot_path.stat().st_mtime_ns
+    time.sleep(0.01)
+    assert cache.load(StockMapper, transport).payload_hash == first.payload_hash
+    assert transport.num_fetches == 2
+    assert snapshot_path.stat().st_mtime_ns == mtime
+    assert cache.get_index(StockMapper)["payload_hashes"] == [first.payload_hash]
+
+    # Only the newest snapshots are kept
+    hashes = [first.payload_hash]
+    for num_rows in (600, 700):
+        set_stock_payload(transport, num_rows)
+        hashes.insert(0, cache.load(StockMapper, transport).payload_hash)
+    assert cache.get_index(StockMapper)["payload_hashes"] == hashes[:2]
+    assert not snapshot_path.exists()
+    snapshots = sorted(path.name for path in cache.store.directory.glob("*.snapshot"))
+    assert snapshots == sorted(
+        cache.snapshot_key(StockMapper, payload_hash) for payload_hash in hashes[:2]
+    )
+    assert not list(cache.store.directory.glob(".*.tmp"))
+    assert not list(cache.store.directory.glob("*.lock"))
+
+
+def test_snapshot_cache_rejected_data(
+    cache: SnapshotCache, transport: CountingTransport, caplog
+):
+    cache.max_age = 0
+    first = cache.load(StockMapper, transport)
+    assert cache.get_index(StockMapper)["rows"] == 500
+
+    # Truncated SEC data is not stored, and the newest snapshot is restored
+    set_stock_payload(transport, 100)
+    with caplog.at_level(logging.WARNING, logger="sec_cik_mapper.cache"):
+        assert cache.load(StockMapper, transport).payload_hash == first.payload_hash
+    assert "Rows dropped by 80% from 500 to 100" in caplog.text
+    assert transport.num_fetches == 2
+    assert cache.get_index(StockMapper)["payload_hashes"] == [first.payload_hash]
+
+    # Without a snapshot to restore, rejected SEC data raises
+    transport.payloads["company_tickers_mf.json"] = b'{"fields": [], "data": []}'
+    with pytest.raises(ValidationError, match="Missing fields"):
+        cache.load(MutualFundMapper, transport)
+    assert cache.get_index(MutualFundMapper)["payload_hashes"] == []
+
+
+def test_snapshot_cache_without_indexes(transport: CountingTransport):
+    cache = SnapshotCache(InMemorySnapshotStore(), indexes=False)
+    mapper = cache.load(StockMapper, transport)
+    loaded = cache.load(StockMapper, transport)
+    assert transport.num_fetches == 1
+    assert loaded._encoded_indexes == {}
+    assert loaded.ticker_to_cik == mapper.ticker_to_cik
+
+
+def test_snapshot_cache_invalid_snapshots(
+    cache: SnapshotCache, transport: CountingTransport, monkeypatch, caplog
+):
+    mapper = cache.load(StockMapper, transport)
+    key = cache.snapshot_key(StockMapper, mapper.payload_hash)
+
+    # Corrupted snapshots are deleted and stored again
+    cache.store.put(key, b"corrupted")
+    with caplog.at_level(logging.WARNING, logger="sec_cik_mapper.cache"):
+        assert cache.load(StockMapper, transport).payload_hash == mapper.payload_hash
+    assert "Deleting invalid snapshot" in caplog.text
+    assert transport.num_fetches == 2
+    cache.load(StockMapper, transport)
+    assert transport.num_fetches == 2
+
+    # Snapshots of other versions are stored and pruned separately
+    monkeypatch.setattr(snapshot, "VERSION", snapshot.VERSION + 1)
+    assert cache.snapshot_key(StockMapper, mapper.payload_hash) != key
+    cache.load(StockMapper, transport)
+    assert transport.num_fetches == 3
+    cache.load(StockMapper, transport)
+    assert transport.num_fetches == 3
+    cache.max_age = 0
+    for num_rows in (480, 460):
+        set_stock_payload(transport, num_rows)
+        cache.load(StockMapper, transport)
+    assert transport.num_fetches == 5
+    assert cache.store.exists(key)
+    monkeypatch.undo()
+    cache.max_age = DEFAULT_MAX_AGE
+    assert cache.load(StockMapper, transport).payload_hash == mapper.payload_hash
+    assert transport.num_fetches == 5
+
+
+def test_snapshot_cache_concurrent_loads(
+    cache: SnapshotCache, transport: CountingTransport
+):
+    mappers = []
+    threads = [
+        threading.Thread(
+            target=lambda: mappers.append(cache.load(StockMapper, transport))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Only one thread fetched the SEC data, and the others waited for its snapshot
+    assert transport.num_fetches == 1
+    assert len({mapper.payload_hash for mapper in mappers}) == 1
+
+
+@pytest.mark.parametrize("store_type", [DirectorySnapshotStore, InMemorySnapshotStore])
+def test_snapshot_cache_lock_timeout(
+    store_type, tmp_path: Path, transport: CountingTransport, caplog
+):
+    store = (
+        store_type(tmp_path) if store_type is DirectorySnapshotStore else store_type()
+    )
+    cache = SnapshotCache(store, lock_timeout=0.05)
+    holder_ready, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with store.lock("StockMapper", 1):
+            holder_ready.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    holder_ready.wait(5)
+    try:
+        with pytest.raises(LockTimeoutError):
+            with store.lock("StockMapper", 0):
+                pass
+        # Mappers are built from the SEC data without storing a snapshot
+        with caplog.at_level(logging.WARNING, logger="sec_cik_mapper.cache"):
+            mapper = cache.load(StockMapper, transport)
+        assert "building the mapper from SEC data instead" in caplog.text
+        assert len(mapper.ticker_to_cik) > 0
+        assert cache.get_index(StockMapper)["payload_hashes"] == []
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_directory_store(tmp_path: Path, caplog):
+    store = DirectorySnapshotStore(tmp_path / "store", stale_lock_age=60)
+    assert store.get("missing") is None
+    assert not store.exists("missing")
+    store.delete("missing")
+    store.put("key", b"data")
+    assert store.get("key") == b"data"
+    assert store.exists("key")
+    store.delete("key")
+    assert store.get("key") is None
+
+    # Lock files left behind by crashed processes are removed
+    lock_path = store.directory / "name.lock"
+    lock_path.write_text("1234-crashed")
+    os.utime(lock_path, (time.time() - 120, time.time() - 120))
+    store.poll_interval = 0.01
+    with caplog.at_level(logging.WARNING, logger="sec_cik_mapper.cache"):
+        with store.lock("name", 1):
+            assert lock_path.read_text().startswith(f"{os.getpid()}-")
+    assert "Removed stale lock file" in caplog.text
+    assert not lock_path.exists()
+    assert list(store.directory.iterdir()) == []
+    # Lock files released while checking their age
+    store._break_stale_lock(lock_path)
+
+
+def test_directory_store_lock_token(tmp_path: Path):
+    store = DirectorySnapshotStore(tmp_path, stale_lock_age=60)
+    lock_path = tmp_path / "name.lock"
+    # Locks taken by another process since a lock file was found stale are
+    # not removed
+    lock_path.write_text("1234-fresh")
+    assert not store._remove_lock(lock_path, "1234-stale")
+    assert lock_path.read_text() == "1234-fresh"
+    assert not store._remove_lock(tmp_path / "missing.lock", "1234-stale")
+
+    # Nor are locks taken by another process after this one's was broken
+    with store.lock("other", 1):
+        other_path = tmp_path / "other.lock"
+        other_path.unlink()
+        other_path.write_text("1234-fresh")
+    assert other_path.read_text() == "1234-fresh"
+
+
+def test_directory_store_lock_touched(tmp_path: Path):
+    store = DirectorySnapshotStore(tmp_path, stale_lock_age=0.5)
+    store.poll_interval = 0.01
+    lock_path = tmp_path / "name.lock"
+    acquired = []
+    with store.lock("name", 1):
+        os.utime(lock_path, (time.time() - 1, time.time() - 1))
+        time.sleep(0.2)
+        # Held locks are touched, and are not broken however long they are held
+        assert time.time() - lock_path.stat().st_mtime < 0.5
+        with pytest.raises(LockTimeoutError):
+            with store.lock("name", 0.3):
+                acquired.append(True)
+    assert not acquired
+
+
+def test_in_memory_store():
+    store = InMemorySnapshotStore()
+    assert not store.exists("key")
+    store.put("key", b"data")
+    assert store.exists("key")
+    assert store.get("key") == b"data"
+    store.delete("key")
+    store.delete("key")
+    assert store.get("key") is None
+
+
+def test_invalid_keep(tmp_path: Path):
+    with pytest.raises(ValueError, match="At least one snapshot"):
+        SnapshotCache(tmp_path, keep=0)
@@ -0,0 +1,90 @@
+import pickle
+import sys
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.compact import CompactSet, CompactSetMapping
+from sec_cik_mapper.synthetic import generate_mutual_fund_payload
+from sec_cik_mapper.transports import InMemoryTransport
+
+
+def test_compact_set_mapping():
+    mapping = CompactSetMapping.from_columns(
+        ["0000000002", "0000000001", "0000000002", "", "0000000002", "0000000003"],
+        ["B", "A", "A", "C", "B", ""],
+    )
+    # Blank keys and values are ignored, and values are sorted without duplicates
+    assert list(mapping) == ["0000000001", "0000000002"]
+    assert len(mapping) == 2
+    assert mapping == {"0000000001": {"A"}, "0000000002": {"A", "B"}}
+    assert repr(mapping) == "{'0000000001': {'A'}, '0000000002': {'A', 'B'}}"
+    assert "0000000001" in mapping
+    assert "0000000003" not in mapping
+    assert 1 not in mapping
+    assert mapping.get("9999999999") is None
+    with pytest.raises(KeyError):
+        mapping["0000000000"]
+    assert sys.getsizeof(mapping) > sys.getsizeof(mapping._values)
+
+
+def test_compact_set():
+    values = CompactSet(("A", "B", "C", "D"), 1, 3)
+    assert list(values) == ["B", "C"]
+    assert len(values) == 2
+    assert repr(values) == "{'B', 'C'}"
+    assert values == {"B", "C"}
+    assert {"B", "C"} == values
+    assert "B" in values and "C" in values
+    assert "A" not in values and "D" not in values and 1 not in values
+    # Set operations return regular sets
+    assert values | {"E"} == {"B", "C", "E"}
+    assert type(values & {"B"}) is set
+    assert values.isdisjoint({"A"})
+    assert CompactSet(("A",), 1, 1) == set()
+    assert repr(CompactSet(("A",), 1, 1)) == "set()"
+
+
+def test_compact_sets_mapper(synthetic_stock_mapper: StockMapper):
+    dict_mapper = StockMapper(transport=synthetic_stock_mapper.transport)
+    expected = dict_mapper.materialize_all()
+    synthetic_stock_mapper.compact_sets = True
+
+    synthetic_stock_mapper.build_indexes(["cik_to_tickers"])
+    assert isinstance(synthetic_stock_mapper.cik_to_tickers, CompactSetMapping)
+    indexes = synthetic_stock_mapper.materialize_all()
+    assert isinstance(indexes["exchange_to_ciks"], CompactSetMapping)
+    # Mappings to single values are unchanged
+    assert type(indexes["ticker_to_cik"]) is dict
+    assert indexes == expected
+
+    compact_usage = synthetic_stock_mapper.memory_usage()
+    dict_usage = dict_mapper.memory_usage()
+    assert compact_usage["indexes"]["cik_to_tickers"] < (
+        dict_usage["indexes"]["cik_to_tickers"] / 2
+    )
+    assert compact_usage["total"] < dict_usage["total"]
+
+
+def test_compact_sets_pickle(synthetic_stock_mapper: StockMapper):
+    synthetic_stock_mapper.compact_sets = True
+    expected = synthetic_stock_mapper.materialize_all()
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    assert unpickled.compact_sets
+    assert isinstance(unpickled.cik_to_tickers, CompactSetMapping)
+    assert unpickled.materialize_all() == expected
+
+    # Mappers pickled without compact sets decode to dicts of sets
+    synthetic_stock_mapper.compact_sets = False
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    assert type(unpickled.materialize_all()["cik_to_tickers"]) is dict
+
+
+def test_compact_sets_mutual_funds():
+    transport = InMemoryTransport(
+        {"company_tickers_mf.json": generate_mutual_fund_payload(1000)}
+    )
+    expected = MutualFundMapper(transport=transport).materialize_all()
+    mapper = MutualFundMapper(transport=transport)
+    mapper.compact_sets = True
+    assert mapper.materialize_all() == expected
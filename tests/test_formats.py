@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.formats import _FORMATS
+
+FORMATS = list(_FORMATS)
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_save_and_load_metadata(stock_mapper: StockMapper, tmp_path: Path, format):
+    path = tmp_path / f"mappings.{format}"
+    stock_mapper.save_metadata(path)
+    assert path.exists()
+
+    loaded = StockMapper.load_metadata(path)
+    assert isinstance(loaded, StockMapper)
+    pd.testing.assert_frame_equal(loaded.raw_dataframe, stock_mapper.raw_dataframe)
+    assert loaded.ticker_to_cik == stock_mapper.ticker_to_cik
+    assert loaded.exchange_to_tickers == stock_mapper.exchange_to_tickers
+
+
+@pytest.mark.parametrize("format", ["csv.gz", "ndjson.xz", "parquet"])
+def test_save_and_load_metadata_explicit_format(
+    mutual_fund_mapper: MutualFundMapper, tmp_path: Path, format
+):
+    path = tmp_path / "mappings.bin"
+    mutual_fund_mapper.save_metadata(path, format=format)
+
+    loaded = MutualFundMapper.load_metadata(path, format=format)
+    pd.testing.assert_frame_equal(
+        loaded.raw_dataframe, mutual_fund_mapper.raw_dataframe
+    )
+    assert loaded.series_id_to_class_ids == mutual_fund_mapper.series_id_to_class_ids
+
+
+def test_load_metadata_from_csv(stock_mapper: StockMapper, tmp_path: Path):
+    # CIKs keep their leading zeros when reloading the CSV export
+    path = tmp_path / "mappings.csv"
+    stock_mapper.save_metadata_to_csv(path)
+    loaded = StockMapper.load_metadata(path)
+    pd.testing.assert_frame_equal(loaded.raw_dataframe, stock_mapper.raw_dataframe)
+
+
+def test_invalid_metadata_format(stock_mapper: StockMapper, tmp_path: Path):
+    with pytest.raises(ValueError):
+        stock_mapper.save_metadata(tmp_path / "mappings.txt")
+
+    with pytest.raises(ValueError):
+        stock_mapper.save_metadata(tmp_path / "mappings.csv", format="txt")
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from sec_cik_mapper import StockMapper
+from sec_cik_mapper.generate import (
+    MANIFEST_FILE_NAME,
+    MAPPER_TYPES,
+    _write_atomically,
+    generate_mappings,
+    load_manifest,
+    main,
+    save_mappings,
+    serialize_mapping,
+)
+from sec_cik_mapper.synthetic import generate_stock_payload
+from sec_cik_mapper.transports import InMemoryTransport
+from sec_cik_mapper.validation import ValidationError
+
+
+class LegacyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, set):
+            return sorted(list(obj))
+        return json.JSONEncoder.default(self, obj)
+
+
+def legacy_serialize(path: Path, obj):
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, sort_keys=True, cls=LegacyEncoder)
+
+
+def test_serialize_mapping_matches_legacy_output(tmp_path: Path):
+    mapping = {"b": {"Z", "é", "A"}, "a": {"C"}}
+    legacy_path = tmp_path / "legacy.json"
+    legacy_serialize(legacy_path, mapping)
+    assert serialize_mapping(mapping) == legacy_path.read_text(encoding="utf-8")
+    assert serialize_mapping({"b": "Société", "a": "x"}) == (
+        '{"a": "x", "b": "Société"}'
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_save_mappings(stock_mapper: StockMapper, tmp_path: Path, max_workers: int):
+    entry, written = save_mappings(stock_mapper, tmp_path, max_workers=max_workers)
+    assert len(written) == len(StockMapper._index_specs) + 1
+    assert sorted(tmp_path.iterdir()) == sorted(written)
+    assert entry["payload_hash"] == stock_mapper.payload_hash
+    assert len(stock_mapper.payload_hash) == 64
+
+    for path in written:
+        record = entry["artifacts"][path.name]
+        assert record["size"] == path.stat().st_size
+        assert record["sha256"] == hashlib.sha256(path.read_bytes()).hexdigest()
+
+    # Output is byte-for-byte identical to the legacy json.dump output
+    for name in StockMapper._index_specs:
+        legacy_path = tmp_path / f"{name}.legacy"
+        legacy_serialize(legacy_path, getattr(stock_mapper, name))
+        assert (tmp_path / f"{name}.json").read_bytes() == legacy_path.read_bytes()
+
+
+def test_save_mappings_skips_unchanged_artifacts(
+    stock_mapper: StockMapper, tmp_path: Path
+):
+    entry, _ = save_mappings(stock_mapper, tmp_path, max_workers=1)
+
+    # Nothing is rewritten when the inputs are unchanged
+    assert save_mappings(stock_mapper, tmp_path, previous=entry) == (entry, [])
+
+    # Stale or tampered artifacts are rewritten, even if their size is intact
+    (tmp_path / "ticker_to_cik.json").write_text("{}")
+    cik_to_tickers_path = tmp_path / "cik_to_tickers.json"
+    data = cik_to_tickers_path.read_bytes()
+    cik_to_tickers_path.write_bytes(data[:-2] + b"x}")
+    entry["artifacts"]["mappings.csv"]["input_hash"] = "stale"
+    new_entry, written = save_mappings(
+        stock_mapper, tmp_path, max_workers=1, previous=entry
+    )
+    assert written == [
+        tmp_path / "mappings.csv",
+        tmp_path / "cik_to_tickers.json",
+        tmp_path / "ticker_to_cik.json",
+    ]
+    assert new_entry["artifacts"]["ticker_to_cik.json"]["size"] > 2
+    assert cik_to_tickers_path.read_bytes() == data
+
+
+def test_write_atomically_cleans_up_on_failure(tmp_path: Path):
+    path = tmp_path / "artifact.json"
+    path.write_text("old")
+
+    def failing_write(tmp_path: Path):
+        tmp_path.write_text("partial")
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        _write_atomically(path, failing_write)
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+    def interrupted_write(tmp_path: Path):
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        _write_atomically(path, interrupted_write)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_atomically_permissions(tmp_path: Path):
+    umask = os.umask(0o022)
+    try:
+        path = tmp_path / "artifact.json"
+        _write_atomically(path, lambda tmp_path: tmp_path.write_text("new"))
+    finally:
+        os.umask(umask)
+    # Artifacts are readable by everyone, like files written directly
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_main(tmp_path: Path, capsys):
+    args = ["--output-dir", str(tmp_path), "--kind", "stocks", "--workers", "1"]
+    main(args)
+    assert (tmp_path / "stocks" / "mappings.csv").exists()
+    assert not (tmp_path / "mutual_funds").exists()
+    assert "[stocks] ticker_to_cik.json ✓" in capsys.readouterr().out
+
+    manifest = load_manifest(tmp_path)
+    assert list(manifest) == ["stocks"]
+
+    # Exit early when the SEC payload is unchanged
+    main(args)
+    assert capsys.readouterr().out == "[stocks] No changes detected, skipping\n"
+
+    main([*args, "--force"])
+    assert "[stocks] mappings.csv ✓" in capsys.readouterr().out
+
+
+class CountingStockMapper(StockMapper):
+    num_built = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        type(self).num_built += 1
+        super().__init__(*args, **kwargs)
+
+
+def test_generate_mappings_skips_unchanged_payload(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setitem(MAPPER_TYPES, "stocks", CountingStockMapper)
+    payload = generate_stock_payload(100)
+    transport = InMemoryTransport({"company_tickers_exchange.json": payload})
+    written = generate_mappings(tmp_path, ["stocks"], 1, transport=transport)
+    assert len(written["stocks"]) == len(StockMapper._index_specs) + 1
+    assert CountingStockMapper.num_built == 1
+    assert load_manifest(tmp_path)["stocks"]["payload_hash"] == (
+        hashlib.sha256(transport.fetch("company_tickers_exchange.json")).hexdigest()
+    )
+
+    # Unchanged payloads are not decoded into a mapper
+    assert generate_mappings(tmp_path, ["stocks"], 1, transport=transport) == {
+        "stocks": []
+    }
+    assert CountingStockMapper.num_built == 1
+
+
+def test_generate_mappings_keeps_rejected_payload(tmp_path: Path, caplog):
+    payload = generate_stock_payload(100)
+    transport = InMemoryTransport({"company_tickers_exchange.json": payload})
+    generate_mappings(tmp_path, ["stocks"], 1, transport=transport)
+    manifest = (tmp_path / MANIFEST_FILE_NAME).read_bytes()
+    assert load_manifest(tmp_path)["stocks"]["rows"] == 100
+    csv = (tmp_path / "stocks" / "mappings.csv").read_bytes()
+
+    # Artifacts and the manifest are kept if too many rows are gone
+    payload["data"] = payload["data"][:50]
+    transport = InMemoryTransport({"company_tickers_exchange.json": payload})
+    assert generate_mappings(tmp_path, ["stocks"], 1, transport=transport) == {
+        "stocks": []
+    }
+    assert "SEC data rejected: Invalid mapping metadata: Rows dropped" in caplog.text
+    assert (tmp_path / MANIFEST_FILE_NAME).read_bytes() == manifest
+    assert (tmp_path / "stocks" / "mappings.csv").read_bytes() == csv
+
+    # Without previous artifacts, rejected SEC data is an error
+    payload["fields"] = ["cik", "name", "ticker"]
+    transport = InMemoryTransport({"company_tickers_exchange.json": payload})
+    with pytest.raises(ValidationError, match="Missing fields: exchange"):
+        generate_mappings(tmp_path / "other", ["stocks"], 1, transport=transport)
+
+
+def test_load_manifest_ignores_other_versions(tmp_path: Path):
+    assert load_manifest(tmp_path) == {}
+    (tmp_path / MANIFEST_FILE_NAME).write_text('{"version": 0, "mappings": {}}')
+    assert load_manifest(tmp_path) == {}
@@ -0,0 +1,60 @@
+import importlib.util
+import os
+import shutil
+import socketserver
+import threading
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path("scripts/generate_curl_commands.py")
+
+
+@pytest.fixture(scope="module")
+def script():
+    spec = importlib.util.spec_from_file_location("generate_curl_commands", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def mappings_server():
+    mappings_path = os.path.abspath("mappings")
+
+    class MappingsHandler(SimpleHTTPRequestHandler):
+        def translate_path(self, path):
+            relative_path = os.path.relpath(super().translate_path(path))
+            return os.path.join(mappings_path, relative_path)
+
+        def log_message(self, *args):
+            pass
+
+    class ThreadingServer(socketserver.ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    server = ThreadingServer(("127.0.0.1", 0), MappingsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_validate_urls(script, mappings_server: str):
+    expected_artifacts = script.get_expected_artifacts(Path("mappings"))
+    assert "stocks/ticker_to_cik.json" in expected_artifacts
+    assert "mutual_funds/mappings.csv" in expected_artifacts
+
+    base_urls = {"local": mappings_server}
+    script.validate_urls(expected_artifacts, base_urls=base_urls, max_workers=4)
+
+
+def test_validate_urls_detects_mismatch(script, mappings_server: str, tmp_path: Path):
+    shutil.copytree("mappings/stocks", tmp_path / "stocks")
+    (tmp_path / "stocks" / "ticker_to_cik.json").write_text("{}")
+    expected_artifacts = script.get_expected_artifacts(tmp_path)
+
+    with pytest.raises(AssertionError, match="ticker_to_cik.json"):
+        script.validate_urls(expected_artifacts, base_urls={"local": mappings_server})
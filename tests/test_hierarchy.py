@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import MutualFundMapper
+from sec_cik_mapper.synthetic import generate_mutual_fund_payload
+from sec_cik_mapper.transports import InMemoryTransport
+
+MUTUAL_FUND_PAYLOAD = {
+    "fields": ["cik", "seriesId", "classId", "symbol"],
+    "data": [
+        [2110, "S000009184", "C000024954", "LACAX"],
+        [2110, "S000009184", "C000024956", "LIACX"],
+        [2110, "S000033622", "C000103785", ""],
+        [2646, "S000008760", "C000023849", "IIBPX"],
+        [2646, "", "C000000001", "NOSER"],
+        [2663, "S000009999", "C000099999", "OLDX"],
+        # Listed again under another series
+        [2663, "S000010000", "C000099999", "OLDX"],
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def mutual_fund_mapper() -> MutualFundMapper:
+    return MutualFundMapper(
+        transport=InMemoryTransport({"company_tickers_mf.json": MUTUAL_FUND_PAYLOAD})
+    )
+
+
+def test_fund_hierarchy_arrays(mutual_fund_mapper: MutualFundMapper):
+    hierarchy = mutual_fund_mapper.fund_hierarchy
+    assert hierarchy is mutual_fund_mapper.fund_hierarchy
+    assert len(hierarchy) == 5
+    assert list(hierarchy.ciks) == ["0000002110", "0000002646", "0000002663"]
+    assert list(hierarchy.cik_offsets) == [0, 2, 3, 4]
+    # Series and classes keep the order of the mapping metadata (by ticker)
+    assert list(hierarchy.series_offsets) == [0, 1, 3, 4, 5]
+    assert list(hierarchy.class_tickers[hierarchy.series_offsets[:-1]]) == [
+        "",
+        "LACAX",
+        "IIBPX",
+        "OLDX",
+    ]
+    assert list(hierarchy.class_codes(["C000023849", "C000000001"])) == [3, -1]
+
+
+def test_fund_hierarchy_traversal(mutual_fund_mapper: MutualFundMapper):
+    hierarchy = mutual_fund_mapper.fund_hierarchy
+    ciks = ["0000002646", "0000000000", "0000002110", "0000002646"]
+    assert list(hierarchy.series_under(ciks)) == [
+        "S000008760",
+        "S000033622",
+        "S000009184",
+    ]
+    assert list(hierarchy.classes_under(ciks)) == [
+        "C000023849",
+        "C000103785",
+        "C000024954",
+        "C000024956",
+    ]
+    # Classes without a ticker are left out
+    assert list(hierarchy.tickers_under(np.array(ciks))) == ["IIBPX", "LACAX", "LIACX"]
+    assert hierarchy.classes_under([]).size == 0
+
+    classes = hierarchy.classes_under(pd.Series(["0000002663"]), as_frame=True)
+    expected = pd.DataFrame(
+        {
+            "CIK": ["0000002663"],
+            "Series ID": ["S000010000"],
+            "Class ID": ["C000099999"],
+            "Ticker": ["OLDX"],
+        }
+    )
+    pd.testing.assert_frame_equal(classes, expected, check_dtype=False)
+    series = hierarchy.series_under(["0000002663"], as_frame=True)
+    pd.testing.assert_frame_equal(series, expected.iloc[:, :2], check_dtype=False)
+
+
+def test_fund_hierarchy_parents(mutual_fund_mapper: MutualFundMapper):
+    hierarchy = mutual_fund_mapper.fund_hierarchy
+    class_ids = ["C000103785", "C000000001", "C000099999"]
+    parents = hierarchy.parents(class_ids)
+    assert list(parents.series_ids) == ["S000033622", None, "S000010000"]
+    assert list(parents.ciks) == ["0000002110", None, "0000002663"]
+
+    frame = hierarchy.parents(class_ids, as_frame=True)
+    assert list(frame.columns) == ["Class ID", "Series ID", "CIK"]
+    assert frame["Class ID"].tolist()[::2] == ["C000103785", "C000099999"]
+    assert frame.iloc[1].isna().all()
+
+
+def test_fund_hierarchy_matches_mappings():
+    payload = generate_mutual_fund_payload(2000)
+    mapper = MutualFundMapper(
+        transport=InMemoryTransport({"company_tickers_mf.json": payload})
+    )
+    hierarchy = mapper.fund_hierarchy
+    for cik, class_ids in mapper.cik_to_class_ids.items():
+        assert set(hierarchy.classes_under([cik])) == class_ids
+        assert set(hierarchy.series_under([cik])) == mapper.cik_to_series_ids[cik]
+    parents = hierarchy.parents(list(mapper.class_id_to_cik))
+    assert list(parents.ciks) == list(mapper.class_id_to_cik.values())
+    for class_id, series_id in zip(mapper.class_id_to_cik, parents.series_ids):
+        assert class_id in mapper.series_id_to_class_ids[series_id]
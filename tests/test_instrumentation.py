@@ -0,0 +1,79 @@
+import tracemalloc
+from typing import List
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import generate_stock_payload
+from sec_cik_mapper.transports import InMemoryTransport
+from sec_cik_mapper.types import PhaseStats
+
+TRANSPORT = InMemoryTransport(
+    {"company_tickers_exchange.json": generate_stock_payload(1000)}
+)
+
+
+def test_stats_disabled(stock_mapper: StockMapper):
+    assert stock_mapper.instrumentation is None
+    assert stock_mapper.stats == {}
+
+
+def test_stats():
+    collected: List[PhaseStats] = []
+    instrumentation = Instrumentation(hooks=[collected.append])
+    stock_mapper = StockMapper(transport=TRANSPORT, instrumentation=instrumentation)
+
+    stats = stock_mapper.stats
+    assert list(stats) == [
+        "network",
+        "decode",
+        "transform",
+        "dataframe",
+        "sort",
+        "validate",
+    ]
+    assert collected == list(stats.values())
+    assert stats["network"].size == len(
+        TRANSPORT.payloads["company_tickers_exchange.json"]
+    )
+    assert stats["network"].rows is None
+    for name in ["decode", "transform", "dataframe", "sort", "validate"]:
+        assert stats[name].rows == 1000
+        assert stats[name].size is None
+    assert all(s.wall_time >= 0 and s.peak_memory is None for s in stats.values())
+
+    assert len(stock_mapper.ticker_to_cik) == 1000
+    assert stats["build.ticker_to_cik"].rows == 1000
+    stock_mapper.materialize_all()
+    num_entries = sum(
+        len(index)
+        for name, index in stock_mapper._indexes.items()
+        if name != "ticker_to_cik"
+    )
+    assert stats["build_indexes"].rows == num_entries
+    assert list(stats)[-1] == "build_indexes"
+    assert len(collected) == 8
+
+
+def test_trace_memory():
+    instrumentation = Instrumentation(trace_memory=True)
+    StockMapper(transport=TRANSPORT, instrumentation=instrumentation)
+    assert all(s.peak_memory > 0 for s in instrumentation.stats.values())
+    assert not tracemalloc.is_tracing()
+
+    # Allocations are left alone when the caller is already tracing them
+    tracemalloc.start()
+    try:
+        StockMapper(transport=TRANSPORT, instrumentation=instrumentation)
+    finally:
+        tracemalloc.stop()
+    assert all(s.peak_memory is None for s in instrumentation.stats.values())
+
+
+def test_failed_phase_is_not_recorded():
+    instrumentation = Instrumentation(trace_memory=True)
+    with pytest.raises(KeyError):
+        MutualFundMapper(transport=TRANSPORT, instrumentation=instrumentation)
+    assert instrumentation.stats == {}
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.synthetic import generate_mutual_fund_payload
+
+from .conftest import CountingTransport
+
+
+@pytest.fixture
+def transport() -> CountingTransport:
+    return CountingTransport(
+        {"company_tickers_mf.json": generate_mutual_fund_payload(1000)}
+    )
+
+
+def test_memory_usage(transport: CountingTransport):
+    mutual_fund_mapper = MutualFundMapper(transport=transport)
+    usage = mutual_fund_mapper.memory_usage()
+    assert list(usage["table"]) == ["Index", "CIK", "Ticker", "Series ID", "Class ID"]
+    assert all(size > 0 for size in usage["table"].values())
+    assert usage["indexes"] == {}
+    assert usage["shared_strings"] == usage["unique_strings"] == 0
+    assert usage["total"] == sum(usage["table"].values())
+
+    # A single mapping only references unique strings
+    mutual_fund_mapper.build_indexes(["class_id_to_cik"])
+    usage = mutual_fund_mapper.memory_usage()
+    assert list(usage["indexes"]) == ["class_id_to_cik"]
+    assert usage["shared_strings"] == 0
+    assert usage["total"] == sum(usage["table"].values()) + sum(
+        usage["indexes"].values()
+    )
+
+    mutual_fund_mapper.materialize_all()
+    usage = mutual_fund_mapper.memory_usage()
+    assert set(usage["indexes"]) == set(MutualFundMapper._index_specs)
+    assert usage["shared_strings"] > 0
+    # Strings shared between mappings are counted once in the total
+    assert usage["total"] < sum(usage["table"].values()) + sum(
+        usage["indexes"].values()
+    )
+
+    shallow_usage = mutual_fund_mapper.memory_usage(deep=False)
+    assert shallow_usage["shared_strings"] == shallow_usage["unique_strings"] == 0
+    for name, size in shallow_usage["indexes"].items():
+        assert 0 < size < usage["indexes"][name]
+    assert shallow_usage["total"] < usage["total"]
+
+
+def test_drop_indexes(transport: CountingTransport):
+    mutual_fund_mapper = MutualFundMapper(transport=transport)
+    ticker_to_cik = mutual_fund_mapper.ticker_to_cik
+    mutual_fund_mapper.build_indexes(["class_id_to_cik", "series_id_to_cik"])
+
+    mutual_fund_mapper.drop_indexes(["ticker_to_cik", "class_id_to_cik"])
+    assert list(mutual_fund_mapper.memory_usage()["indexes"]) == ["series_id_to_cik"]
+    assert mutual_fund_mapper.ticker_to_cik == ticker_to_cik
+    assert mutual_fund_mapper.ticker_to_cik is not ticker_to_cik
+
+    mutual_fund_mapper.drop_indexes()
+    assert mutual_fund_mapper.memory_usage()["indexes"] == {}
+    assert transport.fetched == [MutualFundMapper._retriever.source_url]
+
+    with pytest.raises(ValueError, match="cik_to_exchange"):
+        mutual_fund_mapper.drop_indexes(["cik_to_exchange"])
+
+
+def test_drop_raw_table(transport: CountingTransport):
+    mutual_fund_mapper = MutualFundMapper(transport=transport)
+    raw_dataframe = mutual_fund_mapper.raw_dataframe
+    ticker_to_cik = mutual_fund_mapper.ticker_to_cik
+
+    mutual_fund_mapper.drop_raw_table()
+    usage = mutual_fund_mapper.memory_usage()
+    assert usage["table"] == {}
+    assert usage["total"] == usage["indexes"]["ticker_to_cik"]
+    assert mutual_fund_mapper.ticker_to_cik is ticker_to_cik
+    assert len(transport.fetched) == 1
+
+    # The mapping metadata is fetched again when needed
+    assert mutual_fund_mapper.class_id_to_cik
+    assert len(transport.fetched) == 2
+    assert mutual_fund_mapper.raw_dataframe.equals(raw_dataframe)
+    assert mutual_fund_mapper.ticker_to_cik is ticker_to_cik
+
+
+def test_drop_raw_table_changed_payload(transport: CountingTransport):
+    mutual_fund_mapper = MutualFundMapper(transport=transport, backend="arrow")
+    payload_hash = mutual_fund_mapper.payload_hash
+    ticker_to_cik = mutual_fund_mapper.ticker_to_cik
+    mutual_fund_mapper.drop_raw_table()
+    assert mutual_fund_mapper.raw_dataframe.num_rows == 1000
+    assert mutual_fund_mapper.ticker_to_cik is ticker_to_cik
+
+    # Mappings built from a previous payload are dropped with it
+    mutual_fund_mapper.drop_raw_table()
+    transport.payloads["company_tickers_mf.json"] = json.dumps(
+        generate_mutual_fund_payload(900, seed=1)
+    ).encode()
+    assert mutual_fund_mapper.raw_dataframe.num_rows == 900
+    assert mutual_fund_mapper.payload_hash != payload_hash
+    assert mutual_fund_mapper._indexes == {}
+    assert mutual_fund_mapper.ticker_to_cik == (
+        MutualFundMapper(transport=transport).ticker_to_cik
+    )
+
+
+def test_memory_usage_stock_mapper(stock_mapper: StockMapper):
+    usage = stock_mapper.memory_usage(deep=False)
+    assert list(usage["table"]) == ["Index", "CIK", "Ticker", "Name", "Exchange"]
@@ -1,6 +1,7 @@
 from typing import Dict
 
 import pandas as pd
+import pytest
 
 from sec_cik_mapper import MutualFundMapper
 
@@ -190,19 +191,43 @@ def test_class_id_to_ticker(
     assert class_id_to_ticker[class_id] == ticker
 
 
-def test_caching(mutual_fund_mapper: MutualFundMapper):
+def test_caching(mutual_fund_mapper: MutualFundMapper, monkeypatch: pytest.MonkeyPatch):
     # Clear cache
-    MutualFundMapper.ticker_to_cik.fget.cache_clear()  # type: ignore
+    mutual_fund_mapper._property_cache.pop("ticker_to_cik", None)
+    get_index = mutual_fund_mapper._get_index
+    names = []
+
+    def counting_get_index(name):
+        names.append(name)
+        return get_index(name)
+
+    monkeypatch.setattr(mutual_fund_mapper, "_get_index", counting_get_index)
     n = 1000
 
     for _ in range(n):
         mutual_fund_mapper.ticker_to_cik
 
-    # Verify cache hits and misses
-    cache_info = MutualFundMapper.ticker_to_cik.fget.cache_info()  # type: ignore
+    # Verify cache misses
+    assert names == ["ticker_to_cik"]
+    # Caches are per mapper
+    other_mapper = MutualFundMapper(transport=mutual_fund_mapper.transport)
+    assert "ticker_to_cik" not in other_mapper._property_cache
 
-    expected_misses = 1
-    assert cache_info.misses == expected_misses
 
-    expected_hits = n - expected_misses
-    assert cache_info.hits == expected_hits
+def test_materialize_all(mutual_fund_mapper: MutualFundMapper):
+    # Drop mappings built by previous tests
+    mutual_fund_mapper._indexes.clear()
+    indexes = mutual_fund_mapper.materialize_all()
+    assert set(indexes) == set(MutualFundMapper._index_specs)
+
+    df = mutual_fund_mapper.raw_dataframe
+    for name, spec in MutualFundMapper._index_specs.items():
+        keys, values = df[spec.key], df[spec.value]
+        if spec.multi_valued:
+            expected = mutual_fund_mapper._form_kv_set_mapping(keys, values)
+        else:
+            expected = mutual_fund_mapper._form_kv_mapping(keys, values)
+        assert indexes[name] == expected
+        # Property caches are filled with the prebuilt mappings
+        mutual_fund_mapper._property_cache.pop(name, None)
+        assert getattr(mutual_fund_mapper, name) is indexes[name]
@@ -0,0 +1,97 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.transports import RequestsTransport
+
+
+@pytest.mark.parametrize(
+    "mapper_fixture", ["synthetic_stock_mapper", "synthetic_mutual_fund_mapper"]
+)
+def test_pickle_round_trip(request, mapper_fixture: str):
+    mapper = request.getfixturevalue(mapper_fixture)
+    expected = mapper.materialize_all()
+    unpickled = pickle.loads(pickle.dumps(mapper))
+
+    assert type(unpickled) is type(mapper)
+    assert unpickled.retriever is mapper.retriever
+    assert unpickled.payload_hash == mapper.payload_hash
+    assert unpickled.instrumentation is None
+    assert unpickled.stats == {}
+    # The mapping metadata is decoded on first access
+    assert unpickled._mapping_metadata is None
+    pd.testing.assert_frame_equal(unpickled.raw_dataframe, mapper.raw_dataframe)
+    # Mappings are decoded on first access instead of being rebuilt
+    assert unpickled._indexes == {}
+    assert list(unpickled._encoded_indexes) == list(expected)
+    for name, index in expected.items():
+        unpickled_index = getattr(unpickled, name)
+        assert unpickled_index == index
+        assert list(unpickled_index) == list(index)
+    assert unpickled._encoded_indexes == {}
+    assert unpickled.materialize_all() == expected
+
+
+def test_pickle_is_compact(synthetic_mutual_fund_mapper: MutualFundMapper):
+    synthetic_mutual_fund_mapper.transport = RequestsTransport()
+    synthetic_mutual_fund_mapper.materialize_all()
+    state = dict(
+        synthetic_mutual_fund_mapper.__dict__,
+        instrumentation=None,
+        _build_lock=None,
+        warm_up_thread=None,
+    )
+    assert len(pickle.dumps(synthetic_mutual_fund_mapper)) < len(pickle.dumps(state))
+
+
+def test_pickle_without_indexes(synthetic_stock_mapper: StockMapper):
+    expected = synthetic_stock_mapper.build_indexes(["ticker_to_cik"])
+    synthetic_stock_mapper.pickle_indexes = False
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    assert unpickled.pickle_indexes is False
+    assert unpickled._indexes == unpickled._encoded_indexes == {}
+    assert unpickled.ticker_to_cik == expected["ticker_to_cik"]
+
+
+def test_pickle_unpickled_mapper(synthetic_stock_mapper: StockMapper):
+    expected = synthetic_stock_mapper.build_indexes(["cik_to_tickers", "ticker_to_cik"])
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    # Mappings that were not decoded yet are pickled again as is
+    unpickled.build_indexes(["ticker_to_cik"])
+    unpickled = pickle.loads(pickle.dumps(unpickled))
+    assert list(unpickled._encoded_indexes) == ["ticker_to_cik", "cik_to_tickers"]
+    assert unpickled.build_indexes(["cik_to_tickers", "ticker_to_cik"]) == expected
+    # Dropped mappings are not decoded
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    unpickled.drop_indexes(["cik_to_tickers"])
+    assert list(unpickled._encoded_indexes) == ["ticker_to_cik"]
+
+
+def test_pickle_without_raw_table(synthetic_stock_mapper: StockMapper):
+    expected = synthetic_stock_mapper.build_indexes(["ticker_to_cik"])
+    synthetic_stock_mapper.drop_raw_table()
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    assert unpickled._mapping_metadata is None
+    assert unpickled.ticker_to_cik == expected["ticker_to_cik"]
+    # The mapping metadata is fetched again through the pickled transport
+    pd.testing.assert_frame_equal(
+        unpickled.raw_dataframe, StockMapper(unpickled.transport).raw_dataframe
+    )
+
+
+def test_pickle_missing_values():
+    mapping_metadata = pd.DataFrame(
+        {"CIK": ["0000320193", None], "Ticker": ["AAPL", "MSFT"]}, dtype=object
+    )
+    mapper = StockMapper._from_mapping_metadata(mapping_metadata)
+    unpickled = pickle.loads(pickle.dumps(mapper))
+    assert unpickled.raw_dataframe["CIK"].isna().tolist() == [False, True]
+
+
+def test_unpickle_unsupported_version(synthetic_stock_mapper: StockMapper):
+    state = synthetic_stock_mapper.__getstate__()
+    state["version"] += 1
+    with pytest.raises(ValueError, match="Unsupported StockMapper pickle version"):
+        StockMapper.__new__(StockMapper).__setstate__(state)
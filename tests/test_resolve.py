@@ -0,0 +1,198 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.cli import main
+from sec_cik_mapper.resolve import (
+    _init_worker,
+    _resolve_chunk_in_worker,
+    build_lookups,
+    read_chunks,
+    resolve,
+)
+from sec_cik_mapper.synthetic import generate_stock_payload
+from sec_cik_mapper.transports import InMemoryTransport
+
+STOCK_PAYLOAD = {
+    "fields": ["cik", "name", "ticker", "exchange"],
+    "data": [
+        [320193, "Apple Inc.", "AAPL", "Nasdaq"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-B", "NYSE"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-A", "NYSE"],
+    ],
+}
+INPUT_CSV = "date,symbol,qty\n2022-01-03,aapl,10\n2022-01-03,BRK.B,5\n,MISSING,1\n"
+
+
+@pytest.fixture(scope="module")
+def stock_mapper() -> StockMapper:
+    transport = InMemoryTransport({"company_tickers_exchange.json": STOCK_PAYLOAD})
+    return StockMapper(transport=transport)
+
+
+def test_resolve_csv(stock_mapper: StockMapper, tmp_path: Path):
+    input_path = tmp_path / "trades.csv"
+    input_path.write_text(INPUT_CSV)
+    output_path = tmp_path / "resolved.csv.gz"
+    num_rows = resolve(
+        stock_mapper,
+        input_path,
+        output_path,
+        key_column="symbol",
+        fields=["cik", "name", "exchange"],
+        chunk_size=2,
+    )
+    assert num_rows == 3
+    # Input columns are kept as is, and keys are normalized like tickers
+    assert gzip.decompress(output_path.read_bytes()).decode() == (
+        "date,symbol,qty,cik,name,exchange\n"
+        "2022-01-03,aapl,10,0000320193,Apple Inc.,Nasdaq\n"
+        "2022-01-03,BRK.B,5,,,\n"
+        ",MISSING,1,,,\n"
+    )
+
+
+def test_resolve_multi_valued_fields(stock_mapper: StockMapper, tmp_path: Path):
+    input_path = tmp_path / "ciks.csv.gz"
+    pd.DataFrame({"cik": ["1067983", "0000320193", "1"]}).to_csv(
+        input_path, index=False
+    )
+    output_path = tmp_path / "resolved.csv"
+    resolve(stock_mapper, input_path, output_path, "cik", key="cik", fields=["ticker"])
+    assert output_path.read_text() == (
+        "cik,ticker\n1067983,BRK-A|BRK-B\n0000320193,AAPL\n1,\n"
+    )
+
+
+def test_resolve_parquet(tmp_path: Path):
+    payload = generate_stock_payload(1000)
+    transport = InMemoryTransport({"company_tickers_exchange.json": payload})
+    stock_mapper = StockMapper(transport=transport)
+    tickers = [ticker for _, _, ticker, _ in payload["data"]] + ["MISSING"]
+    input_path = tmp_path / "tickers.parquet"
+    pd.DataFrame({"ticker": tickers, "n": range(len(tickers))}).to_parquet(input_path)
+
+    output_path = tmp_path / "resolved.parquet"
+    num_rows = resolve(
+        stock_mapper,
+        input_path,
+        output_path,
+        "ticker",
+        fields=["cik", "exchange"],
+        chunk_size=300,
+        workers=2,
+    )
+    assert num_rows == len(tickers)
+    resolved = pd.read_parquet(output_path)
+    assert list(resolved.columns) == ["ticker", "n", "cik", "exchange"]
+    assert list(resolved["n"]) == list(range(len(tickers)))
+    expected_ciks = [stock_mapper.ticker_to_cik.get(t, "") for t in tickers]
+    assert list(resolved["cik"]) == expected_ciks
+    assert resolved["exchange"].iloc[-1] == ""
+
+
+def test_resolve_stdin(stock_mapper: StockMapper, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(INPUT_CSV))
+    resolve(stock_mapper, "-", "-", "symbol")
+    assert capsys.readouterr().out.splitlines() == [
+        "date,symbol,qty,cik",
+        "2022-01-03,aapl,10,0000320193",
+        "2022-01-03,BRK.B,5,",
+        ",MISSING,1,",
+    ]
+
+
+def test_resolve_errors(stock_mapper: StockMapper, tmp_path: Path):
+    input_path = tmp_path / "trades.csv"
+    input_path.write_text(INPUT_CSV)
+    output_path = tmp_path / "resolved.csv"
+    with pytest.raises(ValueError, match="Unknown key field for StockMapper: isin"):
+        resolve(stock_mapper, input_path, output_path, "symbol", key="isin")
+    with pytest.raises(ValueError, match="Unable to resolve exchange to name"):
+        resolve(stock_mapper, input_path, output_path, "symbol", "exchange", ["name"])
+    with pytest.raises(ValueError, match="Key column not found in input: ticker"):
+        resolve(stock_mapper, input_path, output_path, "ticker")
+    with pytest.raises(ValueError, match="Key column not found in input: ticker"):
+        resolve(stock_mapper, input_path, output_path, "ticker", workers=2)
+
+
+def test_resolve_chunk_in_worker(stock_mapper: StockMapper):
+    # Workers resolve chunks with the lookup tables set by the pool initializer
+    lookups = build_lookups(stock_mapper, "exchange", ["ticker"])
+    chunk = pd.DataFrame({"venue": [" NYSE ", "Nasdaq", "OTC"]})
+    _init_worker({"lookups": lookups, "as_csv": False})
+    resolved = _resolve_chunk_in_worker(chunk.copy(), "venue")
+    assert list(resolved["ticker"]) == ["BRK-A|BRK-B", "AAPL", ""]
+
+    # Chunks are formatted as CSV in the workers for CSV output
+    _init_worker({"lookups": lookups, "as_csv": True})
+    expected = (["venue", "ticker"], 3, " NYSE ,BRK-A|BRK-B\nNasdaq,AAPL\nOTC,\n")
+    assert _resolve_chunk_in_worker(chunk.copy(), "venue") == expected
+
+    # Or with the lookup tables sent with the chunk, without a pool initializer
+    _init_worker({"lookups": {}, "as_csv": False})
+    state = {"lookups": lookups, "as_csv": True}
+    assert _resolve_chunk_in_worker(chunk.copy(), "venue", state) == expected
+
+
+def test_resolve_without_pool_initializer(
+    stock_mapper: StockMapper, tmp_path: Path, monkeypatch
+):
+    # Process pools of Python 3.6 take no initializer
+    monkeypatch.setattr("sec_cik_mapper.resolve._POOL_INITIALIZER", False)
+    input_path = tmp_path / "trades.csv"
+    input_path.write_text(INPUT_CSV)
+    output_path = tmp_path / "resolved.csv"
+    assert resolve(stock_mapper, input_path, output_path, "symbol", workers=2) == 3
+    assert output_path.read_text().splitlines()[1:] == [
+        "2022-01-03,aapl,10,0000320193",
+        "2022-01-03,BRK.B,5,",
+        ",MISSING,1,",
+    ]
+
+
+def test_read_chunks(tmp_path: Path):
+    input_path = tmp_path / "trades.csv"
+    input_path.write_text(INPUT_CSV)
+    chunks = list(read_chunks(input_path, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[1]["date"].iloc[0] == ""
+
+
+def test_cli_resolve(tmp_path: Path, capsys):
+    (tmp_path / "company_tickers_exchange.json").write_text(json.dumps(STOCK_PAYLOAD))
+    input_path = tmp_path / "trades.csv"
+    input_path.write_text(INPUT_CSV)
+    output_path = tmp_path / "resolved.csv"
+    argv = ["resolve", str(input_path), "--key-column", "symbol"]
+
+    main([*argv, "--data-dir", str(tmp_path), "--output", str(output_path)])
+    assert "Resolved 3 rows" in capsys.readouterr().err
+    resolved = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+    assert list(resolved["cik"]) == ["0000320193", "", ""]
+
+
+def test_cli_resolve_from_metadata(tmp_path: Path, capsys):
+    payload = {
+        "fields": ["cik", "seriesId", "classId", "symbol"],
+        "data": [[36405, "S000002848", "C000007806", "VTSAX"]],
+    }
+    transport = InMemoryTransport({"company_tickers_mf.json": payload})
+    metadata_path = tmp_path / "metadata.parquet"
+    MutualFundMapper(transport=transport).save_metadata(metadata_path)
+    input_path = tmp_path / "funds.csv"
+    input_path.write_text("fund\nvtsax\nVTI\n")
+
+    argv = ["resolve", str(input_path), "--key-column", "fund", "--kind"]
+    argv += ["mutual_funds", "--metadata", str(metadata_path)]
+    main([*argv, "--fields", "series_id", "class_id", "--workers", "2"])
+    assert capsys.readouterr().out.splitlines() == [
+        "fund,series_id,class_id",
+        "vtsax,S000002848,C000007806",
+        "VTI,,",
+    ]
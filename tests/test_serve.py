@@ -0,0 +1,273 @@
+import json
+import logging
+import threading
+import time
+from http.client import HTTPConnection
+from typing import Iterator
+
+import pytest
+
+from sec_cik_mapper import StockMapper
+from sec_cik_mapper.cache import InMemorySnapshotStore, SnapshotCache
+from sec_cik_mapper.serve import (
+    DEFAULT_MAX_BODY_SIZE,
+    LookupServer,
+    MapperService,
+    main,
+)
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+from sec_cik_mapper.validation import ValidationError
+
+STOCK_PAYLOAD = {
+    "fields": ["cik", "name", "ticker", "exchange"],
+    "data": [
+        [320193, "Apple Inc.", "AAPL", "Nasdaq"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-B", "NYSE"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-A", "NYSE"],
+    ],
+}
+
+
+@pytest.fixture
+def transport() -> InMemoryTransport:
+    return InMemoryTransport(
+        {
+            "company_tickers_exchange.json": STOCK_PAYLOAD,
+            "company_tickers_mf.json": generate_mutual_fund_payload(100),
+        }
+    )
+
+
+@pytest.fixture
+def service(transport: InMemoryTransport) -> MapperService:
+    return MapperService(transport)
+
+
+@pytest.fixture
+def connection(service: MapperService) -> Iterator[HTTPConnection]:
+    server = LookupServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    connection = HTTPConnection("127.0.0.1", server.server_port)
+    yield connection
+    connection.close()
+    server.shutdown()
+    server.server_close()
+
+
+def request(connection: HTTPConnection, method: str, path: str, body=None):
+    connection.request(method, path, body=body)
+    resp = connection.getresponse()
+    assert resp.getheader("Content-Type") == "application/json"
+    return resp.status, json.loads(resp.read())
+
+
+def test_lookup(service: MapperService):
+    assert service.lookup("stocks", "ticker_to_cik", " aapl ") == "0000320193"
+    assert service.lookup("stocks", "cik_to_tickers", "1067983") == {"BRK-A", "BRK-B"}
+    assert service.lookup("stocks", "ticker_to_cik", "MSFT") is None
+    assert service.lookup_many("stocks", "ticker_to_exchange", ["BRK-B", "X"]) == [
+        "NYSE",
+        None,
+    ]
+    with pytest.raises(KeyError, match="stocks/series_id_to_cik"):
+        service.lookup("stocks", "series_id_to_cik", "S000002848")
+    with pytest.raises(KeyError, match="etfs/ticker_to_cik"):
+        service.lookup_many("etfs", "ticker_to_cik", ["AAPL"])
+
+
+def test_refresh(service: MapperService, transport: InMemoryTransport):
+    indexes = service.indexes
+    assert service.refresh() == []
+    assert service.indexes is indexes
+
+    transport.payloads["company_tickers_exchange.json"] = json.dumps(
+        generate_stock_payload(10)
+    ).encode()
+    assert service.refresh() == ["stocks"]
+    assert service.indexes["mutual_funds"] is indexes["mutual_funds"]
+    assert service.lookup("stocks", "ticker_to_cik", "AAPL") is None
+    assert len(service.indexes["stocks"]["ticker_to_cik"]) == 10
+    # The membership filter is rebuilt along with the mappings
+    stock_mapper = service.mappers["stocks"]
+    assert stock_mapper._membership_filter is not None
+    assert not stock_mapper.contains_many(["AAPL"])[0]
+
+
+def test_refresh_rejected_data(
+    service: MapperService, transport: InMemoryTransport, caplog
+):
+    indexes = service.indexes
+    transport.payloads["company_tickers_mf.json"] = json.dumps(
+        generate_mutual_fund_payload(10)
+    ).encode()
+    with caplog.at_level(logging.WARNING, logger="sec_cik_mapper.serve"):
+        assert service.refresh() == []
+    assert "Keeping the current mutual_funds mappings" in caplog.text
+    assert service.indexes == indexes
+
+    # Services do not start without valid SEC data
+    transport.payloads["company_tickers_mf.json"] = b'{"fields": [], "data": []}'
+    with pytest.raises(ValidationError, match="Missing fields"):
+        MapperService(transport, ["mutual_funds"])
+
+
+def test_snapshot_cache(transport: InMemoryTransport):
+    cache = SnapshotCache(InMemorySnapshotStore())
+    service = MapperService(transport, ["stocks"], cache)
+    # Other services restore the snapshot instead of fetching the SEC data
+    transport.payloads.clear()
+    other = MapperService(transport, ["stocks"], cache)
+    assert (
+        other.mappers["stocks"].payload_hash == service.mappers["stocks"].payload_hash
+    )
+    assert other.lookup("stocks", "ticker_to_cik", "AAPL") == "0000320193"
+    assert other.refresh() == []
+
+
+def test_background_refresh(
+    service: MapperService, transport: InMemoryTransport, caplog
+):
+    caplog.set_level(logging.INFO, logger="sec_cik_mapper.serve")
+    del transport.payloads["company_tickers_exchange.json"]
+    thread = service.start_refresh(0.01)
+    with caplog.at_level(logging.INFO):
+        while "Failed to refresh mappers" not in caplog.text:
+            time.sleep(0.001)
+        # Lookups keep using the last good mappings
+        assert service.lookup("stocks", "ticker_to_cik", "AAPL") == "0000320193"
+
+        transport.payloads["company_tickers_exchange.json"] = json.dumps(
+            generate_stock_payload(10)
+        ).encode()
+        while "Refreshed mappers: stocks" not in caplog.text:
+            time.sleep(0.001)
+        while "Refreshed mappers: none" not in caplog.text:
+            time.sleep(0.001)
+    service.stop_refresh()
+    thread.join()
+    assert service.lookup("stocks", "ticker_to_cik", "AAPL") is None
+
+
+def test_single_lookups(connection: HTTPConnection):
+    assert request(connection, "GET", "/stocks/ticker_to_cik/AAPL") == (
+        200,
+        "0000320193",
+    )
+    # Sets are sorted and keys are normalized
+    assert request(connection, "GET", "/stocks/cik_to_tickers/1067983") == (
+        200,
+        ["BRK-A", "BRK-B"],
+    )
+    assert request(connection, "GET", "/stocks/ticker_to_cik/brk%20b") == (
+        404,
+        {"error": "Unknown key: brk b"},
+    )
+    assert request(connection, "GET", "/stocks/ticker_to_cik/brk-b?x=1") == (
+        200,
+        "0001067983",
+    )
+    assert request(connection, "GET", "/stocks/unknown/AAPL") == (
+        404,
+        {"error": "Unknown mapping: stocks/unknown"},
+    )
+    assert request(connection, "GET", "/stocks/ticker_to_cik") == (
+        404,
+        {"error": "Not found: /stocks/ticker_to_cik"},
+    )
+    status, hashes = request(connection, "GET", "/health")
+    assert status == 200
+    assert list(hashes) == ["stocks", "mutual_funds"]
+
+
+def test_batch_lookups(connection: HTTPConnection):
+    body = json.dumps(["AAPL", "BRK-A", "MISSING", "brk-b"])
+    assert request(connection, "POST", "/stocks/ticker_to_cik", body) == (
+        200,
+        ["0000320193", "0001067983", None, "0001067983"],
+    )
+    assert request(connection, "POST", "/stocks/exchange_to_ciks", '["NYSE"]') == (
+        200,
+        [["0001067983"]],
+    )
+    assert request(connection, "POST", "/stocks/ticker_to_cik", "[]") == (200, [])
+    for invalid_body in ["AAPL", '{"keys": ["AAPL"]}', "[1, 2]", ""]:
+        assert request(connection, "POST", "/stocks/ticker_to_cik", invalid_body) == (
+            400,
+            {"error": "Expected a JSON array of keys"},
+        )
+    assert request(connection, "POST", "/stocks/unknown", "[]") == (
+        404,
+        {"error": "Unknown mapping: stocks/unknown"},
+    )
+    assert request(connection, "POST", "/stocks/ticker_to_cik/AAPL", "[]") == (
+        404,
+        {"error": "Not found: /stocks/ticker_to_cik/AAPL"},
+    )
+    # Bodies of failed requests are read, so the connection is kept alive
+    assert request(connection, "POST", "/stocks/ticker_to_cik", '["AAPL"]') == (
+        200,
+        ["0000320193"],
+    )
+
+
+@pytest.mark.parametrize(
+    "content_length, expected",
+    [
+        (None, (411, {"error": "Content-Length required"})),
+        ("abc", (400, {"error": "Invalid Content-Length: abc"})),
+        ("-1", (400, {"error": "Invalid Content-Length: -1"})),
+        (
+            str(DEFAULT_MAX_BODY_SIZE + 1),
+            (413, {"error": f"Request body larger than {DEFAULT_MAX_BODY_SIZE} bytes"}),
+        ),
+    ],
+)
+def test_batch_lookup_content_length(
+    connection: HTTPConnection, content_length, expected
+):
+    connection.putrequest("POST", "/stocks/ticker_to_cik")
+    if content_length is not None:
+        connection.putheader("Content-Length", content_length)
+    connection.endheaders()
+    resp = connection.getresponse()
+    assert (resp.status, json.loads(resp.read())) == expected
+    # The body is not read, so the connection is closed
+    assert resp.getheader("Connection") == "close"
+    assert request(connection, "POST", "/stocks/ticker_to_cik", '["AAPL"]') == (
+        200,
+        ["0000320193"],
+    )
+
+
+@pytest.mark.parametrize(
+    "refresh_interval, snapshot_cache", [("0", False), ("3600", True)]
+)
+def test_main(
+    tmp_path, monkeypatch, capsys, refresh_interval: str, snapshot_cache: bool
+):
+    (tmp_path / "company_tickers_exchange.json").write_text(json.dumps(STOCK_PAYLOAD))
+    started = []
+
+    def serve_forever(self):
+        started.append(self)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(LookupServer, "serve_forever", serve_forever)
+    argv = ["--data-dir", str(tmp_path), "--kind", "stocks", "--port", "0"]
+    if snapshot_cache:
+        argv += ["--snapshot-cache", str(tmp_path / "snapshots")]
+    main([*argv, "--refresh-interval", refresh_interval])
+
+    [server] = started
+    assert server.service.kinds == ["stocks"]
+    assert server.service.lookup("stocks", "ticker_to_cik", "AAPL") == "0000320193"
+    index_path = tmp_path / "snapshots" / SnapshotCache._index_key(StockMapper)
+    assert index_path.exists() == snapshot_cache
+    assert f"Serving on http://127.0.0.1:{server.server_port}" in (
+        capsys.readouterr().out
+    )
@@ -0,0 +1,105 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import StockMapper
+
+shared = pytest.importorskip("sec_cik_mapper.shared")
+SharedMapper = shared.SharedMapper
+
+
+@pytest.fixture
+def published(synthetic_stock_mapper: StockMapper) -> Iterator["shared.SharedMapper"]:
+    with SharedMapper.publish(synthetic_stock_mapper) as shared_mapper:
+        yield shared_mapper
+
+
+def lookup_cik(shared_mapper: "shared.SharedMapper", ticker: str):
+    return shared_mapper.ticker_to_cik.get(ticker)
+
+
+@pytest.mark.parametrize(
+    "mapper_fixture", ["synthetic_stock_mapper", "synthetic_mutual_fund_mapper"]
+)
+def test_shared_mappings_match_mapper(request, mapper_fixture: str):
+    mapper = request.getfixturevalue(mapper_fixture)
+    expected = mapper.materialize_all()
+    with SharedMapper.publish(mapper) as published:
+        with SharedMapper(published.name) as shared_mapper:
+            assert shared_mapper.mapper_type == type(mapper).__name__
+            assert shared_mapper.payload_hash == mapper.payload_hash
+            assert shared_mapper.num_rows == len(mapper.raw_dataframe)
+            assert list(shared_mapper.indexes) == list(expected)
+            for name, index in expected.items():
+                shared_index = getattr(shared_mapper, name)
+                assert len(shared_index) == len(index)
+                # Keys are iterated in the same order as the mapper's mappings
+                assert list(shared_index) == list(index)
+                for key, value in index.items():
+                    if isinstance(value, set):
+                        assert shared_index[key] == frozenset(value)
+                    else:
+                        assert shared_index[key] == value
+            pd.testing.assert_frame_equal(
+                shared_mapper.raw_dataframe,
+                mapper.raw_dataframe,
+                check_dtype=False,
+                check_column_type=False,
+            )
+            # Copying the table does not create new views of the buffer
+            num_views = len(shared_mapper._views)
+            shared_mapper.raw_dataframe
+            assert len(shared_mapper._views) == num_views
+
+
+def test_shared_index_missing_keys(published: "shared.SharedMapper"):
+    ticker_to_cik = published.ticker_to_cik
+    assert "UNKNOWN-TICKER" not in ticker_to_cik
+    assert ticker_to_cik.get("UNKNOWN-TICKER") is None
+    with pytest.raises(KeyError):
+        ticker_to_cik["UNKNOWN-TICKER"]
+    # Non-string keys are never found
+    assert 1 not in ticker_to_cik
+    with pytest.raises(KeyError):
+        ticker_to_cik[1]
+    with pytest.raises(AttributeError, match="has no attribute unknown_to_cik"):
+        published.unknown_to_cik
+
+
+def test_shared_mapper_pickles_by_name(published: "shared.SharedMapper"):
+    data = pickle.dumps(published)
+    # Only the name of the shared memory block is pickled
+    assert len(data) < 200
+    with pickle.loads(data) as shared_mapper:
+        assert dict(shared_mapper.ticker_to_cik) == dict(published.ticker_to_cik)
+    # Closing an attached mapper leaves the published mapper usable
+    assert len(published.ticker_to_cik) > 0
+
+
+def test_shared_mapper_in_worker_processes(published: "shared.SharedMapper"):
+    tickers = list(published.ticker_to_cik)[:10] + ["UNKNOWN-TICKER"]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        ciks = list(executor.map(lookup_cik, [published] * len(tickers), tickers))
+    assert ciks == [published.ticker_to_cik.get(ticker) for ticker in tickers]
+
+
+def test_shared_mapper_rejects_invalid_blocks(
+    published: "shared.SharedMapper", monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(shared, "VERSION", shared.VERSION + 1)
+    with pytest.raises(ValueError, match="Unsupported shared mapper version"):
+        SharedMapper(published.name)
+    monkeypatch.setattr(shared, "MAGIC", b"NOTMAGIC")
+    with pytest.raises(ValueError, match="Not a shared mapper"):
+        SharedMapper(published.name)
+
+
+def test_shared_mapper_unlink(synthetic_stock_mapper: StockMapper):
+    published = SharedMapper.publish(synthetic_stock_mapper)
+    assert published.size >= len(shared.encode_mapper(synthetic_stock_mapper))
+    published.unlink()
+    with pytest.raises(FileNotFoundError):
+        SharedMapper(published.name)
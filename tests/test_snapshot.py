@@ -0,0 +1,132 @@
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper, snapshot
+from sec_cik_mapper.cli import main
+from sec_cik_mapper.snapshot import (
+    SnapshotError,
+    SnapshotVersionError,
+    dumps_snapshot,
+    loads_snapshot,
+    read_snapshot,
+)
+from sec_cik_mapper.transports import InMemoryTransport, RequestsTransport
+
+
+@pytest.fixture
+def snapshot_path(synthetic_stock_transport: InMemoryTransport, tmp_path: Path) -> Path:
+    snapshot_path = tmp_path / "stocks.snapshot"
+    StockMapper(transport=synthetic_stock_transport).save_snapshot(snapshot_path)
+    return snapshot_path
+
+
+@pytest.mark.parametrize(
+    "mapper_type, transport_fixture",
+    [
+        (StockMapper, "synthetic_stock_transport"),
+        (MutualFundMapper, "synthetic_mutual_fund_transport"),
+    ],
+)
+def test_snapshot_round_trip(request, tmp_path: Path, mapper_type, transport_fixture):
+    mapper = mapper_type(transport=request.getfixturevalue(transport_fixture))
+    snapshot_path = tmp_path / "mapper.snapshot"
+    mapper.save_snapshot(snapshot_path)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    loaded = mapper_type.load_snapshot(snapshot_path)
+    assert type(loaded) is mapper_type
+    assert isinstance(loaded.transport, RequestsTransport)
+    assert loaded.payload_hash == mapper.payload_hash
+    # Nothing is decoded until it is accessed
+    assert loaded._mapping_metadata is None
+    assert loaded._indexes == {}
+    assert loaded.materialize_all() == mapper.materialize_all()
+    pd.testing.assert_frame_equal(loaded.raw_dataframe, mapper.raw_dataframe)
+
+
+def test_snapshot_transport(
+    snapshot_path: Path, synthetic_stock_transport: InMemoryTransport
+):
+    loaded = StockMapper.load_snapshot(
+        snapshot_path, transport=synthetic_stock_transport
+    )
+    loaded.drop_raw_table()
+    assert loaded.transport is synthetic_stock_transport
+    # The mapping metadata is decoded again rather than fetched
+    assert len(loaded.raw_dataframe) == 2000
+
+
+def test_snapshot_bytes(synthetic_stock_transport: InMemoryTransport):
+    mapper = StockMapper(transport=synthetic_stock_transport)
+    data = dumps_snapshot(mapper, indexes=False)
+    # Mappings are left out, and the mapper still pickles them
+    assert mapper._indexes == {}
+    assert mapper.pickle_indexes
+    loaded = loads_snapshot(StockMapper, data)
+    assert loaded._encoded_indexes == {}
+    assert loaded.ticker_to_cik == mapper.ticker_to_cik
+
+    assert len(dumps_snapshot(mapper)) > len(data)
+    with pytest.raises(SnapshotError, match="Snapshot <bytes> holds a StockMapper"):
+        loads_snapshot(MutualFundMapper, data)
+
+
+def test_snapshot_errors(snapshot_path: Path, tmp_path: Path):
+    not_a_snapshot = tmp_path / "stocks.json"
+    not_a_snapshot.write_text("{}")
+    with pytest.raises(SnapshotError, match="Not a mapper snapshot"):
+        read_snapshot(StockMapper, not_a_snapshot)
+
+    with pytest.raises(SnapshotError, match="holds a StockMapper, not a Mutual"):
+        read_snapshot(MutualFundMapper, snapshot_path)
+
+    data = bytearray(snapshot_path.read_bytes())
+    data[-1] ^= 0xFF
+    snapshot_path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="checksum mismatch"):
+        StockMapper.load_snapshot(snapshot_path)
+
+
+def test_snapshot_version_mismatch(
+    snapshot_path: Path,
+    synthetic_stock_transport: InMemoryTransport,
+    monkeypatch,
+    caplog,
+):
+    monkeypatch.setattr(snapshot, "VERSION", snapshot.VERSION + 1)
+    with pytest.raises(SnapshotVersionError, match="snapshot/state/Python/marshal"):
+        read_snapshot(StockMapper, snapshot_path)
+
+    # Mappers are built from the SEC data instead
+    with caplog.at_level(logging.WARNING, logger="sec_cik_mapper.snapshot"):
+        mapper = StockMapper.load_snapshot(
+            snapshot_path, transport=synthetic_stock_transport
+        )
+    assert "building the mapper from SEC data instead" in caplog.text
+    assert mapper.transport is synthetic_stock_transport
+    assert mapper._mapping_metadata is not None
+
+
+def test_cli_snapshot(tmp_path: Path, capsys):
+    payload = {
+        "fields": ["cik", "name", "ticker", "exchange"],
+        "data": [[320193, "Apple Inc.", "AAPL", "Nasdaq"]],
+    }
+    (tmp_path / "company_tickers_exchange.json").write_text(json.dumps(payload))
+    snapshot_path = tmp_path / "stocks.snapshot"
+    main(["snapshot", str(snapshot_path), "--data-dir", str(tmp_path)])
+    assert f"Wrote {snapshot_path}" in capsys.readouterr().err
+
+    input_path = tmp_path / "trades.csv"
+    input_path.write_text("symbol\naapl\nMSFT\n")
+    argv = ["resolve", str(input_path), "--key-column", "symbol"]
+    main([*argv, "--snapshot", str(snapshot_path), "--fields", "cik", "name"])
+    assert capsys.readouterr().out.splitlines() == [
+        "symbol,cik,name",
+        "aapl,0000320193,Apple Inc.",
+        "MSFT,,",
+    ]
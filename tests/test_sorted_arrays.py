@@ -0,0 +1,98 @@
+import pickle
+import sys
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.sorted_arrays import SortedArrayMapping
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+
+KEYS = ["B", "A", "", "B", "C", "A", "Ä"]
+VALUES = ["2", "1", "3", "4", "", "1", "5"]
+
+
+def test_sorted_array_mapping():
+    single = SortedArrayMapping.from_columns(KEYS, VALUES, multi_valued=False)
+    multi = SortedArrayMapping.from_columns(KEYS, VALUES, multi_valued=True)
+    # Blank keys and values are ignored, and keys are iterated in sorted order
+    assert list(single) == ["A", "B", "Ä"]
+    assert single == {"A": "1", "B": "4", "Ä": "5"}
+    assert multi == {"A": {"1"}, "B": {"2", "4"}, "Ä": {"5"}}
+    assert len(single) == len(multi) == 3
+    assert "Ä" in single and "C" not in single and "BB" not in single
+    assert 1 not in single
+    assert single.get("") is None
+    with pytest.raises(KeyError):
+        multi["C"]
+    assert repr(single) == "{'A': '1', 'B': '4', 'Ä': '5'}"
+    assert sys.getsizeof(multi) > sys.getsizeof(single) > single._keys.nbytes
+
+    # Batch lookups
+    keys = ["B", "Z", "A", "Ä", "", "AA"]
+    assert single.find_many(keys).tolist() == [1, -1, 0, 2, -1, -1]
+    assert single.get_many(keys) == [single.get(key) for key in keys]
+    assert multi.get_many(keys, default=set()) == [
+        {"2", "4"},
+        set(),
+        {"1"},
+        {"5"},
+        set(),
+        set(),
+    ]
+
+    empty = SortedArrayMapping.from_columns([], [], multi_valued=False)
+    assert len(empty) == 0
+    assert "A" not in empty
+    assert empty.get_many(["A"]) == [None]
+
+
+@pytest.mark.parametrize(
+    "mapper_type, file_name, payload",
+    [
+        (StockMapper, "company_tickers_exchange.json", generate_stock_payload(2000)),
+        (
+            MutualFundMapper,
+            "company_tickers_mf.json",
+            generate_mutual_fund_payload(2000),
+        ),
+    ],
+)
+def test_sorted_arrays_mapper(mapper_type, file_name, payload):
+    transport = InMemoryTransport({file_name: payload})
+    expected = mapper_type(transport=transport).materialize_all()
+    mapper = mapper_type(transport=transport)
+    mapper.sorted_arrays = True
+    indexes = mapper.materialize_all()
+    for name, index in indexes.items():
+        assert isinstance(index, SortedArrayMapping)
+        assert index == expected[name]
+        keys = list(expected[name])[:100] + ["?"]
+        assert index.get_many(keys) == [expected[name].get(key) for key in keys]
+
+
+def test_sorted_arrays_memory_usage(synthetic_stock_mapper: StockMapper):
+    dict_mapper = StockMapper(transport=synthetic_stock_mapper.transport)
+    dict_mapper.materialize_all()
+    synthetic_stock_mapper.sorted_arrays = True
+    synthetic_stock_mapper.materialize_all()
+    sorted_usage = synthetic_stock_mapper.memory_usage()
+    dict_usage = dict_mapper.memory_usage()
+    assert sorted_usage["indexes"]["ticker_to_cik"] < (
+        dict_usage["indexes"]["ticker_to_cik"] / 2
+    )
+    assert sorted_usage["total"] < dict_usage["total"]
+
+
+def test_sorted_arrays_pickle(synthetic_stock_mapper: StockMapper):
+    synthetic_stock_mapper.sorted_arrays = True
+    expected = synthetic_stock_mapper.materialize_all()
+    unpickled = pickle.loads(pickle.dumps(synthetic_stock_mapper))
+    assert unpickled.sorted_arrays
+    indexes = unpickled.materialize_all()
+    assert isinstance(indexes["cik_to_tickers"], SortedArrayMapping)
+    assert isinstance(indexes["ticker_to_cik"], SortedArrayMapping)
+    assert indexes == expected
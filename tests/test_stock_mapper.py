@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Dict
 
 import pandas as pd
+import pytest
 
 from sec_cik_mapper import StockMapper
 
@@ -146,19 +147,61 @@ def test_save_metadata_to_csv(stock_mapper: StockMapper, tmp_path: Path):
     assert len(df) == len(stock_mapper.raw_dataframe)
 
 
-def test_caching(stock_mapper: StockMapper):
+def test_caching(stock_mapper: StockMapper, monkeypatch: pytest.MonkeyPatch):
     # Clear cache
-    StockMapper.ticker_to_cik.fget.cache_clear()  # type: ignore
+    stock_mapper._property_cache.pop("ticker_to_cik", None)
+    get_index = stock_mapper._get_index
+    names = []
+
+    def counting_get_index(name):
+        names.append(name)
+        return get_index(name)
+
+    monkeypatch.setattr(stock_mapper, "_get_index", counting_get_index)
     n = 1000
 
     for _ in range(n):
         stock_mapper.ticker_to_cik
 
-    # Verify cache hits and misses
-    cache_info = StockMapper.ticker_to_cik.fget.cache_info()  # type: ignore
+    # Verify cache misses
+    assert names == ["ticker_to_cik"]
+    # Caches are per mapper
+    other_mapper = StockMapper(transport=stock_mapper.transport)
+    assert "ticker_to_cik" not in other_mapper._property_cache
+
 
-    expected_misses = 1
-    assert cache_info.misses == expected_misses
+def test_materialize_all(stock_mapper: StockMapper):
+    # Drop mappings built by previous tests
+    stock_mapper._indexes.clear()
+    indexes = stock_mapper.materialize_all()
+    assert set(indexes) == set(StockMapper._index_specs)
+
+    df = stock_mapper.raw_dataframe
+    for name, spec in StockMapper._index_specs.items():
+        keys, values = df[spec.key], df[spec.value]
+        if spec.multi_valued:
+            expected = stock_mapper._form_kv_set_mapping(keys, values)
+        else:
+            expected = stock_mapper._form_kv_mapping(keys, values)
+        assert indexes[name] == expected
+        # Property caches are filled with the prebuilt mappings
+        stock_mapper._property_cache.pop(name, None)
+        assert getattr(stock_mapper, name) is indexes[name]
+
+
+def test_build_indexes(stock_mapper: StockMapper):
+    stock_mapper._indexes.clear()
+    names = ["ticker_to_exchange", "exchange_to_ciks"]
+    indexes = stock_mapper.build_indexes(names)
+    assert list(indexes) == names
+    assert list(stock_mapper._indexes) == names
+
+    # Mappings that have already been built are reused
+    assert stock_mapper.build_indexes(names[:1])["ticker_to_exchange"] is (
+        indexes["ticker_to_exchange"]
+    )
+    assert indexes["ticker_to_exchange"] == stock_mapper.ticker_to_exchange
+    assert indexes["exchange_to_ciks"] == stock_mapper.exchange_to_ciks
 
-    expected_hits = n - expected_misses
-    assert cache_info.hits == expected_hits
+    with pytest.raises(ValueError):
+        stock_mapper.build_indexes(["ticker_to_cik", "not_a_mapping"])
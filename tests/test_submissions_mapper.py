@@ -0,0 +1,151 @@
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from sec_cik_mapper import SubmissionsMapper, SubmissionsRetriever
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import generate_submissions_archive
+from sec_cik_mapper.transports import FileTransport, InMemoryTransport
+
+SUBMISSIONS = {
+    "CIK0000320193.json": {
+        "cik": "320193",
+        "name": "APPLE INC.",
+        "tickers": ["AAPL"],
+        "exchanges": ["Nasdaq"],
+        "sic": "3571",
+        "sicDescription": "Electronic Computers",
+        "stateOfIncorporation": "CA",
+        "formerNames": [
+            {"name": "APPLE COMPUTER INC", "from": "1994-01-26", "to": "2007-01-04"},
+            {
+                "name": "APPLE COMPUTER INC/ FA",
+                "from": "1997-07-15",
+                "to": "1997-07-15",
+            },
+        ],
+        "filings": {"recent": {"form": ["10-K"]}, "files": []},
+    },
+    "CIK0001067983.json": {
+        "cik": "1067983",
+        "name": "BERKSHIRE HATHAWAY INC",
+        "tickers": ["BRK-B", "BRK-A"],
+        "exchanges": ["NYSE", "NYSE"],
+        "sic": "6331",
+        "sicDescription": "Fire, Marine & Casualty Insurance",
+        "stateOfIncorporation": "DE",
+        "formerNames": [],
+    },
+    # Companies without tickers or with missing fields
+    "CIK0000000020.json": {
+        "cik": "20",
+        "name": "K TRON INTERNATIONAL INC",
+        "tickers": [],
+        "exchanges": [],
+        "sic": "3823",
+        "sicDescription": None,
+        "stateOfIncorporation": "NJ",
+        "formerNames": [{"name": "K-TRON INTERNATIONAL INC"}],
+    },
+    "CIK0000001750.json": {"cik": "1750", "name": "AAR CORP"},
+    # Further pages of filings do not hold company data
+    "CIK0000320193-submissions-001.json": {"form": ["10-Q"]},
+}
+
+
+@pytest.fixture
+def submissions_path(tmp_path: Path) -> Path:
+    with zipfile.ZipFile(tmp_path / "submissions.zip", "w") as archive:
+        for name, submission in SUBMISSIONS.items():
+            archive.writestr(name, json.dumps(submission))
+        archive.writestr("README.txt", "Not a submission")
+    return tmp_path
+
+
+def test_submissions_retriever():
+    retriever = SubmissionsRetriever()
+    assert retriever.source_url.endswith("/submissions.zip")
+    assert retriever.is_company_member("CIK0000320193.json")
+    assert not retriever.is_company_member("CIK0000320193-submissions-001.json")
+    assert not retriever.is_company_member("README.txt")
+
+    member = json.dumps(SUBMISSIONS["CIK0000320193.json"]).encode()
+    assert retriever.parse(member) == [
+        {
+            "CIK": "0000320193",
+            "Ticker": "AAPL",
+            "Name": "Apple Inc.",
+            "Exchange": "Nasdaq",
+            "SIC": "3571",
+            "SIC Description": "Electronic Computers",
+            "State of Incorporation": "CA",
+            "Former Name": "Apple Computer Inc",
+        },
+        {
+            "CIK": "0000320193",
+            "Ticker": "",
+            "Name": "Apple Inc.",
+            "Exchange": "",
+            "SIC": "3571",
+            "SIC Description": "Electronic Computers",
+            "State of Incorporation": "CA",
+            "Former Name": "Apple Computer Inc/ Fa",
+        },
+    ]
+
+
+def test_submissions_mapper(submissions_path: Path):
+    instrumentation = Instrumentation()
+    mapper = SubmissionsMapper(
+        transport=FileTransport(submissions_path), instrumentation=instrumentation
+    )
+    archive = (submissions_path / "submissions.zip").read_bytes()
+    assert mapper.stats["network"].size == len(archive)
+    assert mapper.stats["decode"].rows == len(mapper.raw_dataframe) == 6
+    assert (
+        mapper.payload_hash
+        == SubmissionsMapper(
+            transport=InMemoryTransport({"submissions.zip": archive})
+        ).payload_hash
+    )
+
+    assert mapper.ticker_to_cik == {
+        "AAPL": "0000320193",
+        "BRK-A": "0001067983",
+        "BRK-B": "0001067983",
+    }
+    assert mapper.cik_to_tickers["0001067983"] == {"BRK-A", "BRK-B"}
+    assert mapper.cik_to_company_name["0000000020"] == "K Tron International Inc"
+    assert mapper.cik_to_sic == {
+        "0000000020": "3823",
+        "0000320193": "3571",
+        "0001067983": "6331",
+    }
+    assert mapper.sic_to_ciks["3571"] == {"0000320193"}
+    assert mapper.sic_to_description == {
+        "3571": "Electronic Computers",
+        "6331": "Fire, Marine & Casualty Insurance",
+    }
+    assert mapper.cik_to_state_of_incorporation["0000320193"] == "CA"
+    assert mapper.state_of_incorporation_to_ciks["DE"] == {"0001067983"}
+    assert mapper.cik_to_former_names == {
+        "0000000020": {"K-Tron International Inc"},
+        "0000320193": {"Apple Computer Inc", "Apple Computer Inc/ Fa"},
+    }
+    assert mapper.former_name_to_ciks["Apple Computer Inc"] == {"0000320193"}
+    assert mapper.normalize_key("cik_to_sic", "320193") == "0000320193"
+
+
+def test_submissions_mapper_workers(monkeypatch: pytest.MonkeyPatch):
+    transport = InMemoryTransport(
+        {"submissions.zip": generate_submissions_archive(300)}
+    )
+    expected = SubmissionsMapper(transport=transport)
+    assert len(expected.cik_to_sic) == 300
+    monkeypatch.setattr(SubmissionsMapper, "batch_size", 7)
+    mapper = SubmissionsMapper(transport=transport, workers=2)
+    assert mapper.workers == 2 and SubmissionsMapper.workers == 1
+    assert mapper.raw_dataframe.equals(expected.raw_dataframe)
+    assert mapper.materialize_all() == expected.materialize_all()
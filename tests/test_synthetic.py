@@ -0,0 +1,101 @@
+import io
+import json
+import random
+import string
+import zipfile
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.synthetic import (
+    _code_width,
+    _unique_codes,
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+    generate_submissions_archive,
+    main,
+)
+from sec_cik_mapper.transports import FileTransport, InMemoryTransport
+
+
+def test_unique_codes():
+    codes = list(_unique_codes(random.Random(0), 1))
+    assert sorted(codes) == list(string.ascii_uppercase)
+    assert codes != sorted(codes)
+    assert len(set(_unique_codes(random.Random(0), 2))) == 26**2
+
+    assert _code_width(26**4, min_width=4) == 4
+    assert _code_width(26**4 + 1, min_width=4) == 5
+
+
+def test_generate_stock_payload():
+    payload = generate_stock_payload(5000, seed=1)
+    assert payload["fields"] == ["cik", "name", "ticker", "exchange"]
+    assert len(payload["data"]) == 5000
+    assert payload == generate_stock_payload(5000, seed=1)
+    assert payload != generate_stock_payload(5000, seed=2)
+
+    tickers = [ticker for _, _, ticker, _ in payload["data"]]
+    assert len(set(tickers)) == len(tickers)
+    tickers_per_cik = Counter(Counter(cik for cik, *_ in payload["data"]).values())
+    assert tickers_per_cik[1] > tickers_per_cik[2] > 0
+    assert None in {exchange for *_, exchange in payload["data"]}
+
+
+def test_generate_mutual_fund_payload():
+    payload = generate_mutual_fund_payload(5000, seed=1)
+    assert payload["fields"] == ["cik", "seriesId", "classId", "symbol"]
+    assert len(payload["data"]) == 5000
+    assert payload == generate_mutual_fund_payload(5000, seed=1)
+
+    class_ids = [class_id for _, _, class_id, _ in payload["data"]]
+    assert len(set(class_ids)) == len(class_ids)
+    tickers = [ticker for *_, ticker in payload["data"] if ticker]
+    assert len(set(tickers)) == len(tickers)
+    assert "" in {ticker for *_, ticker in payload["data"]}
+
+
+def test_generate_submissions_archive():
+    archive = generate_submissions_archive(500, seed=1)
+    assert archive == generate_submissions_archive(500, seed=1)
+    assert archive != generate_submissions_archive(500, seed=2)
+    with zipfile.ZipFile(io.BytesIO(archive)) as f:
+        names = f.namelist()
+        submission = json.loads(f.read(names[0]))
+    companies = [name for name in names if "-submissions-" not in name]
+    assert len(companies) == 500 and len(names) > 500
+    assert submission["tickers"] and submission["sic"]
+
+
+@pytest.mark.parametrize("num_rows", [1, 3, 1000])
+def test_mappers_from_synthetic_payloads(num_rows: int):
+    stock_mapper = StockMapper(
+        transport=InMemoryTransport(
+            {"company_tickers_exchange.json": generate_stock_payload(num_rows)}
+        )
+    )
+    assert len(stock_mapper.raw_dataframe) == num_rows
+    assert len(stock_mapper.ticker_to_cik) == num_rows
+
+    mutual_fund_mapper = MutualFundMapper(
+        transport=InMemoryTransport(
+            {"company_tickers_mf.json": generate_mutual_fund_payload(num_rows)}
+        )
+    )
+    assert len(mutual_fund_mapper.raw_dataframe) == num_rows
+    assert len(mutual_fund_mapper.class_id_to_cik) == num_rows
+
+
+def test_main(tmp_path: Path, capsys):
+    main(["--kind", "stocks", "--rows", "100", "--output-dir", str(tmp_path)])
+    main(["--kind", "mutual_funds", "--rows", "100", "--output-dir", str(tmp_path)])
+    assert "✓" in capsys.readouterr().out
+
+    payload = json.loads((tmp_path / "company_tickers_exchange.json").read_text())
+    assert payload == generate_stock_payload(100)
+    stock_mapper = StockMapper(transport=FileTransport(tmp_path))
+    assert len(stock_mapper.ticker_to_cik) == 100
+    mutual_fund_mapper = MutualFundMapper(transport=FileTransport(tmp_path))
+    assert len(mutual_fund_mapper.class_id_to_cik) == 100
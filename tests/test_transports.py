@@ -0,0 +1,121 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.transports import (
+    FileTransport,
+    InMemoryTransport,
+    RequestsTransport,
+)
+
+STOCK_PAYLOAD = {
+    "fields": ["cik", "name", "ticker", "exchange"],
+    "data": [
+        [320193, "Apple Inc.", "AAPL", "Nasdaq"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-B", "NYSE"],
+        [1067983, "Berkshire Hathaway Inc", "BRK-A", "NYSE"],
+    ],
+}
+MUTUAL_FUND_PAYLOAD = {
+    "fields": ["cik", "seriesId", "classId", "symbol"],
+    "data": [[36405, "S000002848", "C000007806", "VTSAX"]],
+}
+
+
+def test_default_transport(stock_mapper: StockMapper):
+    assert isinstance(stock_mapper.transport, RequestsTransport)
+
+
+def test_in_memory_transport():
+    url = StockMapper._retriever.source_url
+    transport = InMemoryTransport(
+        {url: json.dumps(STOCK_PAYLOAD).encode(), "other.json": STOCK_PAYLOAD}
+    )
+    assert json.loads(transport.fetch(url)) == STOCK_PAYLOAD
+    assert json.loads(transport.fetch("https://example.com/other.json")) == (
+        STOCK_PAYLOAD
+    )
+    with pytest.raises(KeyError):
+        transport.fetch("https://example.com/missing.json")
+
+
+def test_stock_mapper_from_in_memory_transport():
+    transport = InMemoryTransport({"company_tickers_exchange.json": STOCK_PAYLOAD})
+    stock_mapper = StockMapper(transport=transport)
+    assert stock_mapper.transport is transport
+    assert stock_mapper.ticker_to_cik == {
+        "AAPL": "0000320193",
+        "BRK-A": "0001067983",
+        "BRK-B": "0001067983",
+    }
+    assert stock_mapper.cik_to_tickers["0001067983"] == {"BRK-A", "BRK-B"}
+    assert stock_mapper.payload_hash
+
+
+def test_mutual_fund_mapper_from_file_transport(tmp_path: Path):
+    payload = json.dumps(MUTUAL_FUND_PAYLOAD).encode()
+    (tmp_path / "company_tickers_mf.json").write_bytes(payload)
+    mutual_fund_mapper = MutualFundMapper(transport=FileTransport(tmp_path))
+    assert mutual_fund_mapper.ticker_to_series_id == {"VTSAX": "S000002848"}
+
+
+def test_file_transport_gzip(tmp_path: Path):
+    payload = json.dumps(STOCK_PAYLOAD).encode()
+    with gzip.open(tmp_path / "company_tickers_exchange.json.gz", "wb") as f:
+        f.write(payload)
+    transport = FileTransport(str(tmp_path))
+    assert transport.fetch(StockMapper._retriever.source_url) == payload
+
+    # Uncompressed files take precedence
+    (tmp_path / "company_tickers_exchange.json").write_bytes(b"{}")
+    assert transport.fetch(StockMapper._retriever.source_url) == b"{}"
+
+
+def test_file_transport_missing_file(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        FileTransport(tmp_path).fetch(StockMapper._retriever.source_url)
+
+
+def test_open(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    url = StockMapper._retriever.source_url
+    payload = json.dumps(STOCK_PAYLOAD).encode()
+    with InMemoryTransport({url: payload}).open(url) as f:
+        assert f.read() == payload
+
+    # Gzip compressed files are decompressed in memory
+    with gzip.open(tmp_path / "company_tickers_exchange.json.gz", "wb") as f:
+        f.write(payload)
+    with FileTransport(tmp_path).open(url) as f:
+        assert f.read() == payload
+    (tmp_path / "company_tickers_exchange.json").write_bytes(b"{}")
+    with FileTransport(tmp_path).open(url) as f:
+        assert f.read() == b"{}"
+
+
+def test_requests_transport_open(monkeypatch: pytest.MonkeyPatch):
+    class Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield from (b"abc", b"def")
+
+    requests_kwargs = []
+
+    def get(url, **kwargs):
+        requests_kwargs.append(kwargs)
+        return Response()
+
+    monkeypatch.setattr("sec_cik_mapper.transports.requests.get", get)
+    with RequestsTransport().open("https://www.sec.gov/submissions.zip") as f:
+        assert f.read() == b"abcdef"
+    assert requests_kwargs[0]["stream"]
@@ -0,0 +1,238 @@
+import json
+import pickle
+from copy import deepcopy
+
+import pandas as pd
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.backends import PandasBackend
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+from sec_cik_mapper.validation import (
+    MetadataValidator,
+    ValidationError,
+    ValidationIssue,
+    ValidationReport,
+)
+
+STOCK_PAYLOAD = generate_stock_payload(2000)
+
+
+def stock_transport(payload) -> InMemoryTransport:
+    return InMemoryTransport({"company_tickers_exchange.json": payload})
+
+
+@pytest.mark.parametrize("backend", ["pandas", "arrow", "polars"])
+def test_valid_mapper(backend):
+    instrumentation = Instrumentation()
+    mapper = StockMapper(stock_transport(STOCK_PAYLOAD), instrumentation, backend)
+    assert mapper.validation_report == ValidationReport(2000, None, [])
+    assert mapper.validation_report.valid
+    assert mapper.stats["validate"].rows == 2000
+    assert mapper.validate() == mapper.validation_report
+
+    # Blank tickers are valid
+    mutual_fund_mapper = MutualFundMapper(
+        InMemoryTransport(
+            {"company_tickers_mf.json": generate_mutual_fund_payload(2000)}
+        ),
+        backend=backend,
+    )
+    assert (mutual_fund_mapper.mapping_metadata["Ticker"] == "").any()
+    assert mutual_fund_mapper.validation_report.issues == []
+
+
+def test_missing_fields():
+    payload = {"fields": ["cik", "name", "symbol"], "data": [[1, "A", "A"]]}
+    with pytest.raises(ValidationError, match="Missing fields: ticker, exchange") as e:
+        StockMapper(transport=stock_transport(payload))
+    assert e.value.report == ValidationReport(
+        1,
+        None,
+        [
+            ValidationIssue(
+                "fields",
+                "Missing fields: ticker, exchange",
+                2,
+                ["ticker", "exchange"],
+                True,
+            )
+        ],
+    )
+
+
+def test_invalid_rows():
+    payload = deepcopy(STOCK_PAYLOAD)
+    rows = payload["data"]
+    rows[0][0] = "abc"
+    rows[1][2] = "-abc"
+    # Tickers of the same CIK on several rows do not conflict
+    rows.append(list(rows[2]))
+
+    # A few invalid rows are warnings
+    mapper = StockMapper(transport=stock_transport(payload))
+    assert mapper.validation_report == ValidationReport(
+        2001,
+        None,
+        [
+            ValidationIssue(
+                "cik_format",
+                "Malformed CIKs in 1 of 2001 rows",
+                1,
+                ["0000000abc"],
+                False,
+            ),
+            ValidationIssue(
+                "ticker_format",
+                "Malformed tickers in 1 of 2001 rows",
+                1,
+                ["-ABC"],
+                False,
+            ),
+        ],
+    )
+    assert mapper.validation_report.valid
+
+    # More are errors
+    rows[3][0] = rows[4][0] = "x"
+    with pytest.raises(ValidationError, match="Malformed CIKs in 3 of 2001 rows"):
+        StockMapper(transport=stock_transport(payload))
+
+
+def test_ticker_conflicts(monkeypatch):
+    monkeypatch.setattr(StockMapper, "validator", MetadataValidator(0.25, 0))
+    payload = deepcopy(STOCK_PAYLOAD)
+    rows = payload["data"]
+    other = next(row for row in rows if row[0] != rows[0][0])
+    other[2] = rows[0][2]
+    with pytest.raises(ValidationError) as e:
+        StockMapper(transport=stock_transport(payload))
+    assert e.value.report.issues == [
+        ValidationIssue(
+            "ticker_conflicts",
+            "Tickers mapped to several CIKs: 1",
+            1,
+            [rows[0][2]],
+            True,
+        )
+    ]
+
+
+def test_validate_table():
+    validator = MetadataValidator()
+    backend = PandasBackend()
+    columns = ["CIK", "Ticker", "Name"]
+    report = validator.validate(
+        pd.DataFrame({"CIK": [], "Ticker": []}), backend, columns
+    )
+    assert not report.valid
+    assert report.issues == [
+        ValidationIssue("columns", "Missing columns: Name", 1, ["Name"], True),
+        ValidationIssue("row_count", "No rows", 0, [], True),
+    ]
+
+    df = pd.DataFrame(
+        {
+            "CIK": ["0000000001", "0000000002", None],
+            "Ticker": ["A", None, "C"],
+            "Name": ["A", "B", "C"],
+        }
+    )
+    report = validator.validate(df, backend, columns, previous_rows=5)
+    assert [issue.check for issue in report.errors] == [
+        "row_count",
+        "missing_values",
+        "cik_format",
+    ]
+    assert report.errors[0].message == "Rows dropped by 40% from 5 to 3, more than 25%"
+    assert report.errors[1].message == "Missing values: 2 in CIK, Ticker"
+    with pytest.raises(ValidationError, match="^Invalid mapping metadata: Rows"):
+        report.raise_for_errors()
+
+    # Only the given columns are checked
+    assert validator.validate(df, backend, ["Name"], previous_rows=3).issues == []
+    assert validator.validate(df.drop(columns="Ticker"), backend, ["CIK"]).errors[
+        0
+    ] == ValidationIssue("missing_values", "Missing values: 1 in CIK", 1, ["CIK"], True)
+
+
+def test_row_drop():
+    mapper = StockMapper(transport=stock_transport(STOCK_PAYLOAD))
+    assert mapper.validate(previous_rows=2500).valid
+    report = mapper.validate(previous_rows=3000)
+    assert report.previous_rows == 3000
+    assert report.errors == [
+        ValidationIssue(
+            "row_count",
+            "Rows dropped by 33% from 3000 to 2000, more than 25%",
+            1000,
+            [],
+            True,
+        )
+    ]
+
+
+def test_refetched_row_drop():
+    transport = stock_transport(STOCK_PAYLOAD)
+    mapper = StockMapper(transport=transport)
+    ticker_to_cik = mapper.ticker_to_cik
+    payload_hash = mapper.payload_hash
+    mapper.drop_raw_table()
+    mapper.drop_raw_table()
+
+    # The payload fetched again lost too many of the dropped rows
+    payload = {"fields": STOCK_PAYLOAD["fields"], "data": STOCK_PAYLOAD["data"][:1000]}
+    transport.payloads = stock_transport(payload).payloads
+    with pytest.raises(ValidationError, match="Rows dropped by 50% from 2000 to 1000"):
+        mapper.raw_dataframe
+    # Mappings built from the dropped mapping metadata are kept
+    assert mapper.payload_hash == payload_hash
+    assert mapper.ticker_to_cik is ticker_to_cik
+    assert mapper.validation_report.rows == 2000
+
+    payload["data"] = STOCK_PAYLOAD["data"][:1600]
+    transport.payloads = stock_transport(payload).payloads
+    assert len(mapper.raw_dataframe) == 1600
+    assert mapper.payload_hash != payload_hash
+    assert mapper.validation_report.previous_rows == 2000
+
+
+def test_validator_argument():
+    validator = MetadataValidator(max_row_drop=0.1)
+    mapper = StockMapper(transport=stock_transport(STOCK_PAYLOAD), validator=validator)
+    assert mapper.validator is validator
+    assert StockMapper.validator is not validator
+    assert StockMapper(transport=mapper.transport).validator is StockMapper.validator
+    # The validator is pickled with the mapper
+    assert pickle.loads(pickle.dumps(mapper)).validator.max_row_drop == 0.1
+
+
+def test_validation_disabled():
+    payload = {"fields": STOCK_PAYLOAD["fields"], "data": [[1, "A", "-", "NYSE"]]}
+    mapper = StockMapper(transport=stock_transport(payload), validator=None)
+    assert mapper.validation_report is None
+    # The default validator still reports issues on demand
+    assert not mapper.validate().valid
+
+    # Mapping metadata fetched again is validated
+    mapper.drop_raw_table()
+    mapper.validator = MetadataValidator()
+    with pytest.raises(ValidationError, match="Malformed tickers in 1 of 1 rows"):
+        mapper.raw_dataframe
+
+
+@pytest.mark.parametrize("max_row_drop, max_invalid_share", [(-0.1, 0), (0, 1.5)])
+def test_invalid_thresholds(max_row_drop, max_invalid_share):
+    with pytest.raises(ValueError, match="must be between 0 and 1"):
+        MetadataValidator(max_row_drop, max_invalid_share)
+
+
+def test_report_json():
+    report = StockMapper(transport=stock_transport(STOCK_PAYLOAD)).validate(3000)
+    # Reports are plain tuples, e.g. for logging or monitoring
+    assert json.loads(json.dumps(report._asdict()))["issues"][0][0] == "row_count"
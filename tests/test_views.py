@@ -0,0 +1,106 @@
+import pickle
+import sys
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+from sec_cik_mapper.views import KeyIndex, MappingView
+
+KEYS = ["A", "B", "", "A", "C", "B", "A"]
+VALUES = ["1", "2", "3", "", "", "4", "5"]
+
+
+@pytest.fixture
+def stock_transport() -> InMemoryTransport:
+    return InMemoryTransport(
+        {"company_tickers_exchange.json": generate_stock_payload(2000)}
+    )
+
+
+def test_key_index():
+    index = KeyIndex(KEYS)
+    assert index.keys == ["A", "B", "", "C"]
+    assert index.code("B") == 1
+    # Blank and unknown keys have no code
+    assert index.code("") == index.code("D") == -1
+    assert index.rows_of(index.code("A")).tolist() == [0, 3, 6]
+    assert sys.getsizeof(index) > index.rows.nbytes
+
+
+def test_mapping_view():
+    key_index = KeyIndex(KEYS)
+    single = MappingView(key_index, VALUES, multi_valued=False)
+    multi = MappingView(key_index, VALUES, multi_valued=True)
+    # Blank keys and values are ignored, and keys without values are left out
+    assert dict(single) == {"A": "5", "B": "4"}
+    assert dict(multi) == {"A": {"1", "5"}, "B": {"2", "4"}}
+    assert list(multi) == ["A", "B"]
+    assert len(single) == len(multi) == 2
+    assert "A" in single and "C" not in single and "D" not in single
+    assert single.get("C") is None
+    with pytest.raises(KeyError):
+        multi["D"]
+    assert repr(single) == "{'A': '5', 'B': '4'}"
+    assert single == {"A": "5", "B": "4"}
+    assert sys.getsizeof(single) > 0
+
+    empty = MappingView(KeyIndex([]), [], multi_valued=False)
+    assert len(empty) == 0
+    assert dict(empty) == {}
+
+
+@pytest.mark.parametrize(
+    "mapper_type, file_name, payload",
+    [
+        (StockMapper, "company_tickers_exchange.json", generate_stock_payload(2000)),
+        (
+            MutualFundMapper,
+            "company_tickers_mf.json",
+            generate_mutual_fund_payload(2000),
+        ),
+    ],
+)
+def test_lazy_mappings(mapper_type, file_name, payload):
+    transport = InMemoryTransport({file_name: payload})
+    expected = mapper_type(transport=transport).materialize_all()
+    mapper = mapper_type(transport=transport)
+    mapper.lazy_mappings = True
+    indexes = mapper.materialize_all()
+    for name, index in indexes.items():
+        assert isinstance(index, MappingView)
+        assert index == expected[name]
+        assert list(index) == list(expected[name])
+
+
+def test_lazy_mappings_share_key_indexes(stock_transport: InMemoryTransport):
+    mapper = StockMapper(transport=stock_transport)
+    mapper.lazy_mappings = True
+    mapper.compact_sets = True
+    cik_to_tickers = mapper.cik_to_tickers
+    assert isinstance(cik_to_tickers, MappingView)
+    assert cik_to_tickers._key_index is mapper.cik_to_exchange._key_index
+    assert list(mapper._key_indexes) == ["CIK"]
+    assert mapper.memory_usage()["indexes"]["cik_to_tickers"] > 0
+
+    # Views keep working without the mapping metadata
+    ticker = next(iter(mapper.ticker_to_cik))
+    mapper.drop_raw_table()
+    assert mapper._key_indexes == mapper._columns == {}
+    assert mapper.ticker_to_cik[ticker] in cik_to_tickers
+    mapper.drop_indexes()
+    assert mapper._key_indexes == mapper._columns == {}
+
+
+def test_lazy_mappings_pickle(stock_transport: InMemoryTransport):
+    mapper = StockMapper(transport=stock_transport)
+    mapper.lazy_mappings = True
+    expected = mapper.materialize_all()
+    unpickled = pickle.loads(pickle.dumps(mapper))
+    assert unpickled.lazy_mappings
+    assert unpickled._key_indexes == {}
+    assert unpickled.materialize_all() == expected
@@ -0,0 +1,130 @@
+import pickle
+import threading
+
+import pytest
+
+from sec_cik_mapper import MutualFundMapper, StockMapper, SubmissionsMapper
+from sec_cik_mapper.instrumentation import Instrumentation
+from sec_cik_mapper.synthetic import (
+    generate_mutual_fund_payload,
+    generate_stock_payload,
+    generate_submissions_archive,
+)
+from sec_cik_mapper.transports import InMemoryTransport
+
+STOCK_TRANSPORT = InMemoryTransport(
+    {"company_tickers_exchange.json": generate_stock_payload(2000)}
+)
+
+FUND_NAMES = ["series_id_to_class_ids", "ticker_to_series_id"]
+
+
+class BlockingTransport(InMemoryTransport):
+    """Transport whose fetches wait until ``release`` is set."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+        self.release.set()
+        self.num_fetches = 0
+
+    def fetch(self, url: str) -> bytes:
+        assert self.release.wait(10)
+        self.num_fetches += 1
+        return super().fetch(url)
+
+
+def test_warm_up_none():
+    mapper = StockMapper(transport=STOCK_TRANSPORT)
+    assert mapper._indexes == {}
+    assert mapper.warm_up_thread is None
+    assert mapper.warm_up("none") is None
+    assert mapper._indexes == {}
+
+
+def test_warm_up_all():
+    expected = StockMapper(transport=STOCK_TRANSPORT).materialize_all()
+    instrumentation = Instrumentation()
+    mapper = StockMapper(STOCK_TRANSPORT, instrumentation, warm_up="all")
+    assert mapper._indexes == expected
+    # Every mapping is built in a single pass
+    assert "build_indexes" in mapper.stats
+    assert not [name for name in mapper.stats if name.startswith("build.")]
+    assert mapper.warm_up_thread is None
+
+
+def test_warm_up_names():
+    transport = InMemoryTransport(
+        {"company_tickers_mf.json": generate_mutual_fund_payload(2000)}
+    )
+    mapper = MutualFundMapper(transport=transport, warm_up=FUND_NAMES)
+    assert list(mapper._indexes) == FUND_NAMES
+    mapper.drop_indexes()
+    assert mapper.warm_up(iter(FUND_NAMES[:1])) is None
+    assert list(mapper._indexes) == FUND_NAMES[:1]
+
+
+@pytest.mark.parametrize(
+    "names, message",
+    [
+        ("some", "Unknown warm-up policy: some. Valid policies: none, all"),
+        (["ticker_to_sic"], "Unknown mapping"),
+    ],
+)
+def test_warm_up_invalid(names, message):
+    with pytest.raises(ValueError, match=message):
+        StockMapper(transport=STOCK_TRANSPORT, warm_up=names)
+    with pytest.raises(ValueError, match=message):
+        StockMapper(transport=STOCK_TRANSPORT).warm_up(names, background=True)
+
+
+def test_background_warm_up():
+    mapper = StockMapper(
+        transport=STOCK_TRANSPORT, warm_up="all", background_warm_up=True
+    )
+    thread = mapper.warm_up_thread
+    assert thread.daemon and thread.name == "StockMapper-warm-up"
+    thread.join()
+    assert set(mapper._indexes) == set(StockMapper._index_specs)
+
+
+def test_lookup_waits_for_background_warm_up():
+    transport = BlockingTransport(
+        {"company_tickers_mf.json": generate_mutual_fund_payload(2000)}
+    )
+    mapper = MutualFundMapper(transport=transport)
+    expected = MutualFundMapper(transport=transport).series_id_to_class_ids
+    # Building mappings fetches the dropped table again, holding the build lock
+    mapper.drop_raw_table()
+    transport.release.clear()
+    thread = mapper.warm_up(FUND_NAMES, background=True)
+
+    lookups = []
+    lookup = threading.Thread(
+        target=lambda: lookups.append(mapper.series_id_to_class_ids)
+    )
+    lookup.start()
+    lookup.join(0.2)
+    assert lookup.is_alive() and not lookups
+
+    transport.release.set()
+    thread.join()
+    lookup.join()
+    assert lookups == [expected]
+    assert lookups[0] is mapper._indexes["series_id_to_class_ids"]
+    # The lookup did not fetch the data and build the mapping again
+    assert transport.num_fetches == 3
+
+
+def test_warm_up_restored_mapper():
+    mapper = StockMapper(transport=STOCK_TRANSPORT)
+    unpickled = pickle.loads(pickle.dumps(mapper))
+    assert unpickled.warm_up_thread is None
+    unpickled.warm_up(["ticker_to_cik"], background=True).join()
+    assert unpickled._indexes["ticker_to_cik"] == mapper.ticker_to_cik
+
+
+def test_submissions_mapper_warm_up():
+    transport = InMemoryTransport({"submissions.zip": generate_submissions_archive(50)})
+    mapper = SubmissionsMapper(transport=transport, warm_up=["cik_to_sic"])
+    assert list(mapper._indexes) == ["cik_to_sic"]